@@ -0,0 +1,96 @@
+"""
+Benchmark ADWIN: ventana deque (split en el medio) vs histograma exponencial
+Serie sintetica con un cambio de media conocido.
+
+Uso:
+    python scripts/benchmark_adwin.py --points 10000000 --legacy-points 20000
+    (el detector legacy es O(W) por update: se mide sobre un prefijo y se extrapola)
+"""
+
+import sys
+sys.path.insert(0, 'C:/TradingSystem/src')
+
+import argparse
+import time
+from collections import deque
+
+import numpy as np
+
+from research.drift_detection import ADWIN
+
+
+class LegacyADWIN:
+    """ADWIN original: copia la deque en cada update y prueba solo el medio."""
+
+    def __init__(self, delta: float = 0.002):
+        self.delta = delta
+        self._window = deque()
+
+    def update(self, value: float) -> bool:
+        self._window.append(value)
+        n = len(self._window)
+        n0 = n // 2
+        n1 = n - n0
+        if n0 < 5 or n1 < 5:
+            return False
+
+        window_list = list(self._window)
+        mean0 = np.mean(window_list[:n0])
+        mean1 = np.mean(window_list[n0:])
+        m = 1.0 / (1.0 / n0 + 1.0 / n1)
+        epsilon = np.sqrt((1.0 / (2 * m)) * np.log(4.0 / self.delta))
+
+        if abs(mean0 - mean1) > epsilon:
+            for _ in range(n0):
+                self._window.popleft()
+            return True
+        return False
+
+
+def synthetic_stream(points: int, change_at: float, shift: float, seed: int = 42) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    values = rng.normal(0.0, 1.0, points)
+    values[int(points * change_at):] += shift
+    return values
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--points', type=int, default=10_000_000)
+    parser.add_argument('--legacy-points', type=int, default=20_000)
+    parser.add_argument('--change-at', type=float, default=0.7)
+    parser.add_argument('--shift', type=float, default=0.5)
+    parser.add_argument('--clock', type=int, default=32,
+                        help='Muestras entre chequeos de corte (ADWIN usa 1 por defecto)')
+    args = parser.parse_args()
+
+    values = synthetic_stream(args.points, args.change_at, args.shift)
+    change_point = int(args.points * args.change_at)
+    print(f"Serie: {args.points:,} puntos, cambio de media +{args.shift} en {change_point:,}, "
+          f"clock {args.clock}")
+    print("=" * 70)
+
+    adwin = ADWIN(clock=args.clock)
+    t0 = time.perf_counter()
+    detections = adwin.update_many(values)
+    elapsed = time.perf_counter() - t0
+    first = next((d for d in detections if d >= change_point), None)
+    false_alarms = int(np.sum(detections < change_point))
+    print(f"{'histograma':12} {elapsed:.1f} s | {elapsed / args.points * 1e6:.2f} us/punto | "
+          f"buckets {adwin.n_buckets} | ventana final {adwin.window_size:,}")
+    print(f"{'':12} retardo deteccion {first - change_point if first is not None else 'n/a'} | "
+          f"falsas alarmas {false_alarms}")
+
+    legacy_points = min(args.legacy_points, args.points)
+    legacy = LegacyADWIN()
+    t0 = time.perf_counter()
+    for value in values[:legacy_points].tolist():
+        legacy.update(value)
+    elapsed = time.perf_counter() - t0
+    print(f"{'legacy':12} {elapsed:.1f} s en {legacy_points:,} puntos | "
+          f"{elapsed / legacy_points * 1e6:.2f} us/punto | ventana {len(legacy._window):,} (crece sin limite)")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
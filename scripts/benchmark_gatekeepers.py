@@ -0,0 +1,114 @@
+"""
+Benchmark Gatekeepers: replay de ticks grabados por símbolo
+Mide ticks/s por símbolo en un core, tick a tick (process_tick) y por
+lotes (process_ticks).
+
+Ficheros de ticks: {tick_dir}/{SYMBOL}.npy (array de mt5.copy_ticks_range)
+o {SYMBOL}.csv (columnas time, bid, ask[, last, volume]).
+
+Uso:
+    python scripts/benchmark_gatekeepers.py --tick-dir C:/TradingSystem/data/ticks --batch 500
+    (sin ficheros usa ticks sintéticos para 28 pares)
+"""
+
+import sys
+sys.path.insert(0, 'C:/TradingSystem/src')
+
+import argparse
+import logging
+import time
+from pathlib import Path
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from gatekeepers.gatekeeper_adapter import GatekeeperAdapter
+
+FX_PAIRS = [
+    'EURUSD', 'GBPUSD', 'USDJPY', 'USDCHF', 'AUDUSD', 'USDCAD', 'NZDUSD',
+    'EURGBP', 'EURJPY', 'EURCHF', 'EURAUD', 'EURCAD', 'EURNZD', 'GBPJPY',
+    'GBPCHF', 'GBPAUD', 'GBPCAD', 'GBPNZD', 'AUDJPY', 'AUDCHF', 'AUDCAD',
+    'AUDNZD', 'CADJPY', 'CADCHF', 'CHFJPY', 'NZDJPY', 'NZDCHF', 'NZDCAD',
+]
+
+TICK_DTYPE = [('time', 'i8'), ('bid', 'f8'), ('ask', 'f8'), ('last', 'f8'), ('volume', 'f8')]
+
+
+def load_recorded_ticks(tick_dir: Path) -> Dict[str, np.ndarray]:
+    """Ticks grabados por símbolo (.npy estructurado o .csv)."""
+    ticks = {}
+    for path in sorted(tick_dir.glob('*.npy')):
+        ticks[path.stem] = np.load(path)
+    for path in sorted(tick_dir.glob('*.csv')):
+        if path.stem not in ticks:
+            ticks[path.stem] = pd.read_csv(path).to_records(index=False)
+    return ticks
+
+
+def synthetic_ticks(n: int, seed: int) -> np.ndarray:
+    """Random walk de mid con spread variable (last = 0 como en FX MT5)."""
+    rng = np.random.default_rng(seed)
+    ticks = np.zeros(n, dtype=TICK_DTYPE)
+    mid = 1.0 + rng.uniform(0, 0.5) + np.cumsum(rng.normal(0, 5e-5, n))
+    spread = rng.uniform(1e-5, 4e-5, n)
+    ticks['time'] = 1_700_000_000 + np.arange(n) // 10
+    ticks['bid'] = mid - spread / 2
+    ticks['ask'] = mid + spread / 2
+    ticks['volume'] = rng.integers(1, 500, n)
+    return ticks
+
+
+def replay(ticks: Dict[str, np.ndarray], batch: int) -> float:
+    """Replay intercalado por símbolo; retorna segundos."""
+    adapter = GatekeeperAdapter(symbols=list(ticks))
+    longest = max(len(t) for t in ticks.values())
+
+    start = time.perf_counter()
+    if batch <= 1:
+        records = {symbol: pd.DataFrame(t).to_dict('records') for symbol, t in ticks.items()}
+        start = time.perf_counter()
+        for i in range(longest):
+            for symbol, rows in records.items():
+                if i < len(rows):
+                    tick = rows[i]
+                    tick['symbol'] = symbol
+                    adapter.process_tick(tick)
+    else:
+        for offset in range(0, longest, batch):
+            for symbol, t in ticks.items():
+                chunk = t[offset:offset + batch]
+                if len(chunk):
+                    adapter.process_ticks(chunk, symbol=symbol)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--tick-dir', default='C:/TradingSystem/data/ticks')
+    parser.add_argument('--ticks-per-symbol', type=int, default=20_000)
+    parser.add_argument('--batch', type=int, default=500)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+
+    tick_dir = Path(args.tick_dir)
+    ticks = load_recorded_ticks(tick_dir) if tick_dir.exists() else {}
+    if ticks:
+        print(f"Ticks: grabados en {tick_dir} ({len(ticks)} símbolos)")
+    else:
+        ticks = {symbol: synthetic_ticks(args.ticks_per_symbol, i) for i, symbol in enumerate(FX_PAIRS)}
+        print(f"Ticks: sintéticos ({len(ticks)} pares x {args.ticks_per_symbol:,})")
+
+    total = sum(len(t) for t in ticks.values())
+    print("=" * 70)
+    for label, batch in (('process_tick', 1), (f'process_ticks({args.batch})', args.batch)):
+        elapsed = replay(ticks, batch)
+        print(f"{label:22} {elapsed:.1f} s | {total / elapsed:,.0f} ticks/s total | "
+              f"{total / elapsed / len(ticks):,.0f} ticks/s por símbolo | "
+              f"{elapsed / total * 1e6:.1f} us/tick")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
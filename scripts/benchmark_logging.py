@@ -0,0 +1,164 @@
+"""
+Benchmark Logging: latencia del bucle de decisión con logging apagado,
+síncrono (FileHandler + JSONFormatter en el hilo llamador) y asíncrono
+(QueueHandler/QueueListener), con y sin rate limit y con lean_records.
+
+El bucle de decisión es InstitutionalBrain.process_signals sobre N símbolos
+con risk/position managers mínimos (sin MT5 ni ML): mide el coste que el
+logging añade a cada scan, no el de las estrategias. Entre scans se espera
+--interval-ms (el bucle real espera al siguiente tick/barra); esa espera no
+entra en la latencia medida y es cuando el hilo de fondo escribe.
+
+Uso:
+    python scripts/benchmark_logging.py --symbols 28 --iterations 500
+    python scripts/benchmark_logging.py --interval-ms 0     # scans seguidos
+    python scripts/benchmark_logging.py --log-dir C:/TradingSystem/logs/bench
+"""
+
+import sys
+sys.path.insert(0, 'C:/TradingSystem')
+sys.path.insert(0, 'C:/TradingSystem/src')
+
+import argparse
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from structured_logging import JSONFormatter, setup_async_logging
+from src.core.brain import InstitutionalBrain
+from src.core.regime_detector import RegimeDetector
+
+
+class _Detector(RegimeDetector):
+    def should_block_trading(self, regime, confidence):
+        return False, None
+
+
+class _RiskManager:
+    def evaluate_signal(self, signal, market_context):
+        return {'approved': True, 'reason': '', 'position_size_pct': 0.5,
+                'position_size_lots': 0.1, 'quality_score': 0.8}
+
+    def get_statistics(self):
+        return {}
+
+
+class _PositionManager:
+    def get_statistics(self):
+        return {}
+
+
+def synthetic_scan(n_symbols: int, n_bars: int = 200, seed: int = 0):
+    """Señales, barras y features sintéticos para un scan."""
+    rng = np.random.default_rng(seed)
+    market_data, features, signals = {}, {}, []
+    for i in range(n_symbols):
+        symbol = f'SYM{i:02d}'
+        close = 1.1 + np.cumsum(rng.normal(0, 1e-3, n_bars))
+        market_data[symbol] = pd.DataFrame({
+            'open': close, 'high': close + 1e-3, 'low': close - 1e-3, 'close': close,
+            'volume': rng.integers(100, 1000, n_bars).astype(float),
+        })
+        features[symbol] = {'adx': 30.0, 'vpin': 0.3}
+        signals.append({
+            'symbol': symbol, 'strategy_name': 'liquidity_sweep', 'direction': 'LONG',
+            'entry_price': close[-1], 'stop_loss': close[-1] - 0.002,
+            'take_profit': close[-1] + 0.004,
+            'metadata': {'quality_score': 0.9},
+        })
+    return signals, market_data, features
+
+
+def reset_root_logging(level: int):
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+        handler.close()
+    root.setLevel(level)
+
+
+def run_mode(mode: str, log_dir: Path, n_symbols: int, iterations: int,
+             interval_ms: float) -> dict:
+    """Latencias (ms) de process_signals con la configuración de logging dada."""
+    async_logging = None
+    log_path = log_dir / f'{mode}.jsonl'
+
+    if mode == 'off':
+        reset_root_logging(logging.CRITICAL)
+    elif mode == 'sync':
+        reset_root_logging(logging.INFO)
+        handler = logging.FileHandler(log_path, encoding='utf-8')
+        handler.setFormatter(JSONFormatter())
+        logging.getLogger().addHandler(handler)
+    else:
+        reset_root_logging(logging.INFO)
+        async_logging = setup_async_logging(
+            str(log_path), logger_name=None, console=False,
+            rate_limit_per_s=5.0 if mode == 'async_ratelimit' else None,
+            lean_records=mode == 'async_lean'
+        )
+
+    brain = InstitutionalBrain({'min_arbitration_score': 0.0}, _RiskManager(), _PositionManager(),
+                               _Detector({}), None)
+    signals, market_data, features = synthetic_scan(n_symbols)
+    for _ in range(10):
+        brain.process_signals(signals, market_data, features)     # calentamiento
+
+    latencies = np.empty(iterations)
+    for i in range(iterations):
+        if interval_ms:
+            time.sleep(interval_ms / 1000)
+        start = time.perf_counter()
+        brain.process_signals(signals, market_data, features)
+        latencies[i] = (time.perf_counter() - start) * 1000
+
+    drain_start = time.perf_counter()
+    stats = {}
+    if async_logging is not None:
+        stats = async_logging.get_stats()
+        async_logging.close()
+    drain_ms = (time.perf_counter() - drain_start) * 1000
+    reset_root_logging(logging.WARNING)
+
+    lines = sum(1 for _ in open(log_path, encoding='utf-8')) if log_path.exists() else 0
+    return {
+        'mean': latencies.mean(), 'p50': np.percentile(latencies, 50),
+        'p99': np.percentile(latencies, 99), 'lines': lines,
+        'dropped': stats.get('dropped', 0), 'suppressed': stats.get('suppressed', 0),
+        'drain_ms': drain_ms,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark de logging en el bucle de decisión')
+    parser.add_argument('--symbols', type=int, default=28)
+    parser.add_argument('--iterations', type=int, default=300)
+    parser.add_argument('--interval-ms', type=float, default=20.0,
+                        help='Espera entre scans (no se mide)')
+    parser.add_argument('--log-dir', type=str, default=None,
+                        help='Directorio para los .jsonl (por defecto uno temporal)')
+    args = parser.parse_args()
+
+    log_dir = Path(args.log_dir) if args.log_dir else Path(tempfile.mkdtemp(prefix='bench_logging_'))
+    log_dir.mkdir(parents=True, exist_ok=True)
+
+    print(f"process_signals: {args.symbols} símbolos, {args.iterations} iteraciones, "
+          f"{args.interval_ms:.0f} ms entre scans")
+    print(f"{'modo':<16}{'media ms':>10}{'p50 ms':>10}{'p99 ms':>10}{'líneas':>10}"
+          f"{'descart.':>10}{'limitad.':>10}{'drain ms':>10}")
+    baseline = None
+    # async_lean va al final: lean_records cambia flags globales de logging
+    for mode in ('off', 'sync', 'async', 'async_ratelimit', 'async_lean'):
+        r = run_mode(mode, log_dir, args.symbols, args.iterations, args.interval_ms)
+        baseline = baseline or r['mean']
+        print(f"{mode:<16}{r['mean']:>10.3f}{r['p50']:>10.3f}{r['p99']:>10.3f}{r['lines']:>10}"
+              f"{r['dropped']:>10}{r['suppressed']:>10}{r['drain_ms']:>10.1f}"
+              f"   (+{(r['mean'] / baseline - 1) * 100:.0f}% vs off)")
+
+
+if __name__ == '__main__':
+    main()
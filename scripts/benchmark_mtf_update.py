@@ -0,0 +1,92 @@
+"""
+Benchmark MTF: re-pull completo vs modo incremental (ring buffer)
+Reproduce N escaneos M1 sobre ReplayMT5Source, sin terminal MT5.
+
+Uso:
+    python scripts/benchmark_mtf_update.py --symbol EURUSD.pro --scans 300
+    (sin cache local usa historia sintetica)
+"""
+
+import sys
+sys.path.insert(0, 'C:/TradingSystem/src')
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from core.mt5_replay import RATES_DTYPE, ReplayMT5Source
+from core.mtf_data_manager import MultiTimeframeDataManager
+from execution.market_data_store import MarketDataStore
+
+STORE_PATH = 'C:/TradingSystem/data/market_store'
+
+
+def synthetic_history(days: int = 60, seed: int = 42) -> np.ndarray:
+    """Random walk M1 con el formato de copy_rates_*"""
+    rng = np.random.default_rng(seed)
+    times = pd.date_range('2024-01-01', periods=days * 1440, freq='min')
+    rates = np.zeros(len(times), dtype=RATES_DTYPE)
+    rates['time'] = times.as_unit('s').asi8
+    close = 1.1 + np.cumsum(rng.normal(0, 2e-4, len(times)))
+    rates['open'] = np.r_[close[0], close[:-1]]
+    rates['close'] = close
+    rates['high'] = np.maximum(rates['open'], close) + rng.uniform(0, 3e-4, len(times))
+    rates['low'] = np.minimum(rates['open'], close) - rng.uniform(0, 3e-4, len(times))
+    rates['tick_volume'] = rng.integers(1, 300, len(times))
+    return rates
+
+
+def run(mode: str, history: np.ndarray, symbol: str, start, scans: int) -> dict:
+    source = ReplayMT5Source({symbol: history}, start=start)
+    manager = MultiTimeframeDataManager([symbol], source=source)
+    update = manager.update_incremental if mode == 'incremental' else manager.update_all_timeframes
+
+    update(symbol)
+    source.calls = 0
+
+    timings = []
+    for _ in range(scans):
+        if not source.advance():
+            break
+        t0 = time.perf_counter()
+        update(symbol)
+        timings.append(time.perf_counter() - t0)
+
+    timings = np.array(timings) * 1000
+    return {
+        'scans': len(timings),
+        'mean_ms': timings.mean(),
+        'p95_ms': np.percentile(timings, 95),
+        'source_calls': source.calls,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--symbol', default='EURUSD.pro')
+    parser.add_argument('--scans', type=int, default=300)
+    args = parser.parse_args()
+
+    store = MarketDataStore(STORE_PATH)
+    if args.symbol in store.symbols():
+        history = store.load_rates(args.symbol)
+        print(f"Historia: cache local ({len(history):,} barras M1)")
+    else:
+        history = synthetic_history()
+        print(f"Historia: sintetica ({len(history):,} barras M1)")
+
+    # Arrancar cerca del final: toda la historia previa queda visible
+    start = pd.to_datetime(history['time'][-1] - 2 * args.scans * 60, unit='s')
+
+    print("=" * 70)
+    for mode in ('full', 'incremental'):
+        stats = run(mode, history, args.symbol, start, args.scans)
+        print(f"{mode:12} {stats['scans']} escaneos | media {stats['mean_ms']:.1f} ms | "
+              f"p95 {stats['p95_ms']:.1f} ms | llamadas MT5 {stats['source_calls']}")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark estructura MTF: bucles originales vs StructureEngine
+Coste por escaneo (N simbolos x 7 timeframes), con una barra nueva por escaneo.
+
+Uso:
+    python scripts/benchmark_structure_engine.py --symbols 12 --scans 20
+"""
+
+import sys
+sys.path.insert(0, 'C:/TradingSystem/src')
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from core.bar_buffer import OHLCVRingBuffer
+from core.mt5_replay import RATES_DTYPE
+from core.mtf_data_manager import MultiTimeframeDataManager
+from core.structure_engine import StructureEngine
+
+
+def legacy_structure(df: pd.DataFrame):
+    """Bucles por barra previos a StructureEngine (referencia de coste)"""
+    if len(df) < 50:
+        return None
+    structure = {'swing_highs': [], 'swing_lows': [], 'order_blocks': [], 'fvgs': [], 'liquidity_zones': []}
+    highs, lows, times = df['high'].values, df['low'].values, df['time'].values
+    for i in range(5, len(df) - 5):
+        if highs[i] == max(highs[i-5:i+6]):
+            structure['swing_highs'].append({'price': float(highs[i]), 'time': times[i], 'index': i})
+        if lows[i] == min(lows[i-5:i+6]):
+            structure['swing_lows'].append({'price': float(lows[i]), 'time': times[i], 'index': i})
+    for idx, row in df.tail(100).iterrows():
+        if row['high'] - row['low'] > row['atr'] * 1.5:
+            structure['order_blocks'].append({'time': row['time']})
+    for i in range(2, len(df)):
+        if df.iloc[i-2]['high'] < df.iloc[i]['low']:
+            if df.iloc[i]['low'] - df.iloc[i-2]['high'] > df.iloc[i]['atr'] * 0.3:
+                structure['fvgs'].append({'time': df.iloc[i]['time']})
+        elif df.iloc[i-2]['low'] > df.iloc[i]['high']:
+            if df.iloc[i-2]['low'] - df.iloc[i]['high'] > df.iloc[i]['atr'] * 0.3:
+                structure['fvgs'].append({'time': df.iloc[i]['time']})
+    df_tail = df.tail(50)
+    atr_mean = np.mean(df_tail['atr'].values)
+    for i in range(5, len(df_tail)):
+        if df_tail.iloc[i-5:i]['atr'].mean() < atr_mean * 0.6:
+            structure['liquidity_zones'].append({'time': df_tail.iloc[i]['time']})
+    return structure
+
+
+def synthetic_rates(n: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    rates = np.zeros(n, dtype=RATES_DTYPE)
+    rates['time'] = pd.date_range('2024-01-01', periods=n, freq='min').as_unit('s').asi8
+    close = 1.1 + np.cumsum(rng.normal(0, 3e-4, n))
+    rates['open'] = np.r_[close[0], close[:-1]]
+    rates['close'] = close
+    rates['high'] = np.maximum(rates['open'], close) + rng.uniform(0, 2e-4, n)
+    rates['low'] = np.minimum(rates['open'], close) - rng.uniform(0, 2e-4, n)
+    rates['tick_volume'] = rng.integers(1, 300, n)
+    return rates
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--symbols', type=int, default=12)
+    parser.add_argument('--scans', type=int, default=20)
+    args = parser.parse_args()
+
+    bars = MultiTimeframeDataManager.DEFAULT_BARS
+    keys = [(f'SYM{s:02d}', tf) for s in range(args.symbols) for tf in bars]
+
+    # Un ring buffer por (simbolo, TF) con historia + barras para los escaneos
+    history = {}
+    buffers = {}
+    for n, key in enumerate(keys):
+        capacity = bars[key[1]]
+        history[key] = synthetic_rates(capacity + args.scans + 1, seed=n)
+        buffers[key] = OHLCVRingBuffer(capacity)
+        buffers[key].update(history[key][:capacity])
+
+    engine = StructureEngine()
+    for key in keys:
+        engine.update(key, buffers[key].to_frame(*key))
+
+    timings = {'legacy': [], 'detect': [], 'incremental': []}
+    for scan in range(args.scans):
+        frames = {}
+        for key in keys:
+            pos = bars[key[1]] + scan
+            buffers[key].update(history[key][pos - 1:pos + 1])
+            frames[key] = buffers[key].to_frame(*key)
+
+        t0 = time.perf_counter()
+        for key in keys:
+            legacy_structure(frames[key])
+        t1 = time.perf_counter()
+        for key in keys:
+            engine.detect(frames[key])
+        t2 = time.perf_counter()
+        for key in keys:
+            engine.update(key, frames[key])
+        t3 = time.perf_counter()
+
+        timings['legacy'].append(t1 - t0)
+        timings['detect'].append(t2 - t1)
+        timings['incremental'].append(t3 - t2)
+
+    print("=" * 70)
+    print(f"{args.symbols} simbolos x {len(bars)} TF = {len(keys)} estructuras por escaneo")
+    for name, values in timings.items():
+        values = np.array(values) * 1000
+        print(f"  {name:12} media {values.mean():8.2f} ms/escaneo | p95 {np.percentile(values, 95):8.2f} ms")
+    print("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,8 @@ from datetime import datetime
 import importlib
 import logging
 
+from execution.market_data_store import MarketDataStore
+
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
@@ -26,6 +28,8 @@ DB_CONFIG = {
     'password': 'abc'
 }
 
+STORE_PATH = 'C:/TradingSystem/data/market_store'
+
 INITIAL_CAPITAL = 10000.0
 SLIPPAGE_PIPS = 1.0
 
@@ -103,15 +107,25 @@ class ConsolidatedBacktestEngine:
         logger.info("CONSOLIDATED BACKTEST: 9 ORIGINAL STRATEGIES")
         logger.info("=" * 80)
         
+        # Local columnar cache (kept fresh by etl_incremental); symbols not yet
+        # cached are read from PostgreSQL and merged in
+        store = MarketDataStore(STORE_PATH)
         conn = psycopg2.connect(**DB_CONFIG)
         
-        all_data = pd.read_sql_query("""
-            SELECT symbol, time, open, high, low, close
-            FROM market_data
-            ORDER BY time
-        """, conn)
-        
-        conn.close()
+        try:
+            db_symbols = pd.read_sql_query(
+                "SELECT DISTINCT symbol FROM market_data", conn
+            )['symbol'].tolist()
+            symbols = sorted(set(db_symbols) | set(store.symbols()))
+            
+            all_data = store.load_long_merged(symbols, lambda missing: pd.read_sql_query("""
+                SELECT symbol, time, open, high, low, close
+                FROM market_data
+                WHERE symbol = ANY(%s)
+                ORDER BY time
+            """, conn, params=(missing,)))[['symbol', 'time', 'open', 'high', 'low', 'close']]
+        finally:
+            conn.close()
         
         if all_data.empty:
             logger.error("No historical data available in database")
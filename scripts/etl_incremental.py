@@ -10,6 +10,10 @@ import sys
 import json
 from typing import Dict, Optional
 
+sys.path.insert(0, 'C:/TradingSystem/src')
+from execution.market_data_store import MarketDataStore
+from execution.bulk_ingest import BulkIngestor, copy_bars
+
 DB_CONFIG = {
     'host': 'localhost',
     'port': 5432,
@@ -25,6 +29,10 @@ SYMBOLS = [
     'BTCUSD', 'ETHUSD'
 ]
 
+STORE_PATH = 'C:/TradingSystem/data/market_store'
+
+INGEST_WORKERS = 4
+
 def get_last_timestamp(cursor, symbol: str) -> Optional[datetime]:
     """Obtiene timestamp de ultima barra en BD para un simbolo"""
     cursor.execute(
@@ -59,33 +67,18 @@ def fetch_new_bars(symbol: str, from_date: datetime) -> list:
     return rates
 
 def insert_bars(cursor, symbol: str, bars) -> int:
-    """Inserta barras en PostgreSQL, omitiendo duplicados"""
-    inserted = 0
+    """Inserta barras en PostgreSQL (COPY + upsert), omitiendo duplicados"""
+    return copy_bars(cursor.connection, symbol, bars)
+
+def catch_up_store(store: MarketDataStore, cursor, symbol: str, db_last: datetime) -> int:
+    """Rellena la cache columnar con lo que BD tiene y la cache aun no (primera vez: todo)"""
+    store_last = store.last_timestamp(symbol)
     
-    for bar in bars:
-        try:
-            cursor.execute("""
-                INSERT INTO market_data (symbol, time, open, high, low, close, 
-                                       tick_volume, spread, real_volume)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                ON CONFLICT (symbol, time) DO NOTHING
-            """, (
-                symbol,
-                datetime.fromtimestamp(bar['time']),
-                float(bar['open']),
-                float(bar['high']),
-                float(bar['low']),
-                float(bar['close']),
-                int(bar['tick_volume']),
-                int(bar['spread']),
-                int(bar['real_volume'])
-            ))
-            if cursor.rowcount > 0:
-                inserted += 1
-        except Exception as e:
-            print(f"    Error insertando barra: {e}")
+    # Cache y BD en la misma convencion (hora local naive)
+    if store_last is not None and store_last >= db_last:
+        return 0
     
-    return inserted
+    return store.import_from_postgres(cursor, symbol, since=store_last)
 
 def run_incremental_sync():
     """Ejecuta sincronizacion incremental completa"""
@@ -110,6 +103,8 @@ def run_incremental_sync():
         mt5.shutdown()
         return False
     
+    store = MarketDataStore(STORE_PATH)
+    
     # Sincronizar cada simbolo
     stats = {
         'timestamp': datetime.now().isoformat(),
@@ -120,6 +115,9 @@ def run_incremental_sync():
     
     print(f"\nSincronizando {len(SYMBOLS)} simbolos...")
     
+    # Descarga MT5 en este hilo; COPY a PostgreSQL en paralelo por simbolo
+    ingestor = BulkIngestor(DB_CONFIG, max_workers=INGEST_WORKERS)
+    
     for symbol in SYMBOLS:
         try:
             # Obtener ultima fecha en BD
@@ -132,29 +130,52 @@ def run_incremental_sync():
             # Descargar barras nuevas
             new_bars = fetch_new_bars(symbol, last_ts)
             
+            # Cache columnar local al dia con BD antes de anadir lo nuevo
+            cached = catch_up_store(store, cursor, symbol, last_ts)
+            conn.commit()
+            
             if len(new_bars) == 0:
-                print(f"  {symbol}: Sin barras nuevas")
-                stats['details'][symbol] = {'new_bars': 0, 'inserted': 0}
+                print(f"  {symbol}: Sin barras nuevas (cache +{cached})")
+                stats['details'][symbol] = {'new_bars': 0, 'inserted': 0, 'cached': cached}
                 continue
             
-            # Insertar barras
-            inserted = insert_bars(cursor, symbol, new_bars)
-            conn.commit()
+            # Encolar COPY + upsert
+            ingestor.submit(symbol, new_bars)
             
-            print(f"  {symbol}: {inserted}/{len(new_bars)} barras insertadas")
+            # Barras crudas de MT5 directo a la cache (sin pasar por NUMERIC)
+            cached += store.write_bars(symbol, new_bars)
             
-            stats['symbols_synced'] += 1
-            stats['total_bars_inserted'] += inserted
             stats['details'][symbol] = {
                 'new_bars': len(new_bars),
-                'inserted': inserted,
-                'last_update': datetime.now().isoformat()
+                'cached': cached,
             }
             
         except Exception as e:
             print(f"  {symbol}: ERROR - {e}")
             stats['details'][symbol] = {'error': str(e)}
     
+    ingest_stats = ingestor.wait()
+    ingestor.close()
+    
+    for symbol, detail in ingest_stats['details'].items():
+        if 'error' in detail:
+            print(f"  {symbol}: ERROR - {detail['error']}")
+            stats['details'][symbol]['error'] = detail['error']
+            continue
+        
+        inserted = detail['rows_inserted']
+        print(f"  {symbol}: {inserted}/{detail['rows_read']} barras insertadas, "
+              f"cache +{stats['details'][symbol]['cached']}")
+        
+        stats['symbols_synced'] += 1
+        stats['total_bars_inserted'] += inserted
+        stats['details'][symbol].update({
+            'inserted': inserted,
+            'last_update': datetime.now().isoformat()
+        })
+    
+    stats['rows_per_s'] = round(ingest_stats['rows_per_s'], 1)
+    
     # Cerrar conexiones
     cursor.close()
     conn.close()
@@ -166,7 +187,7 @@ def run_incremental_sync():
         f.write(json.dumps(stats) + '\n')
     
     print("\n" + "=" * 70)
-    print(f"COMPLETADO: {stats['total_bars_inserted']} barras nuevas")
+    print(f"COMPLETADO: {stats['total_bars_inserted']} barras nuevas ({stats['rows_per_s']:,.0f} filas/s)")
     print(f"Simbolos sincronizados: {stats['symbols_synced']}/{len(SYMBOLS)}")
     print("=" * 70)
     
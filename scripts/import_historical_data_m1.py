@@ -9,6 +9,11 @@ from datetime import datetime
 import sys
 import json
 
+import pandas as pd
+
+sys.path.insert(0, 'C:/TradingSystem/src')
+from execution.bulk_ingest import BulkIngestor
+
 DB_CONFIG = {
     'host': 'localhost',
     'port': 5432,
@@ -27,6 +32,12 @@ SYMBOLS = [
 START_DATE = datetime(2025, 9, 1)
 END_DATE = datetime.now()
 
+# Descarga por meses para acotar memoria; COPY concurrente por simbolo
+INGEST_WORKERS = 4
+CHUNK_BOUNDS = list(pd.date_range(START_DATE, END_DATE, freq='MS').to_pydatetime())
+CHUNKS = list(zip([START_DATE] + CHUNK_BOUNDS, CHUNK_BOUNDS + [END_DATE]))
+CHUNKS = [(start, end) for start, end in CHUNKS if start < end]
+
 print("=" * 80)
 print("IMPORTACION DE DATOS M1 - DESDE 2025-09-01")
 print("=" * 80)
@@ -41,8 +52,7 @@ print(f"Periodo: {START_DATE.date()} a {END_DATE.date()}")
 print(f"Simbolos: {len(SYMBOLS)}\n")
 
 try:
-    conn = psycopg2.connect(**DB_CONFIG)
-    cursor = conn.cursor()
+    ingestor = BulkIngestor(DB_CONFIG, max_workers=INGEST_WORKERS)
     print("PostgreSQL conectado\n")
 except Exception as e:
     print(f"ERROR PostgreSQL: {e}")
@@ -64,44 +74,42 @@ for symbol in SYMBOLS:
         if not info.visible:
             mt5.symbol_select(symbol, True)
         
-        rates = mt5.copy_rates_range(symbol, mt5.TIMEFRAME_M1, START_DATE, END_DATE)
+        downloaded = 0
+        for chunk_start, chunk_end in CHUNKS:
+            rates = mt5.copy_rates_range(symbol, mt5.TIMEFRAME_M1, chunk_start, chunk_end)
+            if rates is not None and len(rates) > 0:
+                ingestor.submit(symbol, rates)
+                downloaded += len(rates)
         
-        if rates is None or len(rates) == 0:
+        if downloaded == 0:
             print("SIN DATOS")
             stats['symbols_fail'].append(symbol)
             continue
         
-        imported = 0
-        for bar in rates:
-            try:
-                cursor.execute("""
-                    INSERT INTO market_data (symbol, time, open, high, low, close, tick_volume, spread, real_volume)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-                    ON CONFLICT (symbol, time) DO NOTHING
-                """, (
-                    symbol,
-                    datetime.fromtimestamp(bar['time']),
-                    float(bar['open']), float(bar['high']), float(bar['low']), float(bar['close']),
-                    int(bar['tick_volume']), int(bar['spread']), int(bar['real_volume'])
-                ))
-                if cursor.rowcount > 0:
-                    imported += 1
-            except:
-                pass
-        
-        conn.commit()
-        print(f"OK ({imported:,} barras)")
-        stats['total_bars'] += imported
-        stats['symbols_ok'] += 1
+        print(f"OK ({downloaded:,} barras descargadas)")
         
     except Exception as e:
         print(f"ERROR: {str(e)[:50]}")
         stats['symbols_fail'].append(symbol)
 
-cursor.close()
-conn.close()
+ingest_stats = ingestor.wait()
+ingestor.close()
 mt5.shutdown()
 
+print("\nCOPY a PostgreSQL:")
+for symbol, detail in ingest_stats['details'].items():
+    if 'error' in detail:
+        print(f"  {symbol:15} ERROR: {detail['error'][:50]}")
+        stats['symbols_fail'].append(symbol)
+        continue
+    print(f"  {symbol:15} {detail['rows_inserted']:7,} barras nuevas")
+    stats['total_bars'] += detail['rows_inserted']
+    stats['symbols_ok'] += 1
+
+stats['rows_per_s'] = round(ingest_stats['rows_per_s'], 1)
+print(f"Throughput: {ingest_stats['rows_read']:,} filas en {ingest_stats['elapsed_s']:.1f}s "
+      f"({ingest_stats['rows_per_s']:,.0f} filas/s)")
+
 print("\n" + "=" * 80)
 print("RESUMEN")
 print("=" * 80)
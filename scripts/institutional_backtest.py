@@ -7,13 +7,15 @@ import sys
 sys.path.insert(0, 'C:/TradingSystem')
 sys.path.insert(0, 'C:/TradingSystem/src')
 
+import argparse
 import psycopg2
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+from functools import partial
 import importlib
 import logging
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 
 # Import feature calculation modules
 from features.technical_indicators import (
@@ -36,6 +38,8 @@ from features.derived_features import (
     calculate_momentum_quality, calculate_volume_price_correlation,
     detect_price_volume_divergence
 )
+from execution.market_data_store import MarketDataStore
+from backtesting.parallel_runner import ParallelBacktestRunner
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -48,6 +52,12 @@ DB_CONFIG = {
     'password': 'abc'
 }
 
+STORE_PATH = 'C:/TradingSystem/data/market_store'
+
+SYMBOLS = ['EURUSD.pro', 'GBPUSD.pro', 'USDJPY.pro', 'AUDUSD.pro',
+           'USDCAD.pro', 'USDCHF.pro', 'NZDUSD.pro', 'EURGBP.pro',
+           'XAUUSD.pro', 'BTCUSD', 'ETHUSD']
+
 INITIAL_CAPITAL = 10000.0
 SLIPPAGE_PIPS = 1.0
 
@@ -188,6 +198,13 @@ class FeatureGenerator:
         return features
 
 
+def load_strategy(config: Dict):
+    """Instantiate one configured strategy (picklable factory for parallel shards)."""
+    module = importlib.import_module(config['module'])
+    strategy_class = getattr(module, config['class'])
+    return strategy_class(config['params'])
+
+
 class InstitutionalBacktestEngine:
     """
     Production-grade backtesting engine with complete feature pipeline.
@@ -211,19 +228,7 @@ class InstitutionalBacktestEngine:
         
         for strategy_name, config in self.strategy_configs.items():
             try:
-                module = importlib.import_module(config['module'])
-                strategy_class = getattr(module, config['class'])
-                
-                strategy_instance = strategy_class(config['params'])
-                self.strategies[strategy_name] = strategy_instance
-                
-                self.strategy_stats[strategy_name] = {
-                    'signals_generated': 0,
-                    'trades_executed': 0,
-                    'trades_won': 0,
-                    'total_pnl': 0.0
-                }
-                
+                self.add_strategy(strategy_name, load_strategy(config))
                 logger.info(f"✓ Loaded: {strategy_name}")
                 
             except Exception as e:
@@ -231,8 +236,24 @@ class InstitutionalBacktestEngine:
         
         logger.info(f"Successfully loaded {len(self.strategies)} strategies\n")
     
-    def run_backtest(self):
-        """Execute comprehensive backtest with full feature pipeline."""
+    def add_strategy(self, strategy_name: str, strategy_instance):
+        """Register an instantiated strategy and its statistics."""
+        self.strategies[strategy_name] = strategy_instance
+        self.strategy_stats[strategy_name] = {
+            'signals_generated': 0,
+            'trades_executed': 0,
+            'trades_won': 0,
+            'total_pnl': 0.0
+        }
+    
+    def run_backtest(self, all_data: Optional[pd.DataFrame] = None):
+        """
+        Execute comprehensive backtest with full feature pipeline.
+        
+        Args:
+            all_data: Long-format bars (symbol, time, OHLCV); None loads
+                      them with load_market_data()
+        """
         logger.info("=" * 80)
         logger.info("INSTITUTIONAL-GRADE BACKTESTING ENGINE")
         logger.info("=" * 80)
@@ -241,19 +262,8 @@ class InstitutionalBacktestEngine:
         logger.info("Feature Pipeline: Active")
         logger.info("=" * 80)
         
-        conn = psycopg2.connect(**DB_CONFIG)
-        
-        # Load all available historical data
-        all_data = pd.read_sql_query("""
-            SELECT symbol, time, open, high, low, close, tick_volume as volume
-            FROM market_data
-            WHERE symbol IN ('EURUSD.pro', 'GBPUSD.pro', 'USDJPY.pro', 'AUDUSD.pro',
-                           'USDCAD.pro', 'USDCHF.pro', 'NZDUSD.pro', 'EURGBP.pro',
-                           'XAUUSD.pro', 'BTCUSD', 'ETHUSD')
-            ORDER BY time
-        """, conn)
-        
-        conn.close()
+        if all_data is None:
+            all_data = self.load_market_data()
         
         if all_data.empty:
             logger.error("No historical data available")
@@ -338,6 +348,58 @@ class InstitutionalBacktestEngine:
         logger.info("\nBacktest execution completed")
         return True
     
+    def load_market_data(self) -> pd.DataFrame:
+        """Long-format bars for SYMBOLS (symbol, time, open, high, low, close, volume)."""
+        # Load all available historical data (local columnar cache first;
+        # symbols not yet cached come from PostgreSQL)
+        store = MarketDataStore(STORE_PATH)
+        
+        def load_from_db(missing):
+            conn = psycopg2.connect(**DB_CONFIG)
+            try:
+                return pd.read_sql_query("""
+                    SELECT symbol, time, open, high, low, close, tick_volume as volume
+                    FROM market_data
+                    WHERE symbol = ANY(%s)
+                    ORDER BY time
+                """, conn, params=(missing,))
+            finally:
+                conn.close()
+        
+        all_data = store.load_long_merged(SYMBOLS, load_from_db)[
+            ['symbol', 'time', 'open', 'high', 'low', 'close', 'volume']
+        ]
+        
+        return all_data
+    
+    def absorb_parallel_results(self, results: Dict):
+        """
+        Take trades, equity and per-strategy statistics from a single-window
+        ParallelBacktestRunner sweep, for generate_performance_report.
+        """
+        self.trades = results['trades']
+        
+        for shard_result in results['shards']:
+            stats = self.strategy_stats.setdefault(shard_result['shard'].strategy_name, {
+                'signals_generated': 0,
+                'trades_executed': 0,
+                'trades_won': 0,
+                'total_pnl': 0.0
+            })
+            for key, value in shard_result['summary'].items():
+                stats[key] += value
+        
+        equity = results['portfolio_equity'][0]
+        peak = np.maximum.accumulate(np.maximum(equity.to_numpy(), self.initial_capital))
+        self.daily_equity = [
+            {'date': date, 'equity': value, 'peak': peak_value}
+            for date, value, peak_value in zip(equity.index, equity.to_numpy(), peak)
+        ]
+        
+        closed_pnl = sum(t['profit'] for t in self.trades if t['status'] == 'closed')
+        self.current_capital = self.initial_capital + closed_pnl
+        self.equity_peak = float(peak[-1]) if len(peak) else self.initial_capital
+    
     def _execute_trade(self, signal, strategy_name: str, entry_date: datetime):
         """Execute trade from strategy signal."""
         volume = 1.0
@@ -516,8 +578,40 @@ class InstitutionalBacktestEngine:
         logger.info("\n" + "=" * 80)
 
 
+def run_institutional_shard(shard, strategy_factory, data: Dict[str, pd.DataFrame],
+                            engine_kwargs: Dict) -> Dict:
+    """
+    ParallelBacktestRunner shard: this engine with one strategy on the
+    shard's symbols over [shard.start, shard.end].
+    
+    Trade P&L does not depend on capital (fixed volume), so the per-shard
+    equity curves add up to the portfolio curve.
+    """
+    engine = InstitutionalBacktestEngine({}, engine_kwargs['initial_capital'])
+    engine.add_strategy(shard.strategy_name, strategy_factory())
+    
+    frames = [frame.rename_axis('time').reset_index().assign(symbol=symbol)
+              for symbol, frame in data.items()]
+    all_data = pd.concat(frames, ignore_index=True).sort_values('time', kind='stable', ignore_index=True)
+    all_data = all_data[(all_data['time'] >= shard.start) & (all_data['time'] <= shard.end)]
+    
+    engine.run_backtest(all_data[['symbol', 'time', 'open', 'high', 'low', 'close', 'volume']])
+    
+    equity = pd.DataFrame(engine.daily_equity, columns=['date', 'equity', 'peak'])
+    return {
+        'summary': engine.strategy_stats[shard.strategy_name],
+        'trades': [dict(t, entry_time=t['entry_date']) for t in engine.trades],
+        'equity_timestamps': pd.DatetimeIndex(equity['date']).as_unit('ns').asi8,
+        'equity': equity['equity'].to_numpy(dtype=np.float64),
+    }
+
+
 def main():
     """Execute institutional-grade backtesting."""
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Worker processes; >1 shards (strategy, symbol) with ParallelBacktestRunner')
+    args = parser.parse_args()
     
     strategy_configs = {
         'liquidity_sweep': {
@@ -539,6 +633,29 @@ def main():
     }
     
     engine = InstitutionalBacktestEngine(strategy_configs, INITIAL_CAPITAL)
+    
+    if args.workers > 1:
+        all_data = engine.load_market_data()
+        if all_data.empty:
+            logger.error("No historical data available")
+            return False
+        
+        historical_data = {
+            symbol: frame.set_index('time')[['open', 'high', 'low', 'close', 'volume']]
+            for symbol, frame in all_data.groupby('symbol', sort=False)
+        }
+        runner = ParallelBacktestRunner(
+            {name: partial(load_strategy, config) for name, config in strategy_configs.items()},
+            max_workers=args.workers,
+            engine_kwargs={'initial_capital': INITIAL_CAPITAL},
+            shard_runner=run_institutional_shard
+        )
+        results = runner.run(historical_data, [(all_data['time'].min(), all_data['time'].max())])
+        
+        engine.absorb_parallel_results(results)
+        engine.generate_performance_report()
+        return True
+    
     engine.load_strategies()
     
     if engine.run_backtest():
@@ -127,7 +127,7 @@ class LiveTradingEngine:
         self.vpin_calculators = {symbol: VPINCalculator() for symbol in SYMBOLS}
         self.open_positions = {}
         # Inicializar sistema de gatekeepers
-        self.gatekeeper_adapter = GatekeeperAdapter()
+        self.gatekeeper_adapter = GatekeeperAdapter(symbols=SYMBOLS)
         logger.info("Sistema de gatekeepers inicializado")
         self.position_cooldown = 300  # 5 minutos anti-spam
         
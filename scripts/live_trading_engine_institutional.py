@@ -69,12 +69,14 @@ import importlib
 import inspect
 from datetime import datetime
 import time
+from typing import Dict, List
 import warnings
 warnings.filterwarnings("ignore", category=RuntimeWarning)
 
 # Institutional core components
 from core import (
     MultiTimeframeDataManager,
+    ScanFeatureStore,
     InstitutionalRiskManager,
     MarketStructurePositionManager,
     RegimeDetector,
@@ -212,6 +214,10 @@ class InstitutionalTradingEngine:
         # Position tracking for MT5 integration
         self.active_mt5_positions = {}
 
+        # Scan-scoped feature cache shared by all consumers
+        self.feature_store = ScanFeatureStore()
+        self._register_features()
+
         logger.info("Engine initialized (components pending MT5 connection)")
 
     def initialize_mt5(self) -> bool:
@@ -345,18 +351,29 @@ class InstitutionalTradingEngine:
             except Exception as e:
                 logger.error(f"Error updating MTF data for {symbol}: {e}")
 
+    def _register_features(self):
+        """Register feature groups in the scan feature store (computed once per scan)."""
+        self.feature_store.register('atr', self._feature_atr)
+        self.feature_store.register('rsi', self._feature_rsi)
+        self.feature_store.register('order_flow', self._feature_order_flow)
+        self.feature_store.register('adx', self._feature_adx)
+        self.feature_store.register('mtf_trend', self._feature_mtf_trend)
+        self.feature_store.register('structure', self._feature_structure)
+
     def calculate_features(self, symbol: str) -> Dict:
         """
         Calculate features for symbol using MTF data.
 
+        Served from the scan feature store: strategies, Brain, regime
+        detector, position manager and ML snapshots share one computation
+        per (symbol, last bar time).
+
         Args:
             symbol: Symbol to calculate features for
 
         Returns:
             Features dictionary
         """
-        features = {}
-
         try:
             # Get M1 data for microstructure features
             m1_data = self.mtf_manager.get_data(symbol, 'M1')
@@ -371,65 +388,11 @@ class InstitutionalTradingEngine:
                     'order_flow_imbalance': 0.0,
                 }
 
-            # ATR
-            if 'atr' in m1_data.columns:
-                features['atr'] = float(m1_data['atr'].iloc[-1])
-            else:
-                features['atr'] = 0.0001
-
-            # RSI
-            close = m1_data['close']
-            delta = close.diff()
-            gain = delta.where(delta > 0, 0).rolling(14).mean()
-            loss = -delta.where(delta < 0, 0).rolling(14).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            features['rsi'] = float(rsi.iloc[-1]) if not rsi.empty else 50.0
-
-            # VPIN (order flow toxicity)
-            buy_volume = m1_data.loc[m1_data['close'] > m1_data['close'].shift(1), 'volume'].sum()
-            sell_volume = m1_data.loc[m1_data['close'] <= m1_data['close'].shift(1), 'volume'].sum()
-            total_volume = buy_volume + sell_volume
-
-            if total_volume > 0:
-                imbalance = abs(buy_volume - sell_volume) / total_volume
-                features['vpin'] = float(imbalance)
-            else:
-                features['vpin'] = 0.5
-
-            # Order flow imbalance (signed)
-            features['order_flow_imbalance'] = float((buy_volume - sell_volume) / total_volume) if total_volume > 0 else 0.0
-
-            # ADX (simplified)
-            high = m1_data['high']
-            low = m1_data['low']
-            close = m1_data['close']
-
-            plus_dm = high.diff()
-            minus_dm = -low.diff()
-            plus_dm[plus_dm < 0] = 0
-            minus_dm[minus_dm < 0] = 0
-
-            atr = m1_data['atr'] if 'atr' in m1_data.columns else (high - low).rolling(14).mean()
-            plus_di = 100 * (plus_dm.rolling(14).mean() / atr)
-            minus_di = 100 * (minus_dm.rolling(14).mean() / atr)
-
-            dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
-            adx = dx.rolling(14).mean()
-
-            features['adx'] = float(adx.iloc[-1]) if not adx.empty else 0.0
-
-            # MTF confluence
-            mtf_trends = self.mtf_manager.calculate_mtf_trend(symbol)
-            features['mtf_trends'] = mtf_trends
-
-            # Structure data
-            structure = self.mtf_manager.get_structure(symbol, 'M15')
-            features['structure'] = structure
+            return self.feature_store.get(symbol, m1_data)
 
         except Exception as e:
             logger.error(f"Error calculating features for {symbol}: {e}")
-            features = {
+            return {
                 'atr': 0.0001,
                 'rsi': 50.0,
                 'vpin': 0.5,
@@ -437,7 +400,62 @@ class InstitutionalTradingEngine:
                 'order_flow_imbalance': 0.0,
             }
 
-        return features
+    def _feature_atr(self, symbol: str, m1_data: pd.DataFrame) -> Dict:
+        if 'atr' in m1_data.columns:
+            return {'atr': float(m1_data['atr'].iloc[-1])}
+        return {'atr': 0.0001}
+
+    def _feature_rsi(self, symbol: str, m1_data: pd.DataFrame) -> Dict:
+        close = m1_data['close']
+        delta = close.diff()
+        gain = delta.where(delta > 0, 0).rolling(14).mean()
+        loss = -delta.where(delta < 0, 0).rolling(14).mean()
+        rs = gain / loss
+        rsi = 100 - (100 / (1 + rs))
+        return {'rsi': float(rsi.iloc[-1]) if not rsi.empty else 50.0}
+
+    def _feature_order_flow(self, symbol: str, m1_data: pd.DataFrame) -> Dict:
+        # VPIN (order flow toxicity)
+        buy_volume = m1_data.loc[m1_data['close'] > m1_data['close'].shift(1), 'volume'].sum()
+        sell_volume = m1_data.loc[m1_data['close'] <= m1_data['close'].shift(1), 'volume'].sum()
+        total_volume = buy_volume + sell_volume
+
+        if total_volume > 0:
+            vpin = float(abs(buy_volume - sell_volume) / total_volume)
+        else:
+            vpin = 0.5
+
+        # Order flow imbalance (signed)
+        ofi = float((buy_volume - sell_volume) / total_volume) if total_volume > 0 else 0.0
+
+        return {'vpin': vpin, 'order_flow_imbalance': ofi}
+
+    def _feature_adx(self, symbol: str, m1_data: pd.DataFrame) -> Dict:
+        # ADX (simplified)
+        high = m1_data['high']
+        low = m1_data['low']
+
+        plus_dm = high.diff()
+        minus_dm = -low.diff()
+        plus_dm[plus_dm < 0] = 0
+        minus_dm[minus_dm < 0] = 0
+
+        atr = m1_data['atr'] if 'atr' in m1_data.columns else (high - low).rolling(14).mean()
+        plus_di = 100 * (plus_dm.rolling(14).mean() / atr)
+        minus_di = 100 * (minus_dm.rolling(14).mean() / atr)
+
+        dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
+        adx = dx.rolling(14).mean()
+
+        return {'adx': float(adx.iloc[-1]) if not adx.empty else 0.0}
+
+    def _feature_mtf_trend(self, symbol: str, m1_data: pd.DataFrame) -> Dict:
+        # MTF confluence
+        return {'mtf_trends': self.mtf_manager.calculate_mtf_trend(symbol)}
+
+    def _feature_structure(self, symbol: str, m1_data: pd.DataFrame) -> Dict:
+        # Structure data
+        return {'structure': self.mtf_manager.get_structure(symbol, 'M15')}
 
     def collect_signals(self) -> List[Dict]:
         """
@@ -606,16 +624,18 @@ class InstitutionalTradingEngine:
 
     def update_positions(self):
         """Update all active positions through position manager."""
-        # Collect current market data
+        # Collect current market data and features (cached for the rest of the scan)
         market_data = {}
+        features = {}
 
         for symbol in SYMBOLS:
             data = self.mtf_manager.get_data(symbol, 'M1')
             if not data.empty:
                 market_data[symbol] = data
+                features[symbol] = self.calculate_features(symbol)
 
         # Update positions
-        self.brain.update_positions(market_data)
+        self.brain.update_positions(market_data, features)
 
     def check_closed_positions(self):
         """
@@ -748,6 +768,7 @@ class InstitutionalTradingEngine:
         # 1. Update multi-timeframe data
         logger.info("Updating MTF data...")
         self.update_mtf_data()
+        self.feature_store.begin_scan()
 
         # 2. Update positions (trailing stops, partials, etc.)
         logger.info("Updating positions...")
@@ -767,7 +788,7 @@ class InstitutionalTradingEngine:
             logger.info("No signals generated this scan")
             return
 
-        # 4. Prepare market data for Brain
+        # 4. Prepare market data for Brain (features served from scan cache)
         market_data = {}
         features = {}
 
@@ -821,6 +842,15 @@ class InstitutionalTradingEngine:
             logger.info(f"  Signals Rejected:  {rejected}")
             logger.info(f"  Trades Executed:   {executed}")
 
+        # Feature store statistics
+        logger.info("\nFEATURE STORE:")
+        fs_stats = self.feature_store.get_statistics()
+        logger.info(f"  Hits: {fs_stats['hits']} | Misses: {fs_stats['misses']} "
+                    f"| Hit Rate: {fs_stats['hit_rate_pct']:.1f}%")
+        for feature_name, timing in fs_stats['timings'].items():
+            logger.info(f"  {feature_name}: avg {timing['avg_ms']:.2f} ms | max {timing['max_ms']:.2f} ms "
+                        f"({timing['calls']} calls)")
+
         # Brain statistics
         logger.info("\nBRAIN STATISTICS:")
         brain_stats = self.brain.get_statistics()
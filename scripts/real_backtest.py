@@ -19,6 +19,7 @@ import logging
 from features.technical_indicators import calculate_atr, calculate_rsi, identify_swing_points
 from features.order_flow import VPINCalculator, calculate_signed_volume
 from features.statistical_models import calculate_realized_volatility
+from execution.market_data_store import MarketDataStore
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -31,6 +32,8 @@ DB_CONFIG = {
     'password': 'abc'
 }
 
+STORE_PATH = 'C:/TradingSystem/data/market_store'
+
 INITIAL_CAPITAL = 10000.0
 
 STRATEGY_MODULES = [
@@ -148,13 +151,25 @@ class RealBacktestEngine:
         logger.info("BACKTESTING REAL: 9 ESTRATEGIAS ORIGINALES")
         logger.info("=" * 80)
         
+        # Cache columnar local (etl_incremental); los símbolos aún no cacheados
+        # se leen de PostgreSQL y se fusionan
+        store = MarketDataStore(STORE_PATH)
         conn = psycopg2.connect(**DB_CONFIG)
-        data = pd.read_sql_query("""
-            SELECT symbol, time, open, high, low, close, tick_volume as volume
-            FROM market_data
-            ORDER BY time
-        """, conn)
-        conn.close()
+        try:
+            db_symbols = pd.read_sql_query(
+                "SELECT DISTINCT symbol FROM market_data", conn
+            )['symbol'].tolist()
+            data = store.load_long_merged(
+                sorted(set(db_symbols) | set(store.symbols())),
+                lambda missing: pd.read_sql_query("""
+                    SELECT symbol, time, open, high, low, close, tick_volume as volume
+                    FROM market_data
+                    WHERE symbol = ANY(%s)
+                    ORDER BY time
+                """, conn, params=(missing,))
+            )[['symbol', 'time', 'open', 'high', 'low', 'close', 'volume']]
+        finally:
+            conn.close()
         
         dates = sorted(data['time'].unique())
         symbols = data['symbol'].unique()
@@ -0,0 +1,40 @@
+"""
+Rebuild Event Indexes: reconstruye los índices .idx del EventStore
+Genera {fecha}.events.idx para cada {fecha}.events.jsonl existente
+(ficheros anteriores a los índices o índices dañados).
+
+Uso:
+    python scripts/rebuild_event_indexes.py --store-path C:/TradingSystem/data/event_store
+"""
+
+import sys
+sys.path.insert(0, 'C:/TradingSystem/src')
+
+import argparse
+import logging
+from pathlib import Path
+
+from governance.event_index import rebuild_indexes
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Reconstruye los índices del EventStore')
+    parser.add_argument('--store-path', type=Path, required=True,
+                        help='Directorio base del EventStore (contiene events/)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+
+    events_dir = args.store_path / 'events'
+    if not events_dir.is_dir():
+        parser.error(f"No existe {events_dir}")
+
+    results = rebuild_indexes(events_dir)
+
+    print(f"\n{len(results)} ficheros indexados, {sum(results.values()):,} entradas")
+    for name, entries in results.items():
+        print(f"  {name}: {entries:,}")
+
+
+if __name__ == '__main__':
+    main()
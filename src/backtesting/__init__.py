@@ -9,6 +9,8 @@ Components:
 - Walk-forward optimization
 - Monte Carlo simulation
 - Multi-strategy portfolio testing
+- Columnar engine mode (run_backtest(..., columnar=True))
+- ParallelBacktestRunner: process-pool sweeps over (strategy, symbol group, window)
 
 Usage:
     from src.backtesting import BacktestEngine, PerformanceAnalyzer
@@ -42,10 +44,16 @@ Version: 1.0
 
 from .backtest_engine import BacktestEngine
 from .performance_analyzer import PerformanceAnalyzer
+from .columnar import ColumnarMarketData, align_columnar
+from .parallel_runner import ParallelBacktestRunner, BacktestShard
 
 __all__ = [
     'BacktestEngine',
     'PerformanceAnalyzer',
+    'ColumnarMarketData',
+    'align_columnar',
+    'ParallelBacktestRunner',
+    'BacktestShard',
 ]
 
 __version__ = '1.0.0'
@@ -46,9 +46,31 @@ except ImportError:
     calculate_cumulative_volume_delta = None
     calculate_atr = None
 
+from features.rolling_state import RollingFeatureState
+from .columnar import SymbolColumns, align_columnar
+
 logger = logging.getLogger(__name__)
 
 
+def walk_forward_windows(start_date: datetime,
+                         in_sample_months: int = 12,
+                         out_sample_months: int = 3,
+                         total_periods: int = 4) -> List[Tuple[datetime, datetime, datetime]]:
+    """
+    Build walk-forward period boundaries (30-day months).
+
+    Returns:
+        List of (period_start, in_sample_end, out_sample_end) tuples
+    """
+    windows = []
+    for period in range(total_periods):
+        period_start = start_date + timedelta(days=30 * (in_sample_months + out_sample_months) * period)
+        in_sample_end = period_start + timedelta(days=30 * in_sample_months)
+        out_sample_end = in_sample_end + timedelta(days=30 * out_sample_months)
+        windows.append((period_start, in_sample_end, out_sample_end))
+    return windows
+
+
 class BacktestEngine:
     """
     Professional-grade backtesting engine.
@@ -95,14 +117,19 @@ class BacktestEngine:
         self.trades = []
         self.open_positions = {}
 
-        # VPIN calculators per symbol
+        # VPIN calculators per symbol (+ last bar position fed to each)
         self.vpin_calculators = {}
+        self.vpin_last_fed = {}
+
+        # Incremental feature state per symbol (columnar engine): (state, next_idx)
+        self.feature_states = {}
 
     def run_backtest(self,
                      historical_data: Dict[str, pd.DataFrame],
                      start_date: datetime,
                      end_date: datetime,
-                     regime_detector=None) -> Dict:
+                     regime_detector=None,
+                     columnar: bool = False) -> Dict:
         """
         Run complete backtest on historical data.
 
@@ -111,10 +138,17 @@ class BacktestEngine:
             start_date: Backtest start date
             end_date: Backtest end date
             regime_detector: Optional regime detector instance
+            columnar: Use the columnar engine (pre-aligned NumPy arrays,
+                integer offsets, no pandas indexing inside the loop).
+                Snapshot bars are dicts of floats instead of pd.Series.
 
         Returns:
             Dict with backtest results and performance metrics
         """
+        if columnar:
+            return self._run_backtest_columnar(historical_data, start_date, end_date,
+                                               regime_detector)
+
         self.logger.info(f"🔄 Starting backtest: {start_date} to {end_date}")
 
         # Reset state
@@ -147,25 +181,7 @@ class BacktestEngine:
                     features_by_symbol[symbol] = self._calculate_features(symbol, df, current_idx)
 
             # Generate signals from all strategies
-            for strategy in self.strategies:
-                # Check if strategy is enabled and matches regime
-                if not self._should_strategy_run(strategy, current_regime):
-                    continue
-
-                # Get primary symbol for strategy (use first symbol in snapshot)
-                primary_symbol = list(market_snapshot.keys())[0] if market_snapshot else None
-                if not primary_symbol:
-                    continue
-
-                # Get features for primary symbol
-                features = features_by_symbol.get(primary_symbol, {})
-
-                # FIXED: Pass features dict with OFI/CVD/VPIN/ATR to strategies
-                signals = strategy.evaluate(market_snapshot, features)
-
-                if signals:
-                    for signal in signals:
-                        self._execute_trade(signal, market_snapshot, current_time)
+            self._run_strategies(market_snapshot, features_by_symbol, current_regime, current_time)
 
             # Record equity
             current_equity = self._calculate_current_equity(market_snapshot)
@@ -192,6 +208,101 @@ class BacktestEngine:
 
         return results
 
+    def _run_backtest_columnar(self,
+                               historical_data: Dict[str, pd.DataFrame],
+                               start_date: datetime,
+                               end_date: datetime,
+                               regime_detector=None) -> Dict:
+        """
+        Columnar variant of run_backtest.
+
+        Aligns every symbol onto one timeline once, then steps over integer
+        offsets. Equity is recorded into preallocated arrays and converted to
+        the usual list of dicts only at the end, so results are identical to
+        the pandas engine.
+        """
+        self.logger.info(f"🔄 Starting columnar backtest: {start_date} to {end_date}")
+
+        # Reset state
+        self.current_capital = self.initial_capital
+        self.equity_curve = []
+        self.trades = []
+        self.open_positions = {}
+        self.feature_states = {}
+
+        data = align_columnar(historical_data, start_date, end_date)
+        num_bars = len(data)
+
+        equity_values = np.empty(num_bars, dtype=np.float64)
+        open_counts = np.empty(num_bars, dtype=np.int64)
+        market_snapshot = {}
+
+        for i in range(num_bars):
+            current_time = data.timestamps[i]
+            market_snapshot = data.snapshot(i)
+
+            current_regime = None
+            if regime_detector:
+                current_regime = regime_detector.detect_regime(market_snapshot)
+
+            self._update_open_positions(market_snapshot, current_time)
+
+            features_by_symbol = {}
+            for symbol, cols in data.symbols.items():
+                current_idx = cols.positions[i]
+                if current_idx >= 0:
+                    features_by_symbol[symbol] = self._calculate_features_columnar(
+                        symbol, cols, int(current_idx)
+                    )
+
+            self._run_strategies(market_snapshot, features_by_symbol, current_regime, current_time)
+
+            current_equity = self._calculate_current_equity(market_snapshot)
+            equity_values[i] = current_equity
+            open_counts[i] = len(self.open_positions)
+
+            if i % 10000 == 0:
+                self.logger.info(f"Progress: {i}/{num_bars} bars, "
+                               f"Equity: ${current_equity:.2f}, "
+                               f"Trades: {len(self.trades)}")
+
+        self.equity_curve = [
+            {'timestamp': ts, 'equity': equity, 'open_positions': count}
+            for ts, equity, count in zip(data.timestamps, equity_values.tolist(), open_counts.tolist())
+        ]
+
+        self._close_all_positions(market_snapshot, end_date)
+
+        results = self._calculate_backtest_results()
+
+        self.logger.info(f"✅ Columnar backtest complete: {len(self.trades)} trades, "
+                        f"Final equity: ${results.get('final_equity', self.current_capital):.2f}")
+
+        return results
+
+    def _run_strategies(self, market_snapshot: Dict, features_by_symbol: Dict,
+                        current_regime: Optional[str], current_time: datetime):
+        """Evaluate all strategies on the current bar and execute their signals."""
+        for strategy in self.strategies:
+            # Check if strategy is enabled and matches regime
+            if not self._should_strategy_run(strategy, current_regime):
+                continue
+
+            # Get primary symbol for strategy (use first symbol in snapshot)
+            primary_symbol = next(iter(market_snapshot), None)
+            if not primary_symbol:
+                continue
+
+            # Get features for primary symbol
+            features = features_by_symbol.get(primary_symbol, {})
+
+            # FIXED: Pass features dict with OFI/CVD/VPIN/ATR to strategies
+            signals = strategy.evaluate(market_snapshot, features)
+
+            if signals:
+                for signal in signals:
+                    self._execute_trade(signal, market_snapshot, current_time)
+
     def run_walk_forward(self,
                          historical_data: Dict[str, pd.DataFrame],
                          in_sample_months: int = 12,
@@ -222,15 +333,10 @@ class BacktestEngine:
         }
 
         # Get data date range
-        all_data = pd.concat(historical_data.values())
-        start_date = all_data.index.min()
-
-        for period in range(total_periods):
-            # Calculate period dates
-            period_start = start_date + timedelta(days=30 * (in_sample_months + out_sample_months) * period)
-            in_sample_end = period_start + timedelta(days=30 * in_sample_months)
-            out_sample_end = in_sample_end + timedelta(days=30 * out_sample_months)
+        start_date = min(df.index.min() for df in historical_data.values())
 
+        windows = walk_forward_windows(start_date, in_sample_months, out_sample_months, total_periods)
+        for period, (period_start, in_sample_end, out_sample_end) in enumerate(windows):
             # Run in-sample backtest (optimization)
             in_sample_results = self.run_backtest(
                 historical_data,
@@ -276,16 +382,26 @@ class BacktestEngine:
     def run_monte_carlo(self,
                        trade_results: List[float],
                        num_simulations: int = 1000,
-                       confidence_level: float = 0.95) -> Dict:
+                       confidence_level: float = 0.95,
+                       block_size: Optional[int] = None,
+                       seed: Optional[int] = None,
+                       max_memory_mb: float = 256.0) -> Dict:
         """
         Run Monte Carlo simulation on trade results.
 
-        Randomly reorders trades to assess probability of achieving results.
+        Resamples trades with replacement to assess probability of achieving
+        results. Simulations are processed in chunks of an
+        (n_sims x n_trades) resample matrix; equity curves and drawdowns are
+        computed with 2-D cumulative operations.
 
         Args:
             trade_results: List of trade returns (in R)
             num_simulations: Number of simulation runs
             confidence_level: Confidence level for VaR (0.95 = 95%)
+            block_size: Block length for circular block bootstrap
+                (preserves autocorrelation). None or 1 = i.i.d. resampling
+            seed: RNG seed. Same seed + same arguments = identical results
+            max_memory_mb: Cap on working memory per chunk
 
         Returns:
             Monte Carlo statistics
@@ -295,21 +411,30 @@ class BacktestEngine:
 
         self.logger.info(f"🎲 Running {num_simulations} Monte Carlo simulations...")
 
-        simulated_equity_curves = []
-        final_returns = []
-        max_drawdowns = []
+        returns = np.asarray(trade_results, dtype=np.float64)
+        num_trades = len(returns)
+        rng = np.random.default_rng(seed)
+
+        chunk_rows = self._monte_carlo_chunk_rows(num_trades, max_memory_mb)
+        final_returns = np.empty(num_simulations)
+        max_drawdowns = np.empty(num_simulations)
 
-        for _ in range(num_simulations):
-            # Randomly shuffle trade sequence
-            shuffled_trades = np.random.choice(trade_results, size=len(trade_results), replace=True)
+        for chunk_start in range(0, num_simulations, chunk_rows):
+            rows = min(chunk_rows, num_simulations - chunk_start)
+            indices = self._bootstrap_indices(rng, rows, num_trades, block_size)
 
-            # Calculate equity curve
-            equity_curve = np.cumsum(shuffled_trades)
-            simulated_equity_curves.append(equity_curve)
+            equity_curves = returns[indices]
+            del indices
+            np.cumsum(equity_curves, axis=1, out=equity_curves)
 
-            # Calculate metrics
-            final_returns.append(equity_curve[-1])
-            max_drawdowns.append(self._calculate_max_dd(shuffled_trades))
+            chunk = slice(chunk_start, chunk_start + rows)
+            final_returns[chunk] = equity_curves[:, -1]
+            running_max = np.maximum.accumulate(equity_curves, axis=1)
+            np.subtract(equity_curves, running_max, out=equity_curves)
+            max_drawdowns[chunk] = equity_curves.min(axis=1)
+
+        var_threshold = np.percentile(final_returns, (1 - confidence_level) * 100)
+        p5, p95 = np.percentile(final_returns, [5, 95])
 
         # Calculate statistics
         results = {
@@ -317,13 +442,13 @@ class BacktestEngine:
             'mean_return_r': np.mean(final_returns),
             'median_return_r': np.median(final_returns),
             'std_return_r': np.std(final_returns),
-            'var_95': np.percentile(final_returns, (1 - confidence_level) * 100),
-            'cvar_95': np.mean([r for r in final_returns if r <= np.percentile(final_returns, 5)]),
-            'probability_positive': (np.array(final_returns) > 0).sum() / num_simulations,
+            'var_95': var_threshold,
+            'cvar_95': np.mean(final_returns[final_returns <= var_threshold]),
+            'probability_positive': (final_returns > 0).sum() / num_simulations,
             'worst_case_dd': np.min(max_drawdowns),
             'mean_dd': np.mean(max_drawdowns),
-            'percentile_5_return': np.percentile(final_returns, 5),
-            'percentile_95_return': np.percentile(final_returns, 95),
+            'percentile_5_return': p5,
+            'percentile_95_return': p95,
         }
 
         self.logger.info(f"✅ Monte Carlo: P(profit) = {results['probability_positive']:.1%}, "
@@ -331,6 +456,30 @@ class BacktestEngine:
 
         return results
 
+    @staticmethod
+    def _monte_carlo_chunk_rows(num_trades: int, max_memory_mb: float) -> int:
+        """Simulations per chunk so indices + paths + running max fit the cap."""
+        bytes_per_row = 3 * 8 * num_trades
+        return max(1, int(max_memory_mb * 1024 * 1024 // bytes_per_row))
+
+    @staticmethod
+    def _bootstrap_indices(rng: np.random.Generator, rows: int, num_trades: int,
+                           block_size: Optional[int] = None) -> np.ndarray:
+        """
+        Build a (rows x num_trades) matrix of resampled trade indices.
+
+        With block_size > 1, uses a circular block bootstrap: random block
+        starts expanded to consecutive indices (mod num_trades), truncated
+        to num_trades per path.
+        """
+        if not block_size or block_size <= 1:
+            return rng.integers(0, num_trades, size=(rows, num_trades))
+
+        blocks_per_path = -(-num_trades // block_size)
+        starts = rng.integers(0, num_trades, size=(rows, blocks_per_path, 1))
+        indices = (starts + np.arange(block_size)) % num_trades
+        return indices.reshape(rows, blocks_per_path * block_size)[:, :num_trades]
+
     def _get_unified_timeline(self, data: Dict[str, pd.DataFrame],
                              start: datetime, end: datetime) -> List[datetime]:
         """Create unified timeline from all symbols."""
@@ -427,16 +576,14 @@ class BacktestEngine:
 
             # VPIN (Volume-Synchronized PIN)
             if VPINCalculator is not None:
-                # Initialize VPIN calculator for symbol if not exists
-                if symbol not in self.vpin_calculators:
-                    self.vpin_calculators[symbol] = VPINCalculator(bucket_size=50000, num_buckets=50)
-
-                # Feed recent trades to VPIN
-                for idx, row in recent_data.tail(50).iterrows():
-                    trade_direction = 1 if row['close'] > row['open'] else -1
-                    self.vpin_calculators[symbol].add_trade(row['volume'], trade_direction)
-
-                features['vpin'] = self.vpin_calculators[symbol].get_current_vpin()
+                # Feed each bar exactly once (warm-up: last 50 bars on first use)
+                features['vpin'] = self._update_vpin(
+                    symbol,
+                    historical_data['volume'].to_numpy(),
+                    historical_data['open'].to_numpy(),
+                    historical_data['close'].to_numpy(),
+                    current_idx
+                )
             else:
                 # Fallback VPIN (simplified imbalance)
                 buy_volume = recent_data.loc[recent_data['close'] > recent_data['open'], 'volume'].sum()
@@ -458,6 +605,124 @@ class BacktestEngine:
 
         return features
 
+    def _calculate_features_columnar(self, symbol: str, cols: SymbolColumns,
+                                     current_idx: int) -> Dict:
+        """
+        Incremental twin of _calculate_features operating on column arrays.
+
+        ATR, OFI, CVD and the fallback VPIN come from a per-symbol
+        RollingFeatureState that ingests each bar once (O(1) per bar).
+        Values match calculate_atr / calculate_ofi /
+        calculate_cumulative_volume_delta on the same 100-bar window.
+
+        Args:
+            symbol: Trading symbol
+            cols: Column arrays for the symbol
+            current_idx: Current bar position in the symbol's history
+
+        Returns:
+            Dict with features: {'ofi', 'cvd', 'vpin', 'atr'}
+        """
+        features = {}
+
+        try:
+            state = self._get_feature_state(symbol, cols, current_idx)
+
+            if current_idx + 1 < 20:
+                features['ofi'] = 0.0
+                features['cvd'] = 0.0
+                features['vpin'] = 0.5
+                features['atr'] = 0.0001
+                return features
+
+            features['atr'] = float(state.atr)
+            features['ofi'] = 0.0 if state.ofi != state.ofi else float(state.ofi)
+            features['cvd'] = float(state.cvd)
+
+            # VPIN (Volume-Synchronized PIN)
+            if VPINCalculator is not None:
+                features['vpin'] = self._update_vpin(
+                    symbol,
+                    cols.arrays['volume'],
+                    cols.arrays['open'],
+                    cols.arrays['close'],
+                    current_idx
+                )
+            else:
+                features['vpin'] = float(state.bar_imbalance)
+
+        except Exception as e:
+            self.logger.warning(f"Error calculating features for {symbol}: {e}")
+            features['ofi'] = 0.0
+            features['cvd'] = 0.0
+            features['vpin'] = 0.5
+            features['atr'] = 0.0001
+
+        return features
+
+    def _update_vpin(self, symbol: str, volume: np.ndarray, open_: np.ndarray,
+                     close: np.ndarray, current_idx: int) -> float:
+        """
+        Stream bars into the symbol's VPINCalculator, each bar exactly once.
+
+        Only bars after the last one fed are ingested. On first use (or when
+        the position moves backwards, e.g. a new walk-forward window) the
+        calculator is reset and warmed up with the last 50 bars.
+
+        Args:
+            symbol: Trading symbol
+            volume, open_, close: Full-history column arrays for the symbol
+            current_idx: Current bar position in the symbol's history
+
+        Returns:
+            Current VPIN (O(1) query)
+        """
+        calculator = self.vpin_calculators.get(symbol)
+        last_fed = self.vpin_last_fed.get(symbol, -1)
+
+        if calculator is None:
+            calculator = VPINCalculator(bucket_size=50000, num_buckets=50)
+            self.vpin_calculators[symbol] = calculator
+        elif current_idx <= last_fed:
+            calculator.reset()
+            last_fed = -1
+
+        start = max(last_fed + 1, current_idx - 49, 0)
+        end = current_idx + 1
+        if start < end:
+            directions = np.where(close[start:end] > open_[start:end], 1, -1)
+            calculator.add_trades(volume[start:end], directions)
+            self.vpin_last_fed[symbol] = current_idx
+
+        return calculator.get_current_vpin()
+
+    def _get_feature_state(self, symbol: str, cols: SymbolColumns,
+                           current_idx: int) -> RollingFeatureState:
+        """
+        Return the symbol's RollingFeatureState advanced to current_idx.
+
+        Consecutive bars are pushed one at a time. On the first call (or after
+        a jump) the state is rebuilt from the same 100-bar window the pandas
+        engine would slice, so both engines see identical lookback.
+        """
+        entry = self.feature_states.get(symbol)
+
+        if entry is None or entry[1] != current_idx:
+            state = RollingFeatureState()
+            first = max(0, current_idx - state.imbalance_window + 1)
+        else:
+            state = entry[0]
+            first = current_idx
+
+        arrays = cols.arrays
+        open_, high, low = arrays['open'], arrays['high'], arrays['low']
+        close, volume = arrays['close'], arrays['volume']
+        for j in range(first, current_idx + 1):
+            state.push(open_[j], high[j], low[j], close[j], volume[j])
+
+        self.feature_states[symbol] = (state, current_idx + 1)
+        return state
+
     def _should_strategy_run(self, strategy, current_regime: Optional[str]) -> bool:
         """Check if strategy should run in current regime."""
         # Check if strategy is enabled
@@ -0,0 +1,120 @@
+"""
+Columnar Market Data - Pre-aligned NumPy layout for the backtest loop
+
+Aligns every symbol onto one unified timeline once, so the event loop can
+step over integer offsets instead of doing pandas label lookups per bar.
+
+Layout per symbol:
+- Full-history column arrays (float64, contiguous) for feature lookback
+- Row position of each unified bar inside the symbol's own history (-1 = no bar)
+- Pre-built bar rows (lists of Python floats) for market snapshots
+
+Author: Elite Trading System
+Version: 1.0
+"""
+
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, List
+
+
+@dataclass
+class SymbolColumns:
+    """Contiguous column arrays for one symbol."""
+    symbol: str
+    columns: List[str]
+    arrays: Dict[str, np.ndarray]
+    positions: np.ndarray
+    rows: List[List[float]] = field(repr=False)
+
+    def has(self, *names: str) -> bool:
+        """Check that all named columns are available."""
+        return all(name in self.arrays for name in names)
+
+
+@dataclass
+class ColumnarMarketData:
+    """Unified timeline plus per-symbol column arrays."""
+    timestamps: List[pd.Timestamp]
+    symbols: Dict[str, SymbolColumns]
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def snapshot(self, offset: int) -> Dict[str, Dict[str, float]]:
+        """
+        Build market snapshot {symbol: bar} at a unified offset.
+
+        Bars are plain dicts keyed by column name; symbols without a bar at
+        this offset are omitted, matching the pandas engine.
+        """
+        snapshot = {}
+        for symbol, cols in self.symbols.items():
+            if cols.positions[offset] >= 0:
+                snapshot[symbol] = dict(zip(cols.columns, cols.rows[offset]))
+        return snapshot
+
+
+def align_columnar(historical_data: Dict[str, pd.DataFrame],
+                   start: datetime, end: datetime) -> ColumnarMarketData:
+    """
+    Align all symbols onto one sorted timeline within [start, end].
+
+    Only numeric columns are carried over. Full history (including bars
+    before ``start``) is kept in ``arrays`` so lookback windows match the
+    pandas engine exactly.
+
+    Args:
+        historical_data: Dict of DataFrames {symbol: OHLCV data}
+        start: First timestamp (inclusive)
+        end: Last timestamp (inclusive)
+
+    Returns:
+        ColumnarMarketData ready for offset-based iteration
+    """
+    in_range = []
+    for df in historical_data.values():
+        mask = (df.index >= start) & (df.index <= end)
+        in_range.append(df.index[mask])
+
+    if in_range:
+        unified = in_range[0]
+        for idx in in_range[1:]:
+            unified = unified.union(idx)
+        unified = unified.unique().sort_values()
+    else:
+        unified = pd.DatetimeIndex([])
+
+    symbols = {}
+    for symbol, df in historical_data.items():
+        numeric = df.select_dtypes(include=[np.number])
+        columns = list(numeric.columns)
+        arrays = {
+            col: np.ascontiguousarray(numeric[col].to_numpy(dtype=np.float64))
+            for col in columns
+        }
+
+        # Map every unified timestamp to its row in the symbol's own history
+        positions = df.index.get_indexer(unified)
+        positions = np.asarray(positions, dtype=np.int64)
+
+        if columns:
+            matrix = np.column_stack([arrays[col] for col in columns])
+            aligned = np.full((len(unified), len(columns)), np.nan)
+            present = positions >= 0
+            aligned[present] = matrix[positions[present]]
+            rows = aligned.tolist()
+        else:
+            rows = [[] for _ in range(len(unified))]
+
+        symbols[symbol] = SymbolColumns(
+            symbol=symbol,
+            columns=columns,
+            arrays=arrays,
+            positions=positions,
+            rows=rows,
+        )
+
+    return ColumnarMarketData(timestamps=list(unified), symbols=symbols)
@@ -0,0 +1,373 @@
+"""
+Parallel Backtest Runner - Process-pool orchestration over shards
+
+Shards a sweep by (strategy, symbol group, window) and runs each shard on a
+ProcessPoolExecutor, by default with the columnar BacktestEngine. A symbol
+group is one symbol unless symbol_groups says otherwise (pairs / basket
+strategies that need several symbols in the same engine).
+
+Data sharing:
+- Each symbol's history is packed once into a SharedMemory block
+  (int64 timestamps + float64 columns, column-major)
+- Workers attach by name in the pool initializer and wrap the buffers in
+  DataFrames without copying; no DataFrame is pickled per task
+
+Determinism:
+- Shard results are ordered by shard key, never by completion order
+- Trades are merged with a stable sort on (entry_time, shard order)
+- Portfolio equity is the sum of per-shard P&L on the union timeline
+
+Strategy factories and shard runners must be picklable (module-level
+callables or functools.partial of a class) because strategies are built
+inside workers. A shard runner other than run_engine_shard lets a script
+keep its own backtest loop and still be sharded (institutional_backtest.py).
+
+Usage:
+    runner = ParallelBacktestRunner(
+        strategy_factories={'momentum': partial(MomentumQuality, config)},
+        max_workers=8,
+        engine_kwargs={'initial_capital': 10000.0},
+        symbol_groups={'EURUSD': ['EURUSD'], 'EURGBP_pair': ['EURUSD', 'GBPUSD']}
+    )
+    results = runner.run_walk_forward(data_dict, in_sample_months=12,
+                                      out_sample_months=3, total_periods=4)
+
+Author: Elite Trading System
+Version: 1.0
+"""
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from datetime import datetime
+from multiprocessing import shared_memory
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .backtest_engine import BacktestEngine, walk_forward_windows
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True, order=True)
+class BacktestShard:
+    """One unit of work: a strategy on a symbol group over a date window."""
+    strategy_name: str
+    group: str
+    symbols: Tuple[str, ...]
+    window_index: int
+    start: datetime
+    end: datetime
+
+    @property
+    def key(self) -> Tuple[str, str, int]:
+        return (self.strategy_name, self.group, self.window_index)
+
+
+class SharedMarketData:
+    """
+    Owner side of the shared-memory price store.
+
+    Layout per symbol (one SharedMemory block):
+        [n x int64 timestamps (ns, UTC)] [ncols x n float64 columns]
+    """
+
+    def __init__(self, historical_data: Dict[str, pd.DataFrame]):
+        self.blocks: Dict[str, shared_memory.SharedMemory] = {}
+        self.manifest: Dict[str, Dict] = {}
+
+        for symbol, df in historical_data.items():
+            numeric = df.select_dtypes(include=[np.number])
+            columns = list(numeric.columns)
+            n = len(df)
+            nbytes = max(8 * n * (1 + len(columns)), 1)
+
+            block = shared_memory.SharedMemory(create=True, size=nbytes)
+            index = pd.DatetimeIndex(df.index)
+
+            timestamps = np.ndarray((n,), dtype=np.int64, buffer=block.buf)
+            timestamps[:] = index.as_unit('ns').asi8
+            values = np.ndarray((len(columns), n), dtype=np.float64, buffer=block.buf, offset=8 * n)
+            for i, col in enumerate(columns):
+                values[i] = numeric[col].to_numpy(dtype=np.float64)
+
+            self.blocks[symbol] = block
+            self.manifest[symbol] = {
+                'name': block.name,
+                'length': n,
+                'columns': columns,
+                'tz': str(index.tz) if index.tz is not None else None,
+            }
+
+    def close(self):
+        """Release and unlink all shared blocks."""
+        for block in self.blocks.values():
+            try:
+                block.close()
+                block.unlink()
+            except FileNotFoundError:
+                pass
+        self.blocks.clear()
+
+
+# Worker-side state (one copy per process)
+_WORKER_DATA: Dict[str, pd.DataFrame] = {}
+_WORKER_BLOCKS: List[shared_memory.SharedMemory] = []
+
+
+def _attach_shared_data(manifest: Dict[str, Dict]):
+    """Pool initializer: map shared blocks into zero-copy DataFrames."""
+    _WORKER_DATA.clear()
+    for symbol, meta in manifest.items():
+        block = shared_memory.SharedMemory(name=meta['name'])
+        _WORKER_BLOCKS.append(block)
+        _WORKER_DATA[symbol] = _frame_from_buffer(block.buf, meta)
+
+
+def _frame_from_buffer(buffer, meta: Dict) -> pd.DataFrame:
+    n = meta['length']
+    columns = meta['columns']
+    timestamps = np.ndarray((n,), dtype=np.int64, buffer=buffer)
+    values = np.ndarray((len(columns), n), dtype=np.float64, buffer=buffer, offset=8 * n)
+
+    index = pd.DatetimeIndex(timestamps.view('datetime64[ns]'))
+    if meta['tz']:
+        index = index.tz_localize('UTC').tz_convert(meta['tz'])
+
+    return pd.DataFrame({col: values[i] for i, col in enumerate(columns)}, index=index, copy=False)
+
+
+def run_engine_shard(shard: BacktestShard, strategy_factory: Callable,
+                     data: Dict[str, pd.DataFrame], engine_kwargs: Dict) -> Dict:
+    """
+    Default shard runner: columnar BacktestEngine on the shard's symbols.
+
+    Returns:
+        Dict with 'summary', 'trades' (each with 'entry_time'),
+        'equity_timestamps' (int64 ns) and 'equity'
+    """
+    engine = BacktestEngine(strategies=[strategy_factory()], **engine_kwargs)
+    results = engine.run_backtest(data, shard.start, shard.end, columnar=True)
+
+    equity_timestamps = np.array(
+        [pd.Timestamp(p['timestamp']).value for p in engine.equity_curve], dtype=np.int64
+    )
+    equity = np.array([p['equity'] for p in engine.equity_curve], dtype=np.float64)
+    summary = {k: v for k, v in results.items() if k not in ('trades', 'equity_curve')}
+
+    return {
+        'summary': summary,
+        'trades': engine.trades,
+        'equity_timestamps': equity_timestamps,
+        'equity': equity,
+    }
+
+
+def _run_shard(shard: BacktestShard, strategy_factory: Callable,
+               engine_kwargs: Dict, shard_runner: Callable) -> Dict:
+    """Run one shard inside a worker (or in-process) on the attached data."""
+    data = {symbol: _WORKER_DATA[symbol] for symbol in shard.symbols}
+    result = shard_runner(shard, strategy_factory, data, engine_kwargs)
+
+    result['shard'] = shard
+    result['trades'] = [dict(t, strategy_name=shard.strategy_name, window_index=shard.window_index)
+                        for t in result['trades']]
+    return result
+
+
+class ParallelBacktestRunner:
+    """
+    Process-pool backtest orchestrator.
+
+    Features:
+    - Sharding by (strategy, symbol group, window)
+    - Shared-memory price data (no per-task DataFrame pickling)
+    - Deterministic merge of trades and equity curves
+    - Walk-forward sweeps with per-window efficiency
+    """
+
+    def __init__(self,
+                 strategy_factories: Dict[str, Callable],
+                 max_workers: Optional[int] = None,
+                 engine_kwargs: Optional[Dict] = None,
+                 symbol_groups: Optional[Dict[str, Sequence[str]]] = None,
+                 shard_runner: Callable = run_engine_shard):
+        """
+        Initialize runner.
+
+        Args:
+            strategy_factories: {strategy_name: zero-arg picklable factory}
+            max_workers: Worker processes (None = os.cpu_count(), 1 = in-process)
+            engine_kwargs: Keyword arguments for BacktestEngine (capital, costs...)
+            symbol_groups: {group_name: symbols run together in one shard}
+                (None = one group per symbol, named after it)
+            shard_runner: Picklable callable(shard, strategy_factory, data,
+                engine_kwargs) -> result dict (see run_engine_shard)
+        """
+        self.strategy_factories = strategy_factories
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.engine_kwargs = engine_kwargs or {}
+        self.symbol_groups = symbol_groups
+        self.shard_runner = shard_runner
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def resolve_groups(self, symbols: List[str]) -> Dict[str, Tuple[str, ...]]:
+        """Symbol groups for the given data symbols (validated)."""
+        if self.symbol_groups is None:
+            return {symbol: (symbol,) for symbol in symbols}
+
+        groups = {name: tuple(members) for name, members in self.symbol_groups.items()}
+        unknown = sorted({s for members in groups.values() for s in members} - set(symbols))
+        if unknown:
+            raise ValueError(f"Symbol groups reference symbols without data: {', '.join(unknown)}")
+        return groups
+
+    def build_shards(self, groups: Dict[str, Tuple[str, ...]],
+                     windows: List[Tuple[datetime, datetime]]) -> List[BacktestShard]:
+        """Cartesian product of strategies x symbol groups x windows, in key order."""
+        shards = [
+            BacktestShard(strategy_name, group, groups[group], window_index, start, end)
+            for strategy_name in sorted(self.strategy_factories)
+            for group in sorted(groups)
+            for window_index, (start, end) in enumerate(windows)
+        ]
+        return shards
+
+    def run(self, historical_data: Dict[str, pd.DataFrame],
+            windows: List[Tuple[datetime, datetime]]) -> Dict:
+        """
+        Run every (strategy, symbol group, window) shard.
+
+        Args:
+            historical_data: Dict of DataFrames {symbol: OHLCV data}
+            windows: List of (start, end) date windows
+
+        Returns:
+            Dict with ordered shard results, merged trades and equity curves
+        """
+        shards = self.build_shards(self.resolve_groups(list(historical_data)), windows)
+        self.logger.info(f"🔄 Parallel backtest: {len(shards)} shards on {self.max_workers} workers")
+
+        if self.max_workers == 1:
+            shard_results = self._run_in_process(historical_data, shards)
+        else:
+            shard_results = self._run_in_pool(historical_data, shards)
+
+        ordered = [shard_results[shard.key] for shard in shards]
+        merged = self._merge(ordered, len(windows))
+
+        self.logger.info(f"✅ Parallel backtest complete: {len(merged['trades'])} trades")
+        return merged
+
+    def run_walk_forward(self, historical_data: Dict[str, pd.DataFrame],
+                         in_sample_months: int = 12,
+                         out_sample_months: int = 3,
+                         total_periods: int = 4) -> Dict:
+        """
+        Walk-forward sweep with every in/out-of-sample window as its own shard.
+
+        Returns:
+            Same dict as run(), plus per-(strategy, group) walk-forward efficiency
+        """
+        start_date = min(df.index.min() for df in historical_data.values())
+        periods = walk_forward_windows(start_date, in_sample_months, out_sample_months, total_periods)
+
+        windows = []
+        for period_start, in_sample_end, out_sample_end in periods:
+            windows.append((period_start, in_sample_end))
+            windows.append((in_sample_end, out_sample_end))
+
+        results = self.run(historical_data, windows)
+
+        efficiency = {}
+        for shard_result in results['shards']:
+            shard = shard_result['shard']
+            key = (shard.strategy_name, shard.group)
+            totals = efficiency.setdefault(key, {'in_sample_total_r': 0.0, 'out_sample_total_r': 0.0})
+            side = 'in_sample_total_r' if shard.window_index % 2 == 0 else 'out_sample_total_r'
+            totals[side] += shard_result['summary'].get('total_return_r', 0)
+
+        for totals in efficiency.values():
+            if totals['in_sample_total_r'] > 0:
+                totals['wf_efficiency'] = totals['out_sample_total_r'] / totals['in_sample_total_r']
+            else:
+                totals['wf_efficiency'] = 0.0
+
+        results['walk_forward'] = efficiency
+        results['periods'] = periods
+        return results
+
+    def _run_in_process(self, historical_data: Dict[str, pd.DataFrame],
+                        shards: List[BacktestShard]) -> Dict:
+        _WORKER_DATA.clear()
+        _WORKER_DATA.update(historical_data)
+        try:
+            return {
+                shard.key: _run_shard(shard, self.strategy_factories[shard.strategy_name],
+                                      self.engine_kwargs, self.shard_runner)
+                for shard in shards
+            }
+        finally:
+            _WORKER_DATA.clear()
+
+    def _run_in_pool(self, historical_data: Dict[str, pd.DataFrame],
+                     shards: List[BacktestShard]) -> Dict:
+        shared = SharedMarketData(historical_data)
+        shard_results = {}
+        try:
+            with ProcessPoolExecutor(max_workers=self.max_workers,
+                                     initializer=_attach_shared_data,
+                                     initargs=(shared.manifest,)) as pool:
+                futures = {
+                    pool.submit(_run_shard, shard, self.strategy_factories[shard.strategy_name],
+                                self.engine_kwargs, self.shard_runner): shard
+                    for shard in shards
+                }
+                for done, future in enumerate(as_completed(futures), start=1):
+                    shard = futures[future]
+                    shard_results[shard.key] = future.result()
+                    if done % 50 == 0:
+                        self.logger.info(f"Progress: {done}/{len(shards)} shards")
+        finally:
+            shared.close()
+        return shard_results
+
+    def _merge(self, ordered: List[Dict], num_windows: int) -> Dict:
+        """Deterministic merge of ordered shard results."""
+        # Stable sort: ties keep shard key order
+        trades = [trade for result in ordered for trade in result['trades']]
+        trades.sort(key=lambda t: pd.Timestamp(t['entry_time']).value)
+
+        initial_capital = self.engine_kwargs.get('initial_capital', 10000.0)
+        equity_by_window = {}
+        for window_index in range(num_windows):
+            window_results = [r for r in ordered if r['shard'].window_index == window_index]
+            equity_by_window[window_index] = self._combine_equity(window_results, initial_capital)
+
+        return {
+            'shards': ordered,
+            'trades': trades,
+            'equity_curves': {r['shard'].key: (r['equity_timestamps'], r['equity']) for r in ordered},
+            'portfolio_equity': equity_by_window,
+        }
+
+    @staticmethod
+    def _combine_equity(results: List[Dict], initial_capital: float) -> pd.Series:
+        """Sum per-shard P&L on the union timeline (forward-filled)."""
+        non_empty = [r for r in results if len(r['equity_timestamps'])]
+        if not non_empty:
+            return pd.Series(dtype=float)
+
+        timeline = np.unique(np.concatenate([r['equity_timestamps'] for r in non_empty]))
+        total = np.full(len(timeline), initial_capital)
+
+        for r in non_empty:
+            pnl = r['equity'] - initial_capital
+            # Position of the latest shard bar at or before each timeline point
+            pos = np.searchsorted(r['equity_timestamps'], timeline, side='right') - 1
+            total += np.where(pos >= 0, pnl[np.maximum(pos, 0)], 0.0)
+
+        return pd.Series(total, index=pd.to_datetime(timeline), name='equity')
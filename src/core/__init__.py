@@ -8,9 +8,13 @@ Architecture:
 - regime_detector: Market regime detection and classification
 - brain: Advanced orchestration layer
 - ml_adaptive_engine: Machine Learning adaptive engine for continuous learning
+- ml_inference: Fixed feature schema and compiled tree ensemble for outcome inference
+- trade_memory_store: Segmented record log and time-bounded indexes for trade memory
+- scan_feature_store: Compute-once feature cache shared within a scan
 """
 
 from .mtf_data_manager import MultiTimeframeDataManager
+from .scan_feature_store import ScanFeatureStore
 from .risk_manager import (
     InstitutionalRiskManager,
     QualityScorer,
@@ -35,13 +39,26 @@ from .ml_adaptive_engine import (
     TradeMemoryDatabase,
     PerformanceAttributionAnalyzer,
     AdaptiveParameterOptimizer,
+    AsyncSignalWriter,
+    BackgroundLearner,
+    TradeMemorySnapshot,
     TradeRecord,
     SignalRecord
 )
+from .ml_inference import (
+    FeatureSchema,
+    CompiledTreeEnsemble,
+    OUTCOME_FEATURE_SCHEMA
+)
+from .trade_memory_store import (
+    SegmentedRecordLog,
+    TimeBoundedIndex
+)
 
 __all__ = [
     # MTF Data
     'MultiTimeframeDataManager',
+    'ScanFeatureStore',
 
     # Risk Management
     'InstitutionalRiskManager',
@@ -67,6 +84,18 @@ __all__ = [
     'TradeMemoryDatabase',
     'PerformanceAttributionAnalyzer',
     'AdaptiveParameterOptimizer',
+    'AsyncSignalWriter',
+    'BackgroundLearner',
+    'TradeMemorySnapshot',
     'TradeRecord',
     'SignalRecord',
+
+    # ML Inference
+    'FeatureSchema',
+    'CompiledTreeEnsemble',
+    'OUTCOME_FEATURE_SCHEMA',
+
+    # Trade Memory Storage
+    'SegmentedRecordLog',
+    'TimeBoundedIndex',
 ]
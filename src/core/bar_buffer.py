@@ -0,0 +1,181 @@
+"""
+OHLCV Ring Buffer - Fixed-capacity bar store with incremental indicators
+
+Backs the incremental mode of MultiTimeframeDataManager: new bars are
+appended (or the forming bar replaced) and indicators are updated for the
+touched rows only, instead of rebuilding the DataFrame every scan.
+
+Indicators (same columns as MultiTimeframeDataManager._process_ohlcv):
+- ema_20 / ema_50 / ema_200: recursive EMA (pandas ewm adjust=False), seeded
+  at the first bar ever pushed rather than at the start of the current window
+- atr: 14-bar mean true range (windowed sum over the stored true range)
+- volume_ma / volume_spike: 20-bar tick volume mean
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+RATE_FIELDS: Tuple[str, ...] = (
+    'time', 'open', 'high', 'low', 'close', 'tick_volume', 'spread', 'real_volume'
+)
+
+EMA_SPANS: Tuple[int, ...] = (20, 50, 200)
+
+
+class OHLCVRingBuffer:
+    """
+    Fixed-capacity OHLCV buffer for one (symbol, timeframe).
+
+    Storage is a flat array of twice the capacity that is compacted when
+    full, so appends are amortized O(1) and the visible window is always a
+    contiguous slice.
+    """
+
+    def __init__(self, capacity: int, atr_period: int = 14, volume_ma_window: int = 20):
+        """
+        Initialize buffer.
+
+        Args:
+            capacity: Number of bars exposed by to_frame()
+            atr_period: ATR rolling period
+            volume_ma_window: Volume moving-average window
+        """
+        self.capacity = capacity
+        self.atr_period = atr_period
+        self.volume_ma_window = volume_ma_window
+
+        # Rows kept across compaction so windowed indicators stay exact
+        self._keep = max(capacity, atr_period, volume_ma_window)
+        self._size = 2 * self._keep
+
+        self.rates = {
+            field: np.zeros(self._size, dtype=np.int64 if field in ('time', 'tick_volume', 'spread', 'real_volume')
+                            else np.float64)
+            for field in RATE_FIELDS
+        }
+        self.indicators = {
+            name: np.full(self._size, np.nan)
+            for name in [f'ema_{span}' for span in EMA_SPANS] + ['true_range', 'atr', 'volume_ma']
+        }
+
+        self.length = 0
+        self.bars_pushed = 0
+
+    @property
+    def last_time(self) -> Optional[int]:
+        """Open time (epoch seconds) of the newest bar, None if empty."""
+        if self.length == 0:
+            return None
+        return int(self.rates['time'][self.length - 1])
+
+    def __len__(self) -> int:
+        return min(self.length, self.capacity)
+
+    def update(self, rates) -> int:
+        """
+        Ingest bars from an MT5 rates array (oldest first).
+
+        Bars older than the newest stored bar are ignored; a bar with the
+        same open time replaces the stored (forming) bar.
+
+        Args:
+            rates: Structured array from mt5.copy_rates_* (or compatible)
+
+        Returns:
+            Number of rows appended or replaced
+        """
+        if rates is None or len(rates) == 0:
+            return 0
+
+        times = np.asarray(rates['time'], dtype=np.int64)
+        last = self.last_time
+        start = 0 if last is None else int(np.searchsorted(times, last, side='left'))
+
+        touched = 0
+        for i in range(start, len(times)):
+            if self.length and times[i] == self.rates['time'][self.length - 1]:
+                idx = self.length - 1
+            else:
+                if self.length == self._size:
+                    self._compact()
+                idx = self.length
+                self.length += 1
+                self.bars_pushed += 1
+
+            for field in RATE_FIELDS:
+                self.rates[field][idx] = rates[field][i]
+            self._compute(idx)
+            touched += 1
+
+        return touched
+
+    def to_frame(self, symbol: str, timeframe: str) -> pd.DataFrame:
+        """
+        Materialize the visible window with the _process_ohlcv column layout.
+        """
+        lo = max(self.length - self.capacity, 0)
+        hi = self.length
+
+        df = pd.DataFrame({field: self.rates[field][lo:hi].copy() for field in RATE_FIELDS})
+        df['time'] = pd.to_datetime(df['time'], unit='s')
+        df['timestamp'] = df['time']
+        df['symbol'] = symbol
+        df['volume'] = df['tick_volume']
+        df.attrs['symbol'] = symbol
+        df.attrs['timeframe'] = timeframe
+
+        for span in EMA_SPANS:
+            df[f'ema_{span}'] = self.indicators[f'ema_{span}'][lo:hi]
+        df['atr'] = self.indicators['atr'][lo:hi]
+        df['volume_ma'] = self.indicators['volume_ma'][lo:hi]
+        df['volume_spike'] = df['volume'] / df['volume_ma']
+
+        return df
+
+    def _compute(self, idx: int):
+        """Update indicators at idx from row idx-1 (valid for append and replace)."""
+        close = self.rates['close'][idx]
+        high = self.rates['high'][idx]
+        low = self.rates['low'][idx]
+        has_prev = idx > 0
+
+        for span in EMA_SPANS:
+            ema = self.indicators[f'ema_{span}']
+            if has_prev:
+                alpha = 2.0 / (span + 1.0)
+                ema[idx] = alpha * close + (1.0 - alpha) * ema[idx - 1]
+            else:
+                ema[idx] = close
+
+        true_range = high - low
+        if has_prev:
+            prev_close = self.rates['close'][idx - 1]
+            true_range = max(true_range, abs(high - prev_close), abs(low - prev_close))
+        self.indicators['true_range'][idx] = true_range
+
+        # Row count since the first push (compaction keeps enough history)
+        rows_seen = self.bars_pushed - (self.length - 1 - idx)
+
+        window = self.atr_period
+        if rows_seen >= window:
+            self.indicators['atr'][idx] = self.indicators['true_range'][idx - window + 1:idx + 1].sum() / window
+        else:
+            self.indicators['atr'][idx] = np.nan
+
+        window = self.volume_ma_window
+        if rows_seen >= window:
+            volumes = self.rates['tick_volume'][idx - window + 1:idx + 1]
+            self.indicators['volume_ma'][idx] = volumes.sum() / window
+        else:
+            self.indicators['volume_ma'][idx] = np.nan
+
+    def _compact(self):
+        """Move the newest _keep rows to the front of the storage."""
+        lo = self.length - self._keep
+        for arrays in (self.rates, self.indicators):
+            for values in arrays.values():
+                values[:self._keep] = values[lo:self.length]
+        self.length = self._keep
@@ -31,10 +31,17 @@ Research basis:
 
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Hashable, List, Optional, Tuple
 from datetime import datetime, timedelta
 from collections import defaultdict, deque
+from contextlib import contextmanager
 import logging
+import time
+
+from src.features.liquidity_index import LiquidityIndexStore
+from src.features.strategic_stops import calculate_strategic_stop, calculate_strategic_target
+from src.features.technical_indicators import calculate_atr
+from .ml_adaptive_engine import AsyncSignalWriter, TradeRecord
 
 logger = logging.getLogger(__name__)
 
@@ -578,6 +585,21 @@ class InstitutionalBrain:
         # Active trades tracking for ML feedback
         self.active_trades_ml: Dict[str, Dict] = {}
 
+        # Liquidity pools / sweep wicks per (symbol, timeframe) for strategic stops
+        self.liquidity_store = LiquidityIndexStore()
+
+        # Last regime per symbol with the key of its inputs: {symbol: (key, regime_info)}
+        self.regime_cache: Dict[str, Tuple[Hashable, Dict]] = {}
+        self.regime_cache_hits = 0
+
+        # Per-stage pipeline latency: {stage: {'calls', 'total_ms', 'last_ms', 'max_ms'}}
+        self.stage_timings: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: {'calls': 0, 'total_ms': 0.0, 'last_ms': 0.0, 'max_ms': 0.0}
+        )
+
+        # Signal records are built and stored off the decision path
+        self.ml_writer = AsyncSignalWriter(ml_engine) if ml_engine else None
+
         if ml_engine:
             logger.info("Institutional Brain initialized - Advanced orchestration WITH ML LEARNING active")
         else:
@@ -588,14 +610,15 @@ class InstitutionalBrain:
         """
         Process raw signals through institutional decision framework.
 
-        Steps:
-        1. Detect market regime
-        2. Filter signals by regime fit
-        3. Arbitrate between signals (if multiple for same symbol)
-        4. Portfolio-level approval
-        5. Risk management approval
-        6. Position sizing
-        7. Execution instructions
+        Stages (each runs over all symbols before the next one starts):
+        1. Regime - detect market regime, block, filter signals by regime fit
+        2. Arbitration - pick best signal per symbol
+        3. ML scoring - one batched prediction for all surviving signals
+        4. Portfolio - portfolio-level and risk management approval, sizing
+        5. Stops - strategic stops/targets and execution instructions
+
+        Per-stage latency is reported in get_statistics()['stage_latency'].
+        ML signal records are handed to a background writer.
 
         Args:
             raw_signals: Raw signals from strategies
@@ -610,16 +633,85 @@ class InstitutionalBrain:
         if not raw_signals:
             return []
 
-        logger.info(f"Brain processing {len(raw_signals)} signals")
+        logger.info("Brain processing %d signals", len(raw_signals))
 
         # Group signals by symbol
         signals_by_symbol = defaultdict(list)
         for signal in raw_signals:
             signals_by_symbol[signal['symbol']].append(signal)
 
-        approved_orders = []
+        scan_time = datetime.now()
+
+        with self._stage('regime'):
+            candidates = self._regime_stage(signals_by_symbol, market_data, features)
+
+        with self._stage('arbitration'):
+            candidates = self._arbitration_stage(candidates)
+
+        if self.ml_engine:
+            with self._stage('ml_scoring'):
+                candidates = self._ml_scoring_stage(candidates, scan_time)
+
+        with self._stage('portfolio'):
+            candidates = self._portfolio_stage(candidates, scan_time)
+
+        with self._stage('stops'):
+            approved_orders = [self._build_execution_order(candidate, scan_time)
+                               for candidate in candidates]
+
+        self.total_signals_approved += len(approved_orders)
+
+        # Update rejection stats
+        rejected_count = self.total_signals_received - self.total_signals_approved
+        self.total_signals_rejected = rejected_count
+
+        logger.info("Brain processed: %d approved, %d rejected",
+                    len(approved_orders), len(raw_signals) - len(approved_orders))
+
+        return approved_orders
+
+    @contextmanager
+    def _stage(self, name: str):
+        """Time one pipeline stage into stage_timings."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            timing = self.stage_timings[name]
+            timing['calls'] += 1
+            timing['total_ms'] += elapsed_ms
+            timing['last_ms'] = elapsed_ms
+            timing['max_ms'] = max(timing['max_ms'], elapsed_ms)
+
+    def _detect_regime(self, symbol: str, symbol_data: pd.DataFrame, symbol_features: Dict) -> Dict:
+        """
+        Regime for symbol, reusing last scan's result while its inputs are unchanged.
+
+        A reused result still goes through the detector's tracking
+        (track_cached_result), so its statistics match an uncached run.
+        """
+        get_input_key = getattr(self.regime_detector, 'get_input_key', None)
+        track_cached_result = getattr(self.regime_detector, 'track_cached_result', None)
+        if get_input_key is None or track_cached_result is None:
+            return self.regime_detector.detect_regime(symbol_data, symbol_features)
+
+        key = get_input_key(symbol_data, symbol_features)
+        cached = self.regime_cache.get(symbol)
+        if cached is not None and cached[0] == key:
+            self.regime_cache_hits += 1
+            track_cached_result(cached[1])
+            return cached[1]
+
+        regime_info = self.regime_detector.detect_regime(symbol_data, symbol_features)
+        self.regime_cache[symbol] = (key, regime_info)
+        return regime_info
+
+    def _regime_stage(self, signals_by_symbol: Dict[str, List[Dict]],
+                      market_data: Dict[str, pd.DataFrame], features: Dict) -> List[Dict]:
+        """Stage 1: regime detection, regime blocking and regime-fit filtering."""
+        candidates = []
 
-        # Process each symbol
         for symbol, signals in signals_by_symbol.items():
             # Get market context for symbol
             symbol_data = market_data.get(symbol)
@@ -630,11 +722,11 @@ class InstitutionalBrain:
                 continue
 
             # 1. Detect regime
-            regime_info = self.regime_detector.detect_regime(symbol_data, symbol_features)
+            regime_info = self._detect_regime(symbol, symbol_data, symbol_features)
             current_regime = regime_info['regime']
             regime_confidence = regime_info['confidence']
 
-            logger.info(f"{symbol}: Regime = {current_regime} (confidence: {regime_confidence:.2f})")
+            logger.info("%s: Regime = %s (confidence: %.2f)", symbol, current_regime, regime_confidence)
 
             # 2. Check if should block trading based on regime
             should_block, block_reason = self.regime_detector.should_block_trading(
@@ -643,7 +735,6 @@ class InstitutionalBrain:
 
             if should_block:
                 logger.warning(f"{symbol}: Trading blocked - {block_reason}")
-                self.total_signals_rejected += len(signals)
                 continue
 
             # 3. Filter signals by regime fit (remove very poor fits)
@@ -661,11 +752,9 @@ class InstitutionalBrain:
                 filtered_signals = signals
 
             if not filtered_signals:
-                logger.info(f"{symbol}: No signals after regime filtering")
-                self.total_signals_rejected += len(signals)
+                logger.info("%s: No signals after regime filtering", symbol)
                 continue
 
-            # 4. Arbitrate between signals (pick best)
             market_context = {
                 'vpin': symbol_features.get('vpin', 0.4),
                 'volatility_regime': regime_info['sub_regimes']['volatility']['regime'],
@@ -673,217 +762,260 @@ class InstitutionalBrain:
                 'strategy_performance': {},  # Could add recent performance per strategy
             }
 
+            candidates.append({
+                'symbol': symbol,
+                'data': symbol_data,
+                'features': symbol_features,
+                'regime': current_regime,
+                'market_context': market_context,
+                'signals': filtered_signals,
+            })
+
+        return candidates
+
+    def _arbitration_stage(self, candidates: List[Dict]) -> List[Dict]:
+        """Stage 2: arbitrate between each symbol's signals (pick best)."""
+        survivors = []
+
+        for candidate in candidates:
             best_signal = self.arbitrator.arbitrate_signals(
-                filtered_signals, market_context, current_regime
+                candidate['signals'], candidate['market_context'], candidate['regime']
             )
 
             if not best_signal:
-                logger.info(f"{symbol}: No signal passed arbitration")
-                self.total_signals_rejected += len(signals)
+                logger.info("%s: No signal passed arbitration", candidate['symbol'])
                 continue
 
-            # 5. ML PREDICTION (if available) - Enhance decision with learned insights
-            if self.ml_engine:
-                signal_features = {
-                    'quality_score': best_signal.get('metadata', {}).get('quality_score', 0.7),
-                    'mtf_confluence': best_signal.get('metadata', {}).get('mtf_confluence', 0.5),
-                    'structure_alignment': best_signal.get('metadata', {}).get('structure_alignment', 0.5),
-                    'order_flow_quality': 1.0 - symbol_features.get('vpin', 0.4),
-                    'regime_fit': 0.7,
-                    'risk_pct': 0.5,
-                    'entry_features': symbol_features,
-                }
+            candidate['signal'] = best_signal
+            survivors.append(candidate)
+
+        return survivors
+
+    def _ml_scoring_stage(self, candidates: List[Dict], scan_time: datetime) -> List[Dict]:
+        """Stage 3: ML outcome prediction for all candidates in one batch."""
+        if not candidates:
+            return candidates
+
+        signal_features = []
+        for candidate in candidates:
+            metadata = candidate['signal'].get('metadata', {})
+            signal_features.append({
+                'quality_score': metadata.get('quality_score', 0.7),
+                'mtf_confluence': metadata.get('mtf_confluence', 0.5),
+                'structure_alignment': metadata.get('structure_alignment', 0.5),
+                'order_flow_quality': 1.0 - candidate['features'].get('vpin', 0.4),
+                'regime_fit': 0.7,
+                'risk_pct': 0.5,
+                'entry_features': candidate['features'],
+            })
+
+        predictions = self.ml_engine.predict_signal_outcomes(signal_features)
 
-                predicted_r = self.ml_engine.predict_signal_outcome(signal_features)
-                logger.info(f"{symbol}: ML predicts {predicted_r:.2f}R outcome")
-
-                # If ML predicts poor outcome, reject signal
-                if predicted_r < 0.5:
-                    logger.warning(f"{symbol}: ML predicts poor outcome ({predicted_r:.2f}R), rejecting")
-
-                    # Record rejected signal in ML
-                    if self.ml_engine:
-                        from .ml_adaptive_engine import SignalRecord
-                        signal_record = SignalRecord(
-                            signal_id=f"{symbol}_{best_signal['strategy_name']}_{int(datetime.now().timestamp())}",
-                            timestamp=datetime.now(),
-                            symbol=symbol,
-                            strategy=best_signal['strategy_name'],
-                            direction=best_signal['direction'],
-                            quality_score=best_signal.get('metadata', {}).get('quality_score', 0.7),
-                            entry_price=best_signal['entry_price'],
-                            stop_loss=best_signal['stop_loss'],
-                            take_profit=best_signal['take_profit'],
-                            regime=current_regime,
-                            features=symbol_features,
-                            approved=False,
-                            rejection_reason=f"ML predicted poor outcome: {predicted_r:.2f}R",
-                            trade_id=None,
-                            eventual_outcome_r=None,
-                        )
-                        self.ml_engine.record_signal(signal_record)
-
-                    self.total_signals_rejected += 1
-                    continue
-
-            # 6. Portfolio-level approval
-            portfolio_eval = self.orchestrator.evaluate_new_signal(best_signal, market_context)
+        survivors = []
+        for candidate, predicted_r in zip(candidates, predictions):
+            symbol = candidate['symbol']
+            logger.info("%s: ML predicts %.2fR outcome", symbol, predicted_r)
+
+            # If ML predicts poor outcome, reject signal
+            if predicted_r < 0.5:
+                logger.warning(f"{symbol}: ML predicts poor outcome ({predicted_r:.2f}R), rejecting")
+                self._record_signal_ml(candidate, scan_time, approved=False,
+                                       rejection_reason=f"ML predicted poor outcome: {predicted_r:.2f}R")
+                continue
+
+            survivors.append(candidate)
+
+        return survivors
+
+    def _portfolio_stage(self, candidates: List[Dict], scan_time: datetime) -> List[Dict]:
+        """Stage 4: portfolio-level approval (includes risk manager sizing)."""
+        survivors = []
+
+        for candidate in candidates:
+            portfolio_eval = self.orchestrator.evaluate_new_signal(
+                candidate['signal'], candidate['market_context']
+            )
 
             if not portfolio_eval['approved']:
-                logger.info(f"{symbol}: Portfolio rejected - {portfolio_eval['reason']}")
-
-                # Record rejected signal in ML
-                if self.ml_engine:
-                    from .ml_adaptive_engine import SignalRecord
-                    signal_record = SignalRecord(
-                        signal_id=f"{symbol}_{best_signal['strategy_name']}_{int(datetime.now().timestamp())}",
-                        timestamp=datetime.now(),
-                        symbol=symbol,
-                        strategy=best_signal['strategy_name'],
-                        direction=best_signal['direction'],
-                        quality_score=best_signal.get('metadata', {}).get('quality_score', 0.7),
-                        entry_price=best_signal['entry_price'],
-                        stop_loss=best_signal['stop_loss'],
-                        take_profit=best_signal['take_profit'],
-                        regime=current_regime,
-                        features=symbol_features,
-                        approved=False,
-                        rejection_reason=portfolio_eval['reason'],
-                        trade_id=None,
-                        eventual_outcome_r=None,
-                    )
-                    self.ml_engine.record_signal(signal_record)
-
-                self.total_signals_rejected += 1
+                logger.info("%s: Portfolio rejected - %s", candidate['symbol'], portfolio_eval['reason'])
+                self._record_signal_ml(candidate, scan_time, approved=False,
+                                       rejection_reason=portfolio_eval['reason'])
                 continue
 
-            # 7. Apply adjustments (position sizing from risk manager)
-            adjusted_signal = best_signal.copy()
-            adjusted_signal.update(portfolio_eval['adjustments'])
-
-            # 7.5. APPLY STRATEGIC STOPS & TARGETS (structure-based)
-            try:
-                from src.features.strategic_stops import (
-                    calculate_strategic_stop,
-                    calculate_strategic_target
-                )
-
-                # Get MTF data for this symbol (M5, M15, H1, H4)
-                mtf_data_dict = None
-                if self.mtf_manager:
-                    try:
-                        mtf_data_dict = {
-                            'M5': self.mtf_manager.get_data(symbol, 'M5'),
-                            'M15': self.mtf_manager.get_data(symbol, 'M15'),
-                            'H1': self.mtf_manager.get_data(symbol, 'H1'),
-                            'H4': self.mtf_manager.get_data(symbol, 'H4'),
-                        }
-                        # Remove None values
-                        mtf_data_dict = {k: v for k, v in mtf_data_dict.items() if v is not None and not v.empty}
-                    except Exception as mtf_err:
-                        logger.debug(f"{symbol}: MTF data unavailable: {mtf_err}")
-                        mtf_data_dict = None
-
-                # Calculate strategic stop (wick sweep, OB, FVG, swing, ATR fallback)
-                strategic_stop, stop_type = calculate_strategic_stop(
-                    direction=best_signal['direction'],
-                    entry_price=best_signal['entry_price'],
-                    market_data=symbol_data,
-                    features=symbol_features,
-                    mtf_data=mtf_data_dict
-                )
-
-                # Calculate strategic target (untaken liq, OB, FVG, fractal, swing, RR fallback)
-                strategic_target, target_type = calculate_strategic_target(
-                    direction=best_signal['direction'],
-                    entry_price=best_signal['entry_price'],
-                    stop_loss=strategic_stop,
-                    market_data=symbol_data,
-                    features=symbol_features,
-                    mtf_data=mtf_data_dict
-                )
-
-                # Replace original stops/targets with strategic ones
-                adjusted_signal['stop_loss'] = strategic_stop
-                adjusted_signal['take_profit'] = strategic_target
-                adjusted_signal['stop_type'] = stop_type
-                adjusted_signal['target_type'] = target_type
-
-                logger.info(f"{symbol}: Strategic placement applied - "
-                          f"SL={stop_type}, TP={target_type}")
-
-            except Exception as e:
-                logger.warning(f"{symbol}: Strategic stops failed, using original: {e}")
-                # Keep original stops/targets from strategy
-
-            # 8. Create execution order
-            # FIX: Use adjusted_signal stops/targets (strategic placement), not original best_signal
-            execution_order = {
-                'signal': adjusted_signal,
-                'symbol': symbol,
-                'direction': best_signal['direction'],
-                'entry_price': best_signal['entry_price'],
-                'stop_loss': adjusted_signal['stop_loss'],  # FIX: Use strategic stop
-                'take_profit': adjusted_signal['take_profit'],  # FIX: Use strategic target
-                'lot_size': portfolio_eval['adjustments']['position_size_lots'],
-                'risk_pct': portfolio_eval['adjustments']['position_size_pct'],
-                'quality_score': portfolio_eval['adjustments']['quality_score'],
-                'strategy': best_signal['strategy_name'],
-                'regime': current_regime,
-                'timestamp': datetime.now(),
-            }
+            candidate['portfolio_eval'] = portfolio_eval
+            survivors.append(candidate)
+
+        return survivors
+
+    @staticmethod
+    def _placement_atr(candidate: Dict) -> float:
+        """ATR for stop buffers: 'atr' feature, else 14-bar ATR of the symbol data."""
+        atr = candidate['features'].get('atr')
+        if atr is None or not np.isfinite(atr) or atr <= 0:
+            data = candidate['data']
+            atr = calculate_atr(data['high'], data['low'], data['close']).iloc[-1] if len(data) else np.nan
+        if not np.isfinite(atr) or atr <= 0:
+            # Too few bars: half the strategy's own stop distance
+            signal = candidate['signal']
+            atr = abs(signal['entry_price'] - signal['stop_loss']) / 2.0
+        return float(atr)
+
+    def _build_execution_order(self, candidate: Dict, scan_time: datetime) -> Dict:
+        """Stage 5: strategic stops/targets and execution order for an approved signal."""
+        symbol = candidate['symbol']
+        best_signal = candidate['signal']
+        portfolio_eval = candidate['portfolio_eval']
+
+        # 7. Apply adjustments (position sizing from risk manager)
+        adjusted_signal = best_signal.copy()
+        adjusted_signal.update(portfolio_eval['adjustments'])
+
+        # 7.5. APPLY STRATEGIC STOPS & TARGETS (structure-based)
+        try:
+            # Get MTF data for this symbol (M5, M15, H1, H4)
+            mtf_data_dict = None
+            if self.mtf_manager:
+                try:
+                    mtf_data_dict = {
+                        'M5': self.mtf_manager.get_data(symbol, 'M5'),
+                        'M15': self.mtf_manager.get_data(symbol, 'M15'),
+                        'H1': self.mtf_manager.get_data(symbol, 'H1'),
+                        'H4': self.mtf_manager.get_data(symbol, 'H4'),
+                    }
+                    # Remove None values
+                    mtf_data_dict = {k: v for k, v in mtf_data_dict.items() if v is not None and not v.empty}
+                except Exception as mtf_err:
+                    logger.debug(f"{symbol}: MTF data unavailable: {mtf_err}")
+                    mtf_data_dict = None
+
+            # Calculate strategic stop (wick sweep, OB, FVG, swing, ATR fallback)
+            strategic_stop, stop_type = calculate_strategic_stop(
+                direction=best_signal['direction'],
+                entry_price=best_signal['entry_price'],
+                market_data=candidate['data'],
+                features=candidate['features'],
+                atr_fallback=self._placement_atr(candidate),
+                mtf_data=mtf_data_dict,
+                symbol=symbol,
+                liquidity_store=self.liquidity_store
+            )
 
-            # Record APPROVED signal in ML
-            if self.ml_engine:
-                from .ml_adaptive_engine import SignalRecord
-                signal_id = f"{symbol}_{best_signal['strategy_name']}_{int(datetime.now().timestamp())}"
-                # FIX: Record strategic stops/targets for ML learning, not original
-                signal_record = SignalRecord(
-                    signal_id=signal_id,
-                    timestamp=datetime.now(),
-                    symbol=symbol,
-                    strategy=best_signal['strategy_name'],
-                    direction=best_signal['direction'],
-                    quality_score=portfolio_eval['adjustments']['quality_score'],
-                    entry_price=best_signal['entry_price'],
-                    stop_loss=adjusted_signal['stop_loss'],  # FIX: Use strategic stop
-                    take_profit=adjusted_signal['take_profit'],  # FIX: Use strategic target
-                    regime=current_regime,
-                    features=symbol_features,
-                    approved=True,
-                    rejection_reason=None,
-                    trade_id=None,  # Will be linked later
-                    eventual_outcome_r=None,
-                )
-                self.ml_engine.record_signal(signal_record)
-
-                # Track for later linking
-                execution_order['signal_id_ml'] = signal_id
-
-            approved_orders.append(execution_order)
-            self.total_signals_approved += 1
-
-            logger.info(f"{symbol}: Signal APPROVED - {best_signal['strategy_name']} "
-                       f"{best_signal['direction']} @ {best_signal['entry_price']:.5f} "
-                       f"({portfolio_eval['adjustments']['position_size_lots']:.2f} lots)")
+            # Calculate strategic target (untaken liq, OB, FVG, fractal, swing, RR fallback)
+            strategic_target, target_type = calculate_strategic_target(
+                direction=best_signal['direction'],
+                entry_price=best_signal['entry_price'],
+                stop_loss=strategic_stop,
+                market_data=candidate['data'],
+                features=candidate['features'],
+                mtf_data=mtf_data_dict,
+                symbol=symbol,
+                liquidity_store=self.liquidity_store
+            )
 
-        # Update rejection stats
-        rejected_count = self.total_signals_received - self.total_signals_approved
-        self.total_signals_rejected = rejected_count
+            # Replace original stops/targets with strategic ones
+            adjusted_signal['stop_loss'] = strategic_stop
+            adjusted_signal['take_profit'] = strategic_target
+            adjusted_signal['stop_type'] = stop_type
+            adjusted_signal['target_type'] = target_type
+
+            logger.info("%s: Strategic placement applied - SL=%s, TP=%s",
+                        symbol, stop_type, target_type)
+
+        except Exception as e:
+            logger.warning(f"{symbol}: Strategic stops failed, using original: {e}")
+            # Keep original stops/targets from strategy
+
+        # 8. Create execution order
+        # FIX: Use adjusted_signal stops/targets (strategic placement), not original best_signal
+        execution_order = {
+            'signal': adjusted_signal,
+            'symbol': symbol,
+            'direction': best_signal['direction'],
+            'entry_price': best_signal['entry_price'],
+            'stop_loss': adjusted_signal['stop_loss'],  # FIX: Use strategic stop
+            'take_profit': adjusted_signal['take_profit'],  # FIX: Use strategic target
+            'lot_size': portfolio_eval['adjustments']['position_size_lots'],
+            'risk_pct': portfolio_eval['adjustments']['position_size_pct'],
+            'quality_score': portfolio_eval['adjustments']['quality_score'],
+            'strategy': best_signal['strategy_name'],
+            'regime': candidate['regime'],
+            'timestamp': datetime.now(),
+        }
+
+        # Record APPROVED signal in ML
+        if self.ml_engine:
+            # FIX: Record strategic stops/targets for ML learning, not original
+            signal_id = self._record_signal_ml(
+                candidate, scan_time, approved=True,
+                quality_score=portfolio_eval['adjustments']['quality_score'],
+                stop_loss=adjusted_signal['stop_loss'],
+                take_profit=adjusted_signal['take_profit'],
+            )
 
-        logger.info(f"Brain processed: {len(approved_orders)} approved, "
-                   f"{len(raw_signals) - len(approved_orders)} rejected")
+            # Track for later linking
+            execution_order['signal_id_ml'] = signal_id
 
-        return approved_orders
+        logger.info("%s: Signal APPROVED - %s %s @ %.5f (%.2f lots)",
+                    symbol, best_signal['strategy_name'], best_signal['direction'],
+                    best_signal['entry_price'], portfolio_eval['adjustments']['position_size_lots'])
 
-    def update_positions(self, market_data: Dict[str, pd.DataFrame]):
+        return execution_order
+
+    def _record_signal_ml(self, candidate: Dict, scan_time: datetime, approved: bool,
+                          rejection_reason: Optional[str] = None,
+                          quality_score: Optional[float] = None,
+                          stop_loss: Optional[float] = None,
+                          take_profit: Optional[float] = None) -> Optional[str]:
+        """
+        Queue the SignalRecord of a brain decision on the ML writer.
+
+        Defaults come from the candidate's signal; the record itself is built
+        on the writer thread.
+
+        Returns:
+            signal_id, or None without ML engine
+        """
+        if not self.ml_writer:
+            return None
+
+        signal = candidate['signal']
+        signal_id = f"{candidate['symbol']}_{signal['strategy_name']}_{int(scan_time.timestamp())}"
+
+        if quality_score is None:
+            quality_score = signal.get('metadata', {}).get('quality_score', 0.7)
+
+        self.ml_writer.submit(
+            signal_id=signal_id,
+            timestamp=scan_time,
+            symbol=candidate['symbol'],
+            strategy=signal['strategy_name'],
+            direction=signal['direction'],
+            quality_score=quality_score,
+            entry_price=signal['entry_price'],
+            stop_loss=signal['stop_loss'] if stop_loss is None else stop_loss,
+            take_profit=signal['take_profit'] if take_profit is None else take_profit,
+            regime=candidate['regime'],
+            # Copy: the writer thread builds the record later, while the
+            # engine may reuse or update the scan's feature dict
+            features=dict(candidate['features']),
+            approved=approved,
+            rejection_reason=rejection_reason,
+            trade_id=None,  # Linked later for approved signals
+            eventual_outcome_r=None,
+        )
+
+        return signal_id
+
+    def update_positions(self, market_data: Dict[str, pd.DataFrame],
+                         features: Optional[Dict[str, Dict]] = None):
         """
         Update all active positions through position manager.
 
         Args:
             market_data: Current market data per symbol
+            features: Optional pre-calculated features per symbol
         """
-        self.position_manager.update_positions(market_data)
+        self.position_manager.update_positions(market_data, features)
 
     def record_trade_outcome(self, signal: Dict, outcome_r: float):
         """
@@ -911,8 +1043,6 @@ class InstitutionalBrain:
         if not self.ml_engine:
             return
 
-        from .ml_adaptive_engine import TradeRecord
-
         # Create trade record
         trade_record = TradeRecord(
             trade_id=trade_id,
@@ -955,8 +1085,9 @@ class InstitutionalBrain:
         # Record in ML
         self.ml_engine.record_trade_outcome(trade_record)
 
-        # Link signal to trade
+        # Link signal to trade (its record may still be queued on the writer)
         if signal_id:
+            self.ml_writer.flush()
             self.ml_engine.memory_db.link_signal_to_trade(signal_id, trade_id, trade_data['pnl_r'])
 
         logger.info(f"Trade {trade_id} recorded in ML: {trade_data['pnl_r']:.2f}R")
@@ -974,10 +1105,21 @@ class InstitutionalBrain:
             'risk_manager': self.risk_manager.get_statistics(),
             'position_manager': self.position_manager.get_statistics(),
             'regime': self.regime_detector.get_statistics(),
+            'regime_cache_hits': self.regime_cache_hits,
+            'stage_latency': {
+                stage: {
+                    'calls': timing['calls'],
+                    'avg_ms': timing['total_ms'] / timing['calls'] if timing['calls'] else 0.0,
+                    'last_ms': timing['last_ms'],
+                    'max_ms': timing['max_ms'],
+                }
+                for stage, timing in self.stage_timings.items()
+            },
         }
 
         # Add ML statistics if available
         if self.ml_engine:
             stats['ml_engine'] = self.ml_engine.get_statistics()
+            stats['ml_writer'] = self.ml_writer.get_statistics()
 
         return stats
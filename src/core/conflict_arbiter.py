@@ -39,6 +39,7 @@ except ImportError:
     PositionSize = None  # Will be available after position_sizer.py is created
 from core.correlation_tracker import CORRELATION_TRACKER
 from core.decision_ledger import DECISION_LEDGER
+from structured_logging import bind_logger
 
 logger = logging.getLogger(__name__)
 
@@ -270,13 +271,13 @@ class ConflictArbiter:
 
                 if age > self.lock_timeout_seconds:
                     logger.warning(
-                        f"LOCK_TIMEOUT: Liberando lock expirado {lock_key} "
-                        f"(batch={existing_lock.batch_id}, age={age:.1f}s)"
+                        "LOCK_TIMEOUT: Liberando lock expirado %s (batch=%s, age=%.1fs)",
+                        lock_key, existing_lock.batch_id, age
                     )
                     del self.intention_locks[lock_key]
                 else:
                     logger.debug(
-                        f"LOCK_CONTENTION: {lock_key} locked por {existing_lock.batch_id}"
+                        "LOCK_CONTENTION: %s locked por %s", lock_key, existing_lock.batch_id
                     )
                     self.stats['race_conditions_prevented'] += 1
                     return False
@@ -289,7 +290,7 @@ class ConflictArbiter:
                 thread_id=threading.get_ident()
             )
 
-            logger.debug(f"LOCK_ACQUIRED: {lock_key} por {batch_id}")
+            logger.debug("LOCK_ACQUIRED: %s por %s", lock_key, batch_id)
             return True
     
     def release_intention_lock(self, instrument: str, horizon: str, batch_id: str):
@@ -302,7 +303,7 @@ class ConflictArbiter:
                 lock = self.intention_locks[lock_key]
                 if lock.batch_id == batch_id:
                     del self.intention_locks[lock_key]
-                    logger.debug(f"LOCK_RELEASED: {lock_key} por {batch_id}")
+                    logger.debug("LOCK_RELEASED: %s por %s", lock_key, batch_id)
     
     def decide(self, signals: List[InstitutionalSignal], 
                data: pd.DataFrame, features: Dict,
@@ -340,6 +341,9 @@ class ConflictArbiter:
         if not all(s.instrument == instrument and s.horizon == horizon for s in signals):
             return self._create_rejection("MIXED_INSTRUMENTS", signals, batch_id, data_slice_hash)
         
+        # Contexto del batch en todos los logs de la decision
+        log = bind_logger(logger, batch_id=batch_id, symbol=instrument)
+        
         # Adquirir lock
         if not self.acquire_intention_lock(instrument, horizon, batch_id):
             return self._create_rejection("LOCK_CONTENTION", signals, batch_id, data_slice_hash)
@@ -352,9 +356,9 @@ class ConflictArbiter:
                 data_slice_id=data_slice_hash
             )
             
-            logger.info(
-                f"ARBITER_START: {instrument}_{horizon} batch={batch_id} "
-                f"signals={len(signals)} regime={regime_probs}"
+            log.info(
+                "ARBITER_START: %s_%s batch=%s signals=%d regime=%s",
+                instrument, horizon, batch_id, len(signals), regime_probs
             )
             
             # PASO 2: Gating por rÃ©gimen CON SHUTDOWN DURO
@@ -515,11 +519,11 @@ class ConflictArbiter:
             # Actualizar tracking
             self._update_position_tracking(instrument, horizon, winning_signal)
             
-            logger.info(
-                f"CONFLICT_RESOLVED: {winning_signal.strategy_id} gana en {instrument} "
-                f"(batch={batch_id}, weight={adjusted_weights[winning_signal.strategy_id]:.3f}, "
-                f"ev_net={ev_calculations[winning_signal.strategy_id].ev_net:.2f}bp, "
-                f"uuid5={uuid5[:8]}...)"
+            log.info(
+                "CONFLICT_RESOLVED: %s gana en %s (batch=%s, weight=%.3f, ev_net=%.2fbp, uuid5=%s...)",
+                winning_signal.strategy_id, instrument, batch_id,
+                adjusted_weights[winning_signal.strategy_id],
+                ev_calculations[winning_signal.strategy_id].ev_net, uuid5[:8]
             )
             
             self.stats['executions'] += 1
@@ -619,8 +623,8 @@ class ConflictArbiter:
             avg_payoff = 1.5  # Conservative default
             
             logger.debug(
-                f"EV_PRIOR: {signal.strategy_id} en {horizon}/{regime} "
-                f"con {perf['trades']} trades â†’ usando prior conservador"
+                "EV_PRIOR: %s en %s/%s con %s trades â†’ usando prior conservador",
+                signal.strategy_id, horizon, regime, perf['trades']
             )
         
         # Payoff desde signal o histÃ³rico
@@ -871,8 +875,8 @@ class ConflictArbiter:
                 weight *= downweight_factor
                 
                 logger.debug(
-                    f"COLINEARITY_DOWNWEIGHT: {signal.strategy_id} "
-                    f"factor={downweight_factor:.2f} (colinear_mass={colinear_mass:.2f})"
+                    "COLINEARITY_DOWNWEIGHT: %s factor=%.2f (colinear_mass=%.2f)",
+                    signal.strategy_id, downweight_factor, colinear_mass
                 )
                 self.stats['colinearity_downweights'] += 1
             
@@ -928,9 +932,9 @@ class ConflictArbiter:
         dynamic = base + shock_adj + vol_adj + spread_adj + col_adj + dq_adj
         
         logger.debug(
-            f"NO_TRADE_ZONE: base={base:.2f}, shock={shock_adj:.2f}, "
-            f"vol={vol_adj:.2f}, spread={spread_adj:.2f}, "
-            f"col={col_adj:.2f}, dq={dq_adj:.2f}, total={dynamic:.2f}"
+            "NO_TRADE_ZONE: base=%.2f, shock=%.2f, vol=%.2f, spread=%.2f, "
+            "col=%.2f, dq=%.2f, total=%.2f",
+            base, shock_adj, vol_adj, spread_adj, col_adj, dq_adj, dynamic
         )
         
         return dynamic
@@ -987,8 +991,8 @@ class ConflictArbiter:
         """Crea resoluciÃ³n SILENCE."""
         
         logger.warning(
-            f"CONFLICT_SILENCE: {len(signals)} seÃ±ales canceladas "
-            f"(batch={batch_id}, reasons={reason_codes}, regime={regime_probs})"
+            "CONFLICT_SILENCE: %d seÃ±ales canceladas (batch=%s, reasons=%s, regime=%s)",
+            len(signals), batch_id, reason_codes, regime_probs
         )
         
         resolution = ConflictResolution(
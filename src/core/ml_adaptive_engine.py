@@ -31,6 +31,10 @@ from collections import defaultdict, deque
 import logging
 import json
 import pickle
+import queue
+import threading
+import time
+import atexit
 from pathlib import Path
 from dataclasses import dataclass, asdict
 from scipy import stats
@@ -38,6 +42,9 @@ from sklearn.preprocessing import StandardScaler
 from sklearn.ensemble import RandomForestClassifier, GradientBoostingRegressor
 from sklearn.linear_model import Ridge
 import warnings
+
+from .ml_inference import OUTCOME_FEATURE_SCHEMA, CompiledTreeEnsemble
+from .trade_memory_store import SegmentedRecordLog, TimeBoundedIndex
 warnings.filterwarnings('ignore')
 
 logger = logging.getLogger(__name__)
@@ -152,26 +159,45 @@ class TradeMemoryDatabase:
 
     This is the MEMORY of the system - everything is recorded and can be
     analyzed to improve future decisions.
+
+    Storage: every trade, signal and signal->trade link is appended to a
+    SegmentedRecordLog; on each segment rotation (and on close) the in-memory
+    state is written to a snapshot, so startup loads the snapshot plus the
+    log tail after it. Signals are indexed by signal_id; per-strategy,
+    per-symbol and per-regime indexes only keep index_retention_days.
     """
 
-    def __init__(self, storage_path: Path):
+    SNAPSHOT_VERSION = 1
+
+    def __init__(self, storage_path: Path, segment_bytes: int = 8 * 1024 * 1024,
+                 index_retention_days: int = 90):
         """
         Initialize trade memory database.
 
         Args:
             storage_path: Path to store database
+            segment_bytes: Log segment size before rotating (and snapshotting)
+            index_retention_days: Retention of the strategy/symbol/regime indexes
         """
         self.storage_path = storage_path
         self.storage_path.mkdir(parents=True, exist_ok=True)
+        self.snapshot_file = self.storage_path / 'snapshot.pkl'
 
         # In-memory caches - FIX: Limit size to prevent memory leaks
         self.trades: deque = deque(maxlen=5000)  # Keep last 5000 trades
         self.signals: deque = deque(maxlen=10000)  # Keep last 10000 signals
+        self.signals_by_id: Dict[str, SignalRecord] = {}
+
+        # Performance indexes (time-bounded)
+        retention = timedelta(days=index_retention_days)
+        self.trades_by_strategy = TimeBoundedIndex(retention)
+        self.trades_by_symbol = TimeBoundedIndex(retention)
+        self.trades_by_regime = TimeBoundedIndex(retention)
 
-        # Performance indexes
-        self.trades_by_strategy: Dict[str, List[TradeRecord]] = defaultdict(list)
-        self.trades_by_symbol: Dict[str, List[TradeRecord]] = defaultdict(list)
-        self.trades_by_regime: Dict[str, List[TradeRecord]] = defaultdict(list)
+        # Recording happens from the async ML writer thread and the main loop
+        self._lock = threading.RLock()
+        self.log = SegmentedRecordLog(self.storage_path / 'segments', segment_bytes)
+        self.snapshots_written = 0
 
         # Load existing data
         self._load_from_disk()
@@ -180,32 +206,25 @@ class TradeMemoryDatabase:
 
     def record_trade(self, trade: TradeRecord):
         """Record completed trade."""
-        self.trades.append(trade)
-        self.trades_by_strategy[trade.strategy].append(trade)
-        self.trades_by_symbol[trade.symbol].append(trade)
-        self.trades_by_regime[trade.entry_regime].append(trade)
-
-        # Save to disk (append mode)
-        self._save_trade_to_disk(trade)
+        with self._lock:
+            self._add_trade(trade)
+            self._append(('trade', asdict(trade)))
 
         logger.info(f"Trade recorded: {trade.trade_id} {trade.strategy} {trade.pnl_r:.2f}R")
 
     def record_signal(self, signal: SignalRecord):
         """Record signal (approved or rejected)."""
-        self.signals.append(signal)
-
-        # Save to disk
-        self._save_signal_to_disk(signal)
+        with self._lock:
+            self._add_signal(signal)
+            self._append(('signal', asdict(signal)))
 
         logger.debug(f"Signal recorded: {signal.signal_id} {signal.strategy} approved={signal.approved}")
 
     def link_signal_to_trade(self, signal_id: str, trade_id: str, outcome_r: float):
         """Link signal to eventual trade outcome."""
-        for signal in self.signals:
-            if signal.signal_id == signal_id:
-                signal.trade_id = trade_id
-                signal.eventual_outcome_r = outcome_r
-                break
+        with self._lock:
+            if self._apply_link(signal_id, trade_id, outcome_r):
+                self._append(('link', (signal_id, trade_id, outcome_r)))
 
     def get_strategy_trades(self, strategy: str, lookback_days: int = 30) -> List[TradeRecord]:
         """Get recent trades for strategy."""
@@ -227,40 +246,108 @@ class TradeMemoryDatabase:
         trades = self.trades_by_strategy[strategy] if strategy else self.trades
         return [t for t in trades if t.pnl_r <= 0]
 
-    def _save_trade_to_disk(self, trade: TradeRecord):
-        """Save trade to disk."""
-        trades_file = self.storage_path / 'trades.jsonl'
-        with open(trades_file, 'a') as f:
-            f.write(json.dumps(trade.to_dict()) + '\n')
-
-    def _save_signal_to_disk(self, signal: SignalRecord):
-        """Save signal to disk."""
-        signals_file = self.storage_path / 'signals.jsonl'
-        with open(signals_file, 'a') as f:
-            f.write(json.dumps(signal.to_dict()) + '\n')
+    def snapshot(self) -> 'TradeMemorySnapshot':
+        """Point-in-time copy of the trades and their indexes (for background learning)."""
+        with self._lock:
+            return TradeMemorySnapshot(
+                list(self.trades),
+                {k: list(v) for k, v in self.trades_by_strategy.records.items()},
+                {k: list(v) for k, v in self.trades_by_regime.records.items()},
+            )
+
+    def close(self):
+        """Write a final snapshot and close the log."""
+        with self._lock:
+            self._write_snapshot()
+            self.log.close()
+
+    def _add_trade(self, trade: TradeRecord):
+        self.trades.append(trade)
+        self.trades_by_strategy.add(trade.strategy, trade)
+        self.trades_by_symbol.add(trade.symbol, trade)
+        self.trades_by_regime.add(trade.entry_regime, trade)
+
+    def _add_signal(self, signal: SignalRecord):
+        if len(self.signals) == self.signals.maxlen:
+            evicted = self.signals[0]
+            if self.signals_by_id.get(evicted.signal_id) is evicted:
+                del self.signals_by_id[evicted.signal_id]
+        self.signals.append(signal)
+        self.signals_by_id[signal.signal_id] = signal
+
+    def _apply_link(self, signal_id: str, trade_id: str, outcome_r: float) -> bool:
+        signal = self.signals_by_id.get(signal_id)
+        if signal is None:
+            return False
+        signal.trade_id = trade_id
+        signal.eventual_outcome_r = outcome_r
+        return True
+
+    def _append(self, record: Tuple):
+        """Append record to the log; snapshot when the log rotates."""
+        if self.log.append(record):
+            self._write_snapshot()
+
+    def _write_snapshot(self):
+        """Write in-memory state and the log position it covers (atomic replace)."""
+        snapshot = {
+            'version': self.SNAPSHOT_VERSION,
+            'position': self.log.position(),
+            'trades': [asdict(t) for t in self.trades],
+            'signals': [asdict(s) for s in self.signals],
+        }
+        tmp_file = self.snapshot_file.with_suffix('.tmp')
+        with open(tmp_file, 'wb') as f:
+            pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+        tmp_file.replace(self.snapshot_file)
+        self.snapshots_written += 1
 
     def _load_from_disk(self):
-        """Load existing data from disk."""
-        # Load trades
+        """Load snapshot plus the log tail written after it."""
+        start = (1, 0)
+        if self.snapshot_file.exists():
+            with open(self.snapshot_file, 'rb') as f:
+                snapshot = pickle.load(f)
+            for d in snapshot['trades']:
+                self._add_trade(TradeRecord(**d))
+            for d in snapshot['signals']:
+                self._add_signal(SignalRecord(**d))
+            start = tuple(snapshot['position'])
+        elif not self.log.segments():
+            self._migrate_jsonl()
+            return
+
+        for kind, payload in self.log.replay(start):
+            if kind == 'trade':
+                self._add_trade(TradeRecord(**payload))
+            elif kind == 'signal':
+                self._add_signal(SignalRecord(**payload))
+            elif kind == 'link':
+                self._apply_link(*payload)
+
+    def _migrate_jsonl(self):
+        """One-time import of the legacy trades.jsonl / signals.jsonl files."""
         trades_file = self.storage_path / 'trades.jsonl'
+        signals_file = self.storage_path / 'signals.jsonl'
+        if not (trades_file.exists() or signals_file.exists()):
+            return
+
         if trades_file.exists():
             with open(trades_file, 'r') as f:
                 for line in f:
-                    trade_dict = json.loads(line)
-                    trade = TradeRecord.from_dict(trade_dict)
-                    self.trades.append(trade)
-                    self.trades_by_strategy[trade.strategy].append(trade)
-                    self.trades_by_symbol[trade.symbol].append(trade)
-                    self.trades_by_regime[trade.entry_regime].append(trade)
-
-        # Load signals
-        signals_file = self.storage_path / 'signals.jsonl'
+                    self._add_trade(TradeRecord.from_dict(json.loads(line)))
+
         if signals_file.exists():
             with open(signals_file, 'r') as f:
                 for line in f:
-                    signal_dict = json.loads(line)
-                    signal = SignalRecord.from_dict(signal_dict)
-                    self.signals.append(signal)
+                    self._add_signal(SignalRecord.from_dict(json.loads(line)))
+
+        self._write_snapshot()
+        for legacy_file in (trades_file, signals_file):
+            if legacy_file.exists():
+                legacy_file.rename(legacy_file.with_name(legacy_file.name + '.migrated'))
+
+        logger.info(f"Migrated legacy JSONL memory: {len(self.trades)} trades, {len(self.signals)} signals")
 
     def get_statistics(self) -> Dict:
         """Get database statistics."""
@@ -283,9 +370,38 @@ class TradeMemoryDatabase:
             'avg_loss_r': avg_loss,
             'expectancy_r': np.mean([t.pnl_r for t in self.trades]),
             'total_signals': len(self.signals),
+            'log_segment': self.log.segment,
+            'log_records_appended': self.log.records_appended,
+            'snapshots_written': self.snapshots_written,
         }
 
 
+class TradeMemorySnapshot:
+    """
+    Read-only copy of a TradeMemoryDatabase at one point in time.
+
+    Offers the query API the analyzer and optimizer use, so a learning cycle
+    can run on a worker thread while the live database keeps recording.
+    """
+
+    def __init__(self, trades: List[TradeRecord], trades_by_strategy: Dict[str, List[TradeRecord]],
+                 trades_by_regime: Dict[str, List[TradeRecord]]):
+        self.trades = trades
+        self.trades_by_strategy = trades_by_strategy
+        self.trades_by_regime = trades_by_regime
+        self.taken_at = datetime.now()
+
+    def get_strategy_trades(self, strategy: str, lookback_days: int = 30) -> List[TradeRecord]:
+        """Get recent trades for strategy."""
+        cutoff = self.taken_at - timedelta(days=lookback_days)
+        return [t for t in self.trades_by_strategy.get(strategy, []) if t.timestamp >= cutoff]
+
+    def get_regime_trades(self, regime: str, lookback_days: int = 90) -> List[TradeRecord]:
+        """Get trades that occurred in specific regime."""
+        cutoff = self.taken_at - timedelta(days=lookback_days)
+        return [t for t in self.trades_by_regime.get(regime, []) if t.timestamp >= cutoff]
+
+
 class PerformanceAttributionAnalyzer:
     """
     Analyzes WHAT works and WHY through ML-based performance attribution.
@@ -335,12 +451,14 @@ class PerformanceAttributionAnalyzer:
     - Institutional quant research: Trade analytics
     """
 
-    def __init__(self, memory_db: TradeMemoryDatabase):
+    def __init__(self, memory_db: TradeMemoryDatabase, compiled_inference: bool = True):
         """
         Initialize performance attribution analyzer.
 
         Args:
             memory_db: TradeMemoryDatabase instance with historical trades
+            compiled_inference: Evaluate the outcome predictor with the compiled
+                tree ensemble instead of sklearn predict (default: True)
         """
         self.memory_db = memory_db
 
@@ -348,6 +466,11 @@ class PerformanceAttributionAnalyzer:
         self.win_predictor: Optional[RandomForestClassifier] = None
         self.outcome_predictor: Optional[GradientBoostingRegressor] = None
 
+        # Fixed, named feature layout shared by training and inference
+        self.feature_schema = OUTCOME_FEATURE_SCHEMA
+        self.compiled_inference = compiled_inference
+        self.compiled_predictor: Optional[CompiledTreeEnsemble] = None
+
         logger.info("Performance Attribution Analyzer initialized")
 
     def analyze_feature_importance(self, strategy: Optional[str] = None) -> Dict[str, float]:
@@ -478,39 +601,15 @@ class PerformanceAttributionAnalyzer:
         Returns:
             R-squared score of model
         """
-        trades = self.memory_db.trades[-500:]  # Use last 500 trades
+        trades = list(self.memory_db.trades)[-500:]  # Use last 500 trades
 
         if len(trades) < 50:
             logger.warning("Not enough trades to train outcome predictor")
             return 0.0
 
-        # Prepare data
-        X = []
-        y = []
-
-        for trade in trades:
-            features = [
-                trade.quality_score,
-                trade.mtf_confluence,
-                trade.structure_alignment,
-                trade.order_flow_quality,
-                trade.regime_fit,
-                trade.risk_pct,
-            ]
-            # P2-026: Slice [:10] arbitrario puede causar inconsistencia
-            # PROBLEMA: Si entry_features cambia orden o agregan nuevas features,
-            # slice puede capturar diferentes features entre trades → model drift
-            # RECOMENDACIÓN: Usar claves específicas para garantizar consistencia:
-            # feature_keys = ['vpin', 'cvd', 'ofi', 'atr', 'volume_profile', ...]
-            # features.extend([trade.entry_features.get(k, 0.0) for k in feature_keys])
-            # Esto garantiza mismo feature vector siempre, con 0.0 default si falta
-            features.extend(list(trade.entry_features.values())[:10])  # Limit features
-
-            X.append(features)
-            y.append(trade.pnl_r)
-
-        X = np.array(X)
-        y = np.array(y)
+        # Prepare data (fixed schema: same columns for every trade and at inference)
+        X = self.feature_schema.trade_matrix(trades)
+        y = np.array([trade.pnl_r for trade in trades])
 
         # Train/test split
         split = int(len(X) * 0.8)
@@ -518,17 +617,24 @@ class PerformanceAttributionAnalyzer:
         y_train, y_test = y[:split], y[split:]
 
         # Train Gradient Boosting Regressor
-        self.outcome_predictor = GradientBoostingRegressor(
+        outcome_predictor = GradientBoostingRegressor(
             n_estimators=100,
             max_depth=5,
             learning_rate=0.1,
             random_state=42
         )
 
-        self.outcome_predictor.fit(X_train, y_train)
+        outcome_predictor.fit(X_train, y_train)
+
+        # Publish only fitted models (compiled first: predict_batch checks outcome_predictor)
+        self.compiled_predictor = (
+            CompiledTreeEnsemble.from_gradient_boosting(outcome_predictor, X_train)
+            if self.compiled_inference else None
+        )
+        self.outcome_predictor = outcome_predictor
 
         # Evaluate
-        score = self.outcome_predictor.score(X_test, y_test)
+        score = outcome_predictor.score(X_test, y_test)
 
         logger.info(f"Outcome predictor trained: R² = {score:.3f}")
 
@@ -544,33 +650,31 @@ class PerformanceAttributionAnalyzer:
         Returns:
             Predicted R-multiple
         """
-        if self.outcome_predictor is None:
-            return 1.0  # Default expectation
+        return float(self.predict_batch([signal_features])[0])
 
-        # Extract features (same order as training)
-        features = [
-            signal_features.get('quality_score', 0.7),
-            signal_features.get('mtf_confluence', 0.5),
-            signal_features.get('structure_alignment', 0.5),
-            signal_features.get('order_flow_quality', 0.5),
-            signal_features.get('regime_fit', 0.7),
-            signal_features.get('risk_pct', 0.5),
-        ]
+    def predict_batch(self, signals: List[Dict]) -> np.ndarray:
+        """
+        Predict expected R-multiples for several signals in one model call.
+
+        Args:
+            signals: Signal feature dicts (quality metrics + 'entry_features'),
+                     laid out by feature_schema
 
-        # Add entry features (limit to 10)
-        entry_features = signal_features.get('entry_features', {})
-        # P2-026: Slice [:10] - mismo issue que línea 457, usar claves específicas
-        features.extend(list(entry_features.values())[:10])
+        Returns:
+            Predicted R-multiple per signal (same order)
+        """
+        if self.outcome_predictor is None:
+            return np.full(len(signals), 1.0)  # Default expectation
 
-        # Pad if necessary
-        while len(features) < 16:
-            features.append(0.0)
+        if not signals:
+            return np.empty(0)
 
-        X = np.array([features])
+        X = self.feature_schema.signal_matrix(signals)
 
-        prediction = self.outcome_predictor.predict(X)[0]
+        if self.compiled_predictor is not None:
+            return self.compiled_predictor.predict(X)
 
-        return float(prediction)
+        return self.outcome_predictor.predict(X)
 
 
 class AdaptiveParameterOptimizer:
@@ -697,6 +801,177 @@ class AdaptiveParameterOptimizer:
         return self.adjustment_history[strategy]
 
 
+class AsyncSignalWriter:
+    """
+    Background writer of SignalRecords for an MLAdaptiveEngine.
+
+    The decision path only enqueues the record fields; the SignalRecord is
+    built and recorded (memory + disk) on a worker thread. Records are
+    written in submission order. Call flush() before reading signals back
+    from the memory database (e.g. link_signal_to_trade).
+    """
+
+    def __init__(self, engine: 'MLAdaptiveEngine', max_pending: int = 10000):
+        """
+        Initialize writer and start its worker thread.
+
+        Args:
+            engine: ML engine whose record_signal() stores the records
+            max_pending: Queue bound; submit() blocks when full (backpressure)
+        """
+        self.engine = engine
+        self.pending: queue.Queue = queue.Queue(maxsize=max_pending)
+
+        self.submitted = 0
+        self.written = 0
+        self.failed = 0
+
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name='AsyncSignalWriter', daemon=True)
+        self._worker.start()
+
+        # Pending records are written before interpreter exit
+        atexit.register(self.close)
+
+    def submit(self, **fields):
+        """Queue a SignalRecord (given by its fields) for recording."""
+        if self._closed:
+            raise RuntimeError("AsyncSignalWriter is closed")
+        self.submitted += 1
+        self.pending.put(fields)
+
+    def flush(self):
+        """Block until every submitted record has been recorded."""
+        self.pending.join()
+
+    def close(self, timeout: float = 10.0):
+        """Write pending records and stop the worker."""
+        if self._closed:
+            return
+        self._closed = True
+        self.pending.put(None)
+        self._worker.join(timeout)
+
+    def _run(self):
+        while True:
+            fields = self.pending.get()
+            try:
+                if fields is None:
+                    return
+                self.engine.record_signal(SignalRecord(**fields))
+                self.written += 1
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Signal record {fields.get('signal_id')} not recorded: {e}")
+            finally:
+                self.pending.task_done()
+
+    def get_statistics(self) -> Dict:
+        """Writer counters."""
+        return {
+            'submitted': self.submitted,
+            'written': self.written,
+            'failed': self.failed,
+            'pending': self.pending.qsize(),
+        }
+
+
+class BackgroundLearner:
+    """
+    Worker thread running MLAdaptiveEngine learning cycles off the trading path.
+
+    request() only enqueues; the worker takes a snapshot of the trade memory,
+    trains on it and publishes the result with a single reference swap, so
+    live predictions keep using the previous model until the new one is
+    complete. Requests made while a cycle is already queued are coalesced.
+    """
+
+    def __init__(self, engine: 'MLAdaptiveEngine'):
+        """
+        Initialize learner and start its worker thread.
+
+        Args:
+            engine: ML engine whose _run_learning_cycle() is run by the worker
+        """
+        self.engine = engine
+        self.pending: queue.Queue = queue.Queue()
+
+        self.requested = 0
+        self.coalesced = 0
+        self.completed = 0
+        self.failed = 0
+        self.last_duration_s = 0.0
+        self.total_duration_s = 0.0
+        self.max_duration_s = 0.0
+
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name='BackgroundLearner', daemon=True)
+        self._worker.start()
+
+        atexit.register(self.close)
+
+    def request(self) -> bool:
+        """
+        Queue a learning cycle.
+
+        Returns:
+            False if a cycle was already queued (request coalesced into it)
+        """
+        if self._closed:
+            raise RuntimeError("BackgroundLearner is closed")
+        self.requested += 1
+        if self.pending.qsize() > 0:
+            self.coalesced += 1
+            return False
+        self.pending.put(True)
+        return True
+
+    def wait(self):
+        """Block until every queued cycle has finished."""
+        self.pending.join()
+
+    def close(self, timeout: float = 10.0):
+        """Stop the worker after the queued cycles."""
+        if self._closed:
+            return
+        self._closed = True
+        self.pending.put(None)
+        self._worker.join(timeout)
+
+    def _run(self):
+        while True:
+            item = self.pending.get()
+            try:
+                if item is None:
+                    return
+                start = time.perf_counter()
+                self.engine._run_learning_cycle()
+                duration = time.perf_counter() - start
+
+                self.completed += 1
+                self.last_duration_s = duration
+                self.total_duration_s += duration
+                self.max_duration_s = max(self.max_duration_s, duration)
+            except Exception as e:
+                self.failed += 1
+                logger.error(f"Background learning cycle failed: {e}", exc_info=True)
+            finally:
+                self.pending.task_done()
+
+    def get_statistics(self) -> Dict:
+        """Learner counters and cycle durations."""
+        return {
+            'requested': self.requested,
+            'coalesced': self.coalesced,
+            'completed': self.completed,
+            'failed': self.failed,
+            'queue_depth': self.pending.qsize(),
+            'last_duration_s': self.last_duration_s,
+            'avg_duration_s': self.total_duration_s / self.completed if self.completed else 0.0,
+            'max_duration_s': self.max_duration_s,
+        }
+
+
 class MLAdaptiveEngine:
     """
     Master Machine Learning Adaptive Engine.
@@ -709,12 +984,14 @@ class MLAdaptiveEngine:
     - Regime-specific strategy selection
     """
 
-    def __init__(self, storage_path: Path):
+    def __init__(self, storage_path: Path, background_learning: bool = True):
         """
         Initialize ML Adaptive Engine.
 
         Args:
             storage_path: Path to store learning data
+            background_learning: Run learning cycles on a worker thread
+                (default: True); False runs them inline in record_trade_outcome
         """
         self.storage_path = storage_path
         self.storage_path.mkdir(parents=True, exist_ok=True)
@@ -735,6 +1012,10 @@ class MLAdaptiveEngine:
 
         # Performance tracking
         self.learning_iterations = 0
+        self.model_swaps = 0
+
+        # Learning cycles train on a memory snapshot off the trading path
+        self.learner = BackgroundLearner(self) if background_learning else None
 
         logger.info("=" * 80)
         logger.info("ML ADAPTIVE ENGINE INITIALIZED")
@@ -757,7 +1038,12 @@ class MLAdaptiveEngine:
         time_since_analysis = (datetime.now() - self.last_analysis_time).total_seconds() / 3600
 
         if time_since_analysis >= self.analysis_interval_hours:
-            self._run_learning_cycle()
+            # Restart the interval now so the following trades do not re-request
+            self.last_analysis_time = datetime.now()
+            if self.learner is not None:
+                self.learner.request()
+            else:
+                self._run_learning_cycle()
 
     def record_signal(self, signal: SignalRecord):
         """
@@ -814,6 +1100,21 @@ class MLAdaptiveEngine:
         """
         return self.attribution.predict_trade_outcome(signal_dict)
 
+    def predict_signal_outcomes(self, signal_dicts: List[Dict]) -> np.ndarray:
+        """
+        Predict expected outcomes (R-multiples) for a batch of signals.
+
+        One model call for the whole batch - use this when scoring all
+        signals of a scan.
+
+        Args:
+            signal_dicts: Signal dictionaries with features
+
+        Returns:
+            Predicted R-multiple per signal (same order)
+        """
+        return self.attribution.predict_batch(signal_dicts)
+
     def get_best_strategies_for_regime(self, regime: str) -> List[Tuple[str, float]]:
         """
         Get strategies ranked by performance in given regime.
@@ -849,16 +1150,27 @@ class MLAdaptiveEngine:
         return strategy_expectancy
 
     def _run_learning_cycle(self):
-        """Run complete learning cycle - analyze and optimize."""
+        """
+        Run complete learning cycle - analyze and optimize.
+
+        Works on a snapshot of the trade memory with a fresh analyzer; the
+        trained analyzer replaces self.attribution in one assignment, so
+        predict_signal_outcome(s) never sees a partially trained model.
+        """
         logger.info("\n" + "=" * 80)
         logger.info("RUNNING ML LEARNING CYCLE")
         logger.info("=" * 80)
 
         self.learning_iterations += 1
 
+        snapshot = self.memory_db.snapshot()
+        attribution = PerformanceAttributionAnalyzer(
+            snapshot, compiled_inference=self.attribution.compiled_inference
+        )
+
         # 1. Analyze feature importance
         logger.info("Analyzing feature importance...")
-        feature_importance = self.attribution.analyze_feature_importance()
+        feature_importance = attribution.analyze_feature_importance()
 
         if feature_importance:
             top_features = list(feature_importance.items())[:5]
@@ -868,7 +1180,7 @@ class MLAdaptiveEngine:
 
         # 2. Analyze regime performance
         logger.info("\nAnalyzing regime performance...")
-        regime_stats = self.attribution.analyze_regime_performance()
+        regime_stats = attribution.analyze_regime_performance()
 
         if regime_stats:
             logger.info(f"Regime performance (by expectancy):")
@@ -877,7 +1189,7 @@ class MLAdaptiveEngine:
 
         # 3. Analyze quality score performance
         logger.info("\nAnalyzing quality score performance...")
-        quality_stats = self.attribution.analyze_quality_score_performance()
+        quality_stats = attribution.analyze_quality_score_performance()
 
         if quality_stats:
             for range_key, stats in quality_stats.items():
@@ -885,12 +1197,20 @@ class MLAdaptiveEngine:
 
         # 4. Train outcome predictor
         logger.info("\nTraining outcome predictor...")
-        r_squared = self.attribution.train_outcome_predictor()
+        r_squared = attribution.train_outcome_predictor()
         logger.info(f"Outcome predictor R²: {r_squared:.3f}")
 
+        # Atomic swap; without enough trades the previous model stays live
+        if attribution.outcome_predictor is not None:
+            self.attribution = attribution
+            self.model_swaps += 1
+
         # 5. Optimize parameters for each strategy
         logger.info("\nOptimizing strategy parameters...")
-        strategies = set(t.strategy for t in self.memory_db.trades)
+        # The optimizer only runs here; point it at this cycle's snapshot
+        self.optimizer.memory_db = snapshot
+        self.optimizer.attribution = attribution
+        strategies = set(t.strategy for t in snapshot.trades)
 
         for strategy in strategies:
             adjustments = self.optimizer.optimize_strategy_parameters(strategy)
@@ -911,4 +1231,6 @@ class MLAdaptiveEngine:
             'learning_iterations': self.learning_iterations,
             'last_analysis': self.last_analysis_time.isoformat(),
             'hours_since_analysis': (datetime.now() - self.last_analysis_time).total_seconds() / 3600,
+            'model_swaps': self.model_swaps,
+            'learner': self.learner.get_statistics() if self.learner is not None else None,
         }
@@ -0,0 +1,219 @@
+"""
+ML Inference - Fixed feature schema and compiled tree ensembles
+
+Outcome prediction runs on the decision path for every scored signal, so
+inference avoids per-row Python work and per-call sklearn overhead:
+
+- FeatureSchema: fixed, named feature columns with defaults, compiled into
+  one NumPy row layout. Training (TradeRecords) and inference (signal
+  dicts) build their matrices from the same schema, so a column always
+  means the same feature regardless of dict ordering.
+- CompiledTreeEnsemble: a fitted GradientBoostingRegressor laid out as
+  complete binary trees and evaluated level by level for all rows and
+  trees at once. Same predictions as model.predict (up to summation order).
+"""
+
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+# (name, default) - signal-level quality metrics (TradeRecord attributes)
+OUTCOME_SIGNAL_FEATURES: Tuple[Tuple[str, float], ...] = (
+    ('quality_score', 0.7),
+    ('mtf_confluence', 0.5),
+    ('structure_alignment', 0.5),
+    ('order_flow_quality', 0.5),
+    ('regime_fit', 0.7),
+    ('risk_pct', 0.5),
+)
+
+# (name, default) - market features at entry (entry_features dict): the
+# numeric keys of InstitutionalTradingEngine.calculate_features, defaults
+# as in its missing-data fallback
+OUTCOME_ENTRY_FEATURES: Tuple[Tuple[str, float], ...] = (
+    ('vpin', 0.5),
+    ('order_flow_imbalance', 0.0),
+    ('atr', 0.0001),
+    ('rsi', 50.0),
+    ('adx', 0.0),
+)
+
+# Entry feature -> other keys carrying the same value, used when the
+# feature itself is absent (live_trading_engine.py names the signed
+# buy/sell volume imbalance 'order_book_imbalance')
+OUTCOME_ENTRY_ALIASES: Dict[str, Tuple[str, ...]] = {
+    'order_flow_imbalance': ('order_book_imbalance',),
+}
+
+
+class FeatureSchema:
+    """
+    Fixed feature layout of the outcome predictor.
+
+    Usage:
+        schema = FeatureSchema(OUTCOME_SIGNAL_FEATURES, OUTCOME_ENTRY_FEATURES,
+                               OUTCOME_ENTRY_ALIASES)
+        X_train = schema.trade_matrix(trades)      # TradeRecords
+        X = schema.signal_matrix(signal_dicts)     # Brain signal features
+    """
+
+    def __init__(self, signal_features: Sequence[Tuple[str, float]],
+                 entry_features: Sequence[Tuple[str, float]],
+                 entry_aliases: Optional[Dict[str, Sequence[str]]] = None):
+        self.signal_features = tuple(signal_features)
+        self.entry_features = tuple(entry_features)
+
+        self.names: List[str] = ([name for name, _ in self.signal_features] +
+                                 [f'entry_{name}' for name, _ in self.entry_features])
+        self.defaults = np.array([default for _, default in self.signal_features + self.entry_features])
+
+        self._signal_names = [name for name, _ in self.signal_features]
+        self._signal_defaults = [default for _, default in self.signal_features]
+        self._entry_names = [name for name, _ in self.entry_features]
+        self._entry_defaults = [default for _, default in self.entry_features]
+        # (column within the entry block, alias keys)
+        self._entry_aliases = [(self._entry_names.index(name), tuple(keys))
+                               for name, keys in (entry_aliases or {}).items()]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def signal_matrix(self, signals: Sequence[Dict]) -> np.ndarray:
+        """
+        Feature matrix for signal dicts (quality metrics + 'entry_features').
+
+        Missing, None or NaN features take the schema default.
+        """
+        values = []
+        extend = values.extend
+        for signal in signals:
+            extend(map(signal.get, self._signal_names, self._signal_defaults))
+            extend(self._entry_values(signal.get('entry_features') or {}))
+        return self._to_matrix(values, len(signals))
+
+    def trade_matrix(self, trades: Sequence) -> np.ndarray:
+        """Feature matrix for TradeRecords (training)."""
+        values = []
+        for trade in trades:
+            values.extend(getattr(trade, name, default) for name, default in self.signal_features)
+            values.extend(self._entry_values(trade.entry_features or {}))
+        return self._to_matrix(values, len(trades))
+
+    def _entry_values(self, entry: Dict) -> List:
+        # None for missing features (default applied in _to_matrix)
+        row = list(map(entry.get, self._entry_names))
+        for column, keys in self._entry_aliases:
+            if row[column] is None:
+                row[column] = next((entry[key] for key in keys if key in entry), None)
+        return row
+
+    def _to_matrix(self, values: List, n_rows: int) -> np.ndarray:
+        # None -> NaN; missing values (None/NaN) take the schema default
+        X = np.array(values, dtype=np.float64).reshape(n_rows, len(self.names))
+        missing = np.isnan(X)
+        if missing.any():
+            X[missing] = np.broadcast_to(self.defaults, X.shape)[missing]
+        return X
+
+
+OUTCOME_FEATURE_SCHEMA = FeatureSchema(OUTCOME_SIGNAL_FEATURES, OUTCOME_ENTRY_FEATURES,
+                                       OUTCOME_ENTRY_ALIASES)
+
+
+class CompiledTreeEnsemble:
+    """
+    Vectorized evaluation of a fitted GradientBoostingRegressor.
+
+    Every tree is laid out as a complete binary tree of the ensemble depth
+    (children of position p at 2p+1 / 2p+2; leaves shallower than the depth
+    are pushed down with +inf thresholds), so depth rounds of
+    (feature, threshold) lookups route all (row, tree) pairs to their leaf
+    with no child-pointer lookups. Prediction = offset + learning_rate * Σ leaves.
+    """
+
+    def __init__(self, feature: np.ndarray, threshold: np.ndarray, leaf_value: np.ndarray,
+                 scale: float, offset: float = 0.0):
+        """
+        Args:
+            feature: (n_trees, 2**depth - 1) split feature per internal position
+            threshold: (n_trees, 2**depth - 1) split threshold (go left if x <= t)
+            leaf_value: (n_trees, 2**depth) leaf values
+            scale: Learning rate applied to the sum of leaves
+            offset: Initial (prior) prediction
+        """
+        self.n_trees, n_internal = feature.shape
+        self.depth = int(np.log2(n_internal + 1))
+        self.scale = scale
+        self.offset = offset
+
+        # Flat arrays; per-tree base positions
+        self.feature = feature.ravel()
+        self.threshold = threshold.ravel()
+        self.leaf_value = leaf_value.ravel()
+        self.internal_base = (np.arange(self.n_trees) * n_internal)[None, :]
+        self.leaf_base = (np.arange(self.n_trees) * (n_internal + 1) - n_internal)[None, :]
+
+    @classmethod
+    def from_gradient_boosting(cls, model, X_reference: np.ndarray) -> 'CompiledTreeEnsemble':
+        """
+        Compile a fitted single-output GradientBoostingRegressor.
+
+        Args:
+            model: Fitted GradientBoostingRegressor
+            X_reference: Rows of training data; the first one calibrates the
+                         initial (prior) prediction against model.predict
+        """
+        trees = [estimator.tree_ for estimator in model.estimators_[:, 0]]
+        depth = max(tree.max_depth for tree in trees)
+        n_internal = 2 ** depth - 1
+
+        feature = np.zeros((len(trees), n_internal), dtype=np.intp)
+        threshold = np.full((len(trees), n_internal), np.inf)
+        leaf_value = np.zeros((len(trees), n_internal + 1))
+
+        for i, tree in enumerate(trees):
+            # (complete-tree position, sklearn node)
+            stack = [(0, 0)]
+            while stack:
+                position, node = stack.pop()
+                if position >= n_internal:
+                    leaf_value[i, position - n_internal] = tree.value[node, 0, 0]
+                    continue
+                if tree.children_left[node] < 0:
+                    # Shallow leaf: +inf threshold keeps every row on the left path
+                    stack.append((2 * position + 1, node))
+                    continue
+                feature[i, position] = tree.feature[node]
+                threshold[i, position] = tree.threshold[node]
+                stack.append((2 * position + 1, tree.children_left[node]))
+                stack.append((2 * position + 2, tree.children_right[node]))
+
+        compiled = cls(feature, threshold, leaf_value, scale=model.learning_rate)
+
+        X_reference = np.asarray(X_reference[:1], dtype=np.float64)
+        compiled.offset = float(model.predict(X_reference)[0] - compiled.predict(X_reference)[0])
+        return compiled
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """Predictions for rows of X (same feature layout as training)."""
+        n_rows = len(X)
+        if not n_rows:
+            return np.empty(0)
+
+        # sklearn trees compare float32 features against their thresholds;
+        # feature-major so that feature f of row r is at f * n_rows + r
+        X_flat = np.asarray(X, dtype=np.float32).astype(np.float64).T.ravel()
+        feature_offset = self.feature * n_rows
+        rows = np.arange(n_rows)[:, None]
+
+        position = np.zeros((n_rows, self.n_trees), dtype=np.intp)
+        for _ in range(self.depth):
+            node = position + self.internal_base
+            go_right = X_flat.take(feature_offset.take(node) + rows) > self.threshold.take(node)
+            position = 2 * position + 1 + go_right
+
+        return self.offset + self.scale * self.leaf_value.take(position + self.leaf_base).sum(axis=1)
@@ -0,0 +1,186 @@
+"""
+MT5 Replay Source - Offline stand-in for the MetaTrader5 rates API
+
+Replays M1 history through a moving clock and serves copy_rates_from_pos for
+every timeframe the MTF manager uses. Higher timeframes are aggregated from
+M1, and the bar containing the clock is returned as a partial (forming) bar,
+like the live terminal does.
+
+Usage:
+    source = ReplayMT5Source({'EURUSD': m1_rates}, start=first_time)
+    manager = MultiTimeframeDataManager(['EURUSD'], source=source)
+    while source.advance():
+        manager.update_incremental('EURUSD')
+"""
+
+from datetime import datetime
+from typing import Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from .bar_buffer import RATE_FIELDS
+
+
+RATES_DTYPE = np.dtype([
+    ('time', np.int64), ('open', np.float64), ('high', np.float64), ('low', np.float64),
+    ('close', np.float64), ('tick_volume', np.int64), ('spread', np.int32), ('real_volume', np.int64),
+])
+
+
+class ReplayMT5Source:
+    """
+    Replayable fake of the MetaTrader5 module's rates API.
+
+    Timeframe constants carry the real MetaTrader5 values so they can be
+    used interchangeably with the terminal module.
+    """
+
+    TIMEFRAME_M1 = 1
+    TIMEFRAME_M5 = 5
+    TIMEFRAME_M15 = 15
+    TIMEFRAME_M30 = 30
+    TIMEFRAME_H1 = 16385
+    TIMEFRAME_H4 = 16388
+    TIMEFRAME_D1 = 16408
+
+    TIMEFRAME_SECONDS = {
+        TIMEFRAME_M1: 60,
+        TIMEFRAME_M5: 300,
+        TIMEFRAME_M15: 900,
+        TIMEFRAME_M30: 1800,
+        TIMEFRAME_H1: 3600,
+        TIMEFRAME_H4: 14400,
+        TIMEFRAME_D1: 86400,
+    }
+
+    def __init__(self, history: Dict[str, Union[np.ndarray, pd.DataFrame]],
+                 start: Optional[datetime] = None):
+        """
+        Initialize replay.
+
+        Args:
+            history: {symbol: M1 rates} as MT5 structured arrays or DataFrames
+                     with a 'time' column (datetime or epoch seconds)
+            start: Initial clock (None = first M1 bar of any symbol)
+        """
+        self.history = {symbol: self._to_rates(rates) for symbol, rates in history.items()}
+        self.calls = 0
+
+        # Complete higher-timeframe bars, aggregated once per (symbol, timeframe)
+        self._buckets: Dict[tuple, np.ndarray] = {}
+        self._aggregated: Dict[tuple, np.ndarray] = {}
+
+        all_times = np.unique(np.concatenate([r['time'] for r in self.history.values()]))
+        self.timeline = all_times
+        if start is None:
+            self.position = 0
+        else:
+            self.position = int(np.searchsorted(all_times, self._to_epoch(start), side='left'))
+
+    @property
+    def now(self) -> int:
+        """Replay clock: open time of the latest visible M1 bar (epoch seconds)."""
+        return int(self.timeline[self.position])
+
+    def advance(self, bars: int = 1) -> bool:
+        """
+        Move the clock forward by a number of M1 timeline steps.
+
+        Returns:
+            False once the end of the history is reached
+        """
+        if self.position + bars >= len(self.timeline):
+            self.position = len(self.timeline) - 1
+            return False
+        self.position += bars
+        return True
+
+    def copy_rates_from_pos(self, symbol: str, timeframe: int, start_pos: int, count: int):
+        """Bars visible at the clock, newest at position 0 (MT5 semantics)."""
+        self.calls += 1
+        rates = self._visible(symbol, timeframe)
+        end = len(rates) - start_pos
+        if end <= 0 or count <= 0:
+            return None
+        return rates[max(end - count, 0):end].copy()
+
+    def _visible(self, symbol: str, timeframe: int) -> np.ndarray:
+        m1 = self.history.get(symbol)
+        if m1 is None:
+            return np.empty(0, dtype=RATES_DTYPE)
+
+        visible = int(np.searchsorted(m1['time'], self.now, side='right'))
+        if timeframe == self.TIMEFRAME_M1 or visible == 0:
+            return m1[:visible]
+
+        buckets, aggregated = self._aggregate(symbol, timeframe)
+
+        # Complete bars before the bucket holding the clock + partial forming bar
+        current_bucket = buckets[visible - 1]
+        first_in_bucket = int(np.searchsorted(buckets, current_bucket, side='left'))
+        complete = int(np.searchsorted(aggregated['time'], current_bucket, side='left'))
+
+        partial = self._reduce(m1[first_in_bucket:visible], current_bucket)
+        return np.concatenate([aggregated[:complete], partial])
+
+    def _aggregate(self, symbol: str, timeframe: int):
+        key = (symbol, timeframe)
+        if key not in self._aggregated:
+            m1 = self.history[symbol]
+            seconds = self.TIMEFRAME_SECONDS[timeframe]
+            buckets = m1['time'] // seconds * seconds
+            starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+            ends = np.r_[starts[1:], len(m1)]
+
+            aggregated = np.empty(len(starts), dtype=RATES_DTYPE)
+            aggregated['time'] = buckets[starts]
+            aggregated['open'] = m1['open'][starts]
+            aggregated['high'] = np.maximum.reduceat(m1['high'], starts)
+            aggregated['low'] = np.minimum.reduceat(m1['low'], starts)
+            aggregated['close'] = m1['close'][ends - 1]
+            aggregated['tick_volume'] = np.add.reduceat(m1['tick_volume'], starts)
+            aggregated['spread'] = m1['spread'][ends - 1]
+            aggregated['real_volume'] = np.add.reduceat(m1['real_volume'], starts)
+
+            self._buckets[key] = buckets
+            self._aggregated[key] = aggregated
+        return self._buckets[key], self._aggregated[key]
+
+    @staticmethod
+    def _reduce(bars: np.ndarray, bucket_time: int) -> np.ndarray:
+        out = np.empty(1, dtype=RATES_DTYPE)
+        out['time'] = bucket_time
+        out['open'] = bars['open'][0]
+        out['high'] = bars['high'].max()
+        out['low'] = bars['low'].min()
+        out['close'] = bars['close'][-1]
+        out['tick_volume'] = bars['tick_volume'].sum()
+        out['spread'] = bars['spread'][-1]
+        out['real_volume'] = bars['real_volume'].sum()
+        return out
+
+    @staticmethod
+    def _to_rates(rates) -> np.ndarray:
+        if isinstance(rates, pd.DataFrame):
+            frame = rates if 'time' in rates.columns else rates.reset_index()
+            if 'tick_volume' not in frame.columns and 'volume' in frame.columns:
+                frame = frame.assign(tick_volume=frame['volume'])
+            times = frame['time']
+            if np.issubdtype(times.dtype, np.datetime64):
+                times = times.values.astype('datetime64[s]').astype(np.int64)
+            out = np.zeros(len(frame), dtype=RATES_DTYPE)
+            out['time'] = np.asarray(times, dtype=np.int64)
+            for field in RATE_FIELDS[1:]:
+                if field in frame.columns:
+                    out[field] = frame[field].to_numpy()
+        else:
+            out = np.zeros(len(rates), dtype=RATES_DTYPE)
+            for field in RATE_FIELDS:
+                out[field] = rates[field]
+
+        return out[np.argsort(out['time'], kind='stable')]
+
+    @staticmethod
+    def _to_epoch(value) -> int:
+        return int(pd.Timestamp(value).value // 1_000_000_000)
@@ -13,6 +13,9 @@ import logging
 from datetime import datetime, timedelta
 from collections import defaultdict
 
+from .bar_buffer import OHLCVRingBuffer
+from .structure_engine import StructureEngine
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,24 +30,60 @@ class MultiTimeframeDataManager:
     - Liquidity level mapping
     """
 
-    def __init__(self, symbols: List[str]):
+    # pandas resample rules for building higher timeframes from cached M1
+    RESAMPLE_RULES = {
+        'D1': '1D',
+        'H4': '4h',
+        'H1': '1h',
+        'M30': '30min',
+        'M15': '15min',
+        'M5': '5min',
+    }
+
+    # Bar length per timeframe (incremental mode: detect closed bars)
+    TIMEFRAME_SECONDS = {
+        'D1': 86400,
+        'H4': 14400,
+        'H1': 3600,
+        'M30': 1800,
+        'M15': 900,
+        'M5': 300,
+        'M1': 60,
+    }
+
+    DEFAULT_BARS = {
+        'D1': 100,
+        'H4': 150,
+        'H1': 200,
+        'M30': 200,
+        'M15': 300,
+        'M5': 400,
+        'M1': 500,
+    }
+
+    def __init__(self, symbols: List[str], store=None, source=None):
         """
         Initialize MTF data manager.
 
         Args:
             symbols: List of symbols to manage
+            store: Optional MarketDataStore with cached M1 bars (load_from_store)
+            source: Rates source with the MetaTrader5 API (default: mt5 module;
+                    ReplayMT5Source for offline replay)
         """
         self.symbols = symbols
+        self.store = store
+        self.source = source if source is not None else mt5
 
         # Timeframe hierarchy (highest to lowest)
         self.timeframes = {
-            'D1': mt5.TIMEFRAME_D1,
-            'H4': mt5.TIMEFRAME_H4,
-            'H1': mt5.TIMEFRAME_H1,
-            'M30': mt5.TIMEFRAME_M30,
-            'M15': mt5.TIMEFRAME_M15,
-            'M5': mt5.TIMEFRAME_M5,
-            'M1': mt5.TIMEFRAME_M1,
+            'D1': self.source.TIMEFRAME_D1,
+            'H4': self.source.TIMEFRAME_H4,
+            'H1': self.source.TIMEFRAME_H1,
+            'M30': self.source.TIMEFRAME_M30,
+            'M15': self.source.TIMEFRAME_M15,
+            'M5': self.source.TIMEFRAME_M5,
+            'M1': self.source.TIMEFRAME_M1,
         }
 
         # Cache: {symbol: {timeframe: DataFrame}}
@@ -52,10 +91,14 @@ class MultiTimeframeDataManager:
 
         # Structure cache: {symbol: {timeframe: structure_info}}
         self.structure_cache: Dict[str, Dict[str, Dict]] = defaultdict(dict)
+        self.structure_engine = StructureEngine()
 
         # Last update timestamps
         self.last_update: Dict[str, Dict[str, datetime]] = defaultdict(dict)
 
+        # Incremental mode ring buffers: {symbol: {timeframe: OHLCVRingBuffer}}
+        self.buffers: Dict[str, Dict[str, OHLCVRingBuffer]] = defaultdict(dict)
+
         logger.info(f"MTF Manager initialized: {len(symbols)} symbols, {len(self.timeframes)} timeframes")
 
     def update_all_timeframes(self, symbol: str, bars_config: Optional[Dict[str, int]] = None):
@@ -67,21 +110,13 @@ class MultiTimeframeDataManager:
             bars_config: Optional dict of bars to load per TF
         """
         if bars_config is None:
-            bars_config = {
-                'D1': 100,
-                'H4': 150,
-                'H1': 200,
-                'M30': 200,
-                'M15': 300,
-                'M5': 400,
-                'M1': 500,
-            }
+            bars_config = self.DEFAULT_BARS
 
         for tf_name, tf_const in self.timeframes.items():
             bars = bars_config.get(tf_name, 100)
 
             try:
-                rates = mt5.copy_rates_from_pos(symbol, tf_const, 0, bars)
+                rates = self.source.copy_rates_from_pos(symbol, tf_const, 0, bars)
 
                 if rates is not None and len(rates) > 0:
                     df = self._process_ohlcv(rates, symbol, tf_name)
@@ -98,6 +133,143 @@ class MultiTimeframeDataManager:
             except Exception as e:
                 logger.error(f"Error updating {symbol} {tf_name}: {e}")
 
+    def update_incremental(self, symbol: str,
+                           bars_config: Optional[Dict[str, int]] = None) -> List[str]:
+        """
+        Incrementally update all timeframes for a symbol.
+
+        Only bars newer than the buffered ones are fetched and appended to a
+        per-(symbol, timeframe) ring buffer; indicators are updated for the
+        new rows only. M1 is polled every call; higher timeframes are only
+        touched once a new bar has opened (i.e. the previous one closed).
+
+        Args:
+            symbol: Symbol to update
+            bars_config: Optional dict of bars to keep per TF (first call)
+
+        Returns:
+            Timeframes whose data changed
+        """
+        if bars_config is None:
+            bars_config = self.DEFAULT_BARS
+
+        buffers = self.buffers[symbol]
+        changed = []
+
+        # Server clock = open time of the latest M1 bar
+        try:
+            probe = self.source.copy_rates_from_pos(symbol, self.timeframes['M1'], 0, 1)
+        except Exception as e:
+            logger.error(f"Error updating {symbol} M1: {e}")
+            return changed
+
+        if probe is None or len(probe) == 0:
+            logger.warning(f"No data for {symbol} M1")
+            return changed
+        clock = int(probe['time'][-1])
+
+        for tf_name in reversed(list(self.timeframes)):
+            tf_const = self.timeframes[tf_name]
+            tf_seconds = self.TIMEFRAME_SECONDS[tf_name]
+            buffer = buffers.get(tf_name)
+
+            if buffer is None:
+                count = bars_config.get(tf_name, 100)
+            else:
+                # Forming HTF bar still open: nothing closed since last update
+                if tf_name != 'M1' and clock < buffer.last_time + tf_seconds:
+                    continue
+                count = min((clock - buffer.last_time) // tf_seconds + 2, buffer.capacity)
+
+            try:
+                rates = self.source.copy_rates_from_pos(symbol, tf_const, 0, count)
+            except Exception as e:
+                logger.error(f"Error updating {symbol} {tf_name}: {e}")
+                continue
+
+            if rates is None or len(rates) == 0:
+                logger.warning(f"No data for {symbol} {tf_name}")
+                continue
+
+            if buffer is None:
+                buffer = OHLCVRingBuffer(capacity=count)
+                buffers[tf_name] = buffer
+
+            if buffer.update(rates) == 0:
+                continue
+
+            df = buffer.to_frame(symbol, tf_name)
+            self.data_cache[symbol][tf_name] = df
+            self.last_update[symbol][tf_name] = datetime.now()
+            self._update_structure_cache(symbol, tf_name, df)
+            changed.append(tf_name)
+
+            logger.debug(f"Incremental {symbol} {tf_name}: {len(df)} bars")
+
+        return changed
+
+    def load_from_store(self, symbol: str, end: Optional[datetime] = None,
+                        bars_config: Optional[Dict[str, int]] = None):
+        """
+        Warm all timeframes from the local M1 cache instead of MT5.
+
+        Higher timeframes are resampled from M1, so a cold start (or a
+        historical replay up to ``end``) needs no terminal round-trips.
+
+        Args:
+            symbol: Symbol to load
+            end: Last bar time (None = latest cached bar)
+            bars_config: Optional dict of bars to keep per TF
+        """
+        if self.store is None:
+            raise ValueError("No MarketDataStore configured")
+
+        if bars_config is None:
+            bars_config = self.DEFAULT_BARS
+
+        if end is None:
+            end = self.store.last_timestamp(symbol)
+            if end is None:
+                logger.warning(f"No cached data for {symbol}")
+                return
+
+        # Calendar days covering the deepest requested D1 history (weekends included)
+        start = end - timedelta(days=int(bars_config.get('D1', 100) * 1.5) + 7)
+        m1 = self.store.load_frame(symbol, start, end)
+        if m1.empty:
+            logger.warning(f"No cached data for {symbol} up to {end}")
+            return
+
+        m1 = m1.rename(columns={'volume': 'tick_volume'})
+        agg = {
+            'open': 'first',
+            'high': 'max',
+            'low': 'min',
+            'close': 'last',
+            'tick_volume': 'sum',
+            'spread': 'max',
+            'real_volume': 'sum',
+        }
+
+        for tf_name in self.timeframes:
+            bars = bars_config.get(tf_name, 100)
+
+            if tf_name == 'M1':
+                frame = m1
+            else:
+                frame = m1.resample(self.RESAMPLE_RULES[tf_name]).agg(agg).dropna(subset=['open'])
+
+            frame = frame.iloc[-bars:]
+            rates = frame.reset_index()
+            rates['time'] = rates['time'].astype('datetime64[s]').astype(np.int64)
+
+            df = self._process_ohlcv(rates, symbol, tf_name)
+            self.data_cache[symbol][tf_name] = df
+            self.last_update[symbol][tf_name] = datetime.now()
+            self._update_structure_cache(symbol, tf_name, df)
+
+            logger.debug(f"Loaded {symbol} {tf_name} from store: {len(df)} bars")
+
     def _process_ohlcv(self, rates, symbol: str, timeframe: str) -> pd.DataFrame:
         """Process raw OHLCV data into DataFrame with indicators."""
         df = pd.DataFrame(rates)
@@ -136,96 +308,10 @@ class MultiTimeframeDataManager:
         - Fair value gaps
         - Liquidity zones (consolidation areas)
         """
-        if len(df) < 50:
+        structure = self.structure_engine.update((symbol, timeframe), df)
+        if structure is None:
             return
 
-        structure = {
-            'swing_highs': [],
-            'swing_lows': [],
-            'order_blocks': [],
-            'fvgs': [],
-            'liquidity_zones': [],
-        }
-
-        # Detect swing points (institutional pivot points)
-        highs = df['high'].values
-        lows = df['low'].values
-        times = df['time'].values
-
-        # Swing highs: local maximum with 5 bars on each side
-        for i in range(5, len(df) - 5):
-            if highs[i] == max(highs[i-5:i+6]):
-                structure['swing_highs'].append({
-                    'price': float(highs[i]),
-                    'time': times[i],
-                    'index': i
-                })
-
-        # Swing lows: local minimum with 5 bars on each side
-        for i in range(5, len(df) - 5):
-            if lows[i] == min(lows[i-5:i+6]):
-                structure['swing_lows'].append({
-                    'price': float(lows[i]),
-                    'time': times[i],
-                    'index': i
-                })
-
-        # Order blocks: Strong displacement candles (>1.5 ATR range)
-        if 'atr' in df.columns:
-            df_tail = df.tail(100)
-            for idx, row in df_tail.iterrows():
-                candle_range = row['high'] - row['low']
-                if candle_range > row['atr'] * 1.5:
-                    ob_type = 'BULLISH' if row['close'] > row['open'] else 'BEARISH'
-                    structure['order_blocks'].append({
-                        'type': ob_type,
-                        'high': float(row['high']),
-                        'low': float(row['low']),
-                        'time': row['time'],
-                    })
-
-        # Fair Value Gaps: Gap in price action (3-candle pattern)
-        for i in range(2, len(df)):
-            # Bullish FVG: candle[i-2].high < candle[i].low
-            if df.iloc[i-2]['high'] < df.iloc[i]['low']:
-                gap_size = df.iloc[i]['low'] - df.iloc[i-2]['high']
-                if gap_size > df.iloc[i]['atr'] * 0.3:  # Minimum gap size
-                    structure['fvgs'].append({
-                        'type': 'BULLISH',
-                        'high': float(df.iloc[i]['low']),
-                        'low': float(df.iloc[i-2]['high']),
-                        'time': df.iloc[i]['time'],
-                    })
-
-            # Bearish FVG: candle[i-2].low > candle[i].high
-            elif df.iloc[i-2]['low'] > df.iloc[i]['high']:
-                gap_size = df.iloc[i-2]['low'] - df.iloc[i]['high']
-                if gap_size > df.iloc[i]['atr'] * 0.3:
-                    structure['fvgs'].append({
-                        'type': 'BEARISH',
-                        'high': float(df.iloc[i-2]['low']),
-                        'low': float(df.iloc[i]['high']),
-                        'time': df.iloc[i]['time'],
-                    })
-
-        # Liquidity zones: Consolidation areas (low volatility clusters)
-        # Identify using ATR compression
-        if 'atr' in df.columns:
-            df_tail = df.tail(50)
-            atr_values = df_tail['atr'].values
-            atr_mean = np.mean(atr_values)
-
-            for i in range(5, len(df_tail)):
-                window_atr = df_tail.iloc[i-5:i]['atr'].mean()
-                if window_atr < atr_mean * 0.6:  # Low volatility
-                    zone_high = df_tail.iloc[i-5:i]['high'].max()
-                    zone_low = df_tail.iloc[i-5:i]['low'].min()
-                    structure['liquidity_zones'].append({
-                        'high': float(zone_high),
-                        'low': float(zone_low),
-                        'time': df_tail.iloc[i]['time'],
-                    })
-
         self.structure_cache[symbol][timeframe] = structure
 
     def get_data(self, symbol: str, timeframe: str) -> pd.DataFrame:
@@ -286,13 +286,18 @@ class MarketStructurePositionManager:
 
         logger.info(f"Position added to manager: {position_id}")
 
-    def update_positions(self, market_data: Dict[str, pd.DataFrame]):
+    def update_positions(self, market_data: Dict[str, pd.DataFrame],
+                         features: Optional[Dict[str, Dict]] = None):
         """
         Update all positions based on current market data.
 
         Args:
             market_data: Dict of {symbol: DataFrame} with current OHLCV
+            features: Optional pre-calculated features per symbol (scan cache);
+                      'atr' is reused instead of recomputing true range
         """
+        features = features or {}
+
         for position_id, tracker in list(self.active_positions.items()):
             symbol = tracker.symbol
 
@@ -320,9 +325,11 @@ class MarketStructurePositionManager:
                 continue
 
             # Manage position based on structure
-            self._manage_position_structure(tracker, market_data[symbol])
+            atr = features.get(symbol, {}).get('atr')
+            self._manage_position_structure(tracker, market_data[symbol], atr)
 
-    def _manage_position_structure(self, tracker: PositionTracker, market_data: pd.DataFrame):
+    def _manage_position_structure(self, tracker: PositionTracker, market_data: pd.DataFrame,
+                                   atr: Optional[float] = None):
         """
         Manage position using market structure.
 
@@ -339,7 +346,7 @@ class MarketStructurePositionManager:
         if current_r >= self.min_r_for_breakeven and not tracker.stop_moved_to_breakeven:
             # Find nearest structure level near entry
             structure_level = self._find_structure_near_price(
-                tracker.symbol, tracker.entry_price, market_data
+                tracker.symbol, tracker.entry_price, market_data, atr
             )
 
             if structure_level:
@@ -364,10 +371,11 @@ class MarketStructurePositionManager:
 
         # 3. Partial exit at 2.5R+ (at structural level)
         if current_r >= self.min_r_for_partial and not tracker.partial_exits:
-            self._execute_partial_exit_structure(tracker, market_data)
+            self._execute_partial_exit_structure(tracker, market_data, atr)
 
     def _find_structure_near_price(self, symbol: str, target_price: float,
-                                   market_data: pd.DataFrame) -> Optional[StructureLevel]:
+                                   market_data: pd.DataFrame,
+                                   atr: Optional[float] = None) -> Optional[StructureLevel]:
         """
         Find nearest market structure level to target price.
 
@@ -381,6 +389,7 @@ class MarketStructurePositionManager:
             symbol: Symbol
             target_price: Target price to find structure near
             market_data: Current market data
+            atr: Pre-calculated ATR (None = compute from market_data)
 
         Returns:
             StructureLevel or None
@@ -401,14 +410,15 @@ class MarketStructurePositionManager:
             return None
 
         # FIX: Calculate proper ATR (True Range), not just close.diff()
-        if len(market_data) > 14:
-            high_low = market_data['high'] - market_data['low']
-            high_close = (market_data['high'] - market_data['close'].shift(1)).abs()
-            low_close = (market_data['low'] - market_data['close'].shift(1)).abs()
-            true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-            atr = true_range.rolling(14).mean().iloc[-1]
-        else:
-            atr = 0.0001
+        if atr is None:
+            if len(market_data) > 14:
+                high_low = market_data['high'] - market_data['low']
+                high_close = (market_data['high'] - market_data['close'].shift(1)).abs()
+                low_close = (market_data['low'] - market_data['close'].shift(1)).abs()
+                true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
+                atr = true_range.rolling(14).mean().iloc[-1]
+            else:
+                atr = 0.0001
 
         max_distance = atr * self.structure_proximity_atr
 
@@ -542,7 +552,8 @@ class MarketStructurePositionManager:
         if trailing_level:
             tracker.update_stop(trailing_level, 'TRAIL_STRUCTURE')
 
-    def _execute_partial_exit_structure(self, tracker: PositionTracker, market_data: pd.DataFrame):
+    def _execute_partial_exit_structure(self, tracker: PositionTracker, market_data: pd.DataFrame,
+                                        atr: Optional[float] = None):
         """
         Execute partial exit at structural level.
 
@@ -565,7 +576,7 @@ class MarketStructurePositionManager:
 
         # Find nearest structural resistance/support for exit
         structure_level = self._find_structure_near_price(
-            tracker.symbol, current_price, market_data
+            tracker.symbol, current_price, market_data, atr
         )
 
         exit_reason = 'PARTIAL_2.5R'
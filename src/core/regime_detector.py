@@ -15,7 +15,7 @@ Research basis:
 
 import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Hashable, List, Optional, Tuple
 from datetime import datetime
 import logging
 from collections import deque
@@ -142,12 +142,7 @@ class RegimeDetector:
         optimal_strategies = self._get_optimal_strategies(composite_regime)
 
         # Update tracking
-        if composite_regime['regime'] != self.current_regime:
-            self._regime_changed(composite_regime['regime'])
-
-        self.current_regime = composite_regime['regime']
-        self.regime_confidence = composite_regime['confidence']
-        self.regime_duration_bars += 1
+        self._update_tracking(composite_regime['regime'], composite_regime['confidence'])
 
         return {
             'regime': composite_regime['regime'],
@@ -161,6 +156,41 @@ class RegimeDetector:
             'optimal_strategies': optimal_strategies,
         }
 
+    def track_cached_result(self, regime_info: Dict):
+        """
+        Apply the tracking updates of detect_regime() for a reused result.
+
+        Callers that cache detect_regime() by get_input_key() call this on a
+        hit so current_regime, duration and history advance as if it had run.
+        """
+        # Short-data UNKNOWN results (no sub-regimes) are not tracked
+        if regime_info['sub_regimes']:
+            self._update_tracking(regime_info['regime'], regime_info['confidence'])
+
+    def get_input_key(self, market_data: pd.DataFrame, features: Dict) -> Hashable:
+        """
+        Key of everything detect_regime() reads, for caching its result.
+
+        Same key -> same regime result: the bar window (size, last bar and
+        its forming OHLCV/ATR) plus the features the component detectors use.
+        """
+        if market_data is None or market_data.empty:
+            return None
+
+        columns = market_data.columns
+        last_time = market_data['time'].iat[-1] if 'time' in columns else market_data.index[-1]
+        last_bar = tuple(market_data[column].iat[-1] if column in columns else None
+                         for column in ('open', 'high', 'low', 'close', 'volume', 'atr'))
+
+        return (
+            len(market_data),
+            last_time,
+            last_bar,
+            features.get('adx', 0),
+            features.get('vpin', 0.4),
+            features.get('order_flow_imbalance', 0.0),
+        )
+
     def _detect_volatility_regime(self, market_data: pd.DataFrame) -> Dict:
         """
         Detect volatility regime using ATR analysis.
@@ -453,6 +483,15 @@ class RegimeDetector:
 
         return strategy_map.get(regime, [])
 
+    def _update_tracking(self, regime: str, confidence: float):
+        """Record one detection: regime change, confidence and duration."""
+        if regime != self.current_regime:
+            self._regime_changed(regime)
+
+        self.current_regime = regime
+        self.regime_confidence = confidence
+        self.regime_duration_bars += 1
+
     def _regime_changed(self, new_regime: str):
         """Handle regime change."""
         logger.info(f"REGIME CHANGED: {self.current_regime} -> {new_regime} "
@@ -0,0 +1,121 @@
+"""
+Scan Feature Store - Compute-once feature cache for one market scan
+
+Every consumer in a scan (strategies, Brain, regime detector, position
+manager, ML entry snapshots) asks the store for a symbol's features; each
+registered feature is computed once per (symbol, last bar time) and served
+from the cache afterwards.
+
+The cache is scan-scoped: begin_scan() drops it, because the forming bar
+and the higher timeframes can change between scans without a new M1 bar.
+"""
+
+import logging
+import time
+from collections import defaultdict
+from typing import Callable, Dict, Hashable, List, Tuple
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+FeatureFunction = Callable[[str, pd.DataFrame], Dict]
+
+
+class ScanFeatureStore:
+    """
+    Scan-scoped feature cache keyed by (symbol, last bar time).
+
+    Usage:
+        store = ScanFeatureStore()
+        store.register('rsi', lambda symbol, data: {'rsi': ...})
+        store.begin_scan()
+        features = store.get(symbol, m1_data)   # computed
+        features = store.get(symbol, m1_data)   # served from cache
+    """
+
+    def __init__(self):
+        self.features: List[Tuple[str, FeatureFunction]] = []
+        self.cache: Dict[Tuple[str, Hashable], Dict] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.scans = 0
+
+        # {feature_name: {'calls': int, 'total_ms': float, 'max_ms': float}}
+        self.timings: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: {'calls': 0, 'total_ms': 0.0, 'max_ms': 0.0}
+        )
+
+    def register(self, name: str, function: FeatureFunction):
+        """
+        Register a feature computation.
+
+        Args:
+            name: Feature group name (timing key)
+            function: callable(symbol, data) -> dict of feature values;
+                      groups are merged in registration order
+        """
+        self.features.append((name, function))
+
+    def begin_scan(self):
+        """Start a new scan: previous scan's features are dropped."""
+        self.cache.clear()
+        self.scans += 1
+
+    def get(self, symbol: str, data: pd.DataFrame) -> Dict:
+        """
+        Features for symbol at the last bar of data (computed at most once).
+
+        Exceptions from feature functions propagate and nothing is cached.
+        """
+        key = (symbol, self._last_bar_time(data))
+
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        features = {}
+        for name, function in self.features:
+            start = time.perf_counter()
+            features.update(function(symbol, data))
+            elapsed_ms = (time.perf_counter() - start) * 1000
+
+            timing = self.timings[name]
+            timing['calls'] += 1
+            timing['total_ms'] += elapsed_ms
+            timing['max_ms'] = max(timing['max_ms'], elapsed_ms)
+
+        self.cache[key] = features
+        return features
+
+    def get_statistics(self) -> Dict:
+        """Hit/miss counters and per-feature compute timings."""
+        lookups = self.hits + self.misses
+        return {
+            'scans': self.scans,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate_pct': (self.hits / lookups * 100) if lookups else 0.0,
+            'cached_symbols': len(self.cache),
+            'timings': {
+                name: {
+                    'calls': timing['calls'],
+                    'avg_ms': timing['total_ms'] / timing['calls'] if timing['calls'] else 0.0,
+                    'max_ms': timing['max_ms'],
+                    'total_ms': timing['total_ms'],
+                }
+                for name, timing in self.timings.items()
+            },
+        }
+
+    @staticmethod
+    def _last_bar_time(data: pd.DataFrame) -> Hashable:
+        if data is None or data.empty:
+            return None
+        if 'time' in data.columns:
+            return data['time'].iloc[-1]
+        return data.index[-1]
@@ -8,6 +8,7 @@ from collections import defaultdict
 
 from core.signal_schema import InstitutionalSignal
 from core.conflict_arbiter import ConflictArbiter, ConflictResolution
+from structured_logging import bind_logger
 
 __all__ = ["SignalBus", "get_signal_bus"]
 
@@ -34,7 +35,7 @@ class SignalBus:
     def publish(self, signal: InstitutionalSignal) -> bool:
         if signal.is_expired():
             logger.debug(
-                f"SIGNAL_EXPIRED: {signal.strategy_id} en {signal.instrument}"
+                "SIGNAL_EXPIRED: %s en %s", signal.strategy_id, signal.instrument
             )
             self.stats["expired_filtered"] += 1
             return False
@@ -43,10 +44,12 @@ class SignalBus:
         with self.lock:
             self.signal_buffer[group_key].append(signal)
             self.stats["total_published"] += 1
+            buffer_size = len(self.signal_buffer[group_key])
 
+        # Formateo diferido: no se construye el mensaje si INFO está deshabilitado
         logger.info(
-            f"SIGNAL_PUBLISHED: {signal.strategy_id} → {signal.instrument} "
-            f"{signal.direction:+d} (group={group_key}, buffer_size={len(self.signal_buffer[group_key])})"
+            "SIGNAL_PUBLISHED: %s → %s %+d (group=%s, buffer_size=%d)",
+            signal.strategy_id, signal.instrument, signal.direction, group_key, buffer_size
         )
         return True
 
@@ -57,8 +60,10 @@ class SignalBus:
             batch_id = self.arbiter.get_next_batch_id()
 
         self.current_tick += 1
-        logger.info(
-            f"DECISION_TICK_START: tick={self.current_tick} batch={batch_id} groups={len(self.signal_buffer)}"
+        log = bind_logger(logger, batch_id=batch_id)
+        log.info(
+            "DECISION_TICK_START: tick=%d batch=%s groups=%d",
+            self.current_tick, batch_id, len(self.signal_buffer)
         )
 
         decisions: Dict[Tuple[str, str], ConflictResolution] = {}
@@ -90,9 +95,9 @@ class SignalBus:
                 if len(signals) > 1:
                     self.stats["conflicts_resolved"] += 1
 
-                logger.info(
-                    f"DECISION_RESOLVED: {group_key} → {resolution.decision} "
-                    f"(signals={len(signals)})"
+                log.info(
+                    "DECISION_RESOLVED: %s → %s (signals=%d)",
+                    group_key, resolution.decision, len(signals)
                 )
             except Exception as e:
                 # P1-015: Usar CRITICAL para errores en arbiter que causan REJECT
@@ -112,8 +117,8 @@ class SignalBus:
                     metadata={"batch_id": batch_id, "error": str(e)}
                 )
 
-        logger.info(
-            f"DECISION_TICK_END: tick={self.current_tick} decisions={len(decisions)}"
+        log.info(
+            "DECISION_TICK_END: tick=%d decisions=%d", self.current_tick, len(decisions)
         )
         return decisions
 
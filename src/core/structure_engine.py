@@ -0,0 +1,271 @@
+"""
+Structure Engine - Vectorized market-structure detection
+
+NumPy replacement for the per-bar loops in
+MultiTimeframeDataManager._update_structure_cache. Produces the same
+structure dict (swing_highs, swing_lows, order_blocks, fvgs,
+liquidity_zones):
+
+- Swing points: sliding-window max/min over 11 bars (5 each side)
+- Fair value gaps: shifted-array masks (bar i vs bar i-2) with ATR filter
+- Order blocks: boolean ATR-displacement mask over the last 100 bars
+- Liquidity zones: ATR-compression mask over the last 50 bars
+
+Incremental mode keeps the per-bar masks of the previous call per key and
+only re-evaluates bars whose lookahead/lookback touches rows that changed
+(new bars or a replaced forming bar); the rest of the mask is shifted.
+"""
+
+from typing import Dict, Hashable, Optional
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+SWING_WING = 5
+ORDER_BLOCK_TAIL = 100
+ORDER_BLOCK_ATR_MULT = 1.5
+FVG_MIN_ATR = 0.3
+LIQUIDITY_TAIL = 50
+LIQUIDITY_WINDOW = 5
+LIQUIDITY_COMPRESSION = 0.6
+
+_COMPARE_COLUMNS = ('open', 'high', 'low', 'close', 'atr')
+
+
+def swing_mask(values: np.ndarray, start: int, end: int, use_max: bool) -> np.ndarray:
+    """
+    Swing-point mask for centers in [start, end).
+
+    A center i qualifies when values[i] equals the max (min) of
+    values[i-5:i+6]; centers without 5 bars on each side are False.
+    """
+    n = len(values)
+    mask = np.zeros(max(end - start, 0), dtype=bool)
+    lo = max(start, SWING_WING)
+    hi = min(end, n - SWING_WING)
+    if hi <= lo:
+        return mask
+
+    windows = sliding_window_view(values[lo - SWING_WING:hi + SWING_WING], 2 * SWING_WING + 1)
+    extreme = windows.max(axis=1) if use_max else windows.min(axis=1)
+    mask[lo - start:hi - start] = values[lo:hi] == extreme
+    return mask
+
+
+def fvg_masks(highs: np.ndarray, lows: np.ndarray, atr: np.ndarray,
+              start: int, end: int):
+    """
+    Bullish / bearish fair-value-gap masks for bars in [start, end).
+
+    Bullish: high[i-2] < low[i]; bearish (otherwise): low[i-2] > high[i];
+    both require a gap larger than 0.3 * atr[i].
+    """
+    bull = np.zeros(max(end - start, 0), dtype=bool)
+    bear = np.zeros_like(bull)
+    lo = max(start, 2)
+    if end <= lo:
+        return bull, bear
+
+    high_i, low_i, atr_i = highs[lo:end], lows[lo:end], atr[lo:end]
+    high_prev, low_prev = highs[lo - 2:end - 2], lows[lo - 2:end - 2]
+
+    bull_gap = high_prev < low_i
+    bear_gap = ~bull_gap & (low_prev > high_i)
+    with np.errstate(invalid='ignore'):
+        bull[lo - start:] = bull_gap & ((low_i - high_prev) > atr_i * FVG_MIN_ATR)
+        bear[lo - start:] = bear_gap & ((low_prev - high_i) > atr_i * FVG_MIN_ATR)
+    return bull, bear
+
+
+class StructureEngine:
+    """
+    Vectorized structure detector with per-key incremental state.
+
+    Usage:
+        engine = StructureEngine()
+        structure = engine.detect(df)                      # stateless
+        structure = engine.update(('EURUSD', 'H1'), df)    # tail-only re-evaluation
+    """
+
+    def __init__(self):
+        self._state: Dict[Hashable, Dict] = {}
+
+    def detect(self, df: pd.DataFrame) -> Optional[Dict]:
+        """Full detection (None when fewer than 50 bars, like the original)."""
+        if len(df) < 50:
+            return None
+        arrays = self._arrays(df)
+        masks = self._evaluate(arrays, 0)
+        return self._build(df, arrays, masks)
+
+    def update(self, key: Hashable, df: pd.DataFrame) -> Optional[Dict]:
+        """
+        Detection reusing the masks from the previous call for the same key.
+
+        Only rows at or after the first changed row (minus the swing
+        lookahead) are re-evaluated.
+        """
+        if len(df) < 50:
+            self._state.pop(key, None)
+            return None
+
+        arrays = self._arrays(df)
+        previous = self._state.get(key)
+        first_changed = self._first_changed(previous, arrays) if previous else 0
+
+        if first_changed == 0:
+            masks = self._evaluate(arrays, 0)
+        else:
+            dropped = previous['dropped']
+            swing_from = max(first_changed - SWING_WING, 0)
+            fresh_swing = self._evaluate(arrays, swing_from, fvg=False)
+            fresh_fvg = self._evaluate(arrays, first_changed, swing=False)
+
+            masks = {}
+            for name in ('swing_high', 'swing_low'):
+                masks[name] = np.concatenate([
+                    previous['masks'][name][dropped:dropped + swing_from], fresh_swing[name]
+                ])
+                masks[name][:SWING_WING] = False
+            for name in ('fvg_bull', 'fvg_bear'):
+                masks[name] = np.concatenate([
+                    previous['masks'][name][dropped:dropped + first_changed], fresh_fvg[name]
+                ])
+                masks[name][:2] = False
+
+        self._state[key] = {'arrays': arrays, 'masks': masks, 'dropped': 0}
+        return self._build(df, arrays, masks)
+
+    def reset(self, key: Optional[Hashable] = None):
+        """Drop incremental state (one key or all)."""
+        if key is None:
+            self._state.clear()
+        else:
+            self._state.pop(key, None)
+
+    @staticmethod
+    def _arrays(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+        arrays = {col: df[col].to_numpy(dtype=np.float64) for col in _COMPARE_COLUMNS}
+        arrays['time'] = df['time'].values
+        return arrays
+
+    @staticmethod
+    def _first_changed(previous: Dict, arrays: Dict[str, np.ndarray]) -> int:
+        """
+        First row of the new frame that differs from the cached one.
+
+        Stores the number of leading rows dropped from the cached frame in
+        previous['dropped']; returns 0 when the frames cannot be aligned.
+        """
+        old_times = previous['arrays']['time']
+        new_times = arrays['time']
+        dropped = int(np.searchsorted(old_times, new_times[0], side='left'))
+        if dropped >= len(old_times) or old_times[dropped] != new_times[0]:
+            return 0
+
+        overlap = min(len(old_times) - dropped, len(new_times))
+        same = old_times[dropped:dropped + overlap] == new_times[:overlap]
+        for col in _COMPARE_COLUMNS:
+            old = previous['arrays'][col][dropped:dropped + overlap]
+            new = arrays[col][:overlap]
+            same &= (old == new) | (np.isnan(old) & np.isnan(new))
+
+        changed = np.flatnonzero(~same)
+        previous['dropped'] = dropped
+        return int(changed[0]) if len(changed) else overlap
+
+    @staticmethod
+    def _evaluate(arrays: Dict[str, np.ndarray], start: int,
+                  swing: bool = True, fvg: bool = True) -> Dict[str, np.ndarray]:
+        n = len(arrays['time'])
+        masks = {}
+        if swing:
+            masks['swing_high'] = swing_mask(arrays['high'], start, n, use_max=True)
+            masks['swing_low'] = swing_mask(arrays['low'], start, n, use_max=False)
+        if fvg:
+            masks['fvg_bull'], masks['fvg_bear'] = fvg_masks(
+                arrays['high'], arrays['low'], arrays['atr'], start, n
+            )
+        return masks
+
+    @staticmethod
+    def _build(df: pd.DataFrame, arrays: Dict[str, np.ndarray], masks: Dict[str, np.ndarray]) -> Dict:
+        highs, lows = arrays['high'], arrays['low']
+        opens, closes, atr = arrays['open'], arrays['close'], arrays['atr']
+        times = arrays['time']
+        n = len(times)
+
+        structure = {
+            'swing_highs': [
+                {'price': float(highs[i]), 'time': times[i], 'index': i}
+                for i in np.flatnonzero(masks['swing_high']).tolist()
+            ],
+            'swing_lows': [
+                {'price': float(lows[i]), 'time': times[i], 'index': i}
+                for i in np.flatnonzero(masks['swing_low']).tolist()
+            ],
+            'order_blocks': [],
+            'fvgs': [],
+            'liquidity_zones': [],
+        }
+
+        # Timestamp objects (tz preserved), as row access on the frame returns
+        time_column = df['time'].array
+
+        # Order blocks: displacement candles in the last 100 bars
+        lo = max(n - ORDER_BLOCK_TAIL, 0)
+        with np.errstate(invalid='ignore'):
+            displacement = (highs[lo:] - lows[lo:]) > atr[lo:] * ORDER_BLOCK_ATR_MULT
+        rows = np.flatnonzero(displacement) + lo
+        structure['order_blocks'] = [
+            {
+                'type': 'BULLISH' if close > open_ else 'BEARISH',
+                'high': high,
+                'low': low,
+                'time': ts,
+            }
+            for close, open_, high, low, ts in zip(
+                closes[rows].tolist(), opens[rows].tolist(), highs[rows].tolist(),
+                lows[rows].tolist(), list(time_column[rows])
+            )
+        ]
+
+        # FVGs in bar order
+        bull, bear = masks['fvg_bull'], masks['fvg_bear']
+        rows = np.flatnonzero(bull | bear)
+        is_bull = bull[rows]
+        gap_high = np.where(is_bull, lows[rows], lows[rows - 2])
+        gap_low = np.where(is_bull, highs[rows - 2], highs[rows])
+        structure['fvgs'] = [
+            {
+                'type': 'BULLISH' if bullish else 'BEARISH',
+                'high': high,
+                'low': low,
+                'time': ts,
+            }
+            for bullish, high, low, ts in zip(
+                is_bull.tolist(), gap_high.tolist(), gap_low.tolist(), list(time_column[rows])
+            )
+        ]
+
+        # Liquidity zones: ATR compression vs the 50-bar mean
+        lo = max(n - LIQUIDITY_TAIL, 0)
+        tail_atr = atr[lo:]
+        atr_mean = np.mean(tail_atr)
+        if len(tail_atr) > LIQUIDITY_WINDOW and not np.isnan(atr_mean):
+            # Window for bar i covers tail rows [i-5, i)
+            window_atr = sliding_window_view(tail_atr[:-1], LIQUIDITY_WINDOW).sum(axis=1) / LIQUIDITY_WINDOW
+            window_high = sliding_window_view(highs[lo:n - 1], LIQUIDITY_WINDOW).max(axis=1)
+            window_low = sliding_window_view(lows[lo:n - 1], LIQUIDITY_WINDOW).min(axis=1)
+            windows = np.flatnonzero(window_atr < atr_mean * LIQUIDITY_COMPRESSION)
+            structure['liquidity_zones'] = [
+                {'high': high, 'low': low, 'time': ts}
+                for high, low, ts in zip(
+                    window_high[windows].tolist(), window_low[windows].tolist(),
+                    list(time_column[windows + lo + LIQUIDITY_WINDOW])
+                )
+            ]
+
+        return structure
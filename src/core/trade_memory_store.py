@@ -0,0 +1,192 @@
+"""
+Trade Memory Store - Segmented record log and time-bounded indexes
+
+Storage engine behind TradeMemoryDatabase:
+
+- SegmentedRecordLog: append-only log of pickled records split into
+  numbered segment files (rotated by size). The file handle stays open
+  between appends; each record is flushed as it is written. Replay starts
+  from any (segment, offset) position, so startup reads a snapshot plus
+  the tail written after it instead of the whole history. A record torn
+  by a crash at the end of the last segment is truncated on replay.
+- TimeBoundedIndex: per-key record lists that only keep records newer than
+  a retention window, evicting from the old end as records arrive.
+
+Old segments are kept as an archive; they are never read at startup once
+a later snapshot exists.
+"""
+
+import logging
+import os
+import pickle
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Deque, Dict, Hashable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+LogPosition = Tuple[int, int]  # (segment number, byte offset)
+
+
+class SegmentedRecordLog:
+    """
+    Append-only pickled-record log split into segment files.
+
+    Usage:
+        log = SegmentedRecordLog(path / 'segments')
+        for record in log.replay(start=(1, 0)):   # before appending
+            ...
+        rotated = log.append(('trade', {...}))
+    """
+
+    SEGMENT_SUFFIX = '.seg'
+
+    def __init__(self, directory: Path, segment_bytes: int = 8 * 1024 * 1024):
+        """
+        Args:
+            directory: Directory holding the segment files
+            segment_bytes: Rotate to a new segment once the current one reaches this size
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.segment_bytes = segment_bytes
+
+        segments = self.segments()
+        self.segment = segments[-1] if segments else 1
+        self._file = None
+        self._lock = threading.Lock()
+
+        self.records_appended = 0
+        self.rotations = 0
+
+    def segments(self) -> List[int]:
+        """Existing segment numbers, ascending."""
+        return sorted(int(p.stem) for p in self.directory.glob(f'*{self.SEGMENT_SUFFIX}')
+                      if p.stem.isdigit())
+
+    def segment_path(self, segment: int) -> Path:
+        return self.directory / f'{segment:06d}{self.SEGMENT_SUFFIX}'
+
+    def position(self) -> LogPosition:
+        """Position right after the last appended record."""
+        with self._lock:
+            if self._file is not None:
+                return self.segment, self._file.tell()
+            path = self.segment_path(self.segment)
+            return self.segment, path.stat().st_size if path.exists() else 0
+
+    def append(self, record: Any) -> bool:
+        """
+        Append one record.
+
+        Returns:
+            True if the log rotated to a new segment after this record
+        """
+        payload = pickle.dumps(record, protocol=pickle.HIGHEST_PROTOCOL)
+
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.segment_path(self.segment), 'ab')
+            self._file.write(payload)
+            self._file.flush()
+            self.records_appended += 1
+
+            if self._file.tell() < self.segment_bytes:
+                return False
+
+            self._file.close()
+            self._file = None
+            self.segment += 1
+            self.rotations += 1
+            return True
+
+    def replay(self, start: LogPosition = (1, 0)) -> Iterator[Any]:
+        """
+        Records from start to the end of the log, in append order.
+
+        A torn record at the end of the last segment is truncated away.
+        """
+        start_segment, start_offset = start
+        segments = [s for s in self.segments() if s >= start_segment]
+
+        for segment in segments:
+            path = self.segment_path(segment)
+            with open(path, 'rb') as f:
+                if segment == start_segment:
+                    f.seek(start_offset)
+                while True:
+                    offset = f.tell()
+                    try:
+                        record = pickle.load(f)
+                    except EOFError:
+                        break
+                    except (pickle.UnpicklingError, ValueError, TypeError,
+                            AttributeError, ImportError, IndexError) as e:
+                        if segment != segments[-1]:
+                            raise
+                        logger.warning(f"Truncating torn record in {path.name} at {offset}: {e}")
+                        f.close()
+                        os.truncate(path, offset)
+                        break
+                    yield record
+
+    def close(self):
+        """Close the current segment file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class TimeBoundedIndex:
+    """
+    Per-key record lists holding only records newer than a retention window.
+
+    Records are expected in (roughly) time order; eviction pops from the old
+    end of each key's list on add and on access.
+    """
+
+    def __init__(self, retention: timedelta, time_attr: str = 'timestamp'):
+        """
+        Args:
+            retention: Records older than now - retention are evicted
+            time_attr: Record attribute holding its datetime
+        """
+        self.retention = retention
+        self.time_attr = time_attr
+        self.records: Dict[Hashable, Deque] = {}
+
+    def add(self, key: Hashable, record: Any):
+        """Index record under key."""
+        records = self.records.get(key)
+        if records is None:
+            records = self.records[key] = deque()
+        records.append(record)
+        self._evict(key, records)
+
+    def get(self, key: Hashable) -> List:
+        """Records under key within the retention window (oldest first)."""
+        records = self.records.get(key)
+        if records is None:
+            return []
+        self._evict(key, records)
+        return list(records)
+
+    __getitem__ = get
+
+    def keys(self) -> List[Hashable]:
+        return list(self.records)
+
+    def __len__(self) -> int:
+        return sum(len(records) for records in self.records.values())
+
+    def _evict(self, key: Hashable, records: Deque, now: Optional[datetime] = None):
+        cutoff = (now or datetime.now()) - self.retention
+        time_attr = self.time_attr
+        while records and getattr(records[0], time_attr) < cutoff:
+            records.popleft()
+        if not records:
+            del self.records[key]
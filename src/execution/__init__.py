@@ -12,6 +12,8 @@ from .tca_engine import TCAEngine, TCAPreTrade, TCAAtTrade, TCAPostTrade
 from .circuit_breakers import CircuitBreakerManager, BreakerType, BreakerConfig
 from .venue_simulator import VenueSimulator
 from .capacity_model import CapacityModel
+from .market_data_store import MarketDataStore
+from .bulk_ingest import BulkIngestor
 
 __all__ = [
     'DataValidator', 'ValidationResult', 'ValidationSeverity',
@@ -22,5 +24,7 @@ __all__ = [
     'TCAEngine', 'TCAPreTrade', 'TCAAtTrade', 'TCAPostTrade',
     'CircuitBreakerManager', 'BreakerType', 'BreakerConfig',
     'VenueSimulator',
-    'CapacityModel'
+    'CapacityModel',
+    'MarketDataStore',
+    'BulkIngestor'
 ]
\ No newline at end of file
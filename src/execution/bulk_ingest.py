@@ -0,0 +1,254 @@
+"""
+Bulk Ingest - Carga masiva de barras MT5 a PostgreSQL vía COPY
+
+Sustituye el INSERT ... ON CONFLICT fila a fila de los scripts ETL:
+1. Structured array de copy_rates_* -> buffer CSV (vectorizado, sin bucle Python)
+2. COPY a una tabla temporal de staging
+3. Un único INSERT ... SELECT ... ON CONFLICT (symbol, time) DO NOTHING
+
+Los símbolos se procesan en paralelo sobre un ThreadedConnectionPool; las
+llamadas a MT5 se quedan en el hilo del llamador (la API no es thread-safe).
+
+Semántica de time: igual que datetime.fromtimestamp(bar['time']) del ETL
+original (hora local naive), para no mezclar convenciones en market_data.
+"""
+
+import io
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    from psycopg2.pool import ThreadedConnectionPool
+except ImportError:
+    ThreadedConnectionPool = None
+
+logger = logging.getLogger(__name__)
+
+
+STAGE_COLUMNS = ('symbol', 'time', 'open', 'high', 'low', 'close',
+                 'tick_volume', 'spread', 'real_volume')
+
+CREATE_STAGE_SQL = """
+    CREATE TEMP TABLE market_data_stage (
+        symbol VARCHAR(20),
+        time TIMESTAMP,
+        open DOUBLE PRECISION,
+        high DOUBLE PRECISION,
+        low DOUBLE PRECISION,
+        close DOUBLE PRECISION,
+        tick_volume BIGINT,
+        spread INTEGER,
+        real_volume BIGINT
+    ) ON COMMIT DROP
+"""
+
+MERGE_SQL = """
+    INSERT INTO market_data (symbol, time, open, high, low, close,
+                             tick_volume, spread, real_volume)
+    SELECT symbol, time, open, high, low, close, tick_volume, spread, real_volume
+    FROM market_data_stage
+    ON CONFLICT (symbol, time) DO NOTHING
+"""
+
+
+def local_naive_times(epochs: np.ndarray) -> np.ndarray:
+    """
+    Epoch segundos -> datetime64[s] en hora local naive.
+
+    Equivale a datetime.fromtimestamp por fila, pero el offset UTC solo se
+    resuelve una vez por hora distinta (los cambios de horario ocurren en
+    horas en punto).
+    """
+    epochs = np.asarray(epochs, dtype=np.int64)
+    if len(epochs) == 0:
+        return epochs.astype('datetime64[s]')
+
+    hours, inverse = np.unique(epochs // 3600, return_inverse=True)
+    offsets = np.array([
+        int(datetime.fromtimestamp(int(h) * 3600).replace(tzinfo=timezone.utc).timestamp()) - int(h) * 3600
+        for h in hours
+    ], dtype=np.int64)
+
+    return (epochs + offsets[inverse]).astype('datetime64[s]')
+
+
+def rates_to_csv(symbol: str, rates) -> io.StringIO:
+    """
+    Serializa barras MT5 a un buffer CSV listo para COPY.
+
+    Args:
+        symbol: Símbolo
+        rates: Structured array de mt5.copy_rates_* (o DataFrame con las mismas columnas)
+
+    Returns:
+        StringIO posicionado al inicio, columnas en orden STAGE_COLUMNS
+    """
+    frame = pd.DataFrame({
+        'symbol': symbol,
+        'time': local_naive_times(np.asarray(rates['time'])),
+        'open': np.asarray(rates['open'], dtype=np.float64),
+        'high': np.asarray(rates['high'], dtype=np.float64),
+        'low': np.asarray(rates['low'], dtype=np.float64),
+        'close': np.asarray(rates['close'], dtype=np.float64),
+        'tick_volume': np.asarray(rates['tick_volume'], dtype=np.int64),
+        'spread': np.asarray(rates['spread'], dtype=np.int64),
+        'real_volume': np.asarray(rates['real_volume'], dtype=np.int64),
+    }, columns=list(STAGE_COLUMNS))
+
+    buffer = io.StringIO()
+    frame.to_csv(buffer, header=False, index=False, date_format='%Y-%m-%d %H:%M:%S')
+    buffer.seek(0)
+    return buffer
+
+
+def copy_bars(conn, symbol: str, rates) -> int:
+    """
+    Carga barras con COPY a staging + upsert set-based, en una transacción.
+
+    Args:
+        conn: Conexión psycopg2
+        symbol: Símbolo
+        rates: Structured array de mt5.copy_rates_*
+
+    Returns:
+        Filas nuevas insertadas en market_data (duplicados omitidos)
+    """
+    if rates is None or len(rates) == 0:
+        return 0
+
+    buffer = rates_to_csv(symbol, rates)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(CREATE_STAGE_SQL)
+            cursor.copy_expert(
+                f"COPY market_data_stage ({', '.join(STAGE_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                buffer
+            )
+            cursor.execute(MERGE_SQL)
+            inserted = cursor.rowcount
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    return inserted
+
+
+class BulkIngestor:
+    """
+    Ingesta concurrente por símbolo sobre un pool de conexiones.
+
+    submit bloquea mientras haya max_pending bloques en vuelo: la descarga de
+    MT5 es más rápida que COPY y sin cota un backfill largo acumularía casi
+    todo el histórico en memoria.
+
+    Uso:
+        with BulkIngestor(DB_CONFIG, max_workers=4) as ingestor:
+            for symbol in SYMBOLS:
+                ingestor.submit(symbol, mt5.copy_rates_range(...))
+        print(ingestor.stats)
+    """
+
+    def __init__(self, db_config: Dict, max_workers: int = 4,
+                 max_pending: Optional[int] = None):
+        """
+        Inicializa ingestor.
+
+        Args:
+            db_config: Parámetros de psycopg2.connect
+            max_workers: Hilos / conexiones simultáneas
+            max_pending: Bloques encolados o en curso como máximo
+                (None = 2 * max_workers)
+        """
+        if ThreadedConnectionPool is None:
+            raise ImportError("psycopg2 is required for BulkIngestor")
+
+        self.max_workers = max_workers
+        self.max_pending = max_pending or 2 * max_workers
+        self.pool = ThreadedConnectionPool(1, max_workers, **db_config)
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.futures = []
+        self._oldest = 0            # Primer future de self.futures aún no esperado
+
+        self.stats = {
+            'rows_read': 0,
+            'rows_inserted': 0,
+            'elapsed_s': 0.0,
+            'rows_per_s': 0.0,
+            'details': {},
+        }
+        self._start = time.perf_counter()
+
+    def submit(self, symbol: str, rates):
+        """Encola un bloque de barras de un símbolo (espera si hay max_pending en vuelo)."""
+        if rates is None or len(rates) == 0:
+            return
+        while len(self.futures) - self._oldest >= self.max_pending:
+            # Esperar al más antiguo; los errores se recogen en wait()
+            self.futures[self._oldest][2].exception()
+            self._oldest += 1
+        self.futures.append((symbol, len(rates), self.executor.submit(self._ingest, symbol, rates)))
+
+    def _ingest(self, symbol: str, rates) -> Tuple[int, float]:
+        conn = self.pool.getconn()
+        try:
+            start = time.perf_counter()
+            inserted = copy_bars(conn, symbol, rates)
+            return inserted, time.perf_counter() - start
+        finally:
+            self.pool.putconn(conn)
+
+    def wait(self) -> Dict:
+        """
+        Espera a todos los bloques encolados y agrega estadísticas.
+
+        Returns:
+            Dict con rows_read, rows_inserted, elapsed_s, rows_per_s y
+            detalle por símbolo (errores incluidos)
+        """
+        for symbol, rows, future in self.futures:
+            detail = self.stats['details'].setdefault(
+                symbol, {'rows_read': 0, 'rows_inserted': 0, 'copy_s': 0.0}
+            )
+            try:
+                inserted, elapsed = future.result()
+            except Exception as e:
+                logger.error(f"{symbol}: bulk ingest error - {e}")
+                detail['error'] = str(e)
+                continue
+
+            detail['rows_read'] += rows
+            detail['rows_inserted'] += inserted
+            detail['copy_s'] += elapsed
+            self.stats['rows_read'] += rows
+            self.stats['rows_inserted'] += inserted
+
+        self.futures.clear()
+        self._oldest = 0
+
+        elapsed = time.perf_counter() - self._start
+        self.stats['elapsed_s'] = elapsed
+        self.stats['rows_per_s'] = self.stats['rows_read'] / elapsed if elapsed > 0 else 0.0
+        return self.stats
+
+    def close(self):
+        """Espera pendientes y libera hilos y conexiones."""
+        try:
+            self.wait()
+        finally:
+            self.executor.shutdown(wait=True)
+            self.pool.closeall()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
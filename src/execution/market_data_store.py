@@ -0,0 +1,433 @@
+"""
+Market Data Store - Caché columnar binaria local de barras M1
+Particionada por símbolo y mes, columnas float64/int64 memory-mapped al cargar.
+
+Layout:
+    {root}/{symbol}/{YYYY-MM}/CURRENT          -> nombre de la generación activa
+    {root}/{symbol}/{YYYY-MM}/g{n}/{col}.npy   -> una columna por fichero
+
+Cada reescritura de partición crea una generación nueva y conmuta CURRENT con
+os.replace, de modo que un lector nunca ve una partición a medio escribir.
+La generación reemplazada se conserva hasta la siguiente escritura (un lector
+que ya leyó CURRENT puede seguir cargando sus columnas); las anteriores se
+borran entonces.
+
+Tiempos: en disco, epoch segundos de MT5. Hacia fuera (load_frame, load_long,
+last_timestamp y los argumentos start/end) hora local naive, la misma
+convención que market_data.time (escrita con datetime.fromtimestamp), para
+que un backtest vea las mismas barras desde la caché o desde PostgreSQL.
+"""
+
+import logging
+import os
+import shutil
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .bulk_ingest import local_naive_times
+
+logger = logging.getLogger(__name__)
+
+
+# Esquema de columnas (mismo que MT5 copy_rates_* y tabla market_data)
+COLUMNS: Dict[str, type] = {
+    'time': np.int64,          # epoch segundos
+    'open': np.float64,
+    'high': np.float64,
+    'low': np.float64,
+    'close': np.float64,
+    'tick_volume': np.int64,
+    'spread': np.int64,
+    'real_volume': np.int64,
+}
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def local_naive_to_epoch(times: np.ndarray) -> np.ndarray:
+    """
+    datetime64 en hora local naive -> epoch segundos (inversa de local_naive_times).
+
+    Equivale a datetime.timestamp() por fila; el offset UTC se resuelve una
+    vez por hora distinta.
+    """
+    naive = np.asarray(times).astype('datetime64[s]').astype(np.int64)
+    if len(naive) == 0:
+        return naive
+
+    hours, inverse = np.unique(naive // 3600, return_inverse=True)
+    offsets = np.array([
+        int(h) * 3600 - int((_EPOCH + timedelta(hours=int(h))).timestamp())
+        for h in hours
+    ], dtype=np.int64)
+
+    return naive - offsets[inverse]
+
+
+class MarketDataStore:
+    """
+    Caché columnar de market data compartida por backtests y MTF manager.
+
+    Características:
+    - Particiones símbolo/mes, una columna .npy por campo
+    - Carga por rango con np.load(mmap_mode='r') (sin conversión decimal)
+    - Escritura idempotente: duplicados por 'time' se descartan
+      (misma semántica que ON CONFLICT DO NOTHING)
+    - Refresco incremental desde etl_incremental / MT5 rates
+    """
+
+    def __init__(self, root: Path = Path("data/market_store")):
+        """
+        Inicializa store.
+
+        Args:
+            root: Directorio base de la caché
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Escritura
+    # ------------------------------------------------------------------
+
+    def write_bars(self, symbol: str, bars) -> int:
+        """
+        Añade barras a la caché.
+
+        Args:
+            symbol: Símbolo
+            bars: Structured array de MT5 (copy_rates_*) o DataFrame con
+                  columnas 'time' (datetime local naive o epoch s), open, high, low, close,
+                  tick_volume/volume, spread, real_volume
+
+        Returns:
+            Número de barras nuevas insertadas
+        """
+        columns = self._to_columns(bars)
+        if len(columns['time']) == 0:
+            return 0
+
+        months = columns['time'].astype('datetime64[s]').astype('datetime64[M]')
+        inserted = 0
+
+        for month in np.unique(months):
+            mask = months == month
+            new = {col: values[mask] for col, values in columns.items()}
+            month_key = str(month)
+
+            existing = self._read_partition(symbol, month_key, mmap=False)
+            if existing is not None:
+                merged = {col: np.concatenate([existing[col], new[col]]) for col in COLUMNS}
+            else:
+                merged = new
+
+            # Ordenar por tiempo conservando la primera aparición (existente gana)
+            _, first = np.unique(merged['time'], return_index=True)
+            merged = {col: values[first] for col, values in merged.items()}
+
+            added = len(first) - (len(existing['time']) if existing is not None else 0)
+            if added > 0:
+                self._write_partition(symbol, month_key, merged)
+                inserted += added
+
+        return inserted
+
+    def import_from_postgres(self, cursor, symbol: str,
+                             since: Optional[datetime] = None,
+                             batch_size: int = 200_000) -> int:
+        """
+        Importa barras desde la tabla market_data (casts a float8 en SQL).
+
+        La columna time se escribió con datetime.fromtimestamp (hora local
+        naive), así que se convierte de vuelta con datetime.timestamp() para
+        quedar en el mismo epoch que las barras crudas de MT5.
+
+        Args:
+            cursor: Cursor psycopg2 abierto
+            symbol: Símbolo
+            since: Solo barras posteriores a esta fecha (None = todo)
+            batch_size: Filas por fetchmany
+
+        Returns:
+            Barras insertadas en la caché
+        """
+        query = """
+            SELECT time, open::float8, high::float8, low::float8, close::float8,
+                   tick_volume, COALESCE(spread, 0), COALESCE(real_volume, 0)
+            FROM market_data
+            WHERE symbol = %s AND (%s::timestamp IS NULL OR time > %s::timestamp)
+            ORDER BY time
+        """
+        cursor.execute(query, (symbol, since, since))
+
+        inserted = 0
+        dtype = np.dtype([(col, dt) for col, dt in COLUMNS.items()])
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            rows = [(int(row[0].timestamp()),) + tuple(row[1:]) for row in rows]
+            inserted += self.write_bars(symbol, np.array(rows, dtype=dtype))
+
+        return inserted
+
+    # ------------------------------------------------------------------
+    # Lectura
+    # ------------------------------------------------------------------
+
+    def symbols(self) -> List[str]:
+        """Símbolos presentes en la caché."""
+        return sorted(p.name for p in self.root.iterdir() if p.is_dir())
+
+    def partitions(self, symbol: str) -> List[str]:
+        """Meses (YYYY-MM) disponibles para un símbolo, ordenados."""
+        symbol_dir = self.root / symbol
+        if not symbol_dir.exists():
+            return []
+        return sorted(p.name for p in symbol_dir.iterdir() if (p / "CURRENT").exists())
+
+    def last_timestamp(self, symbol: str) -> Optional[datetime]:
+        """Timestamp (hora local naive) de la última barra en caché (None si vacío)."""
+        months = self.partitions(symbol)
+        if not months:
+            return None
+        last = self._read_partition(symbol, months[-1], columns=['time'])
+        return datetime.fromtimestamp(int(last['time'][-1]))
+
+    def load_arrays(self, symbol: str,
+                    start: Optional[datetime] = None,
+                    end: Optional[datetime] = None,
+                    columns: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Carga columnas de un símbolo en [start, end] (hora local naive;
+        'time' se devuelve en epoch segundos como en MT5).
+
+        Una sola partición se devuelve como vista memory-mapped (zero-copy);
+        varias se concatenan.
+
+        Returns:
+            Dict {columna: array}
+        """
+        columns = list(columns) if columns is not None else list(COLUMNS)
+        if 'time' not in columns:
+            columns = ['time'] + columns
+
+        start_s = self._to_epoch(start)
+        end_s = self._to_epoch(end)
+        start_month = self._month_key(start_s) if start_s is not None else None
+        end_month = self._month_key(end_s) if end_s is not None else None
+
+        parts = []
+        for month in self.partitions(symbol):
+            if start_month is not None and month < start_month:
+                continue
+            if end_month is not None and month > end_month:
+                continue
+
+            part = self._read_partition(symbol, month, columns=columns)
+            times = part['time']
+            lo = np.searchsorted(times, start_s, side='left') if start_s is not None else 0
+            hi = np.searchsorted(times, end_s, side='right') if end_s is not None else len(times)
+            if hi > lo:
+                parts.append({col: part[col][lo:hi] for col in columns})
+
+        if not parts:
+            return {col: np.empty(0, dtype=COLUMNS[col]) for col in columns}
+        if len(parts) == 1:
+            return parts[0]
+        return {col: np.concatenate([p[col] for p in parts]) for col in columns}
+
+    def load_rates(self, symbol: str,
+                   start: Optional[datetime] = None,
+                   end: Optional[datetime] = None) -> np.ndarray:
+        """Carga como structured array con el formato de mt5.copy_rates_*."""
+        arrays = self.load_arrays(symbol, start, end)
+        rates = np.empty(len(arrays['time']), dtype=[(col, dt) for col, dt in COLUMNS.items()])
+        for col in COLUMNS:
+            rates[col] = arrays[col]
+        return rates
+
+    def load_frame(self, symbol: str,
+                   start: Optional[datetime] = None,
+                   end: Optional[datetime] = None) -> pd.DataFrame:
+        """
+        Carga DataFrame OHLCV indexado por tiempo (formato BacktestEngine).
+
+        Índice en hora local naive, como market_data.time.
+        Columnas: open, high, low, close, volume (= tick_volume), spread, real_volume
+        """
+        arrays = self.load_arrays(symbol, start, end)
+        index = pd.DatetimeIndex(local_naive_times(arrays['time']), name='time')
+        return pd.DataFrame({
+            'open': arrays['open'],
+            'high': arrays['high'],
+            'low': arrays['low'],
+            'close': arrays['close'],
+            'volume': arrays['tick_volume'],
+            'spread': arrays['spread'],
+            'real_volume': arrays['real_volume'],
+        }, index=index, copy=False)
+
+    def load_long(self, symbols: Optional[List[str]] = None,
+                  start: Optional[datetime] = None,
+                  end: Optional[datetime] = None) -> pd.DataFrame:
+        """
+        Carga formato largo con el mismo resultado que
+        SELECT symbol, time, open, high, low, close, tick_volume AS volume, tick_volume
+        FROM market_data ORDER BY time (time en hora local naive).
+
+        Columnas: symbol, time, open, high, low, close, volume, tick_volume
+        """
+        frames = []
+        for symbol in symbols or self.symbols():
+            frame = self.load_frame(symbol, start, end)
+            if frame.empty:
+                continue
+            frame = frame.reset_index()
+            frame.insert(0, 'symbol', symbol)
+            frame['tick_volume'] = frame['volume']
+            frames.append(frame)
+
+        if not frames:
+            return pd.DataFrame(columns=['symbol', 'time', 'open', 'high', 'low', 'close',
+                                         'volume', 'tick_volume'])
+
+        data = pd.concat(frames, ignore_index=True)
+        return data.sort_values('time', kind='stable', ignore_index=True)
+
+    def load_long_merged(self, symbols: List[str],
+                         load_missing: Callable[[List[str]], pd.DataFrame]) -> pd.DataFrame:
+        """
+        load_long de `symbols` completando desde otra fuente los que no están en caché.
+
+        Una caché parcial no reduce el universo del backtest: los símbolos sin
+        particiones se piden a load_missing (p.ej. SELECT ... WHERE symbol =
+        ANY(%s) en PostgreSQL), se registran en el log y se fusionan por tiempo.
+
+        Args:
+            symbols: Universo pedido
+            load_missing: Callable(lista de símbolos) -> DataFrame largo con
+                          al menos symbol, time y las columnas que use el llamador
+
+        Returns:
+            DataFrame largo ordenado por time (columnas de load_long; las que
+            load_missing no devuelva quedan NaN en sus filas)
+        """
+        cached = [symbol for symbol in symbols if self.partitions(symbol)]
+        missing = [symbol for symbol in symbols if symbol not in cached]
+
+        frames = [self.load_long(cached)] if cached else []
+        if missing:
+            logger.warning("Símbolos sin caché, cargados desde la fuente original: %s",
+                           ', '.join(missing))
+            frames.append(load_missing(missing))
+
+        frames = [frame for frame in frames if not frame.empty]
+        if len(frames) == 1:
+            return frames[0].sort_values('time', kind='stable', ignore_index=True)
+        if not frames:
+            return pd.DataFrame(columns=['symbol', 'time', 'open', 'high', 'low', 'close',
+                                         'volume', 'tick_volume'])
+
+        data = pd.concat(frames, ignore_index=True)
+        return data.sort_values('time', kind='stable', ignore_index=True)
+
+    # ------------------------------------------------------------------
+    # Internos
+    # ------------------------------------------------------------------
+
+    def _partition_dir(self, symbol: str, month: str) -> Path:
+        return self.root / symbol / month
+
+    def _read_partition(self, symbol: str, month: str, mmap: bool = True,
+                        columns: Optional[Iterable[str]] = None) -> Optional[Dict[str, np.ndarray]]:
+        partition = self._partition_dir(symbol, month)
+        current = partition / "CURRENT"
+        if not current.exists():
+            return None
+
+        mmap_mode = 'r' if mmap else None
+        for attempt in range(2):
+            generation = partition / current.read_text().strip()
+            try:
+                return {
+                    col: np.load(generation / f"{col}.npy", mmap_mode=mmap_mode)
+                    for col in (columns or COLUMNS)
+                }
+            except FileNotFoundError:
+                # Generación recogida por dos escrituras durante la lectura: releer CURRENT
+                if attempt:
+                    raise
+
+    def _write_partition(self, symbol: str, month: str, arrays: Dict[str, np.ndarray]):
+        partition = self._partition_dir(symbol, month)
+        partition.mkdir(parents=True, exist_ok=True)
+        current = partition / "CURRENT"
+
+        previous = current.read_text().strip() if current.exists() else None
+        next_gen = int(previous[1:]) + 1 if previous else 0
+        generation = partition / f"g{next_gen}"
+        generation.mkdir(exist_ok=True)
+
+        for col, dtype in COLUMNS.items():
+            np.save(generation / f"{col}.npy", np.ascontiguousarray(arrays[col], dtype=dtype))
+
+        tmp = partition / "CURRENT.tmp"
+        tmp.write_text(generation.name)
+        os.replace(tmp, current)
+
+        # Se conserva la generación anterior (lectores en curso); las demás sobran.
+        # En Windows un lector con mmap abierto puede bloquear el borrado
+        for old in partition.glob("g*"):
+            if old.is_dir() and old.name not in (generation.name, previous):
+                shutil.rmtree(old, ignore_errors=True)
+
+        logger.debug(f"Partición {symbol} {month}: {len(arrays['time'])} barras ({generation.name})")
+
+    @staticmethod
+    def _to_columns(bars) -> Dict[str, np.ndarray]:
+        """Normaliza structured array / DataFrame al esquema COLUMNS."""
+        if isinstance(bars, pd.DataFrame):
+            if 'time' in bars.columns:
+                frame = bars
+            else:
+                frame = bars.reset_index().rename(columns={bars.index.name or 'index': 'time'})
+            if 'tick_volume' not in frame.columns and 'volume' in frame.columns:
+                frame = frame.assign(tick_volume=frame['volume'])
+            source = {col: frame[col].to_numpy() for col in frame.columns}
+        else:
+            bars = np.asarray(bars)
+            source = {col: bars[col] for col in bars.dtype.names}
+
+        n = len(source['time'])
+        times = source['time']
+        if isinstance(bars, pd.DataFrame) and isinstance(frame['time'].dtype, pd.DatetimeTZDtype):
+            times = frame['time'].dt.tz_convert('UTC').dt.tz_localize(None).to_numpy()
+            times = times.astype('datetime64[s]').astype(np.int64)
+        elif np.issubdtype(np.asarray(times).dtype, np.datetime64):
+            times = local_naive_to_epoch(times)
+
+        columns = {'time': np.asarray(times, dtype=np.int64)}
+        for col, dtype in COLUMNS.items():
+            if col == 'time':
+                continue
+            if col in source:
+                columns[col] = np.asarray(source[col], dtype=dtype)
+            else:
+                columns[col] = np.zeros(n, dtype=dtype)
+        return columns
+
+    @staticmethod
+    def _to_epoch(value: Optional[datetime]) -> Optional[int]:
+        """Fecha naive (hora local) o con zona -> epoch segundos."""
+        if value is None:
+            return None
+        return int(pd.Timestamp(value).to_pydatetime().timestamp())
+
+    @staticmethod
+    def _month_key(epoch_seconds: int) -> str:
+        return str(np.datetime64(epoch_seconds, 's').astype('datetime64[M]'))
@@ -0,0 +1,257 @@
+"""
+Liquidity Index - Per-(symbol, timeframe) liquidity pools and sweep wicks
+
+Precomputes, for the window that strategic_stops looks at, everything that
+does not depend on the signal:
+
+- Sweep wicks (last 50 bars): bars whose low/high ran the previous 10 bars'
+  extreme and closed back inside, with sweep distance and wick size.
+- Liquidity pools (last 100 bars): each high/low with its equal-level count
+  (within pip tolerance) and whether a later bar took it.
+
+Both are kept sorted by price, so stop/target placement for an entry is a
+binary search plus a max over the surviving candidates. The index is
+rebuilt only when the window's bars change (new bar or forming-bar update).
+
+Equivalence:
+- best_wick_sweep(...) == loop in strategic_stops._find_wick_liquidity_sweep
+- best_untaken_liquidity(...) == loop in
+  strategic_stops._find_untaken_liquidity_target
+  (same candidates, same strength/significance, earliest bar wins ties)
+"""
+
+import logging
+from bisect import bisect_left, bisect_right
+from typing import Dict, Hashable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+logger = logging.getLogger(__name__)
+
+
+MIN_BARS = 20
+WICK_LOOKBACK = 50
+WICK_CONTEXT = 10
+POOL_LOOKBACK = 100
+PIP_TOLERANCE = 0.0005
+
+
+class _SortedLevels:
+    """Candidate levels sorted by price, with their bar position in the window."""
+
+    def __init__(self, levels: np.ndarray, positions: np.ndarray, **columns: np.ndarray):
+        order = np.lexsort((positions, levels))
+        self.levels = levels[order]
+        self.level_list = self.levels.tolist()
+        self.positions = positions[order]
+        self.columns = {name: values[order] for name, values in columns.items()}
+
+    def __len__(self) -> int:
+        return len(self.level_list)
+
+    def best(self, start: int, stop: int, score: np.ndarray) -> Optional[int]:
+        """Index (in sorted order) of max score in [start, stop); earliest bar on ties."""
+        if start >= stop:
+            return None
+        window = score[start:stop]
+        top = np.fmax.reduce(window)
+        if not top == top:  # all NaN
+            return None
+        tied = np.flatnonzero(window == top)
+        return start + tied[np.argmin(self.positions[start:stop][tied])]
+
+
+class LiquidityIndex:
+    """
+    Liquidity pools and sweep wicks for one (symbol, timeframe).
+
+    Usage:
+        index = LiquidityIndex('M15')
+        index.update(m15_data)                  # rebuild only if bars changed
+        level, significance = index.best_wick_sweep('LONG', entry, atr)
+        level, strength = index.best_untaken_liquidity('LONG', entry, risk)
+    """
+
+    def __init__(self, timeframe: Optional[str] = None, pip_tolerance: float = PIP_TOLERANCE):
+        self.timeframe = timeframe
+        self.pip_tolerance = pip_tolerance
+
+        self.n_bars = 0
+        self.rebuilds = 0
+        self._key: Optional[Tuple] = None
+
+        empty = np.empty(0)
+        self.sweep_lows = _SortedLevels(empty, empty.astype(np.int64))
+        self.sweep_highs = _SortedLevels(empty, empty.astype(np.int64))
+        self.pool_highs = _SortedLevels(empty, empty.astype(np.int64))
+        self.pool_lows = _SortedLevels(empty, empty.astype(np.int64))
+
+    def update(self, data: Optional[pd.DataFrame]) -> bool:
+        """
+        Sync the index with the latest bars.
+
+        Returns:
+            True if the index was rebuilt
+        """
+        key = self._window_key(data)
+        if key == self._key:
+            return False
+
+        self._key = key
+        self.n_bars = 0 if data is None else len(data)
+        if self.n_bars >= MIN_BARS:
+            self._build_sweeps(data.tail(WICK_LOOKBACK))
+            self._build_pools(data.tail(POOL_LOOKBACK))
+        self.rebuilds += 1
+        return True
+
+    def best_wick_sweep(self, direction: str, entry_price: float,
+                        atr: float) -> Tuple[Optional[float], float]:
+        """
+        Most significant sweep wick on the stop side of entry.
+
+        Returns:
+            (wick level, significance), or (None, 0.0) if no candidate
+        """
+        if self.n_bars < MIN_BARS:
+            return None, 0.0
+
+        if direction == 'LONG':
+            sweeps = self.sweep_lows
+            start, stop = 0, bisect_left(sweeps.level_list, entry_price)
+        else:
+            sweeps = self.sweep_highs
+            start, stop = bisect_right(sweeps.level_list, entry_price), len(sweeps)
+
+        if start >= stop:
+            return None, 0.0
+
+        significance = (sweeps.columns['sweep_distance'] / (atr + 1e-10)
+                        * (sweeps.columns['wick_size'] / atr))
+        best = sweeps.best(start, stop, significance)
+        if best is None:
+            return None, 0.0
+        return sweeps.levels[best], significance[best]
+
+    def best_untaken_liquidity(self, direction: str, entry_price: float,
+                               risk: float) -> Tuple[Optional[float], int]:
+        """
+        Untaken equal-highs/lows pool with the most equals, at least 1R from entry.
+
+        Returns:
+            (pool level, number of equals), or (None, 0) if no candidate
+        """
+        if self.n_bars < MIN_BARS:
+            return None, 0
+
+        if direction == 'LONG':
+            pools = self.pool_highs
+            start = max(bisect_right(pools.level_list, entry_price),
+                        bisect_left(pools.level_list, entry_price + risk))
+            stop = len(pools)
+        else:
+            pools = self.pool_lows
+            start = 0
+            stop = min(bisect_left(pools.level_list, entry_price),
+                       bisect_right(pools.level_list, entry_price - risk))
+
+        best = pools.best(start, stop, pools.columns['equals'])
+        if best is None:
+            return None, 0
+        return pools.levels[best], int(pools.columns['equals'][best])
+
+    def _build_sweeps(self, window: pd.DataFrame):
+        high = window['high'].to_numpy(dtype=np.float64)
+        low = window['low'].to_numpy(dtype=np.float64)
+        close = window['close'].to_numpy(dtype=np.float64)
+
+        # prev_low[k] / prev_high[k]: extremes of the 10 bars before bar k + 10
+        # (fmin/fmax skip NaN like the pandas min/max in the loop)
+        prev_low = np.fmin.reduce(sliding_window_view(low[:-1], WICK_CONTEXT), axis=1)
+        prev_high = np.fmax.reduce(sliding_window_view(high[:-1], WICK_CONTEXT), axis=1)
+        bar_high, bar_low, bar_close = high[WICK_CONTEXT:], low[WICK_CONTEXT:], close[WICK_CONTEXT:]
+        positions = np.arange(WICK_CONTEXT, len(window))
+        wick_size = bar_high - bar_low
+
+        swept_low = (bar_low < prev_low) & (bar_close > prev_low)
+        self.sweep_lows = _SortedLevels(
+            bar_low[swept_low], positions[swept_low],
+            sweep_distance=(prev_low - bar_low)[swept_low],
+            wick_size=wick_size[swept_low],
+        )
+
+        swept_high = (bar_high > prev_high) & (bar_close < prev_high)
+        self.sweep_highs = _SortedLevels(
+            bar_high[swept_high], positions[swept_high],
+            sweep_distance=(bar_high - prev_high)[swept_high],
+            wick_size=wick_size[swept_high],
+        )
+
+    def _build_pools(self, window: pd.DataFrame):
+        high = window['high'].to_numpy(dtype=np.float64)
+        low = window['low'].to_numpy(dtype=np.float64)
+        tolerance = self.pip_tolerance
+
+        # The last bar is never a pool candidate (nothing after it)
+        positions = np.arange(len(window) - 1)
+
+        # Equal-level counts over the whole window (window <= 100 bars)
+        high_equals = (np.abs(high[None, :] - high[:-1, None]) < tolerance).sum(axis=1)
+        low_equals = (np.abs(low[None, :] - low[:-1, None]) < tolerance).sum(axis=1)
+
+        # Taken: some later bar traded through the level
+        later_low = np.fmin.accumulate(low[::-1])[::-1][1:]
+        later_high = np.fmax.accumulate(high[::-1])[::-1][1:]
+        high_taken = later_low < high[:-1] - tolerance
+        low_taken = later_high > low[:-1] + tolerance
+
+        pool = ~high_taken & (high_equals >= 2)
+        self.pool_highs = _SortedLevels(high[:-1][pool], positions[pool], equals=high_equals[pool])
+
+        pool = ~low_taken & (low_equals >= 2)
+        self.pool_lows = _SortedLevels(low[:-1][pool], positions[pool], equals=low_equals[pool])
+
+    @staticmethod
+    def _window_key(data: Optional[pd.DataFrame]) -> Hashable:
+        """Identity of the indexed window: size, first/last bar and forming-bar OHLC."""
+        if data is None or data.empty:
+            return None
+        start = max(0, len(data) - POOL_LOOKBACK)
+        if 'time' in data.columns:
+            first_time, last_time = data['time'].iat[start], data['time'].iat[-1]
+        else:
+            first_time, last_time = data.index[start], data.index[-1]
+        return (len(data), first_time, last_time,
+                data['high'].iat[-1], data['low'].iat[-1], data['close'].iat[-1])
+
+
+class LiquidityIndexStore:
+    """
+    LiquidityIndex per (symbol, timeframe), kept across scans.
+
+    Usage:
+        store = LiquidityIndexStore()
+        index = store.get('EURUSD', 'M15', m15_data)   # synced with data
+    """
+
+    def __init__(self):
+        self.indexes: Dict[Tuple[str, str], LiquidityIndex] = {}
+
+    def get(self, symbol: str, timeframe: str, data: pd.DataFrame) -> LiquidityIndex:
+        """Index for (symbol, timeframe), rebuilt if data has new bars."""
+        key = (symbol, timeframe)
+        index = self.indexes.get(key)
+        if index is None:
+            index = LiquidityIndex(timeframe)
+            self.indexes[key] = index
+        index.update(data)
+        return index
+
+    def get_statistics(self) -> Dict:
+        """Index count and total rebuilds."""
+        return {
+            'indexes': len(self.indexes),
+            'rebuilds': sum(index.rebuilds for index in self.indexes.values()),
+        }
@@ -38,6 +38,11 @@ class VPINCalculator:
         self.current_bucket_volume = 0
         self.current_bucket_buy_volume = 0
         self.current_bucket_sell_volume = 0
+
+        # Running totals over self.buckets so VPIN queries are O(1)
+        self.total_imbalance = 0.0
+        self.total_volume = 0.0
+        self._buckets_since_resync = 0
         
     def add_trade(self, volume: float, trade_direction: int) -> Optional[float]:
         """
@@ -73,12 +78,26 @@ class VPINCalculator:
                 self.current_bucket_buy_volume - self.current_bucket_sell_volume
             )
             
+            if len(self.buckets) == self.num_buckets:
+                evicted = self.buckets[0]
+                self.total_imbalance -= evicted['imbalance']
+                self.total_volume -= evicted['total_volume']
+
             self.buckets.append({
                 'total_volume': self.current_bucket_volume,
                 'buy_volume': self.current_bucket_buy_volume,
                 'sell_volume': self.current_bucket_sell_volume,
                 'imbalance': bucket_imbalance
             })
+            self.total_imbalance += bucket_imbalance
+            self.total_volume += self.current_bucket_volume
+
+            # Exact resync once per full window keeps float drift bounded
+            self._buckets_since_resync += 1
+            if self._buckets_since_resync >= self.num_buckets:
+                self.total_imbalance = float(sum(b['imbalance'] for b in self.buckets))
+                self.total_volume = float(sum(b['total_volume'] for b in self.buckets))
+                self._buckets_since_resync = 0
             
             self.current_bucket_volume = 0
             self.current_bucket_buy_volume = 0
@@ -89,23 +108,38 @@ class VPINCalculator:
         
         return None
     
+    def add_trades(self, volumes: np.ndarray, trade_directions: np.ndarray) -> float:
+        """
+        Stream a batch of trades, each ingested exactly once.
+
+        Args:
+            volumes: Array of trade volumes
+            trade_directions: Array of 1 (buy), -1 (sell) or 0 (unclassified)
+
+        Returns:
+            Current VPIN after the batch
+        """
+        for volume, direction in zip(np.asarray(volumes, dtype=float).tolist(),
+                                     np.asarray(trade_directions).tolist()):
+            self.add_trade(volume, direction)
+        return self.get_current_vpin()
+
     def _calculate_vpin(self) -> float:
         """
         Calculate VPIN from accumulated buckets.
-        
+
+        Uses running totals maintained in add_trade, so this is O(1).
+
         Returns:
             VPIN value between 0 and 1
         """
         if len(self.buckets) == 0:
             return 0
         
-        total_imbalance = sum(bucket['imbalance'] for bucket in self.buckets)
-        total_volume = sum(bucket['total_volume'] for bucket in self.buckets)
-        
-        if total_volume == 0:
+        if self.total_volume == 0:
             return 0
         
-        vpin = total_imbalance / total_volume
+        vpin = self.total_imbalance / self.total_volume
         return vpin
     
     def get_current_vpin(self) -> float:
@@ -126,6 +160,91 @@ class VPINCalculator:
         self.current_bucket_volume = 0
         self.current_bucket_buy_volume = 0
         self.current_bucket_sell_volume = 0
+        self.total_imbalance = 0.0
+        self.total_volume = 0.0
+        self._buckets_since_resync = 0
+
+
+def calculate_vpin_series(volumes: np.ndarray,
+                          trade_directions: np.ndarray,
+                          bucket_size: int = 50000,
+                          num_buckets: int = 50) -> np.ndarray:
+    """
+    Compute the full VPIN series from arrays in one vectorized pass.
+
+    Reproduces VPINCalculator streaming semantics exactly: unclassified
+    trades (direction 0) are skipped, a bucket closes on the first trade
+    that takes its volume to >= bucket_size (no overflow carry), and VPIN
+    is the sum of |buy - sell| over the last num_buckets completed buckets
+    divided by their volume.
+
+    Args:
+        volumes: Array of trade (or bar) volumes
+        trade_directions: Array of 1 (buy), -1 (sell) or 0 (unclassified)
+        bucket_size: Volume threshold for each bucket
+        num_buckets: Number of buckets in the rolling window
+
+    Returns:
+        Array with get_current_vpin() as seen after each trade
+    """
+    volumes = np.asarray(volumes, dtype=float)
+    directions = np.asarray(trade_directions)
+    n = len(volumes)
+
+    if n == 0:
+        return np.zeros(0)
+
+    classified = directions != 0
+    effective = np.where(classified, volumes, 0.0)
+    buy = np.where(directions > 0, volumes, 0.0)
+
+    cum_volume = np.cumsum(effective)
+    cum_buy = np.cumsum(buy)
+
+    # Bucket boundaries: each search is O(log n), one iteration per bucket
+    close_indices = []
+    base = 0.0
+    start = 0
+    while start < n:
+        idx = int(np.searchsorted(cum_volume, base + bucket_size, side='left'))
+        # Skip past unclassified trades that cannot close a bucket
+        while idx < n and not classified[idx]:
+            idx += 1
+        if idx >= n:
+            break
+        close_indices.append(idx)
+        base = cum_volume[idx]
+        start = idx + 1
+
+    vpin = np.zeros(n)
+    if not close_indices:
+        return vpin
+
+    close_indices = np.asarray(close_indices)
+    bucket_cum_volume = np.concatenate(([0.0], cum_volume[close_indices]))
+    bucket_cum_buy = np.concatenate(([0.0], cum_buy[close_indices]))
+
+    bucket_volume = np.diff(bucket_cum_volume)
+    bucket_buy = np.diff(bucket_cum_buy)
+    bucket_imbalance = np.abs(2.0 * bucket_buy - bucket_volume)
+
+    # Rolling sums over the last num_buckets completed buckets
+    cum_imbalance = np.concatenate(([0.0], np.cumsum(bucket_imbalance)))
+    cum_bucket_volume = np.concatenate(([0.0], np.cumsum(bucket_volume)))
+    completed = np.arange(1, len(close_indices) + 1)
+    first = np.maximum(completed - num_buckets, 0)
+    window_imbalance = cum_imbalance[completed] - cum_imbalance[first]
+    window_volume = cum_bucket_volume[completed] - cum_bucket_volume[first]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        bucket_vpin = np.where(window_volume > 0, window_imbalance / window_volume, 0.0)
+
+    # Map each trade to the number of buckets completed at or before it
+    completed_at = np.searchsorted(close_indices, np.arange(n), side='right')
+    has_bucket = completed_at > 0
+    vpin[has_bucket] = bucket_vpin[completed_at[has_bucket] - 1]
+
+    return vpin
 
 
 def calculate_signed_volume(prices: pd.Series, volumes: pd.Series) -> pd.Series:
@@ -0,0 +1,196 @@
+"""
+Rolling Feature State - O(1) per-bar feature accumulators
+
+Stateful per-symbol replacement for re-slicing a lookback window every bar.
+Each bar is pushed exactly once; ATR, OFI, CVD and the bar-imbalance
+fallback for VPIN are maintained as windowed running sums.
+
+Equivalence:
+- atr == calculate_atr(high, low, close, period).iloc[-1]
+  (calculate_atr is a simple rolling mean of true range, so the state keeps
+  a windowed true-range sum rather than an EMA)
+- ofi == calculate_ofi(bars, window_size).iloc[-1]
+- cvd == calculate_cumulative_volume_delta(calculate_signed_volume(...)).iloc[-1]
+
+Running sums are re-synchronized exactly (math.fsum) once per window of
+pushes, which keeps floating-point drift bounded at amortized O(1) cost.
+"""
+
+import math
+from collections import deque
+from typing import Optional
+
+
+class RollingSum:
+    """Windowed sum with O(1) updates and NaN tracking."""
+
+    def __init__(self, window: int):
+        """
+        Initialize rolling sum.
+
+        Args:
+            window: Number of most recent values kept in the sum
+        """
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.total = 0.0
+        self.nan_count = 0
+        self._pushes_since_resync = 0
+
+    def push(self, value: float):
+        """Add a value, evicting the oldest one once the window is full."""
+        if len(self.values) == self.window:
+            oldest = self.values[0]
+            if oldest != oldest:
+                self.nan_count -= 1
+            else:
+                self.total -= oldest
+
+        self.values.append(value)
+        if value != value:
+            self.nan_count += 1
+        else:
+            self.total += value
+
+        self._pushes_since_resync += 1
+        if self._pushes_since_resync >= self.window:
+            self.total = math.fsum(v for v in self.values if v == v)
+            self._pushes_since_resync = 0
+
+    @property
+    def is_full(self) -> bool:
+        return len(self.values) == self.window
+
+    def sum(self, skipna: bool = False) -> float:
+        """
+        Current windowed sum.
+
+        Args:
+            skipna: Ignore NaN values (pandas min_periods=1 semantics).
+                When False, any NaN in the window yields NaN.
+        """
+        if self.nan_count and not skipna:
+            return float('nan')
+        return self.total
+
+    def clear(self):
+        self.values.clear()
+        self.total = 0.0
+        self.nan_count = 0
+        self._pushes_since_resync = 0
+
+
+class RollingFeatureState:
+    """
+    Per-symbol incremental feature accumulator.
+
+    Usage:
+        state = RollingFeatureState()
+        for bar in bars:
+            state.push(bar.open, bar.high, bar.low, bar.close, bar.volume)
+            atr, ofi, cvd = state.atr, state.ofi, state.cvd
+    """
+
+    def __init__(self,
+                 atr_period: int = 14,
+                 flow_window: int = 20,
+                 imbalance_window: int = 100):
+        """
+        Initialize feature state.
+
+        Args:
+            atr_period: ATR rolling period (calculate_atr period)
+            flow_window: OFI and CVD window (calculate_ofi window_size / CVD window)
+            imbalance_window: Window for buy/sell bar-volume imbalance
+        """
+        self.atr_period = atr_period
+        self.flow_window = flow_window
+        self.imbalance_window = imbalance_window
+
+        self.true_range = RollingSum(atr_period)
+        self.tick_signed_volume = RollingSum(flow_window)
+        self.flow_volume = RollingSum(flow_window)
+        self.delta_volume = RollingSum(flow_window)
+        self.buy_volume = RollingSum(imbalance_window)
+        self.sell_volume = RollingSum(imbalance_window)
+
+        self.prev_close: Optional[float] = None
+        self.bars_pushed = 0
+
+    def push(self, open_: float, high: float, low: float, close: float, volume: float):
+        """Ingest one bar. O(1) amortized."""
+        prev_close = self.prev_close
+        has_prev = prev_close is not None and prev_close == prev_close
+
+        # True range (pandas max(axis=1) skips NaN components)
+        components = [high - low]
+        if has_prev:
+            components.append(abs(high - prev_close))
+            components.append(abs(low - prev_close))
+        components = [c for c in components if c == c]
+        self.true_range.push(max(components) if components else float('nan'))
+
+        # OFI: tick rule against bar midpoint
+        diff = close - (high + low) / 2.0
+        if diff != diff:
+            direction = float('nan')
+        else:
+            direction = 1.0 if diff > 0 else (-1.0 if diff < 0 else 0.0)
+        self.tick_signed_volume.push(volume * direction)
+        self.flow_volume.push(volume)
+
+        # CVD: close-to-close sign; no previous close keeps +volume
+        change = close - prev_close if has_prev else float('nan')
+        if change < 0:
+            signed = -volume
+        elif change == 0:
+            signed = 0.0
+        else:
+            signed = volume
+        self.delta_volume.push(signed)
+
+        # Bar imbalance (close vs open)
+        self.buy_volume.push(volume if close > open_ else 0.0)
+        self.sell_volume.push(volume if close <= open_ else 0.0)
+
+        self.prev_close = close
+        self.bars_pushed += 1
+
+    @property
+    def atr(self) -> float:
+        """Rolling mean true range (NaN until atr_period bars)."""
+        if not self.true_range.is_full:
+            return float('nan')
+        return self.true_range.sum() / self.atr_period
+
+    @property
+    def ofi(self) -> float:
+        """Normalized order flow imbalance in [-1, 1]."""
+        total_volume = self.flow_volume.sum(skipna=True)
+        total_volume_safe = total_volume if total_volume > 1e-6 else 1e-6
+        return self.tick_signed_volume.sum(skipna=True) / total_volume_safe
+
+    @property
+    def cvd(self) -> float:
+        """Cumulative volume delta over flow_window (NaN until full)."""
+        if not self.delta_volume.is_full:
+            return float('nan')
+        return self.delta_volume.sum()
+
+    @property
+    def bar_imbalance(self) -> float:
+        """|buy - sell| / total bar volume, 0.5 when no volume."""
+        buy = self.buy_volume.sum(skipna=True)
+        sell = self.sell_volume.sum(skipna=True)
+        total = buy + sell
+        if total > 0:
+            return abs(buy - sell) / total
+        return 0.5
+
+    def reset(self):
+        """Reset accumulator state."""
+        for acc in (self.true_range, self.tick_signed_volume, self.flow_volume,
+                    self.delta_volume, self.buy_volume, self.sell_volume):
+            acc.clear()
+        self.prev_close = None
+        self.bars_pushed = 0
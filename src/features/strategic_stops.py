@@ -33,9 +33,11 @@ Version: 2.0 - Wick Liquidity Sweep Integration
 
 import numpy as np
 import pandas as pd
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 import logging
 
+from .liquidity_index import LiquidityIndex, LiquidityIndexStore
+
 logger = logging.getLogger(__name__)
 
 
@@ -46,7 +48,9 @@ def calculate_strategic_stop(
     features: Dict,
     atr_fallback: float,
     buffer_multiplier: float = 1.2,
-    mtf_data: Optional[Dict[str, pd.DataFrame]] = None
+    mtf_data: Optional[Dict[str, pd.DataFrame]] = None,
+    symbol: Optional[str] = None,
+    liquidity_store: Optional[LiquidityIndexStore] = None
 ) -> Tuple[float, str]:
     """
     Calculate strategic stop loss using structure and liquidity sweeps.
@@ -59,13 +63,19 @@ def calculate_strategic_stop(
         atr_fallback: ATR value for fallback calculation
         buffer_multiplier: Buffer beyond structure (typically 1.2 = 20%)
         mtf_data: Optional dict of multi-timeframe data {'M5': df, 'M15': df, 'H1': df}
+        symbol: Symbol name (key for liquidity_store)
+        liquidity_store: Optional per-(symbol, timeframe) LiquidityIndex cache;
+                         without it the indexes are built for this call only
 
     Returns:
         Tuple of (stop_loss_price, stop_type)
         stop_type: 'WICK_SWEEP' | 'ORDER_BLOCK' | 'FVG' | 'SWING' | 'ATR_FALLBACK'
     """
     # Priority 1: WICK LIQUIDITY SWEEP (BEST - where institutions hunted stops)
-    wick_stop = _find_wick_liquidity_sweep(direction, entry_price, market_data, mtf_data, atr_fallback, buffer_multiplier)
+    wick_indexes = _liquidity_indexes(market_data, mtf_data, ['M5', 'M15', 'H1', 'H4'],
+                                      symbol, liquidity_store)
+    wick_stop = _find_wick_liquidity_sweep(direction, entry_price, market_data, mtf_data,
+                                           atr_fallback, buffer_multiplier, wick_indexes)
     if wick_stop is not None:
         return wick_stop, 'WICK_SWEEP'
 
@@ -89,10 +99,40 @@ def calculate_strategic_stop(
     return atr_stop, 'ATR_FALLBACK'
 
 
+def _liquidity_indexes(market_data: pd.DataFrame,
+                       mtf_data: Optional[Dict[str, pd.DataFrame]],
+                       timeframes: List[str],
+                       symbol: Optional[str],
+                       liquidity_store: Optional[LiquidityIndexStore]) -> List[LiquidityIndex]:
+    """
+    LiquidityIndex for the current timeframe plus each available MTF frame, in check order.
+
+    With a store and symbol, indexes persist across calls and are only
+    rebuilt when their bars change.
+    """
+    frames = [('BASE', market_data)]
+
+    if mtf_data:
+        for tf_name in timeframes:
+            if tf_name in mtf_data and mtf_data[tf_name] is not None:
+                frames.append((tf_name, mtf_data[tf_name]))
+
+    if liquidity_store is not None and symbol is not None:
+        return [liquidity_store.get(symbol, tf_name, tf_data) for tf_name, tf_data in frames]
+
+    indexes = []
+    for tf_name, tf_data in frames:
+        index = LiquidityIndex(tf_name)
+        index.update(tf_data)
+        indexes.append(index)
+    return indexes
+
+
 def _find_wick_liquidity_sweep(direction: str, entry_price: float,
                                market_data: pd.DataFrame,
                                mtf_data: Optional[Dict[str, pd.DataFrame]],
-                               atr: float, buffer: float) -> Optional[float]:
+                               atr: float, buffer: float,
+                               liquidity_indexes: Optional[List[LiquidityIndex]] = None) -> Optional[float]:
     """
     Find liquidity sweep wicks for optimal stop placement.
 
@@ -106,6 +146,9 @@ def _find_wick_liquidity_sweep(direction: str, entry_price: float,
     3. Check multiple timeframes (M5, M15, H1) for strongest sweeps
     4. Place stop BEYOND the wick (institutions won't let it get hit)
 
+    Sweeps are precomputed per timeframe in LiquidityIndex (last 50 bars,
+    10-bar context); here only the entry-side lookup runs.
+
     Args:
         direction: 'LONG' or 'SHORT'
         entry_price: Current entry price
@@ -113,80 +156,24 @@ def _find_wick_liquidity_sweep(direction: str, entry_price: float,
         mtf_data: Multi-timeframe data (optional but recommended)
         atr: ATR for buffer calculation
         buffer: Buffer multiplier
+        liquidity_indexes: Prebuilt indexes (current TF, M5, M15, H1, H4)
 
     Returns:
         Stop loss price if wick sweep found, None otherwise
     """
-    # Combine current timeframe + MTF data for analysis
-    timeframes_to_check = [market_data]  # Always check current TF
-
-    if mtf_data:
-        # Check higher timeframes (more significant sweeps)
-        for tf_name in ['M5', 'M15', 'H1', 'H4']:
-            if tf_name in mtf_data and mtf_data[tf_name] is not None:
-                timeframes_to_check.append(mtf_data[tf_name])
+    if liquidity_indexes is None:
+        liquidity_indexes = _liquidity_indexes(market_data, mtf_data, ['M5', 'M15', 'H1', 'H4'],
+                                               None, None)
 
     best_wick_level = None
     best_wick_significance = 0.0
 
-    for tf_data in timeframes_to_check:
-        if len(tf_data) < 20:
-            continue
-
-        # Look back 50 bars for liquidity sweeps
-        lookback = min(50, len(tf_data))
-        recent_bars = tf_data.tail(lookback).copy()
-
-        # Detect liquidity sweeps
-        for i in range(10, len(recent_bars)):
-            current_bar = recent_bars.iloc[i]
-            previous_bars = recent_bars.iloc[max(0, i-10):i]
-
-            if direction == 'LONG':
-                # For LONG: Find DOWNWARD liquidity sweeps (wick below previous lows)
-                prev_low = previous_bars['low'].min()
-
-                # Check if wick swept below previous low
-                wick_swept_low = current_bar['low'] < prev_low
-                closed_above = current_bar['close'] > prev_low  # Reversal confirmation
-
-                if wick_swept_low and closed_above:
-                    wick_low = current_bar['low']
-
-                    # Check if this wick is below our entry (valid for stop placement)
-                    if wick_low < entry_price:
-                        # Calculate significance (how far below prev low)
-                        sweep_distance = prev_low - wick_low
-                        wick_size = current_bar['high'] - current_bar['low']
-
-                        # Strong sweep = significant distance + large wick
-                        significance = sweep_distance / (atr + 1e-10) * (wick_size / atr)
-
-                        if significance > best_wick_significance:
-                            best_wick_significance = significance
-                            best_wick_level = wick_low
-
-            else:  # SHORT
-                # For SHORT: Find UPWARD liquidity sweeps (wick above previous highs)
-                prev_high = previous_bars['high'].max()
-
-                # Check if wick swept above previous high
-                wick_swept_high = current_bar['high'] > prev_high
-                closed_below = current_bar['close'] < prev_high  # Reversal confirmation
-
-                if wick_swept_high and closed_below:
-                    wick_high = current_bar['high']
+    for index in liquidity_indexes:
+        wick_level, significance = index.best_wick_sweep(direction, entry_price, atr)
 
-                    # Check if this wick is above our entry (valid for stop placement)
-                    if wick_high > entry_price:
-                        sweep_distance = wick_high - prev_high
-                        wick_size = current_bar['high'] - current_bar['low']
-
-                        significance = sweep_distance / (atr + 1e-10) * (wick_size / atr)
-
-                        if significance > best_wick_significance:
-                            best_wick_significance = significance
-                            best_wick_level = wick_high
+        if wick_level is not None and significance > best_wick_significance:
+            best_wick_significance = significance
+            best_wick_level = wick_level
 
     # If we found a significant wick sweep (significance > 1.5)
     if best_wick_level is not None and best_wick_significance > 1.5:
@@ -360,7 +347,9 @@ def calculate_strategic_target(
     market_data: pd.DataFrame,
     features: Dict,
     default_rr: float = 3.0,
-    mtf_data: Optional[Dict[str, pd.DataFrame]] = None
+    mtf_data: Optional[Dict[str, pd.DataFrame]] = None,
+    symbol: Optional[str] = None,
+    liquidity_store: Optional[LiquidityIndexStore] = None
 ) -> Tuple[float, str]:
     """
     Calculate strategic take profit using structure and liquidity analysis.
@@ -383,6 +372,8 @@ def calculate_strategic_target(
         features: Dict containing structure data
         default_rr: Default risk:reward ratio if no structure found
         mtf_data: Optional multi-timeframe data for better liquidity detection
+        symbol: Symbol name (key for liquidity_store)
+        liquidity_store: Optional per-(symbol, timeframe) LiquidityIndex cache
 
     Returns:
         Tuple of (take_profit_price, target_type)
@@ -391,7 +382,10 @@ def calculate_strategic_target(
     risk = abs(entry_price - stop_loss)
 
     # Priority 1: UNTAKEN LIQUIDITY (equal highs/lows, liquidity pools)
-    liq_target = _find_untaken_liquidity_target(direction, entry_price, market_data, mtf_data, risk)
+    liq_indexes = _liquidity_indexes(market_data, mtf_data, ['M15', 'H1', 'H4'],
+                                     symbol, liquidity_store)
+    liq_target = _find_untaken_liquidity_target(direction, entry_price, market_data, mtf_data,
+                                                risk, liq_indexes)
     if liq_target is not None:
         return liq_target, 'UNTAKEN_LIQ'
 
@@ -428,7 +422,8 @@ def calculate_strategic_target(
 def _find_untaken_liquidity_target(direction: str, entry_price: float,
                                    market_data: pd.DataFrame,
                                    mtf_data: Optional[Dict[str, pd.DataFrame]],
-                                   risk: float) -> Optional[float]:
+                                   risk: float,
+                                   liquidity_indexes: Optional[List[LiquidityIndex]] = None) -> Optional[float]:
     """
     Find untaken liquidity for target placement.
 
@@ -439,96 +434,34 @@ def _find_untaken_liquidity_target(direction: str, entry_price: float,
 
     These are magnets for price - institutions target resting stop losses.
 
+    Equal-level counts (5 pip tolerance) and taken flags over the last
+    100 bars are precomputed per timeframe in LiquidityIndex.
+
     Args:
         direction: 'LONG' or 'SHORT'
         entry_price: Current entry price
         market_data: Current timeframe data
         mtf_data: Multi-timeframe data (optional but better)
         risk: Risk amount (for minimum distance check)
+        liquidity_indexes: Prebuilt indexes (current TF, M15, H1, H4)
 
     Returns:
         Target price if untaken liquidity found, None otherwise
     """
-    # Combine current + MTF data for better detection
-    timeframes_to_check = [market_data]
-
-    if mtf_data:
-        for tf_name in ['M15', 'H1', 'H4']:
-            if tf_name in mtf_data and mtf_data[tf_name] is not None:
-                timeframes_to_check.append(mtf_data[tf_name])
+    if liquidity_indexes is None:
+        liquidity_indexes = _liquidity_indexes(market_data, mtf_data, ['M15', 'H1', 'H4'],
+                                               None, None)
 
     best_liquidity_level = None
     best_liquidity_strength = 0.0
 
-    for tf_data in timeframes_to_check:
-        if len(tf_data) < 20:
-            continue
-
-        lookback = min(100, len(tf_data))
-        recent_data = tf_data.tail(lookback)
-
-        if direction == 'LONG':
-            # Find UNTAKEN HIGHS above entry (resistance liquidity)
-            highs = recent_data['high'].values
-
-            # Detect equal highs (within 5 pips tolerance)
-            pip_tolerance = 0.0005  # 5 pips for most pairs
-
-            for i in range(len(highs) - 1):
-                current_high = highs[i]
-
-                # Must be above entry price
-                if current_high <= entry_price:
-                    continue
-
-                # Must be at least 1R above entry (worth targeting)
-                if current_high < entry_price + risk:
-                    continue
-
-                # Count how many equal highs at this level
-                equal_highs = sum(1 for h in highs if abs(h - current_high) < pip_tolerance)
-
-                # Check if liquidity was taken (did price go through this level?)
-                was_taken = any(low < current_high - pip_tolerance for low in recent_data['low'].values[i+1:])
-
-                # If liquidity NOT taken AND multiple equal highs = strong target
-                if not was_taken and equal_highs >= 2:
-                    strength = equal_highs  # More equals = stronger liquidity
-
-                    if strength > best_liquidity_strength:
-                        best_liquidity_strength = strength
-                        best_liquidity_level = current_high
-
-        else:  # SHORT
-            # Find UNTAKEN LOWS below entry (support liquidity)
-            lows = recent_data['low'].values
-
-            pip_tolerance = 0.0005
-
-            for i in range(len(lows) - 1):
-                current_low = lows[i]
-
-                # Must be below entry price
-                if current_low >= entry_price:
-                    continue
-
-                # Must be at least 1R below entry
-                if current_low > entry_price - risk:
-                    continue
-
-                # Count equal lows
-                equal_lows = sum(1 for l in lows if abs(l - current_low) < pip_tolerance)
-
-                # Check if taken
-                was_taken = any(high > current_low + pip_tolerance for high in recent_data['high'].values[i+1:])
-
-                # If NOT taken AND multiple equals = strong target
-                if not was_taken and equal_lows >= 2:
-                    strength = equal_lows
+    for index in liquidity_indexes:
+        # Untaken pool with most equals, at least 1R beyond entry
+        liquidity_level, strength = index.best_untaken_liquidity(direction, entry_price, risk)
 
-                    if strength > best_liquidity_strength:
-                        best_liquidity_strength = strength
-                        best_liquidity_level = current_low
+        if liquidity_level is not None and strength > best_liquidity_strength:
+            best_liquidity_strength = strength
+            best_liquidity_level = liquidity_level
 
     # If found strong untaken liquidity (2+ equals)
     if best_liquidity_level is not None and best_liquidity_strength >= 2:
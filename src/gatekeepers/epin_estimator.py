@@ -86,8 +86,9 @@ class ePINEstimator:
         self.current_bucket_sell = 0.0
         self.current_bucket_total = 0.0
 
-        # Para ePIN simple
+        # Para ePIN simple (suma de direcciones = buys - sells en la ventana)
         self.trade_directions = deque(maxlen=epin_window)
+        self.direction_sum = 0
 
         # Valores actuales
         self.current_vpin = None
@@ -139,7 +140,10 @@ class ePINEstimator:
         self.trades_observed += 1
 
         # Actualizar ePIN simple
+        if len(self.trade_directions) == self.trade_directions.maxlen:
+            self.direction_sum -= self.trade_directions[0]
         self.trade_directions.append(direction)
+        self.direction_sum += direction
         self._update_epin()
         
         # Actualizar VPIN con volume buckets
@@ -172,20 +176,14 @@ class ePINEstimator:
         ePIN = |Buys - Sells| / Total Trades
         
         Aproximación simple del PIN completo que no requiere MLE.
+        O(1): direcciones son ±1, así que Buys - Sells = direction_sum.
         """
-        if len(self.trade_directions) < 20:
+        n_total = len(self.trade_directions)
+        if n_total < 20:
             return
         
-        directions = np.array(self.trade_directions)
-        
-        n_buys = np.sum(directions == 1)
-        n_sells = np.sum(directions == -1)
-        n_total = len(directions)
-        
         # ePIN = order imbalance absoluto
-        self.current_epin = abs(n_buys - n_sells) / n_total
-        
-        self.logger.debug(f"ePIN actualizado: {self.current_epin:.4f}")
+        self.current_epin = abs(self.direction_sum) / n_total
     
     def _update_vpin(self) -> None:
         """
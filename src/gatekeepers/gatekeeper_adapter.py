@@ -8,18 +8,21 @@ gatekeepers, y proporcionar una interface limpia para consultas.
 
 Filosofía de diseño:
 - Single source of truth: Los gatekeepers reciben todos los ticks
-- Thread-safe: Puede ser llamado desde múltiples estrategias simultáneamente
+- Por símbolo: cada símbolo tiene sus propios Kyle's Lambda, ePIN y
+  Spread Monitor, y su propio tick previo
+- Thread-safe: Locks repartidos en shards por símbolo; símbolos de
+  shards distintos se procesan en paralelo
 - Fail-safe: Si hay error, asume condiciones adversas
 - Stateful: Mantiene historia completa de decisiones para análisis
 
 Author: Sistema de Trading Institucional
 Date: 2025-11-06
-Version: 1.0
+Version: 1.1
 """
 
 import numpy as np
 import pandas as pd
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import logging
 from collections import deque
@@ -28,28 +31,34 @@ import threading
 from gatekeepers.gatekeeper_integrator import GatekeeperIntegrator
 
 
-class GatekeeperAdapter:
+# Severidad de regímenes (para agregar varios símbolos)
+REGIME_SEVERITY = {'GREEN': 0, 'YELLOW': 1, 'RED': 2}
+
+
+class SymbolGatekeeper:
     """
-    Adaptador entre motor de trading MT5 y sistema de gatekeepers.
+    Gatekeepers de un único símbolo.
     
-    Este adaptador traduce entre dos mundos:
-    1. Motor MT5: Opera con ticks en formato OHLCV
-    2. Gatekeepers: Operan con prices, volumes, bid/ask individuales
+    Mantiene un GatekeeperIntegrator propio (Kyle's Lambda, ePIN y
+    Spread Monitor independientes) y el tick previo de ESTE símbolo,
+    de modo que los ticks de un par no contaminan las estimaciones de otro.
     
-    También mantiene un buffer de decisiones históricas para debugging
-    y análisis post-mortem de por qué se tomaron ciertas decisiones.
+    El lock es el del shard asignado por el adaptador; debe tomarse
+    antes de llamar a update()/update_batch().
     """
     
-    def __init__(self, config: Optional[Dict] = None):
+    def __init__(self, symbol: str, config: Dict, lock: threading.Lock):
         """
-        Inicializa el adaptador con configuración opcional.
+        Inicializa los gatekeepers del símbolo.
         
         Args:
+            symbol: Símbolo
             config: Configuración para los gatekeepers subyacentes
+            lock: Lock del shard al que pertenece el símbolo
         """
-        config = config or {}
+        self.symbol = symbol
+        self.lock = lock
         
-        # Inicializar el integrador de gatekeepers
         self.integrator = GatekeeperIntegrator(
             kyle_config=config.get('kyle', {}),
             epin_config=config.get('epin', {}),
@@ -61,24 +70,179 @@ class GatekeeperAdapter:
         self.prev_mid = None
         self.prev_timestamp = None
         
+        self.ticks_processed = 0
+    
+    def update(self, bid: float, ask: float, last: float,
+               volume: float, timestamp) -> bool:
+        """
+        Actualiza gatekeepers con un tick.
+        
+        Returns:
+            False si el tick solo estableció el estado inicial
+        """
+        current_mid = (bid + ask) / 2
+        
+        # Para el primer tick, inicializar estado previo
+        if self.prev_price is None:
+            self.prev_price = last
+            self.prev_mid = current_mid
+            self.prev_timestamp = timestamp
+            return False
+        
+        self.integrator.update_all(
+            trade_price=last,
+            prev_price=self.prev_price,
+            volume=volume,
+            bid=bid,
+            ask=ask,
+            prev_mid=self.prev_mid
+        )
+        
+        self.prev_price = last
+        self.prev_mid = current_mid
+        self.prev_timestamp = timestamp
+        self.ticks_processed += 1
+        return True
+    
+    def update_batch(self, bid: np.ndarray, ask: np.ndarray, last: np.ndarray,
+                     volume: np.ndarray, timestamps: Optional[np.ndarray] = None) -> int:
+        """
+        Actualiza gatekeepers con ticks en orden cronológico.
+        
+        Mismo resultado que llamar update() tick a tick; el mid y las
+        conversiones se hacen vectorizadas y los estimadores se llaman
+        directamente (sin pasar por el integrador).
+        
+        Returns:
+            Número de ticks que actualizaron los gatekeepers
+        """
+        n = len(bid)
+        if n == 0:
+            return 0
+        
+        mid = (bid + ask) / 2
+        start = 0
+        
+        if self.prev_price is None:
+            self.prev_price = float(last[0])
+            self.prev_mid = float(mid[0])
+            start = 1
+        
+        kyle = self.integrator.kyle
+        epin = self.integrator.epin
+        spread = self.integrator.spread
+        
+        prev_price = self.prev_price
+        prev_mid = self.prev_mid
+        
+        for bid_i, ask_i, last_i, volume_i, mid_i in zip(
+            bid[start:].tolist(), ask[start:].tolist(), last[start:].tolist(),
+            volume[start:].tolist(), mid[start:].tolist()
+        ):
+            kyle.update(
+                current_price=last_i,
+                prev_price=prev_price,
+                volume=volume_i,
+                mid_price=mid_i,
+                prev_mid=prev_mid
+            )
+            epin.update(price=last_i, volume=volume_i, prev_mid=prev_mid)
+            spread.update_quoted(bid_i, ask_i)
+            
+            prev_price = last_i
+            prev_mid = mid_i
+        
+        self.prev_price = prev_price
+        self.prev_mid = prev_mid
+        if timestamps is not None:
+            self.prev_timestamp = timestamps[-1]
+        
+        updated = n - start
+        self.ticks_processed += updated
+        return updated
+
+
+class GatekeeperAdapter:
+    """
+    Adaptador entre motor de trading MT5 y sistema de gatekeepers.
+    
+    Este adaptador traduce entre dos mundos:
+    1. Motor MT5: Opera con ticks en formato OHLCV
+    2. Gatekeepers: Operan con prices, volumes, bid/ask individuales
+    
+    Cada símbolo tiene su SymbolGatekeeper (registro creado bajo demanda).
+    Los símbolos se reparten en `lock_shards` locks: dos símbolos solo
+    se serializan si caen en el mismo shard.
+    
+    También mantiene un buffer de decisiones históricas para debugging
+    y análisis post-mortem de por qué se tomaron ciertas decisiones.
+    """
+    
+    def __init__(self, config: Optional[Dict] = None,
+                 symbols: Optional[List[str]] = None,
+                 lock_shards: int = 16):
+        """
+        Inicializa el adaptador con configuración opcional.
+        
+        Args:
+            config: Configuración para los gatekeepers subyacentes
+            symbols: Símbolos a registrar de antemano (opcional)
+            lock_shards: Número de locks entre los que se reparten los símbolos
+        """
+        self.config = config or {}
+        
+        # Registro símbolo -> gatekeepers
+        self.gatekeepers: Dict[str, SymbolGatekeeper] = {}
+        self._registry_lock = threading.Lock()
+        self._shard_locks = [threading.Lock() for _ in range(max(1, lock_shards))]
+        
         # Historia de decisiones (para debugging)
         # FIX BUG #13: Use deque with maxlen to prevent memory leak
         self.decision_history = deque(maxlen=1000)
         self.max_history_size = 1000
         
-        # Lock para thread safety
+        # Lock para historia y contadores de decisiones
         self.lock = threading.Lock()
         
-        # Contadores de estadísticas
+        # Contadores de estadísticas (ticks: por símbolo en SymbolGatekeeper)
         self.stats = {
-            'total_ticks_processed': 0,
             'total_trades_approved': 0,
             'total_trades_rejected': 0,
             'total_sizing_reductions': 0
         }
         
         self.logger = logging.getLogger(self.__class__.__name__)
-        self.logger.info("Gatekeeper Adapter inicializado")
+        
+        for symbol in symbols or []:
+            self.get_gatekeeper(symbol)
+        
+        self.logger.info(
+            f"Gatekeeper Adapter inicializado: {len(self.gatekeepers)} símbolos, "
+            f"{len(self._shard_locks)} lock shards"
+        )
+    
+    def get_gatekeeper(self, symbol: str) -> SymbolGatekeeper:
+        """
+        Retorna los gatekeepers del símbolo, creándolos si no existen.
+        
+        Args:
+            symbol: Símbolo
+            
+        Returns:
+            SymbolGatekeeper del símbolo
+        """
+        gatekeeper = self.gatekeepers.get(symbol)
+        if gatekeeper is not None:
+            return gatekeeper
+        
+        with self._registry_lock:
+            gatekeeper = self.gatekeepers.get(symbol)
+            if gatekeeper is None:
+                lock = self._shard_locks[hash(symbol) % len(self._shard_locks)]
+                gatekeeper = SymbolGatekeeper(symbol, self.config, lock)
+                self.gatekeepers[symbol] = gatekeeper
+                self.logger.info(f"Gatekeepers registrados para {symbol}")
+            return gatekeeper
     
     def process_tick(self, tick_data: Dict) -> None:
         """
@@ -93,61 +257,111 @@ class GatekeeperAdapter:
                 - symbol: str
                 - bid: float
                 - ask: float
-                - last: float (precio de última transacción)
+                - last: float (precio de última transacción; si falta o
+                  es 0, como en ticks FX de MT5, se usa el mid)
                 - volume: float (volumen del tick)
                 - time: datetime
         """
-        with self.lock:
+        symbol = tick_data.get('symbol', 'UNKNOWN')
+        gatekeeper = self.get_gatekeeper(symbol)
+        
+        with gatekeeper.lock:
             try:
-                # Extraer datos del tick
-                symbol = tick_data.get('symbol', 'UNKNOWN')
                 bid = tick_data['bid']
                 ask = tick_data['ask']
-                last = tick_data.get('last', (bid + ask) / 2)
+                last = tick_data.get('last') or (bid + ask) / 2
                 volume = tick_data.get('volume', 0.0)
                 timestamp = tick_data.get('time', datetime.now())
                 
-                current_mid = (bid + ask) / 2
-                
-                # Para el primer tick, inicializar estado previo
-                if self.prev_price is None:
-                    self.prev_price = last
-                    self.prev_mid = current_mid
-                    self.prev_timestamp = timestamp
+                if not gatekeeper.update(bid, ask, last, volume, timestamp):
                     self.logger.info(f"Estado inicial establecido para {symbol}")
                     return
                 
-                # Actualizar todos los gatekeepers
-                self.integrator.update_all(
-                    trade_price=last,
-                    prev_price=self.prev_price,
-                    volume=volume,
-                    bid=bid,
-                    ask=ask,
-                    prev_mid=self.prev_mid
-                )
-                
-                # Actualizar estado previo para próximo tick
-                self.prev_price = last
-                self.prev_mid = current_mid
-                self.prev_timestamp = timestamp
-                
-                # Incrementar contador
-                self.stats['total_ticks_processed'] += 1
-                
-                if self.stats['total_ticks_processed'] % 100 == 0:
+                if gatekeeper.ticks_processed % 100 == 0:
                     self.logger.debug(
-                        f"Procesados {self.stats['total_ticks_processed']} ticks"
+                        f"{symbol}: procesados {gatekeeper.ticks_processed} ticks"
                     )
                 
             except Exception as e:
                 self.logger.error(
-                    f"Error procesando tick: {str(e)}",
+                    f"Error procesando tick de {symbol}: {str(e)}",
                     exc_info=True
                 )
                 # En caso de error, no actualizar estado
                 # El sistema continuará con último estado conocido
     
+    def process_ticks(self, ticks, symbol: Optional[str] = None) -> int:
+        """
+        Procesa un lote de ticks (uno o varios símbolos).
+        
+        Cada símbolo toma su lock una sola vez por lote. El orden de los
+        ticks se respeta dentro de cada símbolo.
+        
+        Args:
+            ticks: Array estructurado (formato mt5.copy_ticks_*), DataFrame
+                   o lista de dicts con campos bid, ask y opcionalmente
+                   last, volume, time, symbol
+            symbol: Símbolo de todos los ticks si no traen campo 'symbol'
+            
+        Returns:
+            Número de ticks que actualizaron gatekeepers
+        """
+        if isinstance(ticks, list):
+            ticks = pd.DataFrame(ticks)
+        
+        if isinstance(ticks, pd.DataFrame):
+            fields = set(ticks.columns)
+        else:
+            ticks = np.asarray(ticks)
+            fields = set(ticks.dtype.names or ())
+        
+        if len(ticks) == 0:
+            return 0
+        
+        bid = np.asarray(ticks['bid'], dtype=np.float64)
+        ask = np.asarray(ticks['ask'], dtype=np.float64)
+        mid = (bid + ask) / 2
+        
+        if 'last' in fields:
+            last = np.asarray(ticks['last'], dtype=np.float64)
+            last = np.where(last > 0, last, mid)
+        else:
+            last = mid
+        
+        if 'volume' in fields:
+            volume = np.asarray(ticks['volume'], dtype=np.float64)
+        else:
+            volume = np.zeros(len(bid))
+        
+        timestamps = np.asarray(ticks['time']) if 'time' in fields else None
+        
+        if 'symbol' in fields:
+            symbols, codes = np.unique(np.asarray(ticks['symbol']), return_inverse=True)
+            groups = [(sym, np.flatnonzero(codes == code)) for code, sym in enumerate(symbols)]
+        else:
+            groups = [(symbol or 'UNKNOWN', None)]
+        
+        processed = 0
+        for group_symbol, rows in groups:
+            gatekeeper = self.get_gatekeeper(str(group_symbol))
+            
+            if rows is None:
+                columns = (bid, ask, last, volume, timestamps)
+            else:
+                columns = (bid[rows], ask[rows], last[rows], volume[rows],
+                           None if timestamps is None else timestamps[rows])
+            
+            with gatekeeper.lock:
+                try:
+                    processed += gatekeeper.update_batch(*columns)
+                except Exception as e:
+                    self.logger.error(
+                        f"Error procesando lote de ticks de {group_symbol}: {str(e)}",
+                        exc_info=True
+                    )
+        
+        return processed
+    
     def check_trade_permission(self, 
                               strategy_name: str,
                               direction: str,
@@ -157,7 +371,8 @@ class GatekeeperAdapter:
         Verifica si una estrategia tiene permiso para ejecutar un trade.
         
         Esta es la función principal que llaman las estrategias antes
-        de intentar ejecutar cualquier trade.
+        de intentar ejecutar cualquier trade. La decisión usa solo los
+        gatekeepers del símbolo solicitado.
         
         Args:
             strategy_name: Nombre de la estrategia solicitante
@@ -173,47 +388,48 @@ class GatekeeperAdapter:
             - regime: str ('GREEN', 'YELLOW', 'RED')
             - details: Dict (información detallada para logging)
         """
-        with self.lock:
-            try:
-                # Obtener decisión de gatekeepers
-                approval = self.integrator.check_trade_approval()
-                
-                # Calcular tamaño ajustado
-                sizing_multiplier = approval['sizing_multiplier']
-                adjusted_size = proposed_size * sizing_multiplier
-                
-                # Determinar si está permitido
-                permitted = approval['approved']
-                
-                # Construir razón descriptiva
-                if not permitted:
-                    reason = f"RECHAZADO: {approval['halt_reason']}"
-                elif sizing_multiplier < 1.0:
-                    reason = (
-                        f"APROBADO CON REDUCCIÓN: Sizing ajustado a "
-                        f"{sizing_multiplier:.0%} debido a: {', '.join(approval['warnings'])}"
-                    )
-                else:
-                    reason = "APROBADO: Condiciones normales de mercado"
-                
-                # Crear registro de decisión
-                decision_record = {
-                    'timestamp': datetime.now(),
-                    'strategy': strategy_name,
-                    'direction': direction,
-                    'symbol': symbol,
-                    'proposed_size': proposed_size,
-                    'adjusted_size': adjusted_size,
-                    'permitted': permitted,
-                    'regime': approval['regime'],
-                    'sizing_multiplier': sizing_multiplier,
-                    'reason': reason
-                }
-                
-                # Agregar a historia (limitar tamaño)
+        try:
+            gatekeeper = self.get_gatekeeper(symbol)
+            
+            # Obtener decisión de gatekeepers
+            with gatekeeper.lock:
+                approval = gatekeeper.integrator.check_trade_approval()
+            
+            # Calcular tamaño ajustado
+            sizing_multiplier = approval['sizing_multiplier']
+            adjusted_size = proposed_size * sizing_multiplier
+            
+            # Determinar si está permitido
+            permitted = approval['approved']
+            
+            # Construir razón descriptiva
+            if not permitted:
+                reason = f"RECHAZADO: {approval['halt_reason']}"
+            elif sizing_multiplier < 1.0:
+                reason = (
+                    f"APROBADO CON REDUCCIÓN: Sizing ajustado a "
+                    f"{sizing_multiplier:.0%} debido a: {', '.join(approval['warnings'])}"
+                )
+            else:
+                reason = "APROBADO: Condiciones normales de mercado"
+            
+            # Crear registro de decisión
+            decision_record = {
+                'timestamp': datetime.now(),
+                'strategy': strategy_name,
+                'direction': direction,
+                'symbol': symbol,
+                'proposed_size': proposed_size,
+                'adjusted_size': adjusted_size,
+                'permitted': permitted,
+                'regime': approval['regime'],
+                'sizing_multiplier': sizing_multiplier,
+                'reason': reason
+            }
+            
+            with self.lock:
+                # Agregar a historia (deque limita tamaño)
                 self.decision_history.append(decision_record)
-                if len(self.decision_history) > self.max_history_size:
-                    self.decision_history.pop(0)
                 
                 # Actualizar estadísticas
                 if permitted:
@@ -222,74 +438,111 @@ class GatekeeperAdapter:
                         self.stats['total_sizing_reductions'] += 1
                 else:
                     self.stats['total_trades_rejected'] += 1
-                
-                # Log la decisión
-                log_level = logging.INFO if permitted else logging.WARNING
-                self.logger.log(
-                    log_level,
-                    f"{strategy_name} - {symbol} {direction}: {reason}"
-                )
-                
-                # Retornar decisión completa
-                return {
-                    'permitted': permitted,
-                    'adjusted_size': adjusted_size,
-                    'reason': reason,
-                    'regime': approval['regime'],
-                    'details': {
-                        'sizing_multiplier': sizing_multiplier,
-                        'original_size': proposed_size,
-                        'warnings': approval['warnings'],
-                        'halt_reason': approval['halt_reason']
-                    }
-                }
-                
-            except Exception as e:
-                # En caso de error, adoptar postura conservadora
-                self.logger.error(
-                    f"Error en check_trade_permission: {str(e)}",
-                    exc_info=True
-                )
-                
-                return {
-                    'permitted': False,
-                    'adjusted_size': 0.0,
-                    'reason': f"ERROR EN GATEKEEPERS: {str(e)}",
-                    'regime': 'RED',
-                    'details': {'error': str(e)}
+            
+            # Log la decisión
+            log_level = logging.INFO if permitted else logging.WARNING
+            self.logger.log(
+                log_level,
+                f"{strategy_name} - {symbol} {direction}: {reason}"
+            )
+            
+            # Retornar decisión completa
+            return {
+                'permitted': permitted,
+                'adjusted_size': adjusted_size,
+                'reason': reason,
+                'regime': approval['regime'],
+                'details': {
+                    'sizing_multiplier': sizing_multiplier,
+                    'original_size': proposed_size,
+                    'warnings': approval['warnings'],
+                    'halt_reason': approval['halt_reason']
                 }
+            }
+            
+        except Exception as e:
+            # En caso de error, adoptar postura conservadora
+            self.logger.error(
+                f"Error en check_trade_permission: {str(e)}",
+                exc_info=True
+            )
+            
+            return {
+                'permitted': False,
+                'adjusted_size': 0.0,
+                'reason': f"ERROR EN GATEKEEPERS: {str(e)}",
+                'regime': 'RED',
+                'details': {'error': str(e)}
+            }
     
-    def get_current_regime(self) -> str:
+    def get_current_regime(self, symbol: Optional[str] = None) -> str:
         """
         Retorna el régimen actual del mercado sin hacer solicitud de trade.
         
         Útil para dashboard o monitoring.
         
+        Args:
+            symbol: Símbolo; si es None, el régimen más severo entre
+                    todos los símbolos registrados
+        
         Returns:
-            'GREEN', 'YELLOW', o 'RED'
+            'GREEN', 'YELLOW', o 'RED' ('RED' si no hay símbolos)
         """
-        with self.lock:
-            return self.integrator.get_market_regime()
+        if symbol is not None:
+            gatekeeper = self.get_gatekeeper(symbol)
+            with gatekeeper.lock:
+                return gatekeeper.integrator.get_market_regime()
+        
+        regimes = self.get_regimes()
+        if not regimes:
+            return 'RED'
+        return max(regimes.values(), key=REGIME_SEVERITY.__getitem__)
+    
+    def get_regimes(self) -> Dict[str, str]:
+        """
+        Retorna el régimen de cada símbolo registrado.
+        
+        Returns:
+            Dict símbolo -> 'GREEN' | 'YELLOW' | 'RED'
+        """
+        regimes = {}
+        for symbol, gatekeeper in list(self.gatekeepers.items()):
+            with gatekeeper.lock:
+                regimes[symbol] = gatekeeper.integrator.get_market_regime()
+        return regimes
     
-    def get_comprehensive_status(self) -> Dict:
+    def get_comprehensive_status(self, symbol: Optional[str] = None) -> Dict:
         """
-        Retorna status completo de todos los gatekeepers.
+        Retorna status completo de los gatekeepers.
         
         Incluye tanto el estado de los gatekeepers como las estadísticas
         del adaptador.
         
+        Args:
+            symbol: Símbolo; si es None, status de todos los símbolos
+        
         Returns:
             Dict comprehensivo con todo el estado del sistema
         """
+        if symbol is not None:
+            gatekeepers = {symbol: self.get_gatekeeper(symbol)}
+        else:
+            gatekeepers = dict(self.gatekeepers)
+        
+        gatekeeper_status = {}
+        for name, gatekeeper in gatekeepers.items():
+            with gatekeeper.lock:
+                gatekeeper_status[name] = gatekeeper.integrator.get_comprehensive_status()
+        
         with self.lock:
-            gatekeeper_status = self.integrator.get_comprehensive_status()
-            
-            return {
-                'gatekeepers': gatekeeper_status,
-                'adapter_stats': self.stats.copy(),
-                'current_regime': self.get_current_regime(),
-                'recent_decisions': self.decision_history[-10:] if self.decision_history else []
-            }
+            recent_decisions = list(self.decision_history)[-10:]
+        
+        return {
+            'gatekeepers': gatekeeper_status,
+            'adapter_stats': self.get_statistics_summary(),
+            'current_regime': self.get_current_regime(symbol),
+            'recent_decisions': recent_decisions
+        }
     
     def get_statistics_summary(self) -> Dict:
         """
@@ -298,6 +551,11 @@ class GatekeeperAdapter:
         Returns:
             Dict con contadores y ratios
         """
+        ticks_by_symbol = {
+            symbol: gatekeeper.ticks_processed
+            for symbol, gatekeeper in list(self.gatekeepers.items())
+        }
+        
         with self.lock:
             total_decisions = (
                 self.stats['total_trades_approved'] + 
@@ -317,7 +575,8 @@ class GatekeeperAdapter:
                 reduction_rate = 0.0
             
             return {
-                'ticks_processed': self.stats['total_ticks_processed'],
+                'ticks_processed': sum(ticks_by_symbol.values()),
+                'ticks_by_symbol': ticks_by_symbol,
                 'trades_approved': self.stats['total_trades_approved'],
                 'trades_rejected': self.stats['total_trades_rejected'],
                 'sizing_reductions': self.stats['total_sizing_reductions'],
@@ -27,6 +27,8 @@ from typing import Optional, Tuple, Dict
 from collections import deque
 import logging
 
+from gatekeepers.rolling_statistics import RollingCovariance, RollingMoments
+
 
 class KylesLambdaEstimator:
     """
@@ -79,8 +81,12 @@ class KylesLambdaEstimator:
         self.price_changes = deque(maxlen=estimation_window)
         self.signed_volumes = deque(maxlen=estimation_window)
 
+        # Co-momentos (SV, ΔP) de la ventana, solo observaciones con SV != 0
+        self._impact = RollingCovariance(estimation_window)
+
         # Historia de lambdas estimados
         self.lambda_history = deque(maxlen=historical_window)
+        self._lambda_moments = RollingMoments(historical_window)
 
         # Lambda actual
         self.current_lambda = None
@@ -147,9 +153,20 @@ class KylesLambdaEstimator:
         # Signed volume = dirección * volumen
         signed_volume = trade_direction * volume
         
-        # Agregar a buffers
+        # Agregar a buffers (retirando de la regresión la observación que sale)
+        if len(self.price_changes) == self.price_changes.maxlen:
+            evicted_sv = self.signed_volumes[0]
+            if evicted_sv != 0:
+                self._impact.remove(evicted_sv, self.price_changes[0])
+
         self.price_changes.append(price_change)
         self.signed_volumes.append(signed_volume)
+        if signed_volume != 0:
+            self._impact.add(signed_volume, price_change)
+        if self._impact.needs_resync:
+            self._impact.resync(
+                (sv, dp) for sv, dp in zip(self.signed_volumes, self.price_changes) if sv != 0
+            )
 
         # Incrementar contadores
         self.trades_since_update += 1
@@ -168,34 +185,37 @@ class KylesLambdaEstimator:
         Modelo: ΔPrice = λ * SignedVolume + ε
         
         Lambda se estima como: λ = Cov(ΔP, SV) / Var(SV)
+
+        Cov y Var salen de los co-momentos rolling (O(1), sin arrays):
+        mismas fórmulas que np.cov (ddof=1) y np.var (ddof=0) sobre las
+        observaciones con volumen no nulo.
         """
         if len(self.price_changes) < 30:
             # Necesitamos mínimo 30 observaciones para estimación robusta
             return
         
-        # Convertir a arrays numpy
-        delta_prices = np.array(self.price_changes)
-        signed_vols = np.array(self.signed_volumes)
-        
-        # Remover observaciones con volumen cero (evitar división por cero)
-        nonzero_mask = signed_vols != 0
-        delta_prices = delta_prices[nonzero_mask]
-        signed_vols = signed_vols[nonzero_mask]
+        # Solo observaciones con volumen no nulo (evitar división por cero)
+        impact = self._impact
+        n = impact.n
         
-        if len(signed_vols) < 10:
+        if n < 10:
             return
         
         # Calcular lambda = Cov(ΔP, SV) / Var(SV)
-        covariance = np.cov(delta_prices, signed_vols)[0, 1]
-        variance_sv = np.var(signed_vols)
+        covariance = impact.c_xy / (n - 1)
+        variance_sv = impact.m_xx / n
 
         # P1-019: Aumentar threshold a 1e-6 para evitar lambda spike artificial
         if variance_sv > 1e-6:
             lambda_estimate = covariance / variance_sv
 
-            # Calcular error estándar
-            residuals = delta_prices - lambda_estimate * signed_vols
-            mse = np.mean(residuals ** 2)
+            # Calcular error estándar: Σ(ΔP - λ·SV)² desde los co-momentos
+            offset = impact.mean_y - lambda_estimate * impact.mean_x
+            sse = (impact.m_yy
+                   - 2 * lambda_estimate * impact.c_xy
+                   + lambda_estimate ** 2 * impact.m_xx
+                   + n * offset ** 2)
+            mse = max(sse, 0.0) / n
             stderr = np.sqrt(mse / variance_sv)
             
             # Guardar estimados
@@ -203,10 +223,15 @@ class KylesLambdaEstimator:
             self.lambda_stderr = stderr
             
             # Agregar a historia
+            if len(self.lambda_history) == self.lambda_history.maxlen:
+                self._lambda_moments.remove(self.lambda_history[0])
             self.lambda_history.append(lambda_estimate)
+            self._lambda_moments.add(lambda_estimate)
+            if self._lambda_moments.needs_resync:
+                self._lambda_moments.resync(self.lambda_history)
             
             self.logger.debug(
-                f"Lambda actualizado: {lambda_estimate:.6f} (stderr: {stderr:.6f})"
+                "Lambda actualizado: %.6f (stderr: %.6f)", lambda_estimate, stderr
             )
     
     def get_lambda(self) -> Optional[float]:
@@ -228,7 +253,7 @@ class KylesLambdaEstimator:
         if len(self.lambda_history) < 50:
             return None
         
-        return np.mean(self.lambda_history)
+        return self._lambda_moments.mean(self.lambda_history)
     
     def get_historical_std(self) -> Optional[float]:
         """
@@ -240,7 +265,7 @@ class KylesLambdaEstimator:
         if len(self.lambda_history) < 50:
             return None
         
-        return np.std(self.lambda_history)
+        return self._lambda_moments.std(self.lambda_history)
     
     def get_lambda_ratio(self) -> Optional[float]:
         """
@@ -0,0 +1,244 @@
+﻿"""
+Rolling Statistics - Estadísticos de ventana sin arrays por tick
+
+Estructuras add/remove para ventanas que mantiene el propio gatekeeper
+(sus deques siguen siendo la fuente de verdad):
+
+- RollingMedian: dos heaps con borrado perezoso, O(log n) por operación.
+  Misma mediana que np.median (media de los dos centrales si n es par).
+- RollingMoments: media/varianza tipo Welford con retirada, O(1).
+  Equivale a np.mean / np.var / np.std (ddof=0).
+- RollingCovariance: co-momentos de (x, y) con retirada, O(1). Base de
+  la regresión recursiva de Kyle's Lambda.
+
+Las sumas Welford se re-sincronizan exactamente (math.fsum) una vez por
+ventana de altas (needs_resync / resync), igual que RollingSum en
+features.rolling_state: deriva acotada a coste amortizado O(1).
+"""
+
+import heapq
+import math
+from collections import Counter
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+
+
+class RollingMedian:
+    """Mediana de una ventana con altas/bajas O(log n) (dos heaps, borrado perezoso)."""
+
+    def __init__(self):
+        self._low = []     # max-heap (valores negados): mitad inferior
+        self._high = []    # min-heap: mitad superior
+        self._low_size = 0
+        self._high_size = 0
+        self._delayed = Counter()
+        self.nan_count = 0
+
+    def __len__(self) -> int:
+        return self._low_size + self._high_size + self.nan_count
+
+    def add(self, value: float):
+        """Añade un valor a la ventana."""
+        if value != value:
+            self.nan_count += 1
+            return
+
+        if not self._low or value <= -self._low[0]:
+            heapq.heappush(self._low, -value)
+            self._low_size += 1
+        else:
+            heapq.heappush(self._high, value)
+            self._high_size += 1
+        self._rebalance()
+
+    def remove(self, value: float):
+        """Retira un valor presente en la ventana (perezoso: se purga al llegar a la cima)."""
+        if value != value:
+            self.nan_count -= 1
+            return
+
+        self._delayed[value] += 1
+        if value <= -self._low[0]:
+            self._low_size -= 1
+            if value == -self._low[0]:
+                self._prune(self._low, negated=True)
+        else:
+            self._high_size -= 1
+            if self._high and value == self._high[0]:
+                self._prune(self._high, negated=False)
+        self._rebalance()
+
+        if len(self._low) + len(self._high) > 2 * (self._low_size + self._high_size) + 64:
+            self._compact()
+
+    def median(self) -> Optional[float]:
+        """Mediana actual (NaN si la ventana contiene NaN, como np.median)."""
+        if self.nan_count:
+            return float('nan')
+        if self._low_size == 0:
+            return None
+        if self._low_size > self._high_size:
+            return -self._low[0]
+        return (-self._low[0] + self._high[0]) / 2
+
+    def _prune(self, heap, negated: bool):
+        while heap:
+            value = -heap[0] if negated else heap[0]
+            if not self._delayed[value]:
+                break
+            self._delayed[value] -= 1
+            if not self._delayed[value]:
+                del self._delayed[value]
+            heapq.heappop(heap)
+
+    def _rebalance(self):
+        if self._low_size > self._high_size + 1:
+            heapq.heappush(self._high, -heapq.heappop(self._low))
+            self._low_size -= 1
+            self._high_size += 1
+            self._prune(self._low, negated=True)
+        elif self._low_size < self._high_size:
+            heapq.heappush(self._low, -heapq.heappop(self._high))
+            self._high_size -= 1
+            self._low_size += 1
+            self._prune(self._high, negated=False)
+
+    def _compact(self):
+        """Reconstruye los heaps sin los valores pendientes de borrar."""
+        remaining = Counter([-v for v in self._low])
+        remaining.update(self._high)
+        remaining.subtract(self._delayed)
+        values = sorted(remaining.elements())
+
+        split = (len(values) + 1) // 2
+        self._low = [-v for v in values[:split]]
+        heapq.heapify(self._low)
+        self._high = values[split:]
+        self._low_size, self._high_size = split, len(values) - split
+        self._delayed.clear()
+
+
+class RollingMoments:
+    """Media y varianza de una ventana con altas/bajas O(1) (Welford con retirada)."""
+
+    def __init__(self, resync_every: int):
+        """
+        Args:
+            resync_every: Altas entre re-sincronizaciones exactas (tamaño de ventana)
+        """
+        self.resync_every = resync_every
+        self.n = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+        self.nonfinite_count = 0
+        self._adds_since_resync = 0
+
+    def add(self, value: float):
+        """Añade un valor a la ventana."""
+        self._adds_since_resync += 1
+        if not math.isfinite(value):
+            self.nonfinite_count += 1
+            return
+        self.n += 1
+        delta = value - self._mean
+        self._mean += delta / self.n
+        self._m2 += delta * (value - self._mean)
+
+    def remove(self, value: float):
+        """Retira un valor presente en la ventana."""
+        if not math.isfinite(value):
+            self.nonfinite_count -= 1
+            return
+        self.n -= 1
+        if self.n == 0:
+            self._mean = 0.0
+            self._m2 = 0.0
+            return
+        delta = value - self._mean
+        self._mean -= delta / self.n
+        self._m2 = max(self._m2 - delta * (value - self._mean), 0.0)
+
+    @property
+    def needs_resync(self) -> bool:
+        return self._adds_since_resync >= self.resync_every
+
+    def resync(self, values: Iterable[float]):
+        """Recalcula media y M2 exactamente desde los valores de la ventana."""
+        values = list(values)
+        finite = [v for v in values if math.isfinite(v)]
+        self.n = len(finite)
+        self.nonfinite_count = len(values) - len(finite)
+        self._mean = math.fsum(finite) / self.n if self.n else 0.0
+        self._m2 = math.fsum((v - self._mean) ** 2 for v in finite)
+        self._adds_since_resync = 0
+
+    def mean(self, values: Iterable[float] = ()) -> float:
+        """Media (si hay inf/NaN en la ventana se delega en NumPy sobre values)."""
+        if self.nonfinite_count:
+            return np.mean(list(values))
+        return self._mean
+
+    def std(self, values: Iterable[float] = ()) -> float:
+        """Desviación estándar poblacional (ddof=0)."""
+        if self.nonfinite_count:
+            return np.std(list(values))
+        return math.sqrt(self._m2 / self.n) if self.n else 0.0
+
+
+class RollingCovariance:
+    """Co-momentos de (x, y) con altas/bajas O(1)."""
+
+    def __init__(self, resync_every: int):
+        """
+        Args:
+            resync_every: Altas entre re-sincronizaciones exactas (tamaño de ventana)
+        """
+        self.resync_every = resync_every
+        self.resync()
+
+    @property
+    def needs_resync(self) -> bool:
+        return self._adds_since_resync >= self.resync_every
+
+    def resync(self, pairs: Iterable[Tuple[float, float]] = ()):
+        """Recalcula los co-momentos exactamente desde los pares (x, y) de la ventana."""
+        pairs = list(pairs)
+        self._adds_since_resync = 0
+        self.n = len(pairs)
+        if not self.n:
+            self.mean_x = self.mean_y = 0.0
+            self.m_xx = self.m_yy = self.c_xy = 0.0
+            return
+        self.mean_x = math.fsum(x for x, _ in pairs) / self.n
+        self.mean_y = math.fsum(y for _, y in pairs) / self.n
+        self.m_xx = math.fsum((x - self.mean_x) ** 2 for x, _ in pairs)
+        self.m_yy = math.fsum((y - self.mean_y) ** 2 for _, y in pairs)
+        self.c_xy = math.fsum((x - self.mean_x) * (y - self.mean_y) for x, y in pairs)
+
+    def add(self, x: float, y: float):
+        """Añade un par (x, y)."""
+        self._adds_since_resync += 1
+        self.n += 1
+        dx = x - self.mean_x
+        dy = y - self.mean_y
+        self.mean_x += dx / self.n
+        self.mean_y += dy / self.n
+        self.m_xx += dx * (x - self.mean_x)
+        self.m_yy += dy * (y - self.mean_y)
+        self.c_xy += dx * (y - self.mean_y)
+
+    def remove(self, x: float, y: float):
+        """Retira un par (x, y) presente en la ventana."""
+        self.n -= 1
+        if self.n == 0:
+            self.mean_x = self.mean_y = 0.0
+            self.m_xx = self.m_yy = self.c_xy = 0.0
+            return
+        dx = x - self.mean_x
+        dy = y - self.mean_y
+        self.mean_x -= dx / self.n
+        self.mean_y -= dy / self.n
+        self.m_xx = max(self.m_xx - dx * (x - self.mean_x), 0.0)
+        self.m_yy = max(self.m_yy - dy * (y - self.mean_y), 0.0)
+        self.c_xy -= dx * (y - self.mean_y)
@@ -28,6 +28,8 @@ from typing import Optional, Dict, Tuple
 from collections import deque
 import logging
 
+from gatekeepers.rolling_statistics import RollingMedian, RollingMoments
+
 
 class SpreadMonitor:
     """
@@ -67,6 +69,9 @@ class SpreadMonitor:
 
         # Buffer de spreads observados
         self.spreads = deque(maxlen=window_size)
+        # Mediana / media / std de la ventana sin reconstruir arrays por tick
+        self._spread_median = RollingMedian()
+        self._spread_moments = RollingMoments(window_size)
 
         # Historia de spreads para estadísticas
         self.spread_history = deque(maxlen=historical_window)
@@ -153,14 +158,12 @@ class SpreadMonitor:
         mid = (bid + ask) / 2
         spread_bp = self.calculate_quoted_spread(bid, ask, mid)
 
-        self.spreads.append(spread_bp)
-        self.spread_history.append(spread_bp)
-        self.current_spread = spread_bp
+        self._push_spread(spread_bp)
 
         # CR11 FIX: Incrementar contador para warm-up phase
         self.trades_observed += 1
 
-        self.logger.debug(f"Quoted spread actualizado: {spread_bp:.2f} bp")
+        self.logger.debug("Quoted spread actualizado: %.2f bp", spread_bp)
     
     def update_effective(self,
                         trade_price: float,
@@ -178,14 +181,28 @@ class SpreadMonitor:
             trade_price, mid_price, direction
         )
 
-        self.spreads.append(spread_bp)
-        self.spread_history.append(spread_bp)
-        self.current_spread = spread_bp
+        self._push_spread(spread_bp)
 
         # CR11 FIX: Incrementar contador para warm-up phase
         self.trades_observed += 1
         
-        self.logger.debug(f"Effective spread actualizado: {spread_bp:.2f} bp")
+        self.logger.debug("Effective spread actualizado: %.2f bp", spread_bp)
+
+    def _push_spread(self, spread_bp: float) -> None:
+        """Agrega spread a la ventana manteniendo mediana y momentos rolling."""
+        if len(self.spreads) == self.spreads.maxlen:
+            evicted = self.spreads[0]
+            self._spread_median.remove(evicted)
+            self._spread_moments.remove(evicted)
+
+        self.spreads.append(spread_bp)
+        self._spread_median.add(spread_bp)
+        self._spread_moments.add(spread_bp)
+        if self._spread_moments.needs_resync:
+            self._spread_moments.resync(self.spreads)
+
+        self.spread_history.append(spread_bp)
+        self.current_spread = spread_bp
     
     def get_current_spread(self) -> Optional[float]:
         """
@@ -206,7 +223,7 @@ class SpreadMonitor:
         if len(self.spreads) < 10:
             return None
         
-        return np.mean(self.spreads)
+        return self._spread_moments.mean(self.spreads)
     
     def get_median_spread(self) -> Optional[float]:
         """
@@ -220,7 +237,7 @@ class SpreadMonitor:
         if len(self.spreads) < 10:
             return None
         
-        return np.median(self.spreads)
+        return self._spread_median.median()
     
     def get_spread_std(self) -> Optional[float]:
         """
@@ -232,7 +249,7 @@ class SpreadMonitor:
         if len(self.spreads) < 10:
             return None
         
-        return np.std(self.spreads)
+        return self._spread_moments.std(self.spreads)
     
     def get_spread_ratio(self) -> Optional[float]:
         """
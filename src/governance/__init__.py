@@ -1,15 +1,21 @@
 """Governance modules for event sourcing and audit trails."""
 from .event_store import EventStore, Event, EventType
+from .chain_verifier import ChainVerifier, ChainVerificationReport
+from .event_index import EventIndex, rebuild_indexes
+from .event_writer import GroupCommitWriter
 from .id_generation import generate_batch_id, generate_uuidv7
 from .data_lineage import DataLineageTracker
+from .lineage_store import ChunkStore
 from .version_manager import VersionManager
 from .model_registry import ModelRegistry, ModelStatus, ModelMetadata
 from .audit_viewer import AuditLogViewer
 
 __all__ = [
     'EventStore', 'Event', 'EventType',
+    'EventIndex', 'rebuild_indexes', 'GroupCommitWriter',
+    'ChainVerifier', 'ChainVerificationReport',
     'generate_batch_id', 'generate_uuidv7',
-    'DataLineageTracker',
+    'DataLineageTracker', 'ChunkStore',
     'VersionManager',
     'ModelRegistry', 'ModelStatus', 'ModelMetadata',
     'AuditLogViewer'
@@ -10,6 +10,11 @@ from datetime import datetime, date
 from dataclasses import dataclass
 import logging
 
+from .chain_verifier import ChainVerifier
+from .data_lineage import load_bars
+from .event_index import EventIndex, event_files
+from .lineage_store import ChunkStore
+
 logger = logging.getLogger(__name__)
 
 
@@ -316,27 +321,11 @@ class AuditLogViewer:
         return differences
     
     def _find_decision_event(self, decision_id: str) -> Optional[Dict]:
-        """Busca evento de decisión por ID."""
-        # Buscar en todos los archivos de eventos
-        event_files = sorted(self.event_store_path.glob("events/*.events.jsonl"))
-        
-        for file_path in event_files:
-            with open(file_path, 'r') as f:
-                for line in f:
-                    try:
-                        event_record = json.loads(line.strip())
-                        event = event_record['event']
-                        
-                        if event.get('event_id') == decision_id:
-                            return event
-                        
-                        # También buscar en payload
-                        payload = event.get('payload', {})
-                        if payload.get('decision_id') == decision_id:
-                            return event
-                    
-                    except (json.JSONDecodeError, KeyError):
-                        continue
+        """Busca evento de decisión por ID (event_id o payload.decision_id) vía índice."""
+        for file_path in event_files(self.event_store_path / "events"):
+            records = EventIndex(file_path).find(('event_id', 'decision_id'), decision_id, limit=1)
+            if records:
+                return records[0]['event']
         
         return None
     
@@ -349,32 +338,21 @@ class AuditLogViewer:
         if not data_slice_id:
             return related
         
-        # Buscar en ventana temporal alrededor de la decisión
-        decision_time = datetime.fromisoformat(decision_event['timestamp'])
-        
-        # Buscar en archivo del mismo día
-        decision_date = decision_time.date()
+        # Buscar en archivo del mismo día (índice por data_slice_id)
+        decision_date = datetime.fromisoformat(decision_event['timestamp']).date()
         file_path = self._get_events_file(decision_date)
         
-        if file_path.exists():
-            with open(file_path, 'r') as f:
-                for line in f:
-                    try:
-                        event_record = json.loads(line.strip())
-                        event = event_record['event']
-                        
-                        # Mismo data_slice_id y no es el evento original
-                        if (event.get('data_slice_id') == data_slice_id and
-                            event.get('event_id') != decision_event.get('event_id')):
-                            related.append(event)
-                    
-                    except (json.JSONDecodeError, KeyError):
-                        continue
+        for event_record in EventIndex(file_path).find('data_slice_id', data_slice_id):
+            event = event_record['event']
+            
+            # No es el evento original
+            if event.get('event_id') != decision_event.get('event_id'):
+                related.append(event)
         
         return related
     
     def _load_data_slice(self, data_slice_id: str) -> Optional[Dict]:
-        """Carga data slice desde lineage tracker."""
+        """Carga data slice desde lineage tracker (barras como DataFrames)."""
         # Parsear data_slice_id para obtener path
         parts = data_slice_id.split('_')
         if len(parts) >= 2:
@@ -389,9 +367,15 @@ class AuditLogViewer:
                 
                 if slice_path.exists():
                     with open(slice_path, 'r') as f:
-                        return json.load(f)
-            except (ValueError, IndexError):
-                pass
+                        data = json.load(f)
+                    
+                    # Barras reensambladas (chunks del lineage o formato antiguo)
+                    chunk_store = ChunkStore(self.data_lineage_path / "chunks")
+                    data['bars_by_instrument'] = load_bars(data, chunk_store)
+                    data.pop('bar_chunks', None)
+                    return data
+            except (ValueError, IndexError, KeyError, OSError) as e:
+                logger.error(f"Error loading data slice {data_slice_id}: {e}")
         
         return None
     
@@ -400,28 +384,14 @@ class AuditLogViewer:
         start_date: date,
         end_date: date
     ) -> bool:
-        """Verifica integridad de cadena en un período."""
-        events = self.query_events(
-            start_date=start_date,
-            end_date=end_date,
-            limit=100000
-        )
-        
-        if not events:
-            return True
-        
-        for i in range(1, len(events)):
-            prev_event = events[i - 1]
-            current_event = events[i]
-            
-            if current_event.get('prev_event_hash') != prev_event.get('event_hash'):
-                logger.error(
-                    f"Chain integrity breach between "
-                    f"{prev_event.get('event_id')} and {current_event.get('event_id')}"
-                )
-                return False
-        
-        return True
+        """Verifica integridad de cadena en un período (streaming, sin límite de eventos)."""
+        events_dir = self.event_store_path / "events"
+        files = [
+            f for f in event_files(events_dir)
+            if start_date.isoformat() <= f.name.split('.')[0] <= end_date.isoformat()
+        ]
+        # Sin clave HMAC: hashes y enlaces (incluidos los enlaces entre días)
+        return ChainVerifier(events_dir).verify(files).ok
     
     def _compare_versions(
         self,
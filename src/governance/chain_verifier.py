@@ -0,0 +1,349 @@
+"""
+Chain Verifier - Verificación incremental y reanudable de la cadena de eventos
+Recorre los ficheros diarios línea a línea (memoria constante) y valida por
+evento: hash recalculado, enlace prev_event_hash y HMAC.
+
+Checkpoints por día (integrity/{fecha}.checkpoint.json):
+- Offset verificado, nº de eventos, primer prev_hash y último event_hash
+- Firmados con HMAC (misma clave que los eventos); uno alterado se ignora
+- Al reanudar se re-verifica la última línea cubierta (ancla): el fichero
+  debe seguir terminando ahí con el mismo hash y HMAC válido
+
+Modo paralelo: cada día se verifica en un proceso independiente y después
+se comprueban secuencialmente los enlaces entre días (primer prev_hash del
+día == último hash del día anterior).
+"""
+
+import hashlib
+import hmac
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+CHECKPOINT_VERSION = 1
+
+_UNKNOWN = object()
+
+
+@dataclass
+class DayVerification:
+    """Resultado de verificar un fichero diario."""
+    date: str
+    events: int                         # Eventos del fichero hasta end_offset
+    events_verified: int                # Eventos verificados en esta pasada
+    start_offset: int
+    end_offset: int
+    first_prev_hash: Optional[str]
+    last_event_hash: Optional[str]
+    last_line_offset: int
+    from_checkpoint: bool = False
+    error: Optional[str] = None
+
+
+@dataclass
+class ChainVerificationReport:
+    """Resultado de una verificación de la cadena."""
+    ok: bool
+    days_verified: int
+    days_from_checkpoint: int
+    events_verified: int
+    events_total: int
+    errors: List[str] = field(default_factory=list)
+    days: List[DayVerification] = field(default_factory=list)
+    duration_s: float = 0.0
+
+
+def _record_hmac(event, hmac_key: bytes) -> str:
+    return hmac.new(hmac_key, event.canonical_json(include_hash=True).encode(),
+                    hashlib.sha256).hexdigest()
+
+
+def _check_line(line: bytes, hmac_key: Optional[bytes]) -> Tuple[Optional[Dict], Optional[str]]:
+    """(evento, error) de una línea: hash recalculado y HMAC."""
+    # Import diferido: event_store importa este módulo
+    from .event_store import Event
+
+    try:
+        record = json.loads(line)
+        data = record['event']
+        event = Event.from_dict(data)
+    except (json.JSONDecodeError, UnicodeDecodeError, KeyError, TypeError, ValueError) as e:
+        return None, f"unparseable record ({e})"
+
+    if event.event_hash != data.get('event_hash'):
+        return None, (f"event {event.event_id} hash mismatch: stored {data.get('event_hash')}, "
+                      f"computed {event.event_hash}")
+    if hmac_key is not None and not hmac.compare_digest(
+            _record_hmac(event, hmac_key), str(record.get('hmac', ''))):
+        return None, f"event {event.event_id} has invalid HMAC"
+    return data, None
+
+
+def _verify_day(events_file: str, checkpoint: Optional[Dict],
+                hmac_key: Optional[bytes]) -> DayVerification:
+    """
+    Verifica un fichero diario desde el inicio o desde su checkpoint.
+
+    Función de módulo (picklable) para ejecutarse en ProcessPoolExecutor.
+    """
+    path = Path(events_file)
+    result = DayVerification(
+        date=path.name.split('.')[0], events=0, events_verified=0,
+        start_offset=0, end_offset=0, first_prev_hash=None,
+        last_event_hash=None, last_line_offset=0
+    )
+    size = path.stat().st_size
+
+    with open(path, 'rb') as f:
+        if checkpoint:
+            offset = checkpoint['offset']
+            if size < offset:
+                result.error = f"{path.name} truncated: {size} bytes, checkpoint covers {offset}"
+                return result
+
+            # Ancla: la última línea verificada sigue intacta y termina en offset
+            f.seek(checkpoint['last_line_offset'])
+            anchor = f.readline()
+            data, error = _check_line(anchor, hmac_key)
+            if (error or f.tell() != offset or
+                    data.get('event_hash') != checkpoint['last_event_hash']):
+                result.error = f"{path.name} modified before checkpoint offset {offset}: {error or 'anchor mismatch'}"
+                return result
+
+            result.from_checkpoint = True
+            result.start_offset = result.end_offset = offset
+            result.events = checkpoint['events']
+            result.first_prev_hash = checkpoint['first_prev_hash']
+            result.last_event_hash = checkpoint['last_event_hash']
+            result.last_line_offset = checkpoint['last_line_offset']
+        else:
+            offset = 0
+
+        f.seek(offset)
+        first = not checkpoint
+        for line in f:
+            if not line.endswith(b'\n'):
+                break   # línea a medio escribir: se verificará en la próxima pasada
+
+            data, error = _check_line(line, hmac_key)
+            if error:
+                result.error = f"{path.name}@{offset}: {error}"
+                return result
+
+            prev_hash = data.get('prev_event_hash')
+            if first:
+                # El enlace con el día anterior se comprueba al final
+                result.first_prev_hash = prev_hash
+                first = False
+            elif prev_hash != result.last_event_hash:
+                result.error = (f"{path.name}@{offset}: CHAIN_INTEGRITY_BREACH event {data.get('event_id')} "
+                                f"has invalid prev_hash. Expected {result.last_event_hash}, got {prev_hash}")
+                return result
+
+            result.last_event_hash = data['event_hash']
+            result.last_line_offset = offset
+            result.events += 1
+            result.events_verified += 1
+            offset += len(line)
+            result.end_offset = offset
+
+    return result
+
+
+def _last_event_hash(events_file: Path) -> Optional[str]:
+    """event_hash de la última línea completa de un fichero (leyendo solo la cola)."""
+    with open(events_file, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        end = f.tell()
+        block = 4096
+        while True:
+            start = max(0, end - block)
+            f.seek(start)
+            tail = f.read(end - start)
+            lines = tail.split(b'\n')
+            # lines[-1]: resto sin '\n' (vacío o línea a medio escribir)
+            complete = lines[:-1] if start == 0 else lines[1:-1]
+            if complete:
+                try:
+                    return json.loads(complete[-1])['event']['event_hash']
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    return None
+            if start == 0:
+                return None
+            block *= 2
+
+
+class ChainVerifier:
+    """
+    Verificador streaming de la cadena HMAC de un EventStore.
+
+    Uso:
+        verifier = ChainVerifier(store.events_dir, store.integrity_dir, hmac_key)
+        report = verifier.verify(files, workers=4)
+        if not report.ok:
+            print(report.errors)
+    """
+
+    def __init__(
+        self,
+        events_dir: Path,
+        checkpoint_dir: Optional[Path] = None,
+        hmac_key: Optional[bytes] = None
+    ):
+        """
+        Args:
+            events_dir: Directorio de ficheros diarios {fecha}.events.jsonl
+            checkpoint_dir: Directorio de checkpoints (None: sin checkpoints)
+            hmac_key: Clave HMAC de los eventos (None: no se validan HMAC ni
+                se usan checkpoints, que van firmados con ella)
+        """
+        self.events_dir = Path(events_dir)
+        self.checkpoint_dir = Path(checkpoint_dir) if checkpoint_dir else None
+        self.hmac_key = hmac_key
+
+    @property
+    def uses_checkpoints(self) -> bool:
+        return self.checkpoint_dir is not None and self.hmac_key is not None
+
+    def verify(
+        self,
+        files: List[Path],
+        workers: int = 1,
+        use_checkpoints: bool = True
+    ) -> ChainVerificationReport:
+        """
+        Verifica los ficheros diarios dados (en orden cronológico).
+
+        Args:
+            files: Ficheros a verificar, ordenados
+            workers: Procesos para verificar días en paralelo (1: secuencial)
+            use_checkpoints: False re-verifica todo desde el inicio de cada día
+                (los checkpoints se reescriben igualmente)
+
+        Returns:
+            ChainVerificationReport
+        """
+        started = time.perf_counter()
+        files = [Path(f) for f in files]
+        checkpoints = [self._load_checkpoint(f) if use_checkpoints and self.uses_checkpoints else None
+                       for f in files]
+        jobs = [(str(f), cp, self.hmac_key) for f, cp in zip(files, checkpoints)]
+
+        if workers > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+                futures = [pool.submit(_verify_day, *job) for job in jobs]
+                days = [future.result() for future in futures]
+        else:
+            days = [_verify_day(*job) for job in jobs]
+
+        errors = [day.error for day in days if day.error]
+        errors.extend(self._check_boundaries(files, days))
+
+        for events_file, day in zip(files, days):
+            if day.error is None and self.uses_checkpoints and day.events_verified:
+                self._save_checkpoint(events_file, day)
+
+        report = ChainVerificationReport(
+            ok=not errors,
+            days_verified=len(days),
+            days_from_checkpoint=sum(1 for day in days if day.from_checkpoint),
+            events_verified=sum(day.events_verified for day in days),
+            events_total=sum(day.events for day in days),
+            errors=errors,
+            days=days,
+            duration_s=time.perf_counter() - started
+        )
+
+        for error in errors:
+            logger.error(f"CHAIN_INTEGRITY_BREACH: {error}")
+        if report.ok:
+            logger.info(
+                f"Chain integrity verified: {report.events_total} events OK "
+                f"({report.events_verified} new, {report.days_from_checkpoint}/{report.days_verified} "
+                f"days from checkpoint)"
+            )
+        return report
+
+    def _check_boundaries(self, files: List[Path], days: List[DayVerification]) -> List[str]:
+        """Enlaces entre días: primer prev_hash == último hash del día anterior con eventos."""
+        errors = []
+        previous_hash = self._hash_before(files[0]) if files else None
+
+        for events_file, day in zip(files, days):
+            if day.error is not None:
+                # Final del día desconocido: no se comprueba el enlace siguiente
+                previous_hash = _UNKNOWN
+                continue
+            if day.events == 0:
+                continue
+            if previous_hash is not _UNKNOWN and day.first_prev_hash != previous_hash:
+                errors.append(
+                    f"{events_file.name}: cross-day link broken. Expected prev_hash "
+                    f"{previous_hash}, got {day.first_prev_hash}"
+                )
+            previous_hash = day.last_event_hash
+        return errors
+
+    def _hash_before(self, events_file: Path) -> Optional[str]:
+        """Último hash del fichero anterior a events_file (None si es el primero)."""
+        previous = [f for f in sorted(self.events_dir.glob('*.events.jsonl')) if f.name < events_file.name]
+        for candidate in reversed(previous):
+            event_hash = _last_event_hash(candidate)
+            if event_hash is not None:
+                return event_hash
+        return None
+
+    def _checkpoint_path(self, events_file: Path) -> Path:
+        return self.checkpoint_dir / f"{events_file.name.split('.')[0]}.checkpoint.json"
+
+    def _sign(self, content: Dict) -> str:
+        payload = json.dumps(content, sort_keys=True).encode()
+        return hmac.new(self.hmac_key, payload, hashlib.sha256).hexdigest()
+
+    def _load_checkpoint(self, events_file: Path) -> Optional[Dict]:
+        """Checkpoint del día si existe y su firma es válida."""
+        path = self._checkpoint_path(events_file)
+        try:
+            with open(path, 'r') as f:
+                checkpoint = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {path.name}: {e}")
+            return None
+
+        signature = checkpoint.pop('signature', '')
+        if (checkpoint.get('version') != CHECKPOINT_VERSION or
+                not hmac.compare_digest(self._sign(checkpoint), str(signature))):
+            logger.warning(f"Ignoring checkpoint with invalid signature: {path.name}")
+            return None
+        return checkpoint
+
+    def _save_checkpoint(self, events_file: Path, day: DayVerification):
+        """Guarda el checkpoint firmado del día (reemplazo atómico)."""
+        checkpoint = {
+            'version': CHECKPOINT_VERSION,
+            'date': day.date,
+            'offset': day.end_offset,
+            'events': day.events,
+            'first_prev_hash': day.first_prev_hash,
+            'last_event_hash': day.last_event_hash,
+            'last_line_offset': day.last_line_offset,
+        }
+        checkpoint['signature'] = self._sign(checkpoint)
+
+        self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        path = self._checkpoint_path(events_file)
+        tmp_path = path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(checkpoint, f, indent=2)
+        os.replace(tmp_path, path)
+
@@ -1,6 +1,10 @@
 ﻿"""
 Data Lineage Tracker - Rastreo completo de datos que producen cada decisión
 Captura snapshots de datos con hashing determinístico para reproducibilidad.
+
+Cada slice se guarda como un manifest JSON pequeño (digests de los chunks de
+barras + features, regímenes y portfolio); las barras van a un ChunkStore
+direccionado por contenido compartido entre slices.
 """
 
 import json
@@ -11,6 +15,8 @@ from pathlib import Path
 from datetime import datetime
 import logging
 
+from .lineage_store import ChunkStore
+
 logger = logging.getLogger(__name__)
 
 
@@ -57,6 +63,8 @@ class DataLineageTracker:
     bit-a-bit de cualquier decisión histórica.
     """
     
+    SLICE_BARS = 200
+    
     def __init__(self, storage_path: Path):
         """
         Inicializa tracker.
@@ -66,6 +74,7 @@ class DataLineageTracker:
         """
         self.storage_path = Path(storage_path)
         self.storage_path.mkdir(parents=True, exist_ok=True)
+        self.chunk_store = ChunkStore(self.storage_path / "chunks")
         
         logger.info(f"DataLineageTracker inicializado: {self.storage_path}")
     
@@ -90,9 +99,15 @@ class DataLineageTracker:
         """
         timestamp = datetime.now()
         
-        # Calcular hash determinístico del contenido
+        # Barras a chunks (solo se escriben los bloques nuevos)
+        bar_chunks = {
+            instr: self.chunk_store.put_frame(df.tail(self.SLICE_BARS))
+            for instr, df in bars_by_instrument.items()
+        }
+        
+        # Calcular hash determinístico del contenido (barras vía digests de chunks)
         content_hash = self._compute_content_hash(
-            bars_by_instrument,
+            bar_chunks,
             features_by_instrument,
             regime_states,
             portfolio_state
@@ -112,7 +127,7 @@ class DataLineageTracker:
         )
         
         # Persistir
-        self._persist_slice(slice_obj, content_hash)
+        self._persist_slice(slice_obj, content_hash, bar_chunks)
         
         logger.debug(f"Data slice captured: {data_slice_id}")
         
@@ -139,9 +154,7 @@ class DataLineageTracker:
                 data = json.load(f)
             
             # Reconstruir DataFrames
-            bars_by_instrument = {}
-            for instr, bars_dict in data['bars_by_instrument'].items():
-                bars_by_instrument[instr] = pd.DataFrame(bars_dict)
+            bars_by_instrument = load_bars(data, self.chunk_store)
             
             return DataSlice(
                 data_slice_id=data['data_slice_id'],
@@ -152,24 +165,21 @@ class DataLineageTracker:
                 portfolio_state=data['portfolio_state']
             )
         
-        except (json.JSONDecodeError, KeyError) as e:
+        except (json.JSONDecodeError, KeyError, OSError, ValueError) as e:
             logger.error(f"Error loading data slice {data_slice_id}: {e}")
             return None
     
     def _compute_content_hash(
         self,
-        bars_by_instrument: Dict[str, pd.DataFrame],
+        bar_chunks: Dict[str, Dict],
         features_by_instrument: Dict[str, Dict],
         regime_states: Dict[str, Dict],
         portfolio_state: Dict[str, Any]
     ) -> str:
-        """Calcula hash SHA256 del contenido completo."""
+        """Calcula hash SHA256 del contenido completo (barras por digests de chunks)."""
         # Serializar todo a formato determinístico
         content = {
-            'bars': {
-                instr: df.tail(200).to_dict(orient='records')
-                for instr, df in bars_by_instrument.items()
-            },
+            'bars': bar_chunks,
             'features': features_by_instrument,
             'regimes': regime_states,
             'portfolio': portfolio_state
@@ -178,29 +188,25 @@ class DataLineageTracker:
         content_json = json.dumps(content, sort_keys=True)
         return hashlib.sha256(content_json.encode()).hexdigest()
     
-    def _persist_slice(self, slice_obj: DataSlice, content_hash: str):
-        """Persiste slice a storage."""
+    def _persist_slice(self, slice_obj: DataSlice, content_hash: str, bar_chunks: Dict[str, Dict]):
+        """Persiste manifest del slice (las barras ya están en el chunk store)."""
         slice_path = self._get_slice_path(slice_obj.data_slice_id)
         
         # Crear directorio por año/mes para organización
         slice_path.parent.mkdir(parents=True, exist_ok=True)
         
-        # Serializar con DataFrames
         data = {
             'data_slice_id': slice_obj.data_slice_id,
             'timestamp': slice_obj.timestamp.isoformat(),
             'content_hash': content_hash,
-            'bars_by_instrument': {
-                instr: df.tail(200).to_dict(orient='records')
-                for instr, df in slice_obj.bars_by_instrument.items()
-            },
+            'bar_chunks': bar_chunks,
             'features_by_instrument': slice_obj.features_by_instrument,
             'regime_states': slice_obj.regime_states,
             'portfolio_state': slice_obj.portfolio_state
         }
         
         with open(slice_path, 'w') as f:
-            json.dump(data, f, indent=2)
+            json.dump(data, f, separators=(',', ':'))
     
     def _get_slice_path(self, data_slice_id: str) -> Path:
         """Obtiene path de archivo para un data slice."""
@@ -223,10 +229,33 @@ class DataLineageTracker:
         """Obtiene estadísticas del lineage tracker."""
         slice_files = list(self.storage_path.rglob("SLICE_*.json"))
         
-        total_size_bytes = sum(f.stat().st_size for f in slice_files)
+        manifest_size_bytes = sum(f.stat().st_size for f in slice_files)
+        chunk_stats = self.chunk_store.get_stats()
         
         return {
             'total_slices': len(slice_files),
-            'total_size_mb': total_size_bytes / (1024 * 1024),
+            'total_size_mb': manifest_size_bytes / (1024 * 1024) + chunk_stats['total_size_mb'],
+            'manifest_size_mb': manifest_size_bytes / (1024 * 1024),
+            'chunks': chunk_stats,
             'storage_path': str(self.storage_path)
         }
+
+
+def load_bars(data: Dict, chunk_store: ChunkStore) -> Dict[str, pd.DataFrame]:
+    """
+    DataFrames de barras de un slice persistido.
+    
+    Args:
+        data: JSON del slice (manifest con 'bar_chunks', o formato antiguo con
+            las barras en línea en 'bars_by_instrument')
+        chunk_store: Chunk store del tracker
+    """
+    if 'bar_chunks' in data:
+        return {
+            instr: chunk_store.get_frame(entry)
+            for instr, entry in data['bar_chunks'].items()
+        }
+    return {
+        instr: pd.DataFrame(bars_dict)
+        for instr, bars_dict in data['bars_by_instrument'].items()
+    }
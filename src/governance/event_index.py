@@ -0,0 +1,295 @@
+"""
+Event Index - Índices secundarios persistentes para los ficheros diarios del EventStore
+Cada {fecha}.events.jsonl tiene al lado un {fecha}.events.idx ordenado con
+offsets de byte por event_id, event_type, decision_id y data_slice_id.
+
+Formato del .idx:
+- Cabecera: magic b'EVIX', versión, bytes del .jsonl cubiertos, nº de entradas
+- Entradas fijas (key_hash u64, offset u64) ordenadas por (key_hash, offset)
+
+Búsqueda: búsqueda binaria con seeks sobre las entradas (O(log n)) más un
+escaneo de la cola del .jsonl escrita después del último refresh. Cada
+candidato se verifica leyendo su línea (descarta colisiones de hash).
+"""
+
+import hashlib
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+INDEXED_FIELDS = ('event_id', 'event_type', 'decision_id', 'data_slice_id')
+
+_MAGIC = b'EVIX'
+_VERSION = 1
+_HEADER = struct.Struct('<4sIQQ')     # magic, versión, bytes cubiertos, nº entradas
+_ENTRY = struct.Struct('<QQ')         # key_hash, offset
+_ENTRY_DTYPE = np.dtype([('key', '<u8'), ('offset', '<u8')])
+
+
+def key_hash(field: str, value) -> int:
+    """Hash de 64 bits de (campo, valor)."""
+    digest = hashlib.blake2b(f"{field}\x00{value}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def field_value(event: Dict, field: str):
+    """Valor indexado de un evento (decision_id vive en el payload)."""
+    if field == 'decision_id':
+        payload = event.get('payload')
+        return payload.get('decision_id') if isinstance(payload, dict) else None
+    return event.get(field)
+
+
+def event_keys(event: Dict) -> List[int]:
+    """Hashes de las claves indexadas de un evento."""
+    keys = []
+    for field in INDEXED_FIELDS:
+        value = field_value(event, field)
+        if value is not None:
+            keys.append(key_hash(field, value))
+    return keys
+
+
+def index_path(events_file: Path) -> Path:
+    """Path del índice de un fichero de eventos."""
+    return Path(events_file).with_suffix('.idx')
+
+
+class EventIndex:
+    """
+    Índice secundario de un fichero diario de eventos.
+
+    Uso:
+        index = EventIndex(events_dir / '2025-06-01.events.jsonl')
+        index.refresh()                               # indexa lo nuevo
+        records = index.find('decision_id', 'dec_123')
+        records = index.find(('event_id', 'decision_id'), 'dec_123', limit=1)
+    """
+
+    def __init__(self, events_file: Path):
+        self.events_file = Path(events_file)
+        self.index_file = index_path(self.events_file)
+
+    def header(self) -> Tuple[int, int]:
+        """(bytes del .jsonl cubiertos, nº de entradas); (0, 0) si no hay índice válido."""
+        try:
+            with open(self.index_file, 'rb') as f:
+                return _read_header(f)
+        except FileNotFoundError:
+            return 0, 0
+
+    def lookup(self, field: str, value) -> List[int]:
+        """Offsets (ascendentes) de las líneas candidatas para field == value."""
+        target = key_hash(field, value)
+        indexed_size, count = 0, 0
+        offsets = []
+
+        try:
+            f = open(self.index_file, 'rb')
+        except FileNotFoundError:
+            f = None
+
+        if f is not None:
+            # Cabecera y entradas del mismo handle: un _merge concurrente
+            # reemplaza el fichero, pero este handle sigue viendo el anterior
+            with f:
+                indexed_size, count = _read_header(f)
+
+                # Búsqueda binaria del primer key_hash >= target
+                lo, hi = 0, count
+                while lo < hi:
+                    mid = (lo + hi) // 2
+                    f.seek(_HEADER.size + mid * _ENTRY.size)
+                    key, _ = _ENTRY.unpack(f.read(_ENTRY.size))
+                    if key < target:
+                        lo = mid + 1
+                    else:
+                        hi = mid
+
+                f.seek(_HEADER.size + lo * _ENTRY.size)
+                for _ in range(lo, count):
+                    key, offset = _ENTRY.unpack(f.read(_ENTRY.size))
+                    if key != target:
+                        break
+                    offsets.append(offset)
+
+        # Cola sin indexar (escrita después del último refresh); solo se
+        # parsean las líneas que contienen el valor
+        token = json.dumps(str(value))[1:-1].encode()
+        for offset, record in self._scan(indexed_size, contains=token):
+            if _matches(record, field, value):
+                offsets.append(offset)
+
+        return offsets
+
+    def find(self, fields: Union[str, Sequence[str]], value,
+             limit: Optional[int] = None) -> List[Dict]:
+        """
+        Registros ({'event', 'hmac', ...}) en orden del fichero.
+
+        Args:
+            fields: Campo indexado, o varios (coincide cualquiera de ellos)
+            value: Valor buscado
+            limit: Máximo número de registros
+        """
+        if isinstance(fields, str):
+            fields = (fields,)
+
+        records = []
+        offsets = sorted(set().union(*(self.lookup(field, value) for field in fields)))
+        if not offsets:
+            return records
+
+        with open(self.events_file, 'rb') as f:
+            for offset in offsets:
+                f.seek(offset)
+                record = _parse(f.readline())
+                if record is not None and any(_matches(record, field, value) for field in fields):
+                    records.append(record)
+                    if limit is not None and len(records) >= limit:
+                        break
+        return records
+
+    def refresh(self) -> int:
+        """
+        Indexa las líneas escritas desde el último refresh.
+
+        Returns:
+            Nº de entradas añadidas
+        """
+        if not self.events_file.exists():
+            return 0
+
+        indexed_size, count = self.header()
+        if indexed_size > self.events_file.stat().st_size:
+            # Índice de otro fichero (o fichero truncado): reconstruir
+            indexed_size, count = 0, 0
+
+        new_keys, new_offsets = [], []
+        for offset, record in self._scan(indexed_size):
+            event = record['event']
+            for key in event_keys(event):
+                new_keys.append(key)
+                new_offsets.append(offset)
+
+        end = self._line_end
+        if end == indexed_size:
+            return 0
+
+        return self._merge(new_keys, new_offsets, end, count)
+
+    def append(self, keys: List[int], offsets: List[int], start: int, end: int) -> int:
+        """
+        Añade entradas ya calculadas por el escritor para los bytes [start, end).
+
+        Si el índice no cubre exactamente hasta start (líneas escritas por otro
+        proceso, índice ausente), indexa escaneando el fichero (refresh).
+
+        Returns:
+            Nº de entradas añadidas
+        """
+        indexed_size, count = self.header()
+        if indexed_size != start:
+            return self.refresh()
+        if end == indexed_size:
+            return 0
+        return self._merge(keys, offsets, end, count)
+
+    def _merge(self, new_keys: List[int], new_offsets: List[int], end: int, count: int) -> int:
+        """Fusiona entradas nuevas con las existentes y reescribe el índice (reemplazo atómico)."""
+        new_entries = np.empty(len(new_keys), dtype=_ENTRY_DTYPE)
+        new_entries['key'] = new_keys
+        new_entries['offset'] = new_offsets
+
+        if count:
+            existing = np.fromfile(self.index_file, dtype=_ENTRY_DTYPE,
+                                   count=count, offset=_HEADER.size)
+            entries = np.concatenate([existing, new_entries])
+        else:
+            entries = new_entries
+        entries = entries[np.lexsort((entries['offset'], entries['key']))]
+
+        tmp_file = self.index_file.with_suffix('.idx.tmp')
+        with open(tmp_file, 'wb') as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, end, len(entries)))
+            f.write(entries.tobytes())
+        os.replace(tmp_file, self.index_file)
+
+        return len(new_entries)
+
+    def rebuild(self) -> int:
+        """Reconstruye el índice completo desde el fichero de eventos."""
+        if self.index_file.exists():
+            self.index_file.unlink()
+        return self.refresh()
+
+    def _scan(self, start: int, contains: Optional[bytes] = None) -> Iterator[Tuple[int, Dict]]:
+        """(offset, registro) de las líneas completas desde start (que contienen contains)."""
+        self._line_end = start
+        if not self.events_file.exists():
+            return
+
+        with open(self.events_file, 'rb') as f:
+            f.seek(start)
+            offset = start
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break   # línea a medio escribir
+                next_offset = offset + len(line)
+                if contains is None or contains in line:
+                    record = _parse(line)
+                    if record is not None:
+                        yield offset, record
+                offset = self._line_end = next_offset
+
+
+def _read_header(f) -> Tuple[int, int]:
+    """(bytes cubiertos, nº de entradas) de un .idx abierto; (0, 0) si no es válido."""
+    data = f.read(_HEADER.size)
+    if len(data) < _HEADER.size:
+        return 0, 0
+    magic, version, indexed_size, count = _HEADER.unpack(data)
+    if magic != _MAGIC or version != _VERSION:
+        return 0, 0
+    return indexed_size, count
+
+
+def _parse(line: bytes) -> Optional[Dict]:
+    try:
+        record = json.loads(line)
+    except (json.JSONDecodeError, UnicodeDecodeError) as e:
+        logger.error(f"Error parsing event: {e}")
+        return None
+    return record if isinstance(record, dict) and 'event' in record else None
+
+
+def _matches(record: Dict, field: str, value) -> bool:
+    event_value = field_value(record['event'], field)
+    return event_value is not None and str(event_value) == str(value)
+
+
+def event_files(events_dir: Path) -> List[Path]:
+    """Ficheros diarios de eventos, en orden cronológico."""
+    return sorted(Path(events_dir).glob('*.events.jsonl'))
+
+
+def rebuild_indexes(events_dir: Path) -> Dict[str, int]:
+    """
+    Reconstruye los índices de todos los ficheros de eventos existentes.
+
+    Returns:
+        Dict {fichero: nº de entradas}
+    """
+    results = {}
+    for events_file in event_files(events_dir):
+        results[events_file.name] = EventIndex(events_file).rebuild()
+        logger.info(f"Índice reconstruido: {events_file.name} ({results[events_file.name]} entradas)")
+    return results
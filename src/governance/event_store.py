@@ -6,13 +6,23 @@ Implementa append-only event log con verificación de integridad criptográfica.
 import json
 import hashlib
 import hmac
-from typing import Dict, List, Optional, Any
+import threading
+import time
+from typing import Dict, Iterator, List, Optional, Any
 from datetime import datetime, date
 from pathlib import Path
 import logging
 
+from .chain_verifier import ChainVerificationReport, ChainVerifier
+from .event_index import EventIndex, event_files, event_keys, rebuild_indexes
+from .event_writer import GroupCommitWriter
+
 logger = logging.getLogger(__name__)
 
+# Encoder reutilizado: mismo resultado que json.dumps(..., sort_keys=True)
+# sin construir un JSONEncoder por llamada
+_CANONICAL_ENCODER = json.JSONEncoder(sort_keys=True)
+
 
 
 from enum import Enum
@@ -57,22 +67,54 @@ class Event:
         self.config_hashes = config_hashes
         self.data_slice_id = data_slice_id
         self.prev_event_hash = prev_event_hash
+        self._field_json = self._serialize_fields()
         self.event_hash = self._compute_hash()
     
-    def _compute_hash(self) -> str:
-        """Calcula SHA256 hash del evento."""
-        content = {
-            'event_type': self.event_type,
-            'event_id': self.event_id,
-            'timestamp': self.timestamp.isoformat(),
-            'payload': self.payload,
-            'module_versions': self.module_versions,
-            'config_hashes': self.config_hashes,
-            'data_slice_id': self.data_slice_id,
-            'prev_event_hash': self.prev_event_hash
+    def _serialize_fields(self) -> Dict[str, str]:
+        """JSON canónico (sort_keys) de cada campo, serializado una sola vez."""
+        dumps = _CANONICAL_ENCODER.encode
+        return {
+            'config_hashes': dumps(self.config_hashes),
+            'data_slice_id': dumps(self.data_slice_id),
+            'event_id': dumps(self.event_id),
+            'event_type': dumps(self.event_type),
+            'module_versions': dumps(self.module_versions),
+            'payload': dumps(self.payload),
+            'prev_event_hash': dumps(self.prev_event_hash),
+            'timestamp': dumps(self.timestamp.isoformat()),
         }
+    
+    def canonical_json(self, include_hash: bool) -> str:
+        """
+        Igual a json.dumps(content, sort_keys=True) sin re-serializar los campos.
         
-        content_json = json.dumps(content, sort_keys=True)
+        Args:
+            include_hash: False -> contenido del hash; True -> to_dict() (contenido del HMAC)
+        """
+        f = self._field_json
+        # Claves en orden alfabético (sort_keys); event_hash va entre data_slice_id y event_id
+        event_hash = f'"event_hash": "{self.event_hash}", ' if include_hash else ''
+        return (
+            f'{{"config_hashes": {f["config_hashes"]}, "data_slice_id": {f["data_slice_id"]}, '
+            f'{event_hash}"event_id": {f["event_id"]}, "event_type": {f["event_type"]}, '
+            f'"module_versions": {f["module_versions"]}, "payload": {f["payload"]}, '
+            f'"prev_event_hash": {f["prev_event_hash"]}, "timestamp": {f["timestamp"]}}}'
+        )
+    
+    def record_json(self, event_hmac: str, written_at: str) -> str:
+        """Línea del fichero de eventos ({'event', 'hmac', 'written_at'}) desde los campos ya serializados."""
+        f = self._field_json
+        return (
+            f'{{"event": {{"event_type": {f["event_type"]}, "event_id": {f["event_id"]}, '
+            f'"timestamp": {f["timestamp"]}, "payload": {f["payload"]}, '
+            f'"module_versions": {f["module_versions"]}, "config_hashes": {f["config_hashes"]}, '
+            f'"data_slice_id": {f["data_slice_id"]}, "prev_event_hash": {f["prev_event_hash"]}, '
+            f'"event_hash": "{self.event_hash}"}}, "hmac": "{event_hmac}", "written_at": "{written_at}"}}'
+        )
+    
+    def _compute_hash(self) -> str:
+        """Calcula SHA256 hash del evento."""
+        content_json = self.canonical_json(include_hash=False)
         return hashlib.sha256(content_json.encode()).hexdigest()
     
     def to_dict(self) -> Dict:
@@ -112,14 +154,22 @@ class EventStore:
     - Append-only: eventos nunca se modifican ni eliminan
     - HMAC chain: cada evento firma el hash del anterior
     - Rotación diaria: archivos separados por día
-    - Verificación de integridad: valida cadena completa
-    - Indexación eficiente: búsqueda por tipo, fecha, ID
+    - Verificación de integridad: streaming, con checkpoints firmados por día
+    - Indexación eficiente: índice .idx por fichero diario (event_id,
+      event_type, decision_id, data_slice_id) con búsqueda binaria
+    - Escritura por lotes: group commit con fsync por lote (GroupCommitWriter)
     """
     
+    INDEX_MIN_INTERVAL_S = 1.0
+    
     def __init__(
         self,
         store_path: Path,
-        hmac_key: str = "institutional_trading_system_key_2025"
+        hmac_key: str = "institutional_trading_system_key_2025",
+        index_every: int = 1000,
+        max_commit_latency_ms: float = 5.0,
+        max_batch_events: int = 4096,
+        fsync: bool = True
     ):
         """
         Inicializa Event Store.
@@ -127,6 +177,11 @@ class EventStore:
         Args:
             store_path: Directorio base para eventos
             hmac_key: Clave secreta para HMAC (cambiar en producción)
+            index_every: Eventos escritos entre actualizaciones del índice
+                del día (la cola sin indexar se escanea en las búsquedas)
+            max_commit_latency_ms: Espera máxima de un evento antes del group commit
+            max_batch_events: Tamaño de lote que fuerza commit inmediato
+            fsync: fsync por lote confirmado
         """
         self.store_path = Path(store_path)
         self.events_dir = self.store_path / "events"
@@ -137,13 +192,33 @@ class EventStore:
         self.integrity_dir.mkdir(parents=True, exist_ok=True)
         
         self.hmac_key = hmac_key.encode()
+        self._hmac_template = hmac.new(self.hmac_key, digestmod=hashlib.sha256)
         self._last_event_hash: Optional[str] = None
         self._current_date = date.today()
-        self._current_file_handle = None
+        self._current_path = self._get_file_path(self._current_date)
+        self.index_every = index_every
+        self._unindexed_events = 0
+        self._indexing_path: Optional[Path] = None
+        self._index_keys: List[int] = []
+        self._index_offsets: List[int] = []
+        self._index_start = 0
+        self._index_end = 0
+        self._last_index_refresh = 0.0
+        self._lock = threading.Lock()
+        self._index_lock = threading.Lock()
         
         # Cargar último hash si existe
         self._load_last_hash()
         
+        # Escritura por lotes (handle abierto, un fsync por lote); el índice
+        # del día se mantiene desde el hilo de commit
+        self._writer = GroupCommitWriter(
+            max_latency_ms=max_commit_latency_ms,
+            max_batch_events=max_batch_events,
+            fsync=fsync,
+            on_commit=self._on_commit
+        )
+        
         logger.info(f"EventStore inicializado: {self.store_path}")
     
     def append_event(
@@ -167,31 +242,43 @@ class EventStore:
             data_slice_id: ID del slice de datos asociado
             
         Returns:
-            Evento creado y persistido
+            Evento creado y encolado para persistir (durable tras flush() o
+            como máximo max_commit_latency_ms después)
         """
-        # Crear evento
-        event = Event(
-            event_type=event_type,
-            payload=payload,
-            event_id=event_id,
-            timestamp=datetime.now(),
-            module_versions=module_versions,
-            config_hashes=config_hashes,
-            data_slice_id=data_slice_id,
-            prev_event_hash=self._last_event_hash
-        )
-        
-        # Calcular HMAC
-        event_hmac = self._compute_hmac(event)
-        
-        # Persistir
-        self._write_event(event, event_hmac)
-        
-        # Actualizar último hash
-        self._last_event_hash = event.event_hash
+        # El encadenado (prev_event_hash) y el orden de escritura van juntos
+        with self._lock:
+            # Crear evento
+            event = Event(
+                event_type=event_type,
+                payload=payload,
+                event_id=event_id,
+                timestamp=datetime.now(),
+                module_versions=module_versions,
+                config_hashes=config_hashes,
+                data_slice_id=data_slice_id,
+                prev_event_hash=self._last_event_hash
+            )
+            
+            # Calcular HMAC
+            event_hmac = self._compute_hmac(event)
+            
+            # Persistir
+            self._write_event(event, event_hmac)
+            
+            # Actualizar último hash
+            self._last_event_hash = event.event_hash
         
         return event
     
+    def flush(self):
+        """Bloquea hasta que todos los eventos añadidos están escritos en disco."""
+        self._writer.flush()
+    
+    def close(self):
+        """Escribe lo pendiente, cierra el fichero y deja el índice del día completo."""
+        self._writer.close()
+        self.refresh_index()
+    
     def get_events(
         self,
         start_date: Optional[date] = None,
@@ -213,46 +300,79 @@ class EventStore:
         Returns:
             Lista de eventos que cumplen filtros
         """
+        self.flush()
         events = []
         
-        # Determinar archivos a leer
-        if start_date is None:
-            start_date = date(2025, 1, 1)  # Fecha arbitraria pasada
-        if end_date is None:
-            end_date = date.today()
-        
-        current = start_date
-        while current <= end_date and len(events) < limit:
-            file_path = self._get_file_path(current)
+        for file_path in self._files_in_range(start_date, end_date):
+            if len(events) >= limit:
+                break
             
-            if file_path.exists():
-                with open(file_path, 'r') as f:
-                    for line in f:
-                        if len(events) >= limit:
-                            break
-                        
-                        try:
-                            event_data = json.loads(line.strip())
-                            event = Event.from_dict(event_data['event'])
-                            
-                            # Aplicar filtros
-                            if event_type and event.event_type != event_type:
-                                continue
-                            if event_id and event.event_id != event_id:
-                                continue
-                            
-                            events.append(event)
-                        
-                        except (json.JSONDecodeError, KeyError) as e:
-                            logger.error(f"Error parsing event: {e}")
-                            continue
+            # Búsqueda por índice si hay filtro indexado; si no, escaneo
+            if event_id:
+                records = EventIndex(file_path).find('event_id', event_id, limit=limit - len(events))
+            elif event_type:
+                records = EventIndex(file_path).find('event_type', event_type, limit=limit - len(events))
+            else:
+                records = self._iter_records(file_path)
             
-            # Siguiente día
-            from datetime import timedelta
-            current += timedelta(days=1)
+            for event_data in records:
+                if len(events) >= limit:
+                    break
+                
+                try:
+                    event = Event.from_dict(event_data['event'])
+                except KeyError as e:
+                    logger.error(f"Error parsing event: {e}")
+                    continue
+                
+                # Aplicar filtros
+                if event_type and event.event_type != event_type:
+                    continue
+                if event_id and event.event_id != event_id:
+                    continue
+                
+                events.append(event)
         
         return events
     
+    def find_records(
+        self,
+        field: str,
+        value: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Registros ({'event', 'hmac', 'written_at'}) con field == value vía índice.
+        
+        Args:
+            field: 'event_id', 'event_type', 'decision_id' (payload) o 'data_slice_id'
+            value: Valor buscado
+            start_date: Fecha inicio (inclusive)
+            end_date: Fecha fin (inclusive)
+            limit: Máximo número de registros
+        """
+        self.flush()
+        records = []
+        for file_path in self._files_in_range(start_date, end_date):
+            remaining = None if limit is None else limit - len(records)
+            records.extend(EventIndex(file_path).find(field, value, limit=remaining))
+            if limit is not None and len(records) >= limit:
+                break
+        return records
+    
+    def refresh_index(self):
+        """Indexa los eventos del día escritos desde la última actualización."""
+        self.flush()
+        with self._index_lock:
+            self._flush_index_entries()
+            EventIndex(self._current_path).refresh()
+    
+    def rebuild_indexes(self) -> Dict[str, int]:
+        """Reconstruye los índices de todos los ficheros existentes."""
+        return rebuild_indexes(self.events_dir)
+    
     def verify_chain_integrity(
         self,
         start_date: Optional[date] = None,
@@ -261,7 +381,8 @@ class EventStore:
         """
         Verifica integridad de la cadena de eventos.
         
-        Valida que cada evento N contiene el hash correcto del evento N-1.
+        Valida que cada evento N contiene el hash correcto del evento N-1,
+        además del hash y el HMAC de cada evento (ver verify_chain).
         
         Args:
             start_date: Fecha inicio para verificación
@@ -270,55 +391,118 @@ class EventStore:
         Returns:
             True si la cadena es íntegra, False si detecta corrupción
         """
-        events = self.get_events(start_date=start_date, end_date=end_date, limit=100000)
+        return self.verify_chain(start_date=start_date, end_date=end_date).ok
+    
+    def verify_chain(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        workers: int = 1,
+        use_checkpoints: bool = True
+    ) -> ChainVerificationReport:
+        """
+        Verificación streaming (memoria constante) y reanudable de la cadena.
         
-        if not events:
-            return True
+        Cada día se verifica desde su checkpoint firmado en integrity/ (o desde
+        el inicio) y se guarda un checkpoint nuevo al terminar sin errores.
         
-        for i in range(1, len(events)):
-            prev_event = events[i - 1]
-            current_event = events[i]
+        Args:
+            start_date: Fecha inicio (inclusive)
+            end_date: Fecha fin (inclusive)
+            workers: Procesos para verificar días en paralelo (1: secuencial)
+            use_checkpoints: False re-verifica todo el rango desde cero
             
-            # Verificar que current_event.prev_event_hash == prev_event.event_hash
-            if current_event.prev_event_hash != prev_event.event_hash:
-                logger.error(
-                    f"CHAIN_INTEGRITY_BREACH: Event {current_event.event_id} "
-                    f"has invalid prev_hash. Expected {prev_event.event_hash}, "
-                    f"got {current_event.prev_event_hash}"
-                )
-                return False
-        
-        logger.info(f"Chain integrity verified: {len(events)} events OK")
-        return True
+        Returns:
+            ChainVerificationReport con errores detectados y eventos verificados
+        """
+        self.flush()
+        verifier = ChainVerifier(self.events_dir, self.integrity_dir, self.hmac_key)
+        return verifier.verify(
+            self._files_in_range(start_date, end_date),
+            workers=workers,
+            use_checkpoints=use_checkpoints
+        )
     
     def _compute_hmac(self, event: Event) -> str:
-        """Calcula HMAC del evento."""
-        content = event.to_dict()
-        content_json = json.dumps(content, sort_keys=True)
-        return hmac.new(self.hmac_key, content_json.encode(), hashlib.sha256).hexdigest()
+        """Calcula HMAC del evento (sobre to_dict() canónico, sin re-serializar)."""
+        content_json = event.canonical_json(include_hash=True)
+        mac = self._hmac_template.copy()
+        mac.update(content_json.encode())
+        return mac.hexdigest()
     
     def _write_event(self, event: Event, event_hmac: str):
-        """Escribe evento a archivo append-only."""
-        today = date.today()
+        """Encola evento para el fichero append-only del día."""
+        today = event.timestamp.date()
         
-        # Si cambió el día, rotar archivo
+        # Si cambió el día, rotar archivo (el writer cambia de fichero en orden)
         if today != self._current_date:
-            if self._current_file_handle:
-                self._current_file_handle.close()
             self._current_date = today
-            self._current_file_handle = None
+            self._current_path = self._get_file_path(today)
         
-        file_path = self._get_file_path(today)
-        
-        # Escribir evento como línea JSON
-        event_record = {
-            'event': event.to_dict(),
-            'hmac': event_hmac,
-            'written_at': datetime.now().isoformat()
-        }
-        
-        with open(file_path, 'a') as f:
-            f.write(json.dumps(event_record) + '\n')
+        # Escribir evento como línea JSON (el evento viaja para indexarlo tras el commit)
+        line = event.record_json(event_hmac, datetime.now().isoformat())
+        self._writer.write(self._current_path, line + '\n', event)
+    
+    def _on_commit(self, file_path: Path, offsets: List[int], events: List[Event], end: int):
+        """Mantenimiento del índice tras cada commit (hilo del writer)."""
+        with self._index_lock:
+            if file_path != self._indexing_path:
+                # Rotación: dejar completo el índice del fichero anterior
+                self._flush_index_entries()
+                self._indexing_path = file_path
+                self._index_start = offsets[0]
+            
+            for offset, event in zip(offsets, events):
+                for key in event_keys(event.to_dict()):
+                    self._index_keys.append(key)
+                    self._index_offsets.append(offset)
+            self._index_end = end
+            self._unindexed_events += len(events)
+            
+            # Cada actualización reescribe el índice del día: como mucho una por
+            # INDEX_MIN_INTERVAL_S aunque el ritmo de eventos sea alto
+            if (self._unindexed_events >= self.index_every and
+                    time.monotonic() - self._last_index_refresh >= self.INDEX_MIN_INTERVAL_S):
+                self._flush_index_entries()
+    
+    def _flush_index_entries(self):
+        """Vuelca al índice las entradas acumuladas por _on_commit (con _index_lock)."""
+        if self._indexing_path is not None and self._index_keys:
+            EventIndex(self._indexing_path).append(
+                self._index_keys, self._index_offsets, self._index_start, self._index_end
+            )
+        self._index_keys, self._index_offsets = [], []
+        self._index_start = self._index_end
+        self._unindexed_events = 0
+        self._last_index_refresh = time.monotonic()
+    
+    def _files_in_range(
+        self,
+        start_date: Optional[date],
+        end_date: Optional[date]
+    ) -> List[Path]:
+        """Ficheros diarios existentes entre start_date y end_date (inclusive)."""
+        files = []
+        for file_path in event_files(self.events_dir):
+            try:
+                file_date = date.fromisoformat(file_path.name.split('.')[0])
+            except ValueError:
+                continue
+            if start_date and file_date < start_date:
+                continue
+            if end_date and file_date > end_date:
+                continue
+            files.append(file_path)
+        return files
+    
+    def _iter_records(self, file_path: Path) -> Iterator[Dict]:
+        """Registros de un fichero diario, en orden."""
+        with open(file_path, 'r') as f:
+            for line in f:
+                try:
+                    yield json.loads(line.strip())
+                except json.JSONDecodeError as e:
+                    logger.error(f"Error parsing event: {e}")
     
     def _get_file_path(self, event_date: date) -> Path:
         """Obtiene path del archivo para una fecha."""
@@ -348,6 +532,7 @@ class EventStore:
     
     def get_stats(self) -> Dict:
         """Obtiene estadísticas del event store."""
+        self.flush()
         event_files = list(self.events_dir.glob("*.events.jsonl"))
         
         total_events = 0
@@ -363,5 +548,6 @@ class EventStore:
             'total_files': len(event_files),
             'total_size_mb': total_size_bytes / (1024 * 1024),
             'last_event_hash': self._last_event_hash,
-            'store_path': str(self.store_path)
+            'store_path': str(self.store_path),
+            'writer': self._writer.get_stats()
         }
@@ -0,0 +1,233 @@
+"""
+Event Writer - Escritor append-only con group commit para el EventStore
+Los llamadores encolan líneas ya serializadas; un hilo de commit las escribe
+por lotes con el handle del fichero diario abierto y un único fsync por lote.
+
+Semántica de group commit:
+- Un lote se confirma cuando alcanza max_batch_events o cuando el evento
+  más antiguo pendiente lleva max_latency_ms esperando
+- flush() bloquea hasta que todo lo encolado está escrito (y fsync-ado)
+- El orden de escritura es el orden de encolado (la cadena HMAC se conserva)
+"""
+
+import atexit
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class GroupCommitWriter:
+    """
+    Escritor por lotes de líneas JSON en ficheros append-only.
+
+    Uso:
+        writer = GroupCommitWriter(max_latency_ms=5.0)
+        writer.write(path, line)      # no bloquea (salvo backpressure)
+        writer.flush()                # durable hasta aquí
+        writer.close()
+    """
+
+    def __init__(
+        self,
+        max_latency_ms: float = 5.0,
+        max_batch_events: int = 4096,
+        max_pending_events: int = 100000,
+        fsync: bool = True,
+        on_commit: Optional[Callable[[Path, List[int], List[Any], int], None]] = None
+    ):
+        """
+        Inicializa writer y arranca el hilo de commit.
+
+        Args:
+            max_latency_ms: Espera máxima de un evento antes de confirmarse
+            max_batch_events: Tamaño de lote que fuerza commit inmediato
+            max_pending_events: Cota de la cola; write() bloquea al alcanzarla
+            fsync: fsync por lote (False: solo flush al sistema operativo)
+            on_commit: Callback (path, offsets, metas, fin) tras cada commit, en el
+                hilo de commit: offset de byte de cada línea escrita, el meta
+                pasado a write() y el tamaño del fichero tras el commit
+        """
+        self.max_latency_s = max_latency_ms / 1000.0
+        self.max_batch_events = max_batch_events
+        self.max_pending_events = max_pending_events
+        self.fsync = fsync
+        self.on_commit = on_commit
+
+        self._cond = threading.Condition()
+        self._pending: List[Tuple[Path, str, Any]] = []
+        self._first_pending_at = 0.0
+        self._enqueued_seq = 0
+        self._committed_seq = 0
+        self._error: Optional[BaseException] = None
+        self._closed = False
+
+        self._file_path: Optional[Path] = None
+        self._file_handle = None
+
+        # Estadísticas
+        self.batches = 0
+        self.events_written = 0
+        self.fsyncs = 0
+        self.max_batch_size = 0
+        self.max_commit_ms = 0.0
+
+        self._worker = threading.Thread(target=self._run, name='GroupCommitWriter', daemon=True)
+        self._worker.start()
+
+        atexit.register(self.close)
+
+    def write(self, path: Path, line: str, meta: Any = None) -> int:
+        """
+        Encola una línea (debe terminar en '\\n') para el fichero path.
+
+        Args:
+            path: Fichero destino
+            line: Línea a escribir
+            meta: Dato opaco devuelto a on_commit junto al offset de la línea
+
+        Returns:
+            Nº de secuencia de la línea (ver wait_for)
+        """
+        with self._cond:
+            self._raise_error()
+            if self._closed:
+                raise RuntimeError("GroupCommitWriter is closed")
+
+            # Backpressure: el hilo de commit no da abasto
+            while len(self._pending) >= self.max_pending_events and self._error is None:
+                self._cond.wait()
+            self._raise_error()
+
+            if not self._pending:
+                self._first_pending_at = time.monotonic()
+            self._pending.append((path, line, meta))
+            self._enqueued_seq += 1
+
+            if len(self._pending) == 1 or len(self._pending) >= self.max_batch_events:
+                self._cond.notify_all()
+            return self._enqueued_seq
+
+    def wait_for(self, seq: int):
+        """Bloquea hasta que la línea seq está confirmada."""
+        with self._cond:
+            while self._committed_seq < seq and self._error is None:
+                self._cond.wait()
+            self._raise_error()
+
+    def flush(self):
+        """Bloquea hasta que todo lo encolado está confirmado."""
+        with self._cond:
+            seq = self._enqueued_seq
+        self.wait_for(seq)
+
+    def close(self):
+        """Confirma lo pendiente, detiene el hilo y cierra el fichero."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._worker.join()
+        if self._file_handle:
+            self._file_handle.close()
+            self._file_handle = None
+
+    def get_stats(self) -> Dict:
+        """Estadísticas del writer."""
+        with self._cond:
+            pending = len(self._pending)
+        return {
+            'batches': self.batches,
+            'events_written': self.events_written,
+            'fsyncs': self.fsyncs,
+            'avg_batch_size': self.events_written / self.batches if self.batches else 0.0,
+            'max_batch_size': self.max_batch_size,
+            'max_commit_ms': self.max_commit_ms,
+            'pending_events': pending,
+        }
+
+    def _raise_error(self):
+        if self._error is not None:
+            raise RuntimeError(f"GroupCommitWriter failed: {self._error}") from self._error
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending and self._closed:
+                    return
+
+                # Agrupar: esperar hasta lote lleno o latencia máxima del más antiguo
+                deadline = self._first_pending_at + self.max_latency_s
+                while (not self._closed and len(self._pending) < self.max_batch_events):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+
+                batch, self._pending = self._pending, []
+                batch_seq = self._enqueued_seq
+                self._cond.notify_all()   # libera write() bloqueados por backpressure
+
+            try:
+                start = time.perf_counter()
+                self._commit(batch)
+                commit_ms = (time.perf_counter() - start) * 1000
+            except BaseException as e:
+                logger.error(f"Event batch commit failed ({len(batch)} events): {e}")
+                with self._cond:
+                    self._error = e
+                    self._cond.notify_all()
+                return
+
+            with self._cond:
+                self._committed_seq = batch_seq
+                self.batches += 1
+                self.events_written += len(batch)
+                self.max_batch_size = max(self.max_batch_size, len(batch))
+                self.max_commit_ms = max(self.max_commit_ms, commit_ms)
+                self._cond.notify_all()
+
+    def _commit(self, batch: List[Tuple[Path, str, Any]]):
+        """Escribe el lote (agrupado por fichero, en orden) con un fsync por fichero."""
+        start = 0
+        while start < len(batch):
+            path = batch[start][0]
+            end = start
+            while end < len(batch) and batch[end][0] == path:
+                end += 1
+
+            if path != self._file_path:
+                # Rotación (cambio de día): cerrar el fichero anterior
+                if self._file_handle:
+                    self._file_handle.close()
+                self._file_handle = open(path, 'ab')
+                self._file_path = path
+
+            # Binario: offsets exactos (sin traducción de fin de línea)
+            data = [line.encode('utf-8') for _, line, _ in batch[start:end]]
+            position = self._file_handle.tell()
+            offsets = []
+            for chunk in data:
+                offsets.append(position)
+                position += len(chunk)
+
+            self._file_handle.write(b''.join(data))
+            self._file_handle.flush()
+            if self.fsync:
+                os.fsync(self._file_handle.fileno())
+                self.fsyncs += 1
+
+            if self.on_commit is not None:
+                try:
+                    self.on_commit(path, offsets, [meta for _, _, meta in batch[start:end]], position)
+                except Exception as e:
+                    logger.error(f"Event commit callback failed: {e}")
+
+            start = end
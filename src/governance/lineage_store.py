@@ -0,0 +1,246 @@
+"""
+Lineage Store - Almacenamiento direccionado por contenido de barras de data slices
+Las barras de cada instrumento se parten en bloques de filas que se guardan
+como chunks binarios (chunks/ab/abcd....bin, nombre = SHA256 del contenido).
+Un slice solo referencia los digests de sus chunks: slices consecutivos
+comparten casi todas las barras y por tanto casi todos los chunks.
+
+Partición definida por contenido: se corta tras una fila cuando su hash
+cumple hash % AVG_CHUNK_ROWS == 0, de modo que desplazar la ventana de
+barras una posición solo cambia el primer y el último chunk.
+
+Formato de chunk:
+- u32 longitud + cabecera JSON {'columns': [[nombre, dtype]], 'rows', 'index'}
+- Por columna (y el índice si no es RangeIndex): u64 longitud + bytes
+  (numpy crudo para dtypes numéricos/fecha; JSON para el resto)
+"""
+
+import hashlib
+import json
+import os
+import struct
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+AVG_CHUNK_ROWS = 16
+MAX_CHUNK_ROWS = 64
+
+_HEADER_LEN = struct.Struct('<I')
+_BLOCK_LEN = struct.Struct('<Q')
+_BINARY_KINDS = 'biufmM'
+
+
+def _column_bytes(values) -> Tuple[str, bytes]:
+    """(dtype, bytes) de una columna: numpy crudo si el dtype lo permite, si no JSON."""
+    dtype = values.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in _BINARY_KINDS:
+        return dtype.str, np.ascontiguousarray(values.to_numpy()).tobytes()
+    return str(dtype), json.dumps(list(values), default=str).encode()
+
+
+def _column_values(dtype: str, data: bytes):
+    """Inversa de _column_bytes."""
+    try:
+        np_dtype = np.dtype(dtype)
+    except TypeError:
+        np_dtype = None     # dtype de pandas (categórico, fecha con zona...)
+
+    if np_dtype is not None and np_dtype.kind in _BINARY_KINDS:
+        return np.frombuffer(data, dtype=np_dtype).copy()
+
+    values = pd.Series(json.loads(data), dtype=object)
+    if dtype != 'object':
+        try:
+            values = values.astype(dtype)
+        except (TypeError, ValueError):
+            pass
+    return values.to_numpy()
+
+
+def encode_frame(frame: pd.DataFrame, keep_index: bool) -> bytes:
+    """Serializa un bloque de filas (determinístico para el mismo contenido)."""
+    columns, blocks = [], []
+    for name in frame.columns:
+        dtype, data = _column_bytes(frame[name])
+        columns.append([name, dtype])
+        blocks.append(data)
+
+    index = None
+    if keep_index:
+        dtype, data = _column_bytes(frame.index.to_series())
+        index = [frame.index.name, dtype]
+        blocks.append(data)
+
+    header = json.dumps({'columns': columns, 'rows': len(frame), 'index': index},
+                        sort_keys=True, default=str).encode()
+    parts = [_HEADER_LEN.pack(len(header)), header]
+    for data in blocks:
+        parts.append(_BLOCK_LEN.pack(len(data)))
+        parts.append(data)
+    return b''.join(parts)
+
+
+def decode_frame(chunk: bytes) -> pd.DataFrame:
+    """Inversa de encode_frame."""
+    (header_len,) = _HEADER_LEN.unpack_from(chunk, 0)
+    position = _HEADER_LEN.size
+    header = json.loads(chunk[position:position + header_len])
+    position += header_len
+
+    def next_block() -> bytes:
+        nonlocal position
+        (length,) = _BLOCK_LEN.unpack_from(chunk, position)
+        position += _BLOCK_LEN.size
+        data = chunk[position:position + length]
+        position += length
+        return data
+
+    data = {name: _column_values(dtype, next_block()) for name, dtype in header['columns']}
+    index = None
+    if header['index'] is not None:
+        name, dtype = header['index']
+        index = pd.Index(_column_values(dtype, next_block()), name=name)
+
+    return pd.DataFrame(data, index=index, columns=[name for name, _ in header['columns']])
+
+
+class ChunkStore:
+    """
+    Almacén de bloques de barras direccionado por contenido.
+
+    Uso:
+        store = ChunkStore(lineage_path / 'chunks')
+        manifest = store.put_frame(df.tail(200))   # {'chunks': [...], 'rows', ...}
+        df = store.get_frame(manifest)
+    """
+
+    def __init__(self, chunks_path: Path, digest_cache_size: int = 4096):
+        """
+        Args:
+            chunks_path: Directorio de chunks
+            digest_cache_size: Bloques recientes (por hash de filas) cuyo digest
+                se recuerda para no re-serializarlos en cada slice
+        """
+        self.chunks_path = Path(chunks_path)
+        self.chunks_path.mkdir(parents=True, exist_ok=True)
+        self.digest_cache_size = digest_cache_size
+        self._digest_cache: 'OrderedDict[bytes, str]' = OrderedDict()
+
+        # Estadísticas
+        self.chunks_written = 0
+        self.chunks_reused = 0
+        self.bytes_written = 0
+
+    def put_frame(self, frame: pd.DataFrame) -> Dict:
+        """
+        Guarda las filas de frame como chunks (solo los que no existen).
+
+        Returns:
+            Entrada de manifest: {'chunks', 'rows', 'columns', 'range_index'}
+            (range_index = [inicio, paso] si el índice es RangeIndex, que no se
+            guarda en los chunks para no romper la deduplicación)
+        """
+        range_index = None
+        keep_index = not isinstance(frame.index, pd.RangeIndex)
+        if not keep_index:
+            range_index = [int(frame.index.start), int(frame.index.step)]
+
+        row_hashes = pd.util.hash_pandas_object(frame, index=keep_index).to_numpy()
+        schema = json.dumps([[name, str(dtype)] for name, dtype in frame.dtypes.items()],
+                            default=str).encode()
+
+        chunks = []
+        for start, end in self._boundaries(row_hashes):
+            cache_key = schema + row_hashes[start:end].tobytes()
+            digest = self._digest_cache.get(cache_key)
+            if digest is not None:
+                self._digest_cache.move_to_end(cache_key)
+                self.chunks_reused += 1
+            else:
+                digest = self._put(encode_frame(frame.iloc[start:end], keep_index))
+                self._digest_cache[cache_key] = digest
+                if len(self._digest_cache) > self.digest_cache_size:
+                    self._digest_cache.popitem(last=False)
+            chunks.append(digest)
+
+        return {
+            'chunks': chunks,
+            'rows': len(frame),
+            'columns': [str(name) for name in frame.columns],
+            'range_index': range_index
+        }
+
+    def get_frame(self, entry: Dict) -> pd.DataFrame:
+        """Reensambla un DataFrame desde su entrada de manifest."""
+        frames = [decode_frame(self.get(digest)) for digest in entry['chunks']]
+        if frames:
+            frame = pd.concat(frames)
+        else:
+            frame = pd.DataFrame(columns=entry.get('columns', []))
+
+        if entry.get('range_index') is not None:
+            start, step = entry['range_index']
+            frame.index = pd.RangeIndex(start, start + step * len(frame), step)
+        return frame
+
+    def get(self, digest: str) -> bytes:
+        """Bytes de un chunk (verificando su digest)."""
+        with open(self._chunk_path(digest), 'rb') as f:
+            data = f.read()
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Chunk {digest} is corrupted")
+        return data
+
+    def get_stats(self) -> Dict:
+        """Estadísticas del almacén de chunks."""
+        chunk_files = list(self.chunks_path.rglob('*.bin'))
+        return {
+            'total_chunks': len(chunk_files),
+            'total_size_mb': sum(f.stat().st_size for f in chunk_files) / (1024 * 1024),
+            'chunks_written': self.chunks_written,
+            'chunks_reused': self.chunks_reused,
+            'bytes_written': self.bytes_written
+        }
+
+    def _put(self, data: bytes) -> str:
+        """Guarda un chunk si no existe; devuelve su digest."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._chunk_path(digest)
+        if path.exists():
+            self.chunks_reused += 1
+            return digest
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        self.chunks_written += 1
+        self.bytes_written += len(data)
+        return digest
+
+    def _chunk_path(self, digest: str) -> Path:
+        return self.chunks_path / digest[:2] / f"{digest}.bin"
+
+    @staticmethod
+    def _boundaries(row_hashes: np.ndarray) -> List[Tuple[int, int]]:
+        """Rangos [inicio, fin) de filas por chunk (cortes definidos por contenido)."""
+        cuts = np.flatnonzero(row_hashes % AVG_CHUNK_ROWS == 0) + 1
+        ranges, start = [], 0
+        for cut in list(cuts) + [len(row_hashes)]:
+            while cut - start > MAX_CHUNK_ROWS:
+                ranges.append((start, start + MAX_CHUNK_ROWS))
+                start += MAX_CHUNK_ROWS
+            if cut > start:
+                ranges.append((start, int(cut)))
+                start = int(cut)
+        return ranges
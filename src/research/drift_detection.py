@@ -5,38 +5,61 @@ Implementa ADWIN y SPRT para detectar cambios en distribución.
 
 import logging
 import numpy as np
-from typing import Optional, List, Tuple
+from typing import Dict, Hashable, Optional, List, Tuple
 from datetime import datetime
-from collections import deque
 
 logger = logging.getLogger(__name__)
 
 
 class ADWIN:
     """
-    ADaptive WINdowing - Detector de drift automático.
+    ADaptive WINdowing (ADWIN2) - Detector de drift automático.
     
-    Mantiene ventana deslizante de tamaño variable que se ajusta
-    cuando detecta cambio estadístico en la distribución.
+    Mantiene la ventana como histograma exponencial: la fila i guarda
+    hasta `max_buckets` buckets de 2^i muestras (total y varianza de
+    cada uno). Memoria O(log W) y update amortizado O(log W).
+    
+    Cada `clock` muestras se prueban todos los cortes entre buckets;
+    mientras alguno supera el bound se descarta el bucket más antiguo.
+    Con clock=1 (por defecto) update() comprueba en cada llamada; un clock
+    mayor abarata streams largos (update_many, benchmarks) a cambio de que
+    update() devuelva False entre chequeos y el drift se vea hasta clock-1
+    muestras más tarde.
     """
     
-    def __init__(self, delta: float = 0.002):
+    def __init__(
+        self,
+        delta: float = 0.002,
+        clock: int = 1,
+        max_buckets: int = 5,
+        min_window_length: int = 5
+    ):
         """
         Inicializa ADWIN.
         
         Args:
             delta: Nivel de confianza (menor = más sensible)
+            clock: Cada cuántas muestras se buscan cortes
+            max_buckets: Buckets por fila antes de fusionar (M)
+            min_window_length: Mínimo de muestras en cada subventana
         """
         self.delta = delta
-        self._window: deque = deque()
+        self.clock = max(1, int(clock))
+        self.max_buckets = max(2, int(max_buckets))
+        self.min_window_length = max(1, int(min_window_length))
+        
+        # Fila i: buckets de 2^i muestras, del más antiguo al más reciente
+        self._bucket_totals: List[List[float]] = [[]]
+        self._bucket_variances: List[List[float]] = [[]]
         self._width = 0
         self._variance = 0.0
         self._total = 0.0
+        self._tick = 0
         
         self._drift_detected = False
         self._detection_count = 0
         
-        logger.info(f"ADWIN initialized with delta={delta}")
+        logger.info(f"ADWIN initialized with delta={delta}, clock={self.clock}")
     
     def update(self, value: float) -> bool:
         """
@@ -48,88 +71,180 @@ class ADWIN:
         Returns:
             True si se detectó drift
         """
-        self._window.append(value)
-        self._width += 1
+        self._insert([float(value)])
         
-        # Actualizar estadísticas
-        if self._width == 1:
-            self._total = value
-            self._variance = 0.0
-        else:
-            old_mean = self._total / (self._width - 1)
-            self._total += value
-            new_mean = self._total / self._width
-            
-            self._variance += (value - old_mean) * (value - new_mean)
+        self._tick += 1
+        if self._tick < self.clock:
+            return False
+        self._tick = 0
         
-        # Verificar drift
         drift = self._detect_change()
-        
         if drift:
-            self._drift_detected = True
-            self._detection_count += 1
-            logger.warning(
-                f"Drift detected! Window size before: {self._width}, "
-                f"detection #{self._detection_count}"
-            )
+            self._register_drift()
         
         return drift
     
-    def _detect_change(self) -> bool:
-        """Verifica si hay cambio estadístico."""
-        if self._width < 2:
-            return False
-        
-        # Probar diferentes split points
-        n = self._width
-        
-        # Simplificación: probar split en el medio
-        n0 = n // 2
-        n1 = n - n0
-        
-        if n0 < 5 or n1 < 5:
-            return False
+    def update_many(self, values) -> np.ndarray:
+        """
+        Añade un lote de valores en orden, con los mismos chequeos que
+        llamadas sucesivas a update().
         
-        # Calcular medias de cada subventana
-        window_list = list(self._window)
-        mean0 = np.mean(window_list[:n0])
-        mean1 = np.mean(window_list[n0:])
+        Args:
+            values: Array-like 1-D de valores
+            
+        Returns:
+            Posiciones (dentro de values) en las que se detectó drift
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        detections = []
+        
+        start = 0
+        n = len(values)
+        while start < n:
+            # Insertar hasta el próximo chequeo de clock
+            stop = min(n, start + self.clock - self._tick)
+            self._insert(values[start:stop].tolist())
+            self._tick += stop - start
+            start = stop
+            
+            if self._tick < self.clock:
+                break
+            self._tick = 0
+            
+            if self._detect_change():
+                self._register_drift()
+                detections.append(stop - 1)
         
-        # Calcular bound (Hoeffding bound)
-        m = 1.0 / (1.0 / n0 + 1.0 / n1)
+        return np.asarray(detections, dtype=np.int64)
+    
+    def _insert(self, values: List[float]):
+        """
+        Añade muestras como buckets de tamaño 1 y comprime filas.
         
-        epsilon = np.sqrt(
-            (1.0 / (2 * m)) * np.log(4.0 / self.delta)
-        )
+        Fusionar siempre los dos buckets más antiguos hace que añadir un
+        bloque y comprimir después deje el mismo histograma que insertar
+        las muestras una a una.
+        """
+        count = len(values)
+        block_total = sum(values)
+        block_mean = block_total / count
+        block_variance = sum((value - block_mean) ** 2 for value in values)
+        
+        if self._width > 0:
+            diff = block_mean - self._total / self._width
+            self._variance += block_variance + self._width * count * diff * diff / (self._width + count)
+        else:
+            self._variance = block_variance
+        self._width += count
+        self._total += block_total
+        
+        self._bucket_totals[0].extend(values)
+        self._bucket_variances[0].extend([0.0] * count)
+        
+        row = 0
+        while len(self._bucket_totals[row]) > self.max_buckets:
+            totals = self._bucket_totals[row]
+            variances = self._bucket_variances[row]
+            size = 1 << row
+            
+            # Fusionar por parejas los buckets más antiguos en la fila siguiente
+            merged = 2 * ((len(totals) - self.max_buckets + 1) // 2)
+            totals_a, totals_b = totals[0:merged:2], totals[1:merged:2]
+            variances_a, variances_b = variances[0:merged:2], variances[1:merged:2]
+            del totals[:merged], variances[:merged]
+            
+            if row + 1 == len(self._bucket_totals):
+                self._bucket_totals.append([])
+                self._bucket_variances.append([])
+            self._bucket_totals[row + 1].extend(
+                [a + b for a, b in zip(totals_a, totals_b)]
+            )
+            self._bucket_variances[row + 1].extend(
+                [va + vb + (a - b) ** 2 / (2 * size)
+                 for a, b, va, vb in zip(totals_a, totals_b, variances_a, variances_b)]
+            )
+            row += 1
+    
+    def _drop_oldest_bucket(self):
+        """Elimina el bucket más antiguo (fila más alta) y ajusta estadísticas."""
+        row = len(self._bucket_totals) - 1
+        size = 1 << row
+        total = self._bucket_totals[row].pop(0)
+        variance = self._bucket_variances[row].pop(0)
+        
+        self._width -= size
+        self._total -= total
+        if self._width > 0:
+            diff = total / size - self._total / self._width
+            self._variance -= variance + size * self._width * diff * diff / (size + self._width)
+            self._variance = max(self._variance, 0.0)
+        else:
+            self._total = 0.0
+            self._variance = 0.0
         
-        # Detectar si diferencia excede bound
-        if abs(mean0 - mean1) > epsilon:
-            # Reducir ventana, eliminar datos antiguos
-            remove_count = n0
-            for _ in range(remove_count):
-                self._window.popleft()
+        while len(self._bucket_totals) > 1 and not self._bucket_totals[-1]:
+            self._bucket_totals.pop()
+            self._bucket_variances.pop()
+    
+    def _bucket_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Tamaños y totales de todos los buckets, del más antiguo al más reciente."""
+        sizes: List[int] = []
+        totals: List[float] = []
+        for row in range(len(self._bucket_totals) - 1, -1, -1):
+            row_totals = self._bucket_totals[row]
+            sizes.extend([1 << row] * len(row_totals))
+            totals.extend(row_totals)
+        return np.asarray(sizes, dtype=np.float64), np.asarray(totals, dtype=np.float64)
+    
+    def _detect_change(self) -> bool:
+        """Prueba todos los cortes entre buckets; recorta mientras haya cambio."""
+        detected = False
+        
+        while self._width >= 2 * self.min_window_length:
+            sizes, totals = self._bucket_arrays()
+            n0 = np.cumsum(sizes)[:-1]
+            s0 = np.cumsum(totals)[:-1]
+            n1 = self._width - n0
+            s1 = self._total - s0
+            
+            valid = (n0 >= self.min_window_length) & (n1 >= self.min_window_length)
+            if not valid.any():
+                break
+            n0, n1, s0, s1 = n0[valid], n1[valid], s0[valid], s1[valid]
             
-            self._width = len(self._window)
+            # Bound de Bernstein con delta' = delta / ln(W) (ADWIN2)
+            variance = self._variance / self._width
+            log_term = np.log(2.0 * np.log(self._width) / self.delta)
+            m = 1.0 / (1.0 / n0 + 1.0 / n1)
+            epsilon = (
+                np.sqrt(2.0 / m * variance * log_term)
+                + 2.0 / (3.0 * m) * log_term
+            )
             
-            # Recalcular estadísticas
-            if self._width > 0:
-                self._total = sum(self._window)
-                window_array = np.array(self._window)
-                self._variance = np.var(window_array) * self._width
-            else:
-                self._total = 0.0
-                self._variance = 0.0
+            if not np.any(np.abs(s0 / n0 - s1 / n1) > epsilon):
+                break
             
-            return True
+            self._drop_oldest_bucket()
+            detected = True
         
-        return False
+        return detected
+    
+    def _register_drift(self):
+        self._drift_detected = True
+        self._detection_count += 1
+        logger.warning(
+            f"Drift detected! Window size after: {self._width}, "
+            f"detection #{self._detection_count}"
+        )
     
     def reset(self):
         """Resetea detector."""
-        self._window.clear()
+        self._bucket_totals = [[]]
+        self._bucket_variances = [[]]
         self._width = 0
         self._variance = 0.0
         self._total = 0.0
+        self._tick = 0
         self._drift_detected = False
     
     @property
@@ -141,6 +256,16 @@ class ADWIN:
     def window_size(self) -> int:
         """Tamaño actual de la ventana."""
         return self._width
+    
+    @property
+    def mean(self) -> float:
+        """Media de la ventana actual."""
+        return self._total / self._width if self._width else 0.0
+    
+    @property
+    def n_buckets(self) -> int:
+        """Número de buckets en el histograma (O(log W))."""
+        return sum(len(row) for row in self._bucket_totals)
 
 
 class SPRT:
@@ -243,13 +368,16 @@ class DriftDetector:
     Drift detector combinado usando ADWIN y SPRT.
     
     Monitorea múltiples métricas y reporta drift cuando
-    alguno de los detectores lo identifica.
+    alguno de los detectores lo identifica. Cada métrica puede tener
+    varios streams (ej: uno por estrategia), cada uno con su propio
+    ADWIN y SPRT, de modo que un cambio se localiza en su stream.
     """
     
     def __init__(
         self,
         baseline_metrics: dict,
-        sensitivity: str = 'medium'
+        sensitivity: str = 'medium',
+        adwin_clock: int = 1
     ):
         """
         Inicializa detector combinado.
@@ -262,8 +390,11 @@ class DriftDetector:
                     ...
                 }
             sensitivity: 'low', 'medium', 'high'
+            adwin_clock: Clock de cada ADWIN (1 = chequeo en cada muestra;
+                mayor para streams de alta frecuencia o en lote)
         """
         self.baseline_metrics = baseline_metrics
+        self.adwin_clock = adwin_clock
         
         # Configurar sensibilidad
         sensitivity_configs = {
@@ -272,24 +403,15 @@ class DriftDetector:
             'high': {'delta_adwin': 0.001, 'delta_sprt': 0.25}
         }
         
-        config = sensitivity_configs.get(sensitivity, sensitivity_configs['medium'])
+        self._config = sensitivity_configs.get(sensitivity, sensitivity_configs['medium'])
         
-        # Inicializar detectores por métrica
-        self._adwin_detectors = {}
-        self._sprt_detectors = {}
+        # Detectores por (métrica, stream); se crean al ver un stream nuevo
+        # (stream None: métrica sin desglose)
+        self._adwin_detectors: Dict[Tuple[str, Hashable], ADWIN] = {}
+        self._sprt_detectors: Dict[Tuple[str, Hashable], SPRT] = {}
         
-        for metric_name, metric_stats in baseline_metrics.items():
-            # ADWIN
-            self._adwin_detectors[metric_name] = ADWIN(
-                delta=config['delta_adwin']
-            )
-            
-            # SPRT
-            self._sprt_detectors[metric_name] = SPRT(
-                baseline_mean=metric_stats['mean'],
-                baseline_std=metric_stats['std'],
-                delta=config['delta_sprt']
-            )
+        for metric_name in baseline_metrics:
+            self._get_detectors(metric_name, None)
         
         self._drift_history: List[dict] = []
         
@@ -303,10 +425,16 @@ class DriftDetector:
         Actualiza con nuevas métricas y verifica drift.
         
         Args:
-            metrics: Dict con valores actuales de métricas
+            metrics: Dict con valores actuales de métricas. Cada valor puede ser:
+                - escalar: una observación nueva
+                - array 1-D: observaciones nuevas del mismo stream en orden
+                  temporal (ADWIN las procesa en lote)
+                - dict {stream: escalar o array 1-D}: observaciones por
+                  stream (ej: {'momentum': 0.61, 'mean_reversion': 0.58})
             
         Returns:
-            Dict con resultados de detección
+            Dict con resultados de detección ('stream' identifica el stream
+            con drift; None si la métrica no va desglosada)
         """
         results = {
             'drift_detected': False,
@@ -315,35 +443,74 @@ class DriftDetector:
         }
         
         for metric_name, value in metrics.items():
-            if metric_name not in self._adwin_detectors:
+            if metric_name not in self.baseline_metrics:
                 continue
             
-            # Test ADWIN
-            adwin_drift = self._adwin_detectors[metric_name].update(value)
-            
-            # Test SPRT
-            sprt_result = self._sprt_detectors[metric_name].update(value)
-            
-            # Marcar drift si alguno lo detecta
-            if adwin_drift or sprt_result == 'drift':
-                results['drift_detected'] = True
-                results['drifted_metrics'].append({
-                    'metric': metric_name,
-                    'value': value,
-                    'baseline_mean': self.baseline_metrics[metric_name]['mean'],
-                    'detector': 'ADWIN' if adwin_drift else 'SPRT'
-                })
-        
-        if results['drift_detected']:
+            streams = value.items() if isinstance(value, dict) else [(None, value)]
+            for stream, stream_value in streams:
+                drift = self._update_stream(metric_name, stream, stream_value)
+                if drift is not None:
+                    results['drifted_metrics'].append(drift)
+        
+        if results['drifted_metrics']:
+            results['drift_detected'] = True
             self._drift_history.append(results)
             
             logger.warning(
                 f"Drift detected in metrics: "
-                f"{[m['metric'] for m in results['drifted_metrics']]}"
+                f"{[self._label(m['metric'], m['stream']) for m in results['drifted_metrics']]}"
             )
         
         return results
     
+    def _update_stream(self, metric_name: str, stream: Hashable, value) -> Optional[dict]:
+        """Actualiza los detectores de un stream; devuelve la entrada de drift o None."""
+        adwin, sprt = self._get_detectors(metric_name, stream)
+        
+        if np.ndim(value) == 0:
+            adwin_drift = adwin.update(value)
+            sprt_result = sprt.update(value)
+        else:
+            values = np.asarray(value, dtype=np.float64).ravel()
+            if len(values) == 0:
+                return None
+            adwin_drift = len(adwin.update_many(values)) > 0
+            sprt_results = [sprt.update(v) for v in values.tolist()]
+            sprt_result = 'drift' if 'drift' in sprt_results else sprt_results[-1]
+            value = values[-1]
+        
+        # Marcar drift si alguno lo detecta
+        if not (adwin_drift or sprt_result == 'drift'):
+            return None
+        
+        return {
+            'metric': metric_name,
+            'stream': stream,
+            'value': value,
+            'baseline_mean': self.baseline_metrics[metric_name]['mean'],
+            'detector': 'ADWIN' if adwin_drift else 'SPRT'
+        }
+    
+    def _get_detectors(self, metric_name: str, stream: Hashable) -> Tuple[ADWIN, SPRT]:
+        """ADWIN y SPRT de un (métrica, stream), creándolos si es nuevo."""
+        key = (metric_name, stream)
+        if key not in self._adwin_detectors:
+            metric_stats = self.baseline_metrics[metric_name]
+            self._adwin_detectors[key] = ADWIN(
+                delta=self._config['delta_adwin'],
+                clock=self.adwin_clock
+            )
+            self._sprt_detectors[key] = SPRT(
+                baseline_mean=metric_stats['mean'],
+                baseline_std=metric_stats['std'],
+                delta=self._config['delta_sprt']
+            )
+        return self._adwin_detectors[key], self._sprt_detectors[key]
+    
+    @staticmethod
+    def _label(metric_name: str, stream: Hashable) -> str:
+        return metric_name if stream is None else f"{metric_name}[{stream}]"
+    
     def get_drift_history(self) -> List[dict]:
         """Obtiene historial de drift detectado."""
         return self._drift_history
@@ -6,17 +6,145 @@ Implementa método de triple barrier con meta-labeling opcional.
 import logging
 import numpy as np
 import pandas as pd
-from typing import Optional, Tuple
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Optional, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
+# Elementos (filas x max_holding_bars) por bloque de ventanas adelantadas
+DEFAULT_CHUNK_ELEMENTS = 4_000_000
+
+LABEL_COLUMNS = [
+    'entry_price', 'exit_price', 'label', 'barrier_hit',
+    'holding_bars', 'realized_return', 'side'
+]
+
+
+def _row_values(value: Union[float, pd.Series], index: pd.Index) -> np.ndarray:
+    """Escalar o Serie alineada con el índice de precios -> array por fila."""
+    if isinstance(value, pd.Series):
+        return value.reindex(index).to_numpy(dtype=np.float64)
+    return np.full(len(index), float(value))
+
+
+def _first_touch(
+    values: np.ndarray,
+    positions: np.ndarray,
+    upper_level: np.ndarray,
+    lower_level: np.ndarray,
+    max_holding_bars: int,
+    chunk_size: Optional[int] = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Primer toque de cada barrera de precio para las entradas dadas.
+
+    La ventana de la entrada i son los precios [i+1, i+1+max_holding_bars),
+    tomada como vista (sin copia) de sliding_window_view y evaluada por
+    bloques de filas para acotar la memoria de las máscaras booleanas.
+
+    Returns:
+        (first_upper, first_lower): offset 0-based dentro de la ventana,
+        max_holding_bars si la barrera no se toca
+    """
+    windows = sliding_window_view(values[1:], max_holding_bars)
+    if chunk_size is None:
+        chunk_size = max(1, DEFAULT_CHUNK_ELEMENTS // max_holding_bars)
+
+    first_upper = np.full(len(positions), max_holding_bars, dtype=np.int64)
+    first_lower = np.full(len(positions), max_holding_bars, dtype=np.int64)
+
+    for start in range(0, len(positions), chunk_size):
+        rows = slice(start, start + chunk_size)
+        forward = windows[positions[rows]]
+
+        hit_upper = forward >= upper_level[rows, None]
+        hit_lower = forward <= lower_level[rows, None]
+
+        first_upper[rows] = np.where(hit_upper.any(axis=1), hit_upper.argmax(axis=1), max_holding_bars)
+        first_lower[rows] = np.where(hit_lower.any(axis=1), hit_lower.argmax(axis=1), max_holding_bars)
+
+    return first_upper, first_lower
+
+
+def _label_positions(
+    prices: pd.Series,
+    positions: np.ndarray,
+    upper_threshold: Union[float, pd.Series],
+    lower_threshold: Union[float, pd.Series],
+    max_holding_bars: int,
+    side: Optional[pd.Series],
+    volatility: Optional[pd.Series],
+    chunk_size: Optional[int]
+) -> pd.DataFrame:
+    """Triple barrier vectorizado para las posiciones (enteras) de entrada."""
+    values = prices.to_numpy(dtype=np.float64)
+    positions = np.asarray(positions, dtype=np.int64)
+
+    if len(positions) == 0:
+        empty = pd.DataFrame(columns=LABEL_COLUMNS, index=prices.index[:0])
+        empty.index.name = 'timestamp'
+        return empty
+
+    upper = _row_values(upper_threshold, prices.index)[positions]
+    lower = _row_values(lower_threshold, prices.index)[positions]
+    if volatility is not None:
+        scale = _row_values(volatility, prices.index)[positions]
+        upper = upper * scale
+        lower = lower * scale
+
+    if side is not None:
+        sides = side.reindex(prices.index).to_numpy()[positions]
+    else:
+        sides = np.ones(len(positions), dtype=np.int64)  # Default long
+    is_long = sides == 1
+
+    entry = values[positions]
+
+    # Niveles de precio: long gana arriba, short gana abajo
+    profit_level = np.where(is_long, entry * (1 + upper), entry * (1 - upper))
+    stop_level = np.where(is_long, entry * (1 + lower), entry * (1 - lower))
+    upper_level = np.where(is_long, profit_level, stop_level)
+    lower_level = np.where(is_long, stop_level, profit_level)
+
+    first_upper, first_lower = _first_touch(
+        values, positions, upper_level, lower_level, max_holding_bars, chunk_size
+    )
+    first_profit = np.where(is_long, first_upper, first_lower)
+    first_stop = np.where(is_long, first_lower, first_upper)
+
+    # Ganancia solo si se toca estrictamente antes que el stop
+    profit_hit = first_profit < first_stop
+    stop_hit = ~profit_hit & (first_stop < max_holding_bars)
+
+    label = np.where(profit_hit, 1, np.where(stop_hit, -1, 0))
+    barrier_hit = np.where(profit_hit, 'upper', np.where(stop_hit, 'lower', 'time'))
+    exit_idx = np.where(profit_hit, first_profit, np.where(stop_hit, first_stop, max_holding_bars - 1))
+
+    exit_price = values[positions + 1 + exit_idx]
+    realized_return = np.where(is_long, exit_price / entry - 1, entry / exit_price - 1)
+
+    df = pd.DataFrame({
+        'entry_price': entry,
+        'exit_price': exit_price,
+        'label': label,
+        'barrier_hit': barrier_hit.astype(object),
+        'holding_bars': exit_idx + 1,
+        'realized_return': realized_return,
+        'side': sides,
+    }, index=prices.index[positions])
+    df.index.name = 'timestamp'
+
+    return df
+
 
 def triple_barrier_label(
     prices: pd.Series,
-    upper_threshold: float,
-    lower_threshold: float,
+    upper_threshold: Union[float, pd.Series],
+    lower_threshold: Union[float, pd.Series],
     max_holding_bars: int,
-    side: Optional[pd.Series] = None
+    side: Optional[pd.Series] = None,
+    volatility: Optional[pd.Series] = None,
+    chunk_size: Optional[int] = None
 ) -> pd.DataFrame:
     """
     Aplica triple barrier method para labeling.
@@ -26,100 +154,36 @@ def triple_barrier_label(
     - Upper barrier: ganancia objetivo
     - Lower barrier: pérdida máxima
     - Time barrier: máximo holding period
+
+    Todas las entradas se evalúan a la vez con ventanas adelantadas
+    (NumPy), por bloques de filas para acotar memoria.
     
     Args:
         prices: Serie de precios (close)
-        upper_threshold: Ganancia objetivo (ej: 0.002 = 0.2%)
-        lower_threshold: Pérdida máxima (ej: -0.001 = -0.1%)
+        upper_threshold: Ganancia objetivo (ej: 0.002 = 0.2%), escalar o Serie por fila
+        lower_threshold: Pérdida máxima (ej: -0.001 = -0.1%), escalar o Serie por fila
         max_holding_bars: Máximo de barras hacia adelante
         side: Lado de la operación (1=long, -1=short, None=ambos)
+        volatility: Serie por fila que escala ambos umbrales (ej: volatilidad
+                    diaria; upper=2.0 -> barrera a 2 sigmas)
+        chunk_size: Filas por bloque (None = ~4M elementos por bloque)
         
     Returns:
-        DataFrame con labels y metadata
+        DataFrame con labels y metadata (label 1 = barrera de ganancia
+        tocada primero, también para shorts)
     """
     logger.info(
         f"Triple barrier labeling: "
-        f"upper={upper_threshold:.4f}, lower={lower_threshold:.4f}, "
+        f"upper={np.nanmean(_row_values(upper_threshold, prices.index)):.4f}, "
+        f"lower={np.nanmean(_row_values(lower_threshold, prices.index)):.4f}, "
         f"max_bars={max_holding_bars}"
     )
-    
-    labels = []
-    
-    for i in range(len(prices) - max_holding_bars):
-        entry_price = prices.iloc[i]
-        
-        # Determinar lado
-        if side is not None:
-            position_side = side.iloc[i]
-        else:
-            position_side = 1  # Default long
-        
-        # Proyectar hacia adelante
-        forward_prices = prices.iloc[i+1:i+1+max_holding_bars]
-        
-        if position_side == 1:  # Long
-            # Upper barrier = ganancia
-            upper_barrier = entry_price * (1 + upper_threshold)
-            # Lower barrier = pérdida
-            lower_barrier = entry_price * (1 + lower_threshold)
-        else:  # Short
-            # Invertir barreras para short
-            upper_barrier = entry_price * (1 - lower_threshold)
-            lower_barrier = entry_price * (1 - upper_threshold)
-        
-        # Encontrar primera barrera tocada
-        hit_upper = forward_prices >= upper_barrier
-        hit_lower = forward_prices <= lower_barrier
-        
-        first_upper = hit_upper.idxmax() if hit_upper.any() else None
-        first_lower = hit_lower.idxmax() if hit_lower.any() else None
-        
-        # Determinar qué pasó primero
-        if first_upper is not None and first_lower is not None:
-            if forward_prices.index.get_loc(first_upper) < forward_prices.index.get_loc(first_lower):
-                label = 1  # Ganador
-                exit_idx = forward_prices.index.get_loc(first_upper)
-                barrier_hit = 'upper'
-            else:
-                label = -1  # Perdedor
-                exit_idx = forward_prices.index.get_loc(first_lower)
-                barrier_hit = 'lower'
-        elif first_upper is not None:
-            label = 1
-            exit_idx = forward_prices.index.get_loc(first_upper)
-            barrier_hit = 'upper'
-        elif first_lower is not None:
-            label = -1
-            exit_idx = forward_prices.index.get_loc(first_lower)
-            barrier_hit = 'lower'
-        else:
-            # Time barrier alcanzada
-            label = 0
-            exit_idx = len(forward_prices) - 1
-            barrier_hit = 'time'
-        
-        exit_price = forward_prices.iloc[exit_idx]
-        holding_bars = exit_idx + 1
-        
-        # Calcular return realizado
-        if position_side == 1:
-            realized_return = (exit_price / entry_price - 1)
-        else:
-            realized_return = (entry_price / exit_price - 1)
-        
-        labels.append({
-            'timestamp': prices.index[i],
-            'entry_price': entry_price,
-            'exit_price': exit_price,
-            'label': label,
-            'barrier_hit': barrier_hit,
-            'holding_bars': holding_bars,
-            'realized_return': realized_return,
-            'side': position_side
-        })
-    
-    df = pd.DataFrame(labels)
-    df.set_index('timestamp', inplace=True)
+
+    positions = np.arange(max(len(prices) - max_holding_bars, 0))
+    df = _label_positions(
+        prices, positions, upper_threshold, lower_threshold,
+        max_holding_bars, side, volatility, chunk_size
+    )
     
     # Estadísticas
     label_counts = df['label'].value_counts()
@@ -136,15 +200,20 @@ def triple_barrier_label(
 def meta_labeling(
     primary_signals: pd.Series,
     prices: pd.Series,
-    upper_threshold: float,
-    lower_threshold: float,
-    max_holding_bars: int
+    upper_threshold: Union[float, pd.Series],
+    lower_threshold: Union[float, pd.Series],
+    max_holding_bars: int,
+    volatility: Optional[pd.Series] = None,
+    chunk_size: Optional[int] = None
 ) -> pd.DataFrame:
     """
     Meta-labeling: entrena modelo para filtrar señales.
     
     En lugar de predecir dirección, predice si vale la pena
     ejecutar una señal generada por estrategia primaria.
+
+    Las barreras de cada señal se evalúan sobre la serie de precios
+    completa (no solo sobre las barras con señal).
     
     Args:
         primary_signals: Señales de estrategia base (1=long, -1=short, 0=neutral)
@@ -152,26 +221,28 @@ def meta_labeling(
         upper_threshold: Ganancia objetivo
         lower_threshold: Pérdida máxima
         max_holding_bars: Máximo holding period
+        volatility: Serie por fila que escala los umbrales (opcional)
+        chunk_size: Filas por bloque (None = automático)
         
     Returns:
         DataFrame con meta-labels
     """
     # Filtrar solo donde hay señal primaria
-    signal_mask = primary_signals != 0
-    filtered_signals = primary_signals[signal_mask]
-    filtered_prices = prices[signal_mask]
+    signals = primary_signals.reindex(prices.index).fillna(0)
+    signal_mask = (signals != 0).to_numpy()
     
-    if len(filtered_signals) == 0:
+    if not signal_mask.any():
         logger.warning("No primary signals found for meta-labeling")
         return pd.DataFrame()
+
+    # Señales sin horizonte completo hacia adelante no se etiquetan
+    positions = np.flatnonzero(signal_mask)
+    positions = positions[positions < len(prices) - max_holding_bars]
     
     # Aplicar triple barrier solo a señales primarias
-    labels = triple_barrier_label(
-        filtered_prices,
-        upper_threshold,
-        lower_threshold,
-        max_holding_bars,
-        side=filtered_signals
+    labels = _label_positions(
+        prices, positions, upper_threshold, lower_threshold,
+        max_holding_bars, signals, volatility, chunk_size
     )
     
     # Convertir a meta-label binario: ¿ejecutar o no?
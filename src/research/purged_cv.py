@@ -12,6 +12,30 @@ from datetime import timedelta
 logger = logging.getLogger(__name__)
 
 
+def _label_bounds(
+    timestamps: pd.DatetimeIndex,
+    label_times: pd.Series
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Inicio/fin de cada label como int64 (ns), calculados una sola vez.
+
+    Un label_time NaT nunca cuenta como "termina antes" (igual que la
+    comparación con Timestamps).
+    """
+    starts = timestamps.as_unit('ns').asi8
+    label_end = pd.DatetimeIndex(label_times).as_unit('ns')
+    if label_end.tz is None and timestamps.tz is not None:
+        label_end = label_end.tz_localize(timestamps.tz)
+    ends = label_end.asi8.copy()
+    ends[label_end.isna()] = np.iinfo(np.int64).max
+    return starts, ends
+
+
+def _window_ns(timestamps: pd.DatetimeIndex, pct: float) -> int:
+    """Duración total * pct en ns (mismo redondeo que Timedelta * float)."""
+    return ((timestamps[-1] - timestamps[0]) * pct).as_unit('ns').value
+
+
 class PurgedKFold:
     """
     K-Fold cross-validation con purging y embargo.
@@ -21,6 +45,9 @@ class PurgedKFold:
     
     Embargo: elimina observaciones del train set inmediatamente posteriores
     al test set (previene usar información del futuro).
+
+    Purge y embargo se evalúan con máscaras booleanas sobre arrays int64
+    de inicio/fin de label, precalculados una vez por split().
     """
     
     def __init__(
@@ -73,6 +100,10 @@ class PurgedKFold:
         # Si no hay label_times, asumir que cada observación termina en su timestamp
         if label_times is None:
             label_times = pd.Series(X.index, index=X.index)
+
+        starts, ends = _label_bounds(X.index, label_times)
+        purge_ns = _window_ns(X.index, self.purge_pct)
+        embargo_ns = _window_ns(X.index, self.embargo_pct)
         
         # Calcular tamaño de cada fold
         fold_size = n_samples // self.n_splits
@@ -84,26 +115,13 @@ class PurgedKFold:
             
             test_indices = indices[test_start:test_end]
             
-            # Train set: todos excepto test
-            train_indices = np.concatenate([
-                indices[:test_start],
-                indices[test_end:]
-            ])
-            
-            # Aplicar purging
-            train_indices = self._apply_purging(
-                train_indices,
-                test_indices,
-                X.index,
-                label_times
-            )
-            
-            # Aplicar embargo
-            train_indices = self._apply_embargo(
-                train_indices,
-                test_indices,
-                X.index
+            # Train set: todos excepto test, con purging y embargo
+            train_mask = np.ones(n_samples, dtype=bool)
+            train_mask[test_start:test_end] = False
+            train_mask &= self._keep_mask(
+                starts, ends, starts[test_start], starts[test_end - 1], purge_ns, embargo_ns
             )
+            train_indices = np.flatnonzero(train_mask)
             
             logger.debug(
                 f"Fold {fold + 1}/{self.n_splits}: "
@@ -111,6 +129,34 @@ class PurgedKFold:
             )
             
             yield train_indices, test_indices
+
+    @staticmethod
+    def _keep_mask(
+        starts: np.ndarray,
+        ends: np.ndarray,
+        test_start: int,
+        test_end: int,
+        purge_ns: int,
+        embargo_ns: int
+    ) -> np.ndarray:
+        """
+        Máscara de observaciones que sobreviven a purge y embargo.
+
+        Purge: se mantiene si el label termina antes de test_start - purge
+        o empieza después de test_end. Embargo: se elimina si empieza en
+        [test_end, test_end + embargo].
+        """
+        keep = (ends < test_start - purge_ns) | (starts > test_end)
+
+        embargo_end = test_end + embargo_ns
+        if np.all(starts[1:] >= starts[:-1]):
+            lo = np.searchsorted(starts, test_end, side='left')
+            hi = np.searchsorted(starts, embargo_end, side='right')
+            keep[lo:hi] = False
+        else:
+            keep &= (starts < test_end) | (starts > embargo_end)
+
+        return keep
     
     def _apply_purging(
         self,
@@ -125,27 +171,17 @@ class PurgedKFold:
         Una observación en train se purga si su label_time está
         dentro del período del test set.
         """
-        # Timestamps del test set
-        test_start = timestamps[test_indices[0]]
-        test_end = timestamps[test_indices[-1]]
-        
-        # Calcular ventana de purge
-        total_duration = timestamps[-1] - timestamps[0]
-        purge_duration = total_duration * self.purge_pct
-        purge_start = test_start - purge_duration
-        
-        # Filtrar train: mantener solo los que no se solapan
-        purged_indices = []
-        for idx in train_indices:
-            label_end = label_times.iloc[idx]
-            
-            # Mantener si:
-            # 1. Termina antes de purge_start
-            # 2. Comienza después de test_end
-            if label_end < purge_start or timestamps[idx] > test_end:
-                purged_indices.append(idx)
+        starts, ends = _label_bounds(timestamps, label_times)
+        train_indices = np.asarray(train_indices, dtype=np.int64)
+
+        # Timestamps del test set y ventana de purge
+        test_start = starts[test_indices[0]]
+        test_end = starts[test_indices[-1]]
+        purge_start = test_start - _window_ns(timestamps, self.purge_pct)
         
-        return np.array(purged_indices)
+        # Mantener si termina antes de purge_start o comienza después de test_end
+        keep = (ends[train_indices] < purge_start) | (starts[train_indices] > test_end)
+        return train_indices[keep]
     
     def _apply_embargo(
         self,
@@ -159,21 +195,16 @@ class PurgedKFold:
         Previene usar información que podría estar influenciada
         por las operaciones del test set.
         """
-        # Timestamp final del test
-        test_end = timestamps[test_indices[-1]]
-        
-        # Calcular ventana de embargo
-        total_duration = timestamps[-1] - timestamps[0]
-        embargo_duration = total_duration * self.embargo_pct
-        embargo_end = test_end + embargo_duration
-        
-        # Filtrar train: eliminar observaciones en embargo period
-        embargoed_indices = []
-        for idx in train_indices:
-            if timestamps[idx] < test_end or timestamps[idx] > embargo_end:
-                embargoed_indices.append(idx)
+        starts = timestamps.as_unit('ns').asi8
+        train_indices = np.asarray(train_indices, dtype=np.int64)
+
+        # Timestamp final del test y ventana de embargo
+        test_end = starts[test_indices[-1]]
+        embargo_end = test_end + _window_ns(timestamps, self.embargo_pct)
         
-        return np.array(embargoed_indices)
+        train_starts = starts[train_indices]
+        keep = (train_starts < test_end) | (train_starts > embargo_end)
+        return train_indices[keep]
 
 
 class CombinatorialPurgedKFold:
@@ -182,6 +213,10 @@ class CombinatorialPurgedKFold:
     
     Genera múltiples paths de train/test para reducir varianza
     de la estimación de performance.
+
+    Límites de grupo y arrays de label se calculan una vez; la máscara de
+    purge/embargo (O(n) vectorizada) se calcula por combinación sin
+    guardarla, así que la memoria no crece con C(n_splits, n_test_groups).
     """
     
     def __init__(
@@ -221,47 +256,37 @@ class CombinatorialPurgedKFold:
             raise ValueError("X must have DatetimeIndex")
         
         n_samples = len(X)
-        indices = np.arange(n_samples)
         
         if label_times is None:
             label_times = pd.Series(X.index, index=X.index)
+
+        starts, ends = _label_bounds(X.index, label_times)
+        purge_ns = _window_ns(X.index, self.purge_pct)
+        embargo_ns = _window_ns(X.index, self.embargo_pct)
         
-        # Dividir en grupos
+        # Dividir en grupos: límites [bounds[g], bounds[g+1])
         group_size = n_samples // self.n_splits
-        groups = []
-        
-        for i in range(self.n_splits):
-            start = i * group_size
-            end = start + group_size if i < self.n_splits - 1 else n_samples
-            groups.append(indices[start:end])
-        
+        bounds = np.arange(self.n_splits + 1) * group_size
+        bounds[-1] = n_samples
+
         # Generar todas las combinaciones de n_test_groups
         from itertools import combinations
         
         for test_groups in combinations(range(self.n_splits), self.n_test_groups):
             # Test set: unión de grupos seleccionados
-            test_indices = np.concatenate([groups[i] for i in test_groups])
-            
-            # Train set: resto de grupos
-            train_groups = [i for i in range(self.n_splits) if i not in test_groups]
-            train_indices = np.concatenate([groups[i] for i in train_groups])
+            test_mask = np.zeros(n_samples, dtype=bool)
+            for g in test_groups:
+                test_mask[bounds[g]:bounds[g + 1]] = True
+            test_indices = np.flatnonzero(test_mask)
             
             # Aplicar purging y embargo
-            pkf = PurgedKFold(
-                n_splits=self.n_splits,
-                purge_pct=self.purge_pct,
-                embargo_pct=self.embargo_pct
+            keep = PurgedKFold._keep_mask(
+                starts, ends, starts[test_indices[0]], starts[test_indices[-1]],
+                purge_ns, embargo_ns
             )
             
-            train_indices = pkf._apply_purging(
-                train_indices, test_indices,
-                X.index, label_times
-            )
-            
-            train_indices = pkf._apply_embargo(
-                train_indices, test_indices,
-                X.index
-            )
+            # Train set: resto de grupos
+            train_indices = np.flatnonzero(~test_mask & keep)
             
             yield train_indices, test_indices
 
@@ -1,49 +1,312 @@
 ﻿"""
 Modulo de logging estructurado en JSON
 Para auditoria y analisis automatizado
+
+Logging asincrono (setup_async_logging):
+- El hilo llamador solo crea el LogRecord y lo encola (QueueHandler)
+- Un hilo de fondo (QueueListener) vacia la cola por lotes, serializa a JSON
+  y escribe a disco con un flush por lote
+- Cola acotada: si se llena, el registro se descarta y se cuenta (el camino
+  caliente nunca se bloquea por I/O de logging)
+- bind_logger: contexto fijo (strategy/symbol/batch_id) sin dicts por llamada
+- RateLimitFilter: token bucket por punto de llamada para mensajes de alta
+  frecuencia (WARNING y superiores nunca se limitan)
+- lean_records: registros sin fichero/linea/hilo/proceso (el JSON no los usa)
+  para abaratar la creacion del LogRecord, que domina el coste por llamada
 """
 
+import atexit
 import logging
 import json
-from datetime import datetime
-from typing import Dict, Any, Optional
+import queue
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Any, Iterable, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Campos de contexto que se copian del LogRecord al JSON (via extra= o bind_logger)
+CONTEXT_FIELDS = (
+    'strategy', 'symbol', 'action', 'price', 'size', 'confidence',
+    'pnl', 'balance', 'trade_id', 'batch_id', 'suppressed',
+)
+
+_JSON_ENCODER = json.JSONEncoder(default=str)
+
+
+def _dumps(data: Dict[str, Any]) -> str:
+    """JSON de un registro (orjson si esta instalado)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=str, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+        except TypeError:
+            pass    # p. ej. claves no str en un campo de contexto
+    return _JSON_ENCODER.encode(data)
+
 
 class JSONFormatter(logging.Formatter):
     """Formateador de logs en JSON"""
     
+    def __init__(self, fields: Iterable[str] = CONTEXT_FIELDS):
+        super().__init__()
+        self.fields = tuple(fields)
+        # (segundo, 'YYYY-MM-DDTHH:MM:SS') del ultimo registro formateado
+        self._second_cache = (None, '')
+    
     def format(self, record: logging.LogRecord) -> str:
         """Convierte LogRecord a JSON estructurado"""
         
         log_data = {
-            'timestamp': datetime.utcnow().isoformat() + 'Z',
+            'timestamp': self._timestamp(record.created),
             'level': record.levelname,
             'logger': record.name,
             'message': record.getMessage()
         }
         
         # Agregar campos adicionales si existen
-        if hasattr(record, 'strategy'):
-            log_data['strategy'] = record.strategy
-        if hasattr(record, 'symbol'):
-            log_data['symbol'] = record.symbol
-        if hasattr(record, 'action'):
-            log_data['action'] = record.action
-        if hasattr(record, 'price'):
-            log_data['price'] = record.price
-        if hasattr(record, 'size'):
-            log_data['size'] = record.size
-        if hasattr(record, 'pnl'):
-            log_data['pnl'] = record.pnl
-        if hasattr(record, 'balance'):
-            log_data['balance'] = record.balance
-        if hasattr(record, 'trade_id'):
-            log_data['trade_id'] = record.trade_id
+        attrs = record.__dict__
+        for field in self.fields:
+            if field in attrs:
+                log_data[field] = attrs[field]
+        
+        # Agregar excepciones si existen (exc_text si el QueueHandler ya la formateo)
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            log_data['exception'] = record.exc_text
+        
+        return _dumps(log_data)
+    
+    def _timestamp(self, created: float) -> str:
+        """ISO 8601 UTC del momento de creacion del registro (no del formateo)."""
+        second = int(created)
+        cached_second, prefix = self._second_cache
+        if cached_second != second:
+            prefix = time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(second))
+            self._second_cache = (second, prefix)
+        return f"{prefix}.{int((created - second) * 1e6):06d}Z"
+
+
+class BoundLogger(logging.LoggerAdapter):
+    """
+    Logger con contexto fijo (strategy, symbol, batch_id...).
+    
+    El dict de contexto se crea una vez al hacer bind; cada llamada lo reutiliza
+    (solo se combina si la llamada trae su propio extra=).
+    """
+    
+    def process(self, msg, kwargs):
+        extra = kwargs.get('extra')
+        kwargs['extra'] = self.extra if extra is None else {**self.extra, **extra}
+        return msg, kwargs
+    
+    def bind(self, **context) -> 'BoundLogger':
+        """Nuevo BoundLogger con contexto adicional."""
+        return BoundLogger(self.logger, {**self.extra, **context})
+
+
+def bind_logger(logger: logging.Logger, **context) -> BoundLogger:
+    """
+    Logger con contexto fijo para un componente o un batch.
+    
+    Uso:
+        log = bind_logger(logger, batch_id=batch_id, symbol='EURUSD')
+        log.info("ARBITER_START: %s signals", n)
+    """
+    return BoundLogger(logger, context)
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Token bucket por punto de llamada (logger, linea) para mensajes frecuentes.
+    Sin linea (lean_records) la clave es la plantilla del mensaje si la llamada
+    usa argumentos %; los mensajes ya formateados comparten bucket por logger.
+    
+    Los registros descartados se cuentan y el siguiente que pasa lleva el
+    total en el campo 'suppressed'. WARNING y superiores pasan siempre.
+    """
+    
+    def __init__(self, rate_per_s: float = 10.0, burst: int = 20,
+                 exempt_level: int = logging.WARNING):
+        super().__init__()
+        self.rate_per_s = rate_per_s
+        self.burst = burst
+        self.exempt_level = exempt_level
+        self._buckets: Dict[tuple, list] = {}     # clave -> [tokens, ultimo, suprimidos]
+        self._lock = threading.Lock()
+        self.suppressed_total = 0
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= self.exempt_level:
+            return True
+        
+        key = (record.name, record.lineno or (record.msg if record.args else None))
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(self.burst), now, 0]
+            else:
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate_per_s)
+                bucket[1] = now
+            
+            if bucket[0] < 1.0:
+                bucket[2] += 1
+                self.suppressed_total += 1
+                return False
+            
+            bucket[0] -= 1.0
+            suppressed, bucket[2] = bucket[2], 0
         
-        # Agregar excepciones si existen
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+class AsyncQueueHandler(QueueHandler):
+    """
+    QueueHandler para el camino caliente: resuelve el mensaje sin copiar el
+    registro y descarta (contando) cuando hay max_pending registros en cola.
+    """
+    
+    _exc_formatter = logging.Formatter()
+    
+    def __init__(self, log_queue: queue.SimpleQueue, max_pending: int = 10000):
+        super().__init__(log_queue)
+        self.max_pending = max_pending
+        self.enqueued = 0
+        self.dropped = 0
+    
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Los args pueden ser objetos mutables: se resuelve el mensaje aqui
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
         if record.exc_info:
-            log_data['exception'] = self.formatException(record.exc_info)
+            if not record.exc_text:
+                record.exc_text = self._exc_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+    
+    def enqueue(self, record: logging.LogRecord):
+        # SimpleQueue (C, sin Condition) es mucho mas barata que queue.Queue;
+        # la cota es aproximada entre hilos productores
+        if self.queue.qsize() >= self.max_pending:
+            self.dropped += 1
+            return
+        self.queue.put(record)
+        self.enqueued += 1
+
+
+class BatchFileHandler(logging.FileHandler):
+    """FileHandler sin flush por registro: el listener hace flush por lote."""
+    
+    def emit(self, record: logging.LogRecord):
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+class _BatchingListener(QueueListener):
+    """
+    QueueListener que vacia la cola por lotes y hace flush de los handlers por
+    lote. Tras recibir el primer registro espera flush_interval_s para agrupar:
+    el hilo de fondo no compite por el GIL con el hilo llamador registro a registro.
+    """
+    
+    max_batch = 4096
+    flush_interval_s = 0.0
+    batches = 0
+    
+    def _monitor(self):
+        log_queue = self.queue
+        while True:
+            batch = [self.dequeue(True)]
+            if batch[0] is not self._sentinel and self.flush_interval_s > 0:
+                time.sleep(self.flush_interval_s)
+            while len(batch) < self.max_batch:
+                try:
+                    batch.append(log_queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            stop = False
+            for record in batch:
+                if record is self._sentinel:
+                    stop = True
+                else:
+                    self.handle(record)
+            for handler in self.handlers:
+                handler.flush()
+            self.batches += 1
+            
+            if stop:
+                return
+
+
+class AsyncLogging:
+    """
+    Subsistema de logging asincrono: QueueHandler en el hilo llamador y
+    QueueListener con los handlers reales en un hilo de fondo.
+    
+    Uso:
+        async_logging = setup_async_logging('logs/trading.jsonl')
+        ...
+        async_logging.close()     # vacia la cola (tambien en atexit)
+    """
+    
+    def __init__(self, handlers: Iterable[logging.Handler], level: int = logging.INFO,
+                 queue_size: int = 10000, rate_limit: Optional[RateLimitFilter] = None,
+                 flush_interval_ms: float = 50.0):
+        """
+        Args:
+            handlers: Handlers reales (se ejecutan en el hilo de fondo)
+            level: Nivel minimo encolado
+            queue_size: Registros pendientes maximos (los siguientes se descartan)
+            rate_limit: Filtro de frecuencia aplicado antes de encolar
+            flush_interval_ms: Espera maxima de un registro antes de escribirse
+                (agrupa escrituras; 0: escribe en cuanto llega)
+        """
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.handler = AsyncQueueHandler(self.queue, max_pending=queue_size)
+        self.handler.setLevel(level)
+        self.rate_limit = rate_limit
+        if rate_limit is not None:
+            self.handler.addFilter(rate_limit)
+        
+        self.handlers = list(handlers)
+        self.listener = _BatchingListener(self.queue, *self.handlers,
+                                          respect_handler_level=True)
+        self.listener.flush_interval_s = flush_interval_ms / 1000.0
+        self.listener.start()
+        self._closed = False
+        self.logger: Optional[logging.Logger] = None      # logger conectado (setup_async_logging)
         
-        return json.dumps(log_data)
+        atexit.register(self.close)
+    
+    def close(self):
+        """Escribe lo encolado, detiene el hilo de fondo y cierra los handlers."""
+        if self._closed:
+            return
+        self._closed = True
+        self.listener.stop()
+        for handler in self.handlers:
+            handler.close()
+    
+    def get_stats(self) -> Dict:
+        """Estadisticas de la cola de logging."""
+        return {
+            'enqueued': self.handler.enqueued,
+            'dropped': self.handler.dropped,
+            'queue_depth': self.queue.qsize(),
+            'batches': self.listener.batches,
+            'suppressed': self.rate_limit.suppressed_total if self.rate_limit else 0
+        }
 
 def setup_structured_logging(log_path: str, level: int = logging.INFO) -> logging.Logger:
     """
@@ -78,6 +341,69 @@ def setup_structured_logging(log_path: str, level: int = logging.INFO) -> loggin
     
     return logger
 
+def setup_async_logging(log_path: str, level: int = logging.INFO,
+                        logger_name: Optional[str] = 'trading_system',
+                        console: bool = True, queue_size: int = 10000,
+                        rate_limit_per_s: Optional[float] = None,
+                        rate_limit_burst: int = 20,
+                        lean_records: bool = False) -> AsyncLogging:
+    """
+    Configura logging estructurado JSON asincrono
+    
+    Args:
+        log_path: Ruta del archivo de log
+        level: Nivel de logging (default: INFO)
+        logger_name: Logger al que se conecta la cola (None: logger raiz,
+            captura tambien los loggers por modulo de core)
+        console: Handler de consola (formato legible) en el hilo de fondo
+        queue_size: Registros pendientes maximos
+        rate_limit_per_s: Mensajes/s por punto de llamada bajo WARNING
+            (None: sin limite)
+        rate_limit_burst: Rafaga permitida por punto de llamada
+        lean_records: No rellenar fichero/linea/funcion, hilo ni proceso en
+            los LogRecord (ajuste global del modulo logging; los formatos que
+            usen %(lineno)d o %(threadName)s dejan de mostrarlos)
+        
+    Returns:
+        AsyncLogging (close() al terminar; tambien se registra en atexit)
+    """
+    if lean_records:
+        # Ver "Optimization" en la documentacion de logging: evita findCaller
+        # y las consultas de hilo/proceso en cada registro
+        logging._srcfile = None
+        logging.logThreads = False
+        logging.logProcesses = False
+        logging.logMultiprocessing = False
+    
+    logger = logging.getLogger(logger_name)
+    logger.setLevel(level)
+    
+    # Handler para archivo JSON (flush por lote desde el hilo de fondo)
+    json_handler = BatchFileHandler(log_path, encoding='utf-8')
+    json_handler.setLevel(level)
+    json_handler.setFormatter(JSONFormatter())
+    handlers = [json_handler]
+    
+    # Handler para consola (formato legible)
+    if console:
+        console_handler = logging.StreamHandler()
+        console_handler.setLevel(level)
+        console_handler.setFormatter(logging.Formatter(
+            '%(asctime)s - %(levelname)s - %(message)s',
+            datefmt='%Y-%m-%d %H:%M:%S'
+        ))
+        handlers.append(console_handler)
+    
+    rate_limit = None
+    if rate_limit_per_s is not None:
+        rate_limit = RateLimitFilter(rate_limit_per_s, rate_limit_burst)
+    
+    async_logging = AsyncLogging(handlers, level=level, queue_size=queue_size,
+                                 rate_limit=rate_limit)
+    logger.addHandler(async_logging.handler)
+    async_logging.logger = logger
+    return async_logging
+
 def log_signal(logger: logging.Logger, strategy: str, symbol: str, 
                action: str, price: float, size: float, confidence: float):
     """Log de señal generada"""
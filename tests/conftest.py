@@ -1,4 +1,8 @@
-﻿import os, sys, importlib
+﻿import os, sys, importlib, types
+
+import numpy as np
+import pandas as pd
+import pytest
 
 ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 SRC  = os.path.join(ROOT, "src")
@@ -20,3 +24,90 @@ for name, target in _ALIASES.items():
         sys.modules.setdefault(name, importlib.import_module(target))
     except Exception:
         pass
+
+
+# Timeframes de MetaTrader5 que src/core usa al importar
+_MT5_TIMEFRAMES = {
+    'TIMEFRAME_M1': 1, 'TIMEFRAME_M5': 5, 'TIMEFRAME_M15': 15, 'TIMEFRAME_M30': 30,
+    'TIMEFRAME_H1': 16385, 'TIMEFRAME_H4': 16388, 'TIMEFRAME_D1': 16408, 'TIMEFRAME_W1': 32769,
+}
+
+
+@pytest.fixture
+def mt5_stub(monkeypatch):
+    """
+    MetaTrader5 minimo (sin terminal) para importar src/core en CI.
+
+    Solo constantes de timeframe; initialize() devuelve False. Los modulos
+    de core importados durante el test se descartan al terminar para que
+    el resto de la sesion no vea el stub.
+    """
+    before = set(sys.modules)
+    stub = types.ModuleType('MetaTrader5')
+    stub.__dict__.update(_MT5_TIMEFRAMES)
+    stub.initialize = lambda *args, **kwargs: False
+    stub.shutdown = lambda: None
+    stub.last_error = lambda: (1, 'MetaTrader5 stub')
+    monkeypatch.setitem(sys.modules, 'MetaTrader5', stub)
+
+    yield stub
+
+    for name in set(sys.modules) - before:
+        module = sys.modules[name]
+        if (name.split('.')[0] == 'core' or name.startswith('src.core')
+                or getattr(module, 'mt5', None) is stub):
+            del sys.modules[name]
+
+
+# Estrategia y barras sinteticas compartidas por los tests de backtesting.
+# A nivel de modulo para que sean picklables (workers de ParallelBacktestRunner).
+class AlternatingStrategy:
+    """Deterministic strategy: one trade every `every` bars, uses features for stops."""
+
+    def __init__(self, every: int = 23):
+        self.every = every
+        self.calls = 0
+        self.enabled = True
+
+    def evaluate(self, market_snapshot, features):
+        self.calls += 1
+        if self.calls % self.every != 0:
+            return []
+
+        symbol = next(iter(market_snapshot))
+        close = float(market_snapshot[symbol]['close'])
+        atr = max(features.get('atr', 0.0001), 0.0001)
+        direction = 'LONG' if features.get('ofi', 0.0) >= 0 else 'SHORT'
+        sign = 1 if direction == 'LONG' else -1
+
+        return [{
+            'symbol': symbol,
+            'direction': direction,
+            'entry_price': close,
+            'stop_loss': close - sign * 2 * atr,
+            'take_profit': close + sign * 3 * atr,
+            'strategy': 'alternating',
+        }]
+
+
+def make_ohlcv(seed: int, index: pd.DatetimeIndex, base: float) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = base + np.cumsum(rng.normal(0, 0.0004, len(index)))
+    open_ = close + rng.normal(0, 0.0002, len(index))
+    high = np.maximum(open_, close) + rng.uniform(0, 0.0005, len(index))
+    low = np.minimum(open_, close) - rng.uniform(0, 0.0005, len(index))
+    volume = rng.integers(500, 5000, len(index)).astype(float)
+    return pd.DataFrame({'open': open_, 'high': high, 'low': low,
+                         'close': close, 'volume': volume}, index=index)
+
+
+@pytest.fixture
+def alternating_strategy():
+    """Clase AlternatingStrategy (partial(alternating_strategy, n) es picklable)."""
+    return AlternatingStrategy
+
+
+@pytest.fixture(name='make_ohlcv')
+def make_ohlcv_fixture():
+    """make_ohlcv(seed, index, base) -> DataFrame OHLCV con paseo aleatorio."""
+    return make_ohlcv
@@ -0,0 +1,113 @@
+"""
+Background ML learning cycle: snapshot training and atomic model swap
+"""
+
+import threading
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+pytest.importorskip("MetaTrader5")
+pytest.importorskip("sklearn")
+
+from src.core.ml_adaptive_engine import MLAdaptiveEngine, TradeRecord
+
+
+def _trade(i, rng):
+    ts = datetime.now() - timedelta(minutes=i)
+    quality = rng.uniform(0.6, 1.0)
+    return TradeRecord(
+        trade_id=f'T{i}', timestamp=ts, symbol='EURUSD',
+        strategy='liquidity_sweep' if i % 2 else 'momentum_quality', direction='LONG',
+        entry_price=1.1, entry_time=ts, entry_regime='TRENDING',
+        entry_features={'vpin': rng.uniform(0.2, 0.8), 'atr': 0.001},
+        quality_score=quality, mtf_confluence=0.6, structure_alignment=0.7,
+        order_flow_quality=0.7, regime_fit=0.7, lot_size=0.1, risk_pct=0.5,
+        stop_loss=1.098, take_profit=1.104, exit_price=1.102, exit_time=ts,
+        exit_reason='TARGET', pnl_pct=0.2, pnl_r=4 * (quality - 0.75) + rng.normal(0, 0.3),
+        mae_r=-0.3, mfe_r=1.5, duration_minutes=30,
+        avg_vpin_during=0.3, avg_volatility_during=0.001, regime_changes_during=0,
+    )
+
+
+def _signal(quality):
+    return {'quality_score': quality, 'entry_features': {'vpin': 0.4, 'atr': 0.001}}
+
+
+def _fill(engine, n=120, seed=0):
+    rng = np.random.default_rng(seed)
+    for i in range(n):
+        engine.memory_db.record_trade(_trade(i, rng))
+
+
+def test_learning_cycle_runs_off_the_trading_path(tmp_path):
+    engine = MLAdaptiveEngine(tmp_path)
+    _fill(engine)
+    assert engine.predict_signal_outcome(_signal(0.9)) == 1.0   # no model yet
+
+    release = threading.Event()
+
+    def _cycle():
+        release.wait(5)
+        MLAdaptiveEngine._run_learning_cycle(engine)
+
+    engine._run_learning_cycle = _cycle
+    engine.last_analysis_time = datetime.now() - timedelta(hours=7)
+
+    engine.record_trade_outcome(_trade(999, np.random.default_rng(1)))
+    engine.record_trade_outcome(_trade(1000, np.random.default_rng(2)))
+
+    # Trading thread returned while the cycle is still pending/running
+    assert engine.learning_iterations == 0
+    assert engine.predict_signal_outcome(_signal(0.9)) == 1.0
+    assert engine.learner.requested == 1
+
+    release.set()
+    engine.learner.wait()
+
+    stats = engine.get_statistics()
+    assert stats['learning_iterations'] == 1
+    assert stats['model_swaps'] == 1
+    assert stats['learner']['completed'] == 1
+    assert stats['learner']['queue_depth'] == 0
+    assert stats['learner']['last_duration_s'] > 0
+    assert engine.attribution.memory_db is not engine.memory_db   # trained on a snapshot
+    assert engine.predict_signal_outcome(_signal(0.95)) > engine.predict_signal_outcome(_signal(0.65))
+    engine.learner.close()
+
+
+def test_pending_requests_are_coalesced(tmp_path):
+    engine = MLAdaptiveEngine(tmp_path)
+    started, release = threading.Event(), threading.Event()
+
+    def _cycle():
+        started.set()
+        release.wait(5)
+
+    engine._run_learning_cycle = _cycle
+
+    assert engine.learner.request()
+    started.wait(5)   # worker busy with the first cycle
+    assert engine.learner.request()
+    assert not engine.learner.request()
+    assert engine.learner.get_statistics()['coalesced'] == 1
+
+    release.set()
+    engine.learner.wait()
+    assert engine.learner.completed == 2
+    engine.learner.close()
+
+
+def test_too_few_trades_keep_previous_model(tmp_path):
+    engine = MLAdaptiveEngine(tmp_path, background_learning=False)
+    _fill(engine)
+    engine._run_learning_cycle()
+    model = engine.attribution
+
+    engine.memory_db.trades.clear()
+    engine._run_learning_cycle()
+
+    assert engine.learner is None
+    assert engine.attribution is model
+    assert engine.model_swaps == 1
@@ -0,0 +1,53 @@
+"""
+OHLCVRingBuffer incremental indicators vs pandas (no MT5 terminal needed)
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def _m1_rates(rates_dtype, days: int = 2, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    times = pd.date_range('2024-01-01', periods=days * 1440, freq='min')
+    rates = np.zeros(len(times), dtype=rates_dtype)
+    rates['time'] = times.as_unit('s').asi8
+    close = 1.1 + np.cumsum(rng.normal(0, 2e-4, len(times)))
+    rates['open'] = np.r_[close[0], close[:-1]]
+    rates['close'] = close
+    rates['high'] = np.maximum(rates['open'], close) + rng.uniform(0, 3e-4, len(times))
+    rates['low'] = np.minimum(rates['open'], close) - rng.uniform(0, 3e-4, len(times))
+    rates['tick_volume'] = rng.integers(1, 300, len(times))
+    rates['spread'] = 2
+    return rates
+
+
+def test_ring_buffer_matches_pandas_indicators(mt5_stub):
+    # src.core's package init imports MetaTrader5; the buffer itself does not use it
+    from src.core.bar_buffer import OHLCVRingBuffer
+    from src.core.mt5_replay import RATES_DTYPE
+
+    rates = _m1_rates(RATES_DTYPE)
+    buffer = OHLCVRingBuffer(capacity=300)
+
+    # Feed in uneven chunks, re-sending the forming bar each time
+    pos = 0
+    for step in [500, 1, 37, 200, 1000, 1142]:
+        buffer.update(rates[max(pos - 1, 0):pos + step])
+        pos += step
+
+    df = buffer.to_frame('EURUSD', 'M1')
+    full = pd.DataFrame(rates)
+
+    expected_ema = full['close'].ewm(span=200, adjust=False).mean().iloc[-300:].to_numpy()
+    np.testing.assert_allclose(df['ema_200'].to_numpy(), expected_ema, rtol=1e-12)
+
+    high_low = full['high'] - full['low']
+    high_close = (full['high'] - full['close'].shift()).abs()
+    low_close = (full['low'] - full['close'].shift()).abs()
+    true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
+    expected_atr = true_range.rolling(14).mean().iloc[-300:].to_numpy()
+    np.testing.assert_allclose(df['atr'].to_numpy(), expected_atr, rtol=1e-9)
+
+    expected_vma = full['tick_volume'].rolling(20).mean().iloc[-300:].to_numpy()
+    np.testing.assert_allclose(df['volume_ma'].to_numpy(), expected_vma, rtol=1e-12)
+    assert len(df) == 300
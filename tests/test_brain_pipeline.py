@@ -0,0 +1,190 @@
+"""
+Staged Brain pipeline: batched ML scoring, async ML records, regime cache
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("MetaTrader5")
+pytest.importorskip("sklearn")
+
+from src.core.brain import InstitutionalBrain
+from src.core.regime_detector import RegimeDetector
+
+
+class _Detector(RegimeDetector):
+    def __init__(self):
+        super().__init__({})
+        self.detections = 0
+
+    def detect_regime(self, market_data, features):
+        self.detections += 1
+        return super().detect_regime(market_data, features)
+
+    def should_block_trading(self, regime, confidence):
+        return False, None
+
+
+class _RiskManager:
+    def evaluate_signal(self, signal, market_context):
+        return {'approved': True, 'reason': '', 'position_size_pct': 0.5,
+                'position_size_lots': 0.1, 'quality_score': 0.8}
+
+    def get_statistics(self):
+        return {}
+
+
+class _PositionManager:
+    def get_statistics(self):
+        return {}
+
+
+class _MLEngine:
+    def __init__(self):
+        self.batches = []
+        self.records = []
+
+    def predict_signal_outcomes(self, signal_dicts):
+        self.batches.append(len(signal_dicts))
+        # Low-quality signals are predicted to lose
+        return [2.0 if s['quality_score'] >= 0.85 else 0.0 for s in signal_dicts]
+
+    def record_signal(self, record):
+        self.records.append(record)
+
+    def get_statistics(self):
+        return {}
+
+
+def _scan(n_symbols=6, n_bars=200, seed=0):
+    rng = np.random.default_rng(seed)
+    market_data, features, signals = {}, {}, []
+    for i in range(n_symbols):
+        symbol = f'SYM{i}'
+        close = 1.1 + np.cumsum(rng.normal(0, 1e-3, n_bars))
+        market_data[symbol] = pd.DataFrame({
+            'open': close, 'high': close + 1e-3, 'low': close - 1e-3, 'close': close,
+            'volume': rng.integers(100, 1000, n_bars).astype(float),
+        })
+        features[symbol] = {'adx': 30.0, 'vpin': 0.3}
+        signals.append({
+            'symbol': symbol, 'strategy_name': 'liquidity_sweep', 'direction': 'LONG',
+            'entry_price': close[-1], 'stop_loss': close[-1] - 0.002,
+            'take_profit': close[-1] + 0.004,
+            'metadata': {'quality_score': 0.9 if i % 2 else 0.8},
+        })
+    return signals, market_data, features
+
+
+def test_pipeline_scores_in_one_batch_and_records_async():
+    detector, ml_engine = _Detector(), _MLEngine()
+    brain = InstitutionalBrain({'min_arbitration_score': 0.0}, _RiskManager(), _PositionManager(),
+                               detector, None, ml_engine)
+    signals, market_data, features = _scan()
+
+    orders = brain.process_signals(signals, market_data, features)
+    brain.ml_writer.flush()
+
+    assert ml_engine.batches == [len(signals)]
+    assert sorted(o['symbol'] for o in orders) == ['SYM1', 'SYM3', 'SYM5']
+    assert all('signal_id_ml' in o for o in orders)
+
+    approved = {r.symbol for r in ml_engine.records if r.approved}
+    rejected = {r.symbol for r in ml_engine.records if not r.approved}
+    assert approved == {'SYM1', 'SYM3', 'SYM5'}
+    assert rejected == {'SYM0', 'SYM2', 'SYM4'}
+
+    latency = brain.get_statistics()['stage_latency']
+    assert set(latency) == {'regime', 'arbitration', 'ml_scoring', 'portfolio', 'stops'}
+    brain.ml_writer.close()
+
+
+class _BlockingMLEngine(_MLEngine):
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+
+    def record_signal(self, record):
+        self.release.wait(5)
+        super().record_signal(record)
+
+
+def test_queued_records_keep_features_at_decision_time():
+    ml_engine = _BlockingMLEngine()
+    brain = InstitutionalBrain({'min_arbitration_score': 0.0}, _RiskManager(), _PositionManager(),
+                               _Detector(), None, ml_engine)
+    signals, market_data, features = _scan()
+
+    brain.process_signals(signals, market_data, features)
+    # Next scan updates the feature dicts while records are still queued
+    for symbol_features in features.values():
+        symbol_features['vpin'] = 0.99
+    ml_engine.release.set()
+    brain.ml_writer.flush()
+
+    assert len(ml_engine.records) == len(signals)
+    assert all(r.features['vpin'] == 0.3 for r in ml_engine.records)
+    brain.ml_writer.close()
+
+
+def test_regime_reused_until_inputs_change():
+    detector = _Detector()
+    brain = InstitutionalBrain({'min_arbitration_score': 0.0}, _RiskManager(), _PositionManager(),
+                               detector, None)
+    signals, market_data, features = _scan(n_symbols=3)
+
+    first = brain.process_signals(signals, market_data, features)
+    assert detector.detections == 3
+
+    second = brain.process_signals(signals, market_data, features)
+    assert [o['symbol'] for o in second] == [o['symbol'] for o in first]
+    assert detector.detections == 3
+    assert brain.regime_cache_hits == 3
+
+    # New forming-bar close and a changed feature invalidate their symbols only
+    market_data['SYM0'].loc[market_data['SYM0'].index[-1], 'close'] += 1e-4
+    features['SYM1'] = {'adx': 15.0, 'vpin': 0.3}
+    brain.process_signals(signals, market_data, features)
+    assert detector.detections == 5
+
+
+def test_orders_use_strategic_placement(caplog):
+    brain = InstitutionalBrain({'min_arbitration_score': 0.0}, _RiskManager(), _PositionManager(),
+                               _Detector(), None)
+    signals, market_data, features = _scan(n_symbols=3)
+    features['SYM1'] = {'adx': 30.0, 'vpin': 0.3, 'atr': 2e-3}
+
+    with caplog.at_level('WARNING', logger='src.core.brain'):
+        orders = brain.process_signals(signals, market_data, features)
+
+    assert len(orders) == 3
+    assert 'Strategic stops failed' not in caplog.text
+    for order in orders:
+        assert order['signal']['stop_type'] in {'WICK_SWEEP', 'ORDER_BLOCK', 'FVG', 'SWING', 'ATR_FALLBACK'}
+        assert order['signal']['target_type'] in {'UNTAKEN_LIQ', 'ORDER_BLOCK', 'FVG', 'FRACTAL',
+                                                  'SWING', 'RR_DEFAULT'}
+        assert order['stop_loss'] == order['signal']['stop_loss'] < order['entry_price']
+    assert brain.liquidity_store.get_statistics()['indexes'] == 3
+
+
+def test_regime_cache_keeps_detector_statistics():
+    class _Uncached(_Detector):
+        get_input_key = None
+
+    stats = []
+    for detector in (_Detector(), _Uncached()):
+        brain = InstitutionalBrain({'min_arbitration_score': 0.0}, _RiskManager(), _PositionManager(),
+                                   detector, None)
+        signals, market_data, features = _scan(n_symbols=3)
+        for i in range(4):
+            features['SYM2'] = {'adx': 30.0 if i % 2 else 10.0, 'vpin': 0.3}
+            brain.process_signals(signals, market_data, features)
+        stats.append((brain.regime_cache_hits, brain.get_statistics()['regime']))
+
+    (hits, cached), (no_hits, uncached) = stats
+    assert hits == 6 and no_hits == 0
+    assert cached == uncached
+    assert cached['duration_bars'] + cached['regime_changes_total'] > 0
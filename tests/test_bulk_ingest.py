@@ -0,0 +1,102 @@
+"""
+Tests para execution.bulk_ingest (serialización COPY; sin PostgreSQL)
+"""
+
+import csv
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from src.execution import bulk_ingest
+from src.execution.bulk_ingest import BulkIngestor, STAGE_COLUMNS, local_naive_times, rates_to_csv
+from src.execution.market_data_store import COLUMNS
+
+
+def _rates(start: str, periods: int, freq: str = 'min') -> np.ndarray:
+    times = pd.date_range(start, periods=periods, freq=freq)
+    rates = np.zeros(periods, dtype=[(col, dt) for col, dt in COLUMNS.items()])
+    rates['time'] = times.as_unit('s').asi8
+    rates['close'] = 1.1 + np.arange(periods) * 1e-5
+    rates['open'] = rates['close'] - 3e-5
+    rates['high'] = rates['close'] + 1.23456e-4
+    rates['low'] = rates['close'] - 2e-4
+    rates['tick_volume'] = np.arange(periods) + 1
+    rates['spread'] = 7
+    return rates
+
+
+def test_local_naive_times_matches_fromtimestamp():
+    # Un año de horas cubre los cambios de horario locales (si los hay)
+    epochs = pd.date_range('2024-01-01', '2025-01-01', freq='37min').as_unit('s').asi8
+
+    result = local_naive_times(epochs)
+    expected = np.array([np.datetime64(datetime.fromtimestamp(int(e)), 's') for e in epochs])
+
+    np.testing.assert_array_equal(result, expected)
+
+
+def test_rates_to_csv_round_trips_values():
+    rates = _rates('2024-03-01', 500)
+
+    buffer = rates_to_csv('EURUSD.pro', rates)
+    rows = list(csv.reader(buffer))
+
+    assert len(rows) == len(rates)
+    assert all(len(row) == len(STAGE_COLUMNS) for row in rows)
+
+    first = dict(zip(STAGE_COLUMNS, rows[0]))
+    assert first['symbol'] == 'EURUSD.pro'
+    assert first['time'] == datetime.fromtimestamp(int(rates['time'][0])).strftime('%Y-%m-%d %H:%M:%S')
+    assert first['tick_volume'] == '1'
+    assert first['spread'] == '7'
+
+    # Floats exactos (repr), sin pérdida frente al float() del INSERT fila a fila
+    highs = np.array([float(row[STAGE_COLUMNS.index('high')]) for row in rows])
+    np.testing.assert_array_equal(highs, rates['high'])
+
+
+def test_rates_to_csv_empty():
+    buffer = rates_to_csv('EURUSD.pro', _rates('2024-03-01', 0))
+    assert buffer.getvalue() == ''
+
+
+class _Pool:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def getconn(self):
+        return None
+
+    def putconn(self, conn):
+        pass
+
+    def closeall(self):
+        pass
+
+
+def test_submit_bounds_in_flight_blocks(monkeypatch):
+    lock = threading.Lock()
+    in_flight = {'now': 0}
+
+    def slow_copy(conn, symbol, rates):
+        time.sleep(0.01)
+        with lock:
+            in_flight['now'] -= 1
+        return len(rates)
+
+    monkeypatch.setattr(bulk_ingest, 'ThreadedConnectionPool', _Pool)
+    monkeypatch.setattr(bulk_ingest, 'copy_bars', slow_copy)
+
+    with BulkIngestor({}, max_workers=2) as ingestor:
+        assert ingestor.max_pending == 4
+        for i in range(20):
+            with lock:
+                in_flight['now'] += 1
+            ingestor.submit('EURUSD', _rates('2024-01-01', 10))
+            with lock:
+                assert in_flight['now'] <= ingestor.max_pending
+
+    assert ingestor.stats['rows_read'] == ingestor.stats['rows_inserted'] == 200
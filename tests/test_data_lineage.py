@@ -0,0 +1,134 @@
+"""
+DataLineageTracker: barras en chunks direccionados por contenido y deduplicados
+"""
+
+import json
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.governance.audit_viewer import AuditLogViewer
+from src.governance.data_lineage import DataLineageTracker
+from src.governance.event_store import EventStore
+
+
+def _bars(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 1e-4, n))
+    return pd.DataFrame({
+        'time': pd.date_range('2025-01-01', periods=n, freq='min'),
+        'open': close + rng.normal(0, 1e-5, n),
+        'high': close + 2e-4,
+        'low': close - 2e-4,
+        'close': close,
+        'tick_volume': rng.integers(1, 500, n),
+        'session': np.where(np.arange(n) % 2, 'london', 'ny'),
+    })
+
+
+def _capture(tracker, bars, features=None):
+    return tracker.capture_data_slice(
+        bars_by_instrument=bars,
+        features_by_instrument=features or {'EURUSD': {'atr': 0.0012}},
+        regime_states={'EURUSD': {'regime': 'TREND'}},
+        portfolio_state={'equity': 100000.0},
+    )
+
+
+def _legacy_size(bars):
+    """Tamaño del formato anterior (barras en línea, JSON indentado)."""
+    records = {instr: df.tail(200).to_dict(orient='records') for instr, df in bars.items()}
+    return len(json.dumps({'bars_by_instrument': records}, indent=2, default=str))
+
+
+def test_slice_round_trip(tmp_path):
+    tracker = DataLineageTracker(tmp_path)
+    bars = _bars()
+    by_time = bars.set_index('time')
+    captured = _capture(tracker, {'EURUSD': bars, 'GBPUSD': by_time})
+
+    loaded = tracker.load_data_slice(captured.data_slice_id)
+    pd.testing.assert_frame_equal(loaded.bars_by_instrument['EURUSD'], bars.tail(200))
+    pd.testing.assert_frame_equal(loaded.bars_by_instrument['GBPUSD'], by_time.tail(200),
+                                  check_freq=False)
+    assert loaded.features_by_instrument == {'EURUSD': {'atr': 0.0012}}
+    assert loaded.portfolio_state == {'equity': 100000.0}
+
+    # Mismo contenido -> mismo hash; otro feature -> hash distinto
+    assert _capture(tracker, {'EURUSD': bars, 'GBPUSD': by_time}).data_slice_id[-16:] == \
+        captured.data_slice_id[-16:]
+    assert _capture(tracker, {'EURUSD': bars, 'GBPUSD': by_time},
+                    {'EURUSD': {'atr': 0.5}}).data_slice_id[-16:] != captured.data_slice_id[-16:]
+
+
+def test_sliding_window_is_deduplicated(tmp_path):
+    tracker = DataLineageTracker(tmp_path)
+    history = _bars(600)
+
+    legacy_bytes = 0
+    for end in range(300, 400):
+        # Cada decisión ve la ventana desplazada una barra (índice 0..n-1 como MT5)
+        bars = {'EURUSD': history.iloc[end - 250:end].reset_index(drop=True)}
+        slice_obj = _capture(tracker, bars)
+        legacy_bytes += _legacy_size(bars)
+
+    stats = tracker.get_stats()
+    assert stats['total_slices'] == 100
+    assert stats['total_size_mb'] * 1024 * 1024 < legacy_bytes / 10
+    assert stats['chunks']['chunks_reused'] > 5 * stats['chunks']['chunks_written']
+
+    loaded = tracker.load_data_slice(slice_obj.data_slice_id)
+    expected = history.iloc[199:399].reset_index(drop=True)
+    expected.index = pd.RangeIndex(50, 250)
+    pd.testing.assert_frame_equal(loaded.bars_by_instrument['EURUSD'], expected)
+
+
+def test_corrupted_chunk_is_not_loaded(tmp_path):
+    tracker = DataLineageTracker(tmp_path)
+    captured = _capture(tracker, {'EURUSD': _bars()})
+
+    chunk = next((tmp_path / 'chunks').rglob('*.bin'))
+    chunk.write_bytes(chunk.read_bytes()[:-1] + b'\x00')
+    assert tracker.load_data_slice(captured.data_slice_id) is None
+
+
+def test_audit_viewer_reassembles_chunked_and_legacy_slices(tmp_path):
+    lineage_path = tmp_path / 'lineage'
+    tracker = DataLineageTracker(lineage_path)
+    bars = _bars()
+    captured = _capture(tracker, {'EURUSD': bars})
+
+    # Slice en el formato anterior (barras en línea)
+    legacy_id = 'SLICE_1735732800000_0123456789abcdef'
+    legacy_path = tracker._get_slice_path(legacy_id)
+    legacy_path.parent.mkdir(parents=True, exist_ok=True)
+    legacy_path.write_text(json.dumps({
+        'data_slice_id': legacy_id,
+        'timestamp': datetime(2025, 1, 1, 12).isoformat(),
+        'content_hash': '0' * 64,
+        'bars_by_instrument': {'EURUSD': [{'close': 1.1}, {'close': 1.2}]},
+        'features_by_instrument': {}, 'regime_states': {}, 'portfolio_state': {},
+    }, indent=2))
+    assert list(tracker.load_data_slice(legacy_id).bars_by_instrument['EURUSD']['close']) == [1.1, 1.2]
+
+    store = EventStore(tmp_path / 'events')
+    store.append_event('DECISION', {'decision_id': 'dec_1'}, 'evt_1', {}, {},
+                       data_slice_id=captured.data_slice_id)
+    store.close()
+
+    viewer = AuditLogViewer(tmp_path / 'events', lineage_path, tmp_path / 'versions')
+    data_slice = viewer.reconstruct_decision('dec_1').data_slice
+    assert 'bar_chunks' not in data_slice
+    pd.testing.assert_frame_equal(data_slice['bars_by_instrument']['EURUSD'], bars.tail(200))
+    assert viewer._load_data_slice(legacy_id)['bars_by_instrument']['EURUSD'].shape == (2, 1)
+
+
+@pytest.mark.parametrize('n', [0, 1, 200])
+def test_small_frames(tmp_path, n):
+    tracker = DataLineageTracker(tmp_path)
+    bars = _bars(n)
+    loaded = tracker.load_data_slice(_capture(tracker, {'EURUSD': bars}).data_slice_id)
+    assert list(loaded.bars_by_instrument['EURUSD'].columns) == list(bars.columns)
+    assert len(loaded.bars_by_instrument['EURUSD']) == n
@@ -0,0 +1,109 @@
+"""
+Exponential-histogram ADWIN: window statistics, multi-split detection, batch path
+"""
+
+import numpy as np
+
+from src.research.drift_detection import ADWIN, DriftDetector
+
+
+def test_window_statistics_match_numpy():
+    rng = np.random.default_rng(0)
+    values = rng.normal(0.5, 0.1, 5000)
+    adwin = ADWIN(delta=0.002)
+    for value in values:
+        adwin.update(value)
+
+    assert adwin.window_size == len(values)
+    assert np.isclose(adwin.mean, values.mean())
+    assert np.isclose(adwin._variance, values.var() * len(values))
+    # Histograma: memoria O(log W)
+    assert adwin.n_buckets <= adwin.max_buckets * (int(np.log2(len(values))) + 1)
+
+
+def test_no_drift_on_stationary_stream():
+    rng = np.random.default_rng(1)
+    adwin = ADWIN(delta=0.002)
+    assert len(adwin.update_many(rng.normal(0.0, 1.0, 20000))) == 0
+    assert not adwin.drift_detected
+
+
+def test_detects_change_away_from_midpoint():
+    # Cambio al 80%: el split en el medio no lo ve con fuerza
+    rng = np.random.default_rng(2)
+    values = np.r_[rng.normal(0.0, 0.1, 8000), rng.normal(0.3, 0.1, 2000)]
+    adwin = ADWIN(delta=0.002)
+    detections = adwin.update_many(values)
+
+    assert len(detections) > 0
+    assert 8000 <= detections[0] < 8200
+    # La ventana queda recortada a datos posteriores al cambio
+    assert adwin.window_size < 2000 + 2 * adwin.max_buckets * 1024
+    assert abs(adwin.mean - 0.3) < abs(adwin.mean - 0.0)
+
+
+def test_default_clock_checks_every_update():
+    rng = np.random.default_rng(6)
+    values = np.r_[rng.normal(0.0, 0.1, 1000), rng.normal(0.5, 0.1, 300)]
+
+    every = ADWIN(delta=0.002)
+    fired = [i for i, v in enumerate(values) if every.update(v)]
+    clocked = ADWIN(delta=0.002, clock=32)
+    fired_clocked = [i for i, v in enumerate(values) if clocked.update(v)]
+
+    assert every.clock == 1
+    # update() informa en la propia muestra; con clock 32 solo en múltiplos
+    assert 1000 <= fired[0] < fired_clocked[0]
+    assert all((i + 1) % 32 == 0 for i in fired_clocked)
+
+    detector = DriftDetector({'accuracy': {'mean': 0.0, 'std': 0.1}}, adwin_clock=32)
+    assert detector._get_detectors('accuracy', 'momentum')[0].clock == 32
+
+
+def test_update_many_matches_sequential_updates():
+    rng = np.random.default_rng(3)
+    values = np.r_[rng.normal(0.0, 1.0, 3000), rng.normal(2.0, 1.0, 3000)]
+
+    sequential = ADWIN(delta=0.01, clock=8)
+    fired = [i for i, v in enumerate(values) if sequential.update(v)]
+
+    batched = ADWIN(delta=0.01, clock=8)
+    detections = np.concatenate([batched.update_many(chunk) + offset
+                                 for offset, chunk in zip(range(0, 6000, 701),
+                                                          np.array_split(values, range(701, 6000, 701)))])
+
+    assert fired == detections.tolist()
+    assert sequential.window_size == batched.window_size
+    assert np.isclose(sequential.mean, batched.mean)
+
+
+def test_drift_detector_accepts_arrays():
+    rng = np.random.default_rng(4)
+    detector = DriftDetector({'accuracy': {'mean': 0.6, 'std': 0.05}})
+
+    result = detector.update({'accuracy': rng.normal(0.6, 0.05, 500)})
+    assert not any(m['detector'] == 'ADWIN' for m in result['drifted_metrics'])
+
+    result = detector.update({'accuracy': rng.normal(0.3, 0.05, 500)})
+    assert result['drift_detected']
+
+
+def test_drift_detector_localises_stream():
+    rng = np.random.default_rng(5)
+    detector = DriftDetector({'accuracy': {'mean': 0.6, 'std': 0.05}})
+    strategies = [f'strategy_{i}' for i in range(24)]
+
+    adwin_streams = set()
+    for tick in range(1500):
+        # Cada estrategia en su propio nivel; strategy_7 cae a mitad
+        sample = {s: rng.normal(0.5 + 0.01 * i, 0.05) for i, s in enumerate(strategies)}
+        if tick >= 800:
+            sample['strategy_7'] -= 0.2
+        result = detector.update({'accuracy': sample})
+        adwin_streams |= {m['stream'] for m in result['drifted_metrics'] if m['detector'] == 'ADWIN'}
+
+    assert adwin_streams == {'strategy_7'}
+
+    # Arrays dentro del dict: muestras ordenadas de un mismo stream
+    result = detector.update({'accuracy': {'strategy_0': rng.normal(0.0, 0.05, 500)}})
+    assert [m['stream'] for m in result['drifted_metrics']] == ['strategy_0']
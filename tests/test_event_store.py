@@ -0,0 +1,324 @@
+"""
+EventStore: índices secundarios por fichero diario, escritura con group commit
+y verificación incremental de la cadena
+"""
+
+import hashlib
+import hmac
+import json
+import threading
+import time
+from datetime import date, datetime
+
+import pytest
+
+from src.governance import event_index
+from src.governance.audit_viewer import AuditLogViewer
+from src.governance.event_index import EventIndex, rebuild_indexes
+from src.governance.event_store import Event, EventStore
+from src.governance.event_writer import GroupCommitWriter
+
+
+def _fill(store, n=50, start=0):
+    for i in range(start, start + n):
+        store.append_event(
+            event_type='DECISION' if i % 5 == 0 else 'SIGNAL',
+            payload={'decision_id': f'dec_{i // 5}'} if i % 5 == 0 else {'i': i},
+            event_id=f'evt_{i}',
+            module_versions={'brain': '1.0'},
+            config_hashes={'risk': 'abc'},
+            data_slice_id=f'slice_{i // 5}',
+        )
+    store.flush()
+
+
+def _events_file(store):
+    return store._get_file_path(date.today())
+
+
+def test_lookups_match_full_scan(tmp_path):
+    store = EventStore(tmp_path)
+    _fill(store, 30)
+    store.refresh_index()
+    _fill(store, 20, start=30)
+    index = EventIndex(_events_file(store))
+
+    indexed_size, count = index.header()
+    assert 0 < indexed_size < _events_file(store).stat().st_size   # cola sin indexar
+
+    for i in (0, 17, 49):
+        (record,) = index.find('event_id', f'evt_{i}')
+        assert record['event']['event_id'] == f'evt_{i}'
+
+    assert [e.event_id for e in store.get_events(event_type='DECISION')] == \
+        [f'evt_{i}' for i in range(0, 50, 5)]
+    assert [r['event']['event_id'] for r in store.find_records('data_slice_id', 'slice_3')] == \
+        [f'evt_{i}' for i in range(15, 20)]
+    assert store.find_records('decision_id', 'dec_9')[0]['event']['event_id'] == 'evt_45'
+    assert index.find('event_id', 'missing') == []
+
+    store.refresh_index()
+    assert index.header()[0] == _events_file(store).stat().st_size
+    assert [e.event_id for e in store.get_events(event_id='evt_33')] == ['evt_33']
+
+
+def test_rebuild_and_partial_line(tmp_path):
+    store = EventStore(tmp_path)
+    _fill(store, 20)
+    events_file = _events_file(store)
+
+    # Línea a medio escribir al final: no se indexa
+    with open(events_file, 'a') as f:
+        f.write('{"event": {"event_id": "evt_torn"')
+
+    assert rebuild_indexes(store.events_dir) == {events_file.name: 20 * 3 + 4}
+    index = EventIndex(events_file)
+    assert index.find('event_id', 'evt_torn') == []
+    assert index.find('event_type', 'DECISION', limit=2)[1]['event']['event_id'] == 'evt_5'
+
+
+def test_lookup_uses_one_index_snapshot(tmp_path, monkeypatch):
+    store = EventStore(tmp_path)
+    _fill(store, 30)
+    store.refresh_index()
+    index = EventIndex(_events_file(store))
+    read_header = event_index._read_header
+
+    # El hilo de commit reescribe el índice justo después de leer la cabecera
+    def read_header_then_merge(f):
+        header = read_header(f)
+        monkeypatch.setattr(event_index, '_read_header', read_header)
+        index.refresh()
+        return header
+
+    for n, i in enumerate(range(0, 30, 6)):
+        _fill(store, 10, start=30 + 10 * n)     # cola nueva: el refresh la fusiona
+        monkeypatch.setattr(event_index, '_read_header', read_header_then_merge)
+        (record,) = index.find('event_id', f'evt_{i}')
+        assert record['event']['event_id'] == f'evt_{i}'
+
+    # get_events pasa al índice el límite restante
+    limits = []
+    find = EventIndex.find
+
+    def spy_find(self, fields, value, limit=None):
+        limits.append(limit)
+        return find(self, fields, value, limit=limit)
+
+    monkeypatch.setattr(EventIndex, 'find', spy_find)
+    assert len(store.get_events(event_type='SIGNAL', limit=4)) == 4
+    assert limits == [4]
+
+
+def test_audit_viewer_uses_index(tmp_path):
+    store = EventStore(tmp_path, index_every=8)
+    _fill(store)
+
+    viewer = AuditLogViewer(tmp_path, tmp_path / 'lineage', tmp_path / 'versions')
+    decision = viewer._find_decision_event('dec_4')
+    assert decision['event_id'] == 'evt_20'
+    assert viewer._find_decision_event('evt_21')['event_id'] == 'evt_21'
+    assert viewer._find_decision_event('dec_missing') is None
+
+    related = viewer._find_related_events(decision)
+    assert [e['event_id'] for e in related] == ['evt_21', 'evt_22', 'evt_23', 'evt_24']
+
+    reconstruction = viewer.reconstruct_decision('dec_4')
+    assert len(reconstruction.event_chain) == 5
+
+
+def test_serialized_once_matches_legacy_hash_and_hmac(tmp_path):
+    store = EventStore(tmp_path)
+    _fill(store, 10)
+
+    for record in store.find_records('event_type', 'SIGNAL'):
+        event = record['event']
+        content = {k: v for k, v in event.items() if k != 'event_hash'}
+        assert event['event_hash'] == hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()
+        expected_hmac = hmac.new(store.hmac_key, json.dumps(event, sort_keys=True).encode(),
+                                 hashlib.sha256).hexdigest()
+        assert record['hmac'] == expected_hmac
+
+
+def test_group_commit_keeps_chain_across_threads_and_restart(tmp_path):
+    store = EventStore(tmp_path, max_commit_latency_ms=20)
+
+    def worker(t):
+        for i in range(200):
+            store.append_event('SIGNAL', {'t': t, 'i': i}, f'evt_{t}_{i}', {}, {})
+
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    store.close()
+
+    stats = store._writer.get_stats()
+    assert stats['events_written'] == 800
+    assert stats['batches'] < 800 and stats['fsyncs'] == stats['batches']
+
+    reopened = EventStore(tmp_path)
+    reopened.append_event('SIGNAL', {}, 'evt_after_restart', {}, {})
+    assert len(reopened.get_events(limit=10000)) == 801
+    assert reopened.verify_chain_integrity()
+    reopened.close()
+
+
+def test_writer_latency_bound_rotation_and_offsets(tmp_path):
+    commits = []
+    writer = GroupCommitWriter(max_latency_ms=10,
+                               on_commit=lambda *args: commits.append(args))
+    day_1, day_2 = tmp_path / 'a.jsonl', tmp_path / 'b.jsonl'
+
+    writer.write(day_1, '{"n": 1}\n', 'm1')
+    deadline = time.monotonic() + 2
+    while not day_1.exists() or not day_1.read_bytes():
+        assert time.monotonic() < deadline     # confirmado sin flush()
+        time.sleep(0.005)
+
+    writer.write(day_1, '{"n": 2}\n', 'm2')
+    writer.write(day_2, '{"n": 3}\n', 'm3')
+    writer.flush()
+    writer.close()
+
+    assert day_1.read_bytes() == b'{"n": 1}\n{"n": 2}\n'
+    assert day_2.read_bytes() == b'{"n": 3}\n'
+    by_path, last_end = {}, {}
+    for path, offsets, metas, end in commits:
+        by_path.setdefault(path, []).extend(zip(offsets, metas))
+        last_end[path] = end
+    assert by_path == {day_1: [(0, 'm1'), (9, 'm2')], day_2: [(0, 'm3')]}
+    assert last_end == {day_1: 18, day_2: 9}
+    with pytest.raises(RuntimeError):
+        writer.write(day_1, '{}\n')
+
+
+def _write_days(store, days, per_day=20):
+    """Escribe ficheros diarios encadenados (fechas pasadas) firmados con la clave del store."""
+    prev_hash = None
+    for day in days:
+        with open(store._get_file_path(day), 'w') as f:
+            for i in range(per_day):
+                event = Event('SIGNAL', {'i': i}, f'evt_{day}_{i}',
+                              datetime(day.year, day.month, day.day, 10, 0, i), {}, {},
+                              prev_event_hash=prev_hash)
+                f.write(event.record_json(store._compute_hmac(event), '2025-01-01T00:00:00') + '\n')
+                prev_hash = event.event_hash
+
+
+def _rewrite_line(path, n, transform):
+    lines = path.read_text().splitlines(keepends=True)
+    record = json.loads(lines[n])
+    transform(record)
+    lines[n] = json.dumps(record) + '\n'
+    path.write_text(''.join(lines))
+
+
+DAYS = [date(2025, 3, 1), date(2025, 3, 2), date(2025, 3, 3)]
+
+
+def test_verify_chain_detects_hash_hmac_and_link_tampering(tmp_path):
+    def edit_payload(record):
+        record['event']['payload']['i'] = 999
+
+    def forge_hash(record):
+        # Hash recalculado coherente con el payload alterado, pero sin la clave
+        record['event']['payload']['i'] = 999
+        record['event']['event_hash'] = Event.from_dict(record['event']).event_hash
+
+    def relink(record):
+        record['event']['prev_event_hash'] = 'f' * 64
+
+    for transform, expected in ((edit_payload, 'hash mismatch'),
+                                (forge_hash, 'invalid HMAC'),
+                                (relink, 'hash mismatch')):
+        store_path = tmp_path / transform.__name__
+        store = EventStore(store_path)
+        _write_days(store, DAYS)
+        assert store.verify_chain().ok
+
+        _rewrite_line(store._get_file_path(DAYS[1]), 5, transform)
+        report = store.verify_chain(use_checkpoints=False)
+        assert not report.ok and expected in report.errors[0]
+        assert len(report.errors) == 1      # el día siguiente no se marca
+        store.close()
+
+
+def test_verify_chain_resumes_from_signed_checkpoints(tmp_path):
+    writer = EventStore(tmp_path)
+    _write_days(writer, DAYS)
+    writer.close()
+    store = EventStore(tmp_path)            # encadena con el último día escrito
+
+    first = store.verify_chain()
+    assert first.ok and first.events_verified == first.events_total == 60
+    assert len(list(store.integrity_dir.glob('*.checkpoint.json'))) == 3
+
+    # Eventos nuevos hoy: solo se verifica lo nuevo
+    _fill(store, 10)
+    second = store.verify_chain()
+    assert second.ok and second.days_from_checkpoint == 3
+    assert second.events_verified == 10 and second.events_total == 70
+
+    # Alterar una línea ya cubierta por el checkpoint sin tocar el ancla pasa
+    # desapercibido al reanudar, pero no en una verificación completa
+    _rewrite_line(store._get_file_path(DAYS[0]), 3, lambda r: r['event']['payload'].update(i=7))
+    assert store.verify_chain().ok
+    assert not store.verify_chain(use_checkpoints=False).ok
+
+    # El ancla (última línea cubierta) sí se re-verifica al reanudar
+    _rewrite_line(store._get_file_path(DAYS[1]), 19, lambda r: r.update(hmac='0' * 64))
+    report = store.verify_chain()
+    assert not report.ok and 'before checkpoint offset' in report.errors[0]
+    assert not store.verify_chain_integrity()
+    store.close()
+
+
+def test_forged_checkpoint_is_ignored(tmp_path):
+    store = EventStore(tmp_path)
+    _write_days(store, DAYS)
+    assert store.verify_chain().ok
+
+    _rewrite_line(store._get_file_path(DAYS[2]), 0, lambda r: r['event']['payload'].update(i=7))
+    checkpoint_path = store.integrity_dir / f'{DAYS[2]}.checkpoint.json'
+    checkpoint = json.loads(checkpoint_path.read_text())
+    checkpoint['events'] += 1
+    checkpoint_path.write_text(json.dumps(checkpoint))
+
+    report = store.verify_chain()
+    assert report.days_from_checkpoint == 2
+    assert not report.ok and 'hash mismatch' in report.errors[0]
+    store.close()
+
+
+def test_parallel_verification_matches_serial_and_checks_day_boundaries(tmp_path):
+    store = EventStore(tmp_path)
+    _write_days(store, DAYS)
+
+    serial = store.verify_chain(use_checkpoints=False)
+    parallel = store.verify_chain(workers=3, use_checkpoints=False)
+    assert serial.ok and parallel.ok
+    assert [(d.date, d.events, d.last_event_hash) for d in serial.days] == \
+        [(d.date, d.events, d.last_event_hash) for d in parallel.days]
+
+    # Día intermedio sustituido por una cadena válida pero desenganchada
+    second_day = store._get_file_path(DAYS[1])
+    detached = EventStore(tmp_path / 'other')
+    _write_days(detached, [DAYS[1]])
+    second_day.write_bytes(detached._get_file_path(DAYS[1]).read_bytes())
+
+    report = store.verify_chain(workers=3, use_checkpoints=False)
+    assert not report.ok
+    assert [e.split(':')[0] for e in report.errors] == [second_day.name, store._get_file_path(DAYS[2]).name]
+
+    # El primer día del rango se enlaza con el fichero anterior
+    assert not store.verify_chain(start_date=DAYS[2], use_checkpoints=False).ok
+    assert store.verify_chain(start_date=DAYS[1], end_date=DAYS[1], use_checkpoints=False).errors[0] \
+        .startswith(second_day.name)
+
+    viewer = AuditLogViewer(tmp_path, tmp_path / 'lineage', tmp_path / 'versions')
+    assert viewer._verify_chain_integrity_period(DAYS[0], DAYS[0])
+    assert not viewer._verify_chain_integrity_period(DAYS[0], DAYS[2])
+    detached.close()
+    store.close()
@@ -0,0 +1,104 @@
+"""
+Per-symbol GatekeeperAdapter: isolated state, batch path, sharded locks
+"""
+
+import threading
+
+import numpy as np
+
+from gatekeepers.gatekeeper_adapter import GatekeeperAdapter
+
+TICK_DTYPE = [('time', 'i8'), ('bid', 'f8'), ('ask', 'f8'), ('last', 'f8'), ('volume', 'f8')]
+
+
+def _ticks(n, seed, base=1.1):
+    rng = np.random.default_rng(seed)
+    ticks = np.zeros(n, dtype=TICK_DTYPE)
+    mid = base + np.cumsum(rng.normal(0, 5e-5, n))
+    spread = rng.uniform(1e-5, 3e-5, n)
+    ticks['time'] = 1_700_000_000 + np.arange(n)
+    ticks['bid'] = mid - spread / 2
+    ticks['ask'] = mid + spread / 2
+    ticks['last'] = mid + rng.normal(0, 1e-5, n)
+    ticks['volume'] = rng.integers(1, 500, n)
+    return ticks
+
+
+def _as_dicts(ticks, symbol):
+    return [{'symbol': symbol, 'bid': t['bid'], 'ask': t['ask'], 'last': t['last'],
+             'volume': t['volume'], 'time': t['time']} for t in ticks]
+
+
+def _state(adapter, symbol):
+    integrator = adapter.get_gatekeeper(symbol).integrator
+    return (integrator.kyle.current_lambda, list(integrator.kyle.lambda_history),
+            integrator.epin.get_pin(), list(integrator.spread.spreads))
+
+
+def test_symbols_do_not_share_state():
+    eurusd, gbpusd = _ticks(600, 1, 1.1), _ticks(600, 2, 1.27)
+
+    interleaved = GatekeeperAdapter()
+    for a, b in zip(_as_dicts(eurusd, 'EURUSD'), _as_dicts(gbpusd, 'GBPUSD')):
+        interleaved.process_tick(a)
+        interleaved.process_tick(b)
+
+    alone = GatekeeperAdapter()
+    for tick in _as_dicts(gbpusd, 'GBPUSD'):
+        alone.process_tick(tick)
+
+    assert _state(interleaved, 'GBPUSD') == _state(alone, 'GBPUSD')
+    assert interleaved.get_statistics_summary()['ticks_by_symbol'] == {'EURUSD': 599, 'GBPUSD': 599}
+
+
+def test_process_ticks_matches_process_tick():
+    ticks = _ticks(1000, 3)
+
+    sequential = GatekeeperAdapter()
+    for tick in _as_dicts(ticks, 'EURUSD'):
+        sequential.process_tick(tick)
+
+    batched = GatekeeperAdapter()
+    assert batched.process_ticks(ticks[:400], symbol='EURUSD') == 399
+    assert batched.process_ticks(ticks[400:], symbol='EURUSD') == 600
+
+    assert _state(batched, 'EURUSD') == _state(sequential, 'EURUSD')
+    assert batched.get_current_regime('EURUSD') == sequential.get_current_regime('EURUSD')
+
+
+def test_process_ticks_groups_by_symbol_field():
+    eurusd, gbpusd = _ticks(300, 4), _ticks(300, 5, 1.27)
+    mixed = _as_dicts(eurusd, 'EURUSD') + _as_dicts(gbpusd, 'GBPUSD')
+
+    adapter = GatekeeperAdapter()
+    assert adapter.process_ticks(mixed) == 598
+
+    reference = GatekeeperAdapter()
+    reference.process_ticks(gbpusd, symbol='GBPUSD')
+    assert _state(adapter, 'GBPUSD') == _state(reference, 'GBPUSD')
+
+
+def test_concurrent_symbols_and_status():
+    symbols = [f'PAIR{i}' for i in range(8)]
+    adapter = GatekeeperAdapter(symbols=symbols, lock_shards=4)
+    data = {symbol: _ticks(500, i) for i, symbol in enumerate(symbols)}
+
+    def feed(symbol):
+        for start in range(0, 500, 50):
+            adapter.process_ticks(data[symbol][start:start + 50], symbol=symbol)
+            adapter.check_trade_permission('test', 'long', symbol, 1.0)
+
+    threads = [threading.Thread(target=feed, args=(symbol,)) for symbol in symbols]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    summary = adapter.get_statistics_summary()
+    assert summary['ticks_processed'] == 8 * 499
+    assert summary['trades_approved'] + summary['trades_rejected'] == 80
+
+    status = adapter.get_comprehensive_status()
+    assert set(status['gatekeepers']) == set(symbols)
+    assert len(status['recent_decisions']) == 10
+    assert status['current_regime'] in ('GREEN', 'YELLOW', 'RED')
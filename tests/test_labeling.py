@@ -0,0 +1,89 @@
+"""
+Vectorized triple barrier labeling vs the original per-bar loop
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.research.labeling import triple_barrier_label, meta_labeling
+
+
+def _reference_long_labels(prices: pd.Series, upper: float, lower: float, max_bars: int):
+    """Original loop (long side): label, holding_bars, exit_price per entry."""
+    rows = []
+    for i in range(len(prices) - max_bars):
+        entry = prices.iloc[i]
+        forward = prices.iloc[i+1:i+1+max_bars].to_numpy()
+        hit_upper = np.flatnonzero(forward >= entry * (1 + upper))
+        hit_lower = np.flatnonzero(forward <= entry * (1 + lower))
+        first_upper = hit_upper[0] if len(hit_upper) else None
+        first_lower = hit_lower[0] if len(hit_lower) else None
+
+        if first_upper is not None and (first_lower is None or first_upper < first_lower):
+            label, exit_idx = 1, first_upper
+        elif first_lower is not None:
+            label, exit_idx = -1, first_lower
+        else:
+            label, exit_idx = 0, max_bars - 1
+        rows.append((label, exit_idx + 1, forward[exit_idx]))
+    return rows
+
+
+def _prices(n=3000, seed=7):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2024-01-01', periods=n, freq='min')
+    return pd.Series(1.1 * np.exp(np.cumsum(rng.normal(0, 4e-4, n))), index=index)
+
+
+def test_matches_reference_loop_across_chunks():
+    prices = _prices()
+    expected = _reference_long_labels(prices, 0.002, -0.001, 60)
+
+    for chunk_size in (None, 7, 1000):
+        labels = triple_barrier_label(prices, 0.002, -0.001, 60, chunk_size=chunk_size)
+
+        assert len(labels) == len(prices) - 60
+        assert list(labels.columns) == [
+            'entry_price', 'exit_price', 'label', 'barrier_hit',
+            'holding_bars', 'realized_return', 'side'
+        ]
+        assert labels.index.equals(prices.index[:-60])
+        assert [tuple(r) for r in labels[['label', 'holding_bars', 'exit_price']].itertuples(index=False)] == expected
+
+
+def test_short_side_profit_barrier_is_label_one():
+    index = pd.date_range('2024-01-01', periods=6, freq='min')
+    prices = pd.Series([100.0, 99.0, 98.0, 97.0, 97.0, 97.0], index=index)
+    side = pd.Series(-1, index=index)
+
+    labels = triple_barrier_label(prices, 0.015, -0.01, 3, side=side)
+
+    first = labels.iloc[0]
+    assert first['label'] == 1
+    assert first['barrier_hit'] == 'upper'
+    assert first['holding_bars'] == 2
+    assert first['realized_return'] > 0
+
+
+def test_volatility_scaled_barriers():
+    prices = _prices(500)
+    vol = pd.Series(np.linspace(0.5, 2.0, len(prices)), index=prices.index)
+
+    scaled = triple_barrier_label(prices, 0.002, -0.001, 30, volatility=vol)
+    per_row = triple_barrier_label(prices, 0.002 * vol, -0.001 * vol, 30)
+
+    pd.testing.assert_frame_equal(scaled, per_row)
+
+
+def test_meta_labeling_uses_full_price_path():
+    prices = _prices(800)
+    signals = pd.Series(0, index=prices.index)
+    signals.iloc[::25] = 1
+    signals.iloc[10::50] = -1
+
+    meta = meta_labeling(signals, prices, 0.002, -0.001, 40)
+    full = triple_barrier_label(prices, 0.002, -0.001, 40, side=signals)
+    expected = full[signals.iloc[:len(full)].to_numpy() != 0]
+
+    pd.testing.assert_frame_equal(meta.drop(columns='meta_label'), expected)
+    assert (meta['meta_label'] == (meta['label'] == 1).astype(int)).all()
@@ -0,0 +1,124 @@
+"""
+Indexed liquidity search vs the original per-bar loops in strategic_stops
+"""
+
+import numpy as np
+import pandas as pd
+
+from src.features.liquidity_index import LiquidityIndex, LiquidityIndexStore
+from src.features.strategic_stops import calculate_strategic_stop, calculate_strategic_target
+
+
+def _reference_wick(direction, entry_price, frames, atr):
+    """Original _find_wick_liquidity_sweep loop: (level, significance)."""
+    best_level, best_significance = None, 0.0
+    for tf_data in frames:
+        if len(tf_data) < 20:
+            continue
+        recent = tf_data.tail(50)
+        for i in range(10, len(recent)):
+            bar = recent.iloc[i]
+            previous = recent.iloc[i-10:i]
+            if direction == 'LONG':
+                prev_low = previous['low'].min()
+                if bar['low'] < prev_low and bar['close'] > prev_low and bar['low'] < entry_price:
+                    significance = (prev_low - bar['low']) / (atr + 1e-10) * ((bar['high'] - bar['low']) / atr)
+                    if significance > best_significance:
+                        best_significance, best_level = significance, bar['low']
+            else:
+                prev_high = previous['high'].max()
+                if bar['high'] > prev_high and bar['close'] < prev_high and bar['high'] > entry_price:
+                    significance = (bar['high'] - prev_high) / (atr + 1e-10) * ((bar['high'] - bar['low']) / atr)
+                    if significance > best_significance:
+                        best_significance, best_level = significance, bar['high']
+    return best_level, best_significance
+
+
+def _reference_pool(direction, entry_price, frames, risk, tol=0.0005):
+    """Original _find_untaken_liquidity_target loop: (level, strength)."""
+    best_level, best_strength = None, 0.0
+    for tf_data in frames:
+        if len(tf_data) < 20:
+            continue
+        recent = tf_data.tail(100)
+        highs, lows = recent['high'].values, recent['low'].values
+        for i in range(len(recent) - 1):
+            if direction == 'LONG':
+                level = highs[i]
+                if level <= entry_price or level < entry_price + risk:
+                    continue
+                equals = sum(1 for h in highs if abs(h - level) < tol)
+                taken = any(low < level - tol for low in lows[i+1:])
+            else:
+                level = lows[i]
+                if level >= entry_price or level > entry_price - risk:
+                    continue
+                equals = sum(1 for l in lows if abs(l - level) < tol)
+                taken = any(high > level + tol for high in highs[i+1:])
+            if not taken and equals >= 2 and equals > best_strength:
+                best_strength, best_level = equals, level
+    return best_level, best_strength
+
+
+def _bars(n, seed, freq='min'):
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 4e-4, n))
+    # Price grid of 2 pips so equal highs/lows actually occur
+    close = np.round(close / 2e-4) * 2e-4
+    open_ = np.r_[close[0], close[:-1]]
+    high = np.maximum(open_, close) + np.round(rng.uniform(0, 6e-4, n) / 2e-4) * 2e-4
+    low = np.minimum(open_, close) - np.round(rng.uniform(0, 6e-4, n) / 2e-4) * 2e-4
+    index = pd.date_range('2024-01-01', periods=n, freq=freq)
+    return pd.DataFrame({'open': open_, 'high': high, 'low': low, 'close': close}, index=index)
+
+
+def test_queries_match_reference_loops():
+    for seed in range(12):
+        frames = [_bars(300, seed), _bars(120, seed + 100, '15min'), _bars(60, seed + 200, 'h')]
+        indexes = []
+        for df in frames:
+            index = LiquidityIndex()
+            index.update(df)
+            indexes.append(index)
+
+        last = frames[0]['close'].iloc[-1]
+        for direction in ('LONG', 'SHORT'):
+            for offset in np.linspace(-0.01, 0.01, 9):
+                entry = last + offset
+                atr = 5e-4
+
+                best = (None, 0.0)
+                for index in indexes:
+                    level, significance = index.best_wick_sweep(direction, entry, atr)
+                    if level is not None and significance > best[1]:
+                        best = (level, significance)
+                assert best == _reference_wick(direction, entry, frames, atr)
+
+                for risk in (0.0, 5e-4, 2e-3):
+                    best = (None, 0.0)
+                    for index in indexes:
+                        level, strength = index.best_untaken_liquidity(direction, entry, risk)
+                        if level is not None and strength > best[1]:
+                            best = (level, strength)
+                    assert best == _reference_pool(direction, entry, frames, risk)
+
+
+def test_strategic_placement_with_store():
+    m1, m15 = _bars(300, 1), _bars(120, 2, '15min')
+    mtf = {'M15': m15}
+    store = LiquidityIndexStore()
+    entry = m1['close'].iloc[-1]
+
+    for direction in ('LONG', 'SHORT'):
+        stop = calculate_strategic_stop(direction, entry, m1, {}, 5e-4, mtf_data=mtf)
+        assert calculate_strategic_stop(direction, entry, m1, {}, 5e-4, mtf_data=mtf,
+                                        symbol='EURUSD', liquidity_store=store) == stop
+
+        target = calculate_strategic_target(direction, entry, stop[0], m1, {}, mtf_data=mtf)
+        assert calculate_strategic_target(direction, entry, stop[0], m1, {}, mtf_data=mtf,
+                                          symbol='EURUSD', liquidity_store=store) == target
+
+    # Same bars: indexes are reused, not rebuilt
+    assert store.get_statistics() == {'indexes': 2, 'rebuilds': 2}
+    store.get('EURUSD', 'BASE', _bars(301, 1))
+    assert store.get_statistics()['rebuilds'] == 3
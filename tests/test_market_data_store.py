@@ -0,0 +1,161 @@
+"""
+Tests para execution.market_data_store
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+from datetime import datetime
+
+from src.execution.market_data_store import MarketDataStore, COLUMNS
+
+
+def _rates(start: str, periods: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    times = pd.date_range(start, periods=periods, freq='min')
+    rates = np.empty(periods, dtype=[(col, dt) for col, dt in COLUMNS.items()])
+    rates['time'] = times.as_unit('s').asi8
+    rates['close'] = 1.1 + np.cumsum(rng.normal(0, 1e-4, periods))
+    rates['open'] = rates['close'] + 1e-5
+    rates['high'] = rates['close'] + 2e-4
+    rates['low'] = rates['close'] - 2e-4
+    rates['tick_volume'] = rng.integers(1, 500, periods)
+    rates['spread'] = 3
+    rates['real_volume'] = 0
+    return rates
+
+
+@pytest.fixture
+def store(tmp_path):
+    return MarketDataStore(tmp_path / "store")
+
+
+def test_write_partitions_by_month_and_roundtrip(store):
+    rates = _rates('2024-01-31 23:00', 180)
+    assert store.write_bars('EURUSD', rates) == 180
+    assert store.partitions('EURUSD') == ['2024-01', '2024-02']
+
+    loaded = store.load_rates('EURUSD')
+    np.testing.assert_array_equal(loaded, rates)
+    assert store.last_timestamp('EURUSD') == datetime(2024, 2, 1, 1, 59)
+
+
+def test_incremental_refresh_ignores_duplicates(store):
+    rates = _rates('2024-03-01', 300)
+    store.write_bars('EURUSD', rates[:200])
+
+    # Overlapping refresh (ON CONFLICT DO NOTHING semantics)
+    assert store.write_bars('EURUSD', rates[150:]) == 100
+    assert store.write_bars('EURUSD', rates[150:]) == 0
+    np.testing.assert_array_equal(store.load_rates('EURUSD'), rates)
+
+
+def test_load_range_and_frame(store):
+    rates = _rates('2024-01-31 22:00', 240)
+    store.write_bars('GBPUSD', rates)
+
+    frame = store.load_frame('GBPUSD', datetime(2024, 1, 31, 23, 30), datetime(2024, 2, 1, 0, 30))
+    assert len(frame) == 61
+    assert frame.index[0] == pd.Timestamp('2024-01-31 23:30')
+    assert frame.index[-1] == pd.Timestamp('2024-02-01 00:30')
+    assert list(frame.columns[:5]) == ['open', 'high', 'low', 'close', 'volume']
+    assert frame['close'].dtype == np.float64
+
+
+def test_single_partition_is_memory_mapped(store):
+    store.write_bars('EURUSD', _rates('2024-05-01', 100))
+    arrays = store.load_arrays('EURUSD', columns=['close'])
+    assert isinstance(arrays['close'], np.memmap) or isinstance(arrays['close'].base, np.memmap)
+
+
+def test_load_long_matches_sql_layout(store):
+    store.write_bars('EURUSD', _rates('2024-01-01', 50, seed=1))
+    store.write_bars('GBPUSD', _rates('2024-01-01 00:10', 50, seed=2))
+
+    data = store.load_long()
+    assert list(data.columns[:7]) == ['symbol', 'time', 'open', 'high', 'low', 'close', 'volume']
+    assert len(data) == 100
+    assert data['time'].is_monotonic_increasing
+    assert set(data['symbol']) == {'EURUSD', 'GBPUSD'}
+
+
+def test_load_long_merged_fills_uncached_symbols(store, caplog):
+    store.write_bars('EURUSD', _rates('2024-01-01', 50, seed=1))
+    (store.root / 'USDJPY').mkdir()                # directorio sin particiones
+    source = store.load_long(['EURUSD']).assign(symbol='GBPUSD')
+    requested = []
+
+    def from_source(symbols):
+        requested.append(symbols)
+        return source.iloc[::-1][['symbol', 'time', 'open', 'high', 'low', 'close']]
+
+    data = store.load_long_merged(['EURUSD', 'GBPUSD', 'USDJPY'], from_source)
+
+    assert requested == [['GBPUSD', 'USDJPY']]
+    assert 'GBPUSD, USDJPY' in caplog.text
+    assert len(data) == 100
+    assert data['time'].is_monotonic_increasing
+    assert set(data['symbol']) == {'EURUSD', 'GBPUSD'}
+    pd.testing.assert_frame_equal(
+        data[data['symbol'] == 'GBPUSD'][['time', 'close']].reset_index(drop=True),
+        source[['time', 'close']])
+
+    # Todo en caché: no se consulta la fuente
+    assert store.load_long_merged(['EURUSD'], from_source).equals(store.load_long(['EURUSD']))
+    assert len(requested) == 1
+
+
+def test_write_dataframe_input(store):
+    frame = store.load_frame('NONE')
+    assert frame.empty
+
+    df = pd.DataFrame(_rates('2024-06-01', 10))
+    df['time'] = pd.to_datetime(df['time'], unit='s')
+    assert store.write_bars('XAUUSD', df) == 10
+    assert store.load_frame('XAUUSD').index[0] == pd.Timestamp('2024-06-01')
+
+
+@pytest.fixture
+def local_tz(monkeypatch):
+    """Zona horaria local con horario de verano (el host de CI suele ir en UTC)."""
+    monkeypatch.setenv('TZ', 'Europe/Madrid')
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+def test_cache_times_match_sql_mapping(store, local_tz):
+    # Cruza el cambio de horario del 2024-03-31 (01:00 UTC)
+    rates = _rates('2024-03-30 23:00', 300)
+    store.write_bars('EURUSD', rates)
+
+    # market_data.time se escribe con datetime.fromtimestamp (hora local naive)
+    sql_times = [pd.Timestamp(datetime.fromtimestamp(int(t))) for t in rates['time']]
+    data = store.load_long(['EURUSD'])
+    assert list(data['time']) == sql_times
+
+    frame = store.load_frame('EURUSD', sql_times[100], sql_times[200])
+    assert list(frame.index) == sql_times[100:201]
+    assert store.last_timestamp('EURUSD') == sql_times[-1]
+
+    # Un DataFrame en hora local vuelve al mismo epoch
+    assert store.write_bars('GBPUSD', frame.reset_index()) == 101
+    np.testing.assert_array_equal(store.load_rates('GBPUSD')['time'], rates['time'][100:201])
+
+
+def test_replaced_generation_survives_until_next_write(store):
+    rates = _rates('2024-07-01', 300)
+    store.write_bars('EURUSD', rates[:100])
+    partition = store.root / 'EURUSD' / '2024-07'
+
+    # Un lector que ya leyó CURRENT (g0) sigue pudiendo cargar sus columnas
+    store.write_bars('EURUSD', rates[100:200])
+    assert sorted(p.name for p in partition.glob('g*')) == ['g0', 'g1']
+    assert len(np.load(partition / 'g0' / 'close.npy')) == 100
+
+    store.write_bars('EURUSD', rates[200:])
+    assert sorted(p.name for p in partition.glob('g*')) == ['g1', 'g2']
+    np.testing.assert_array_equal(store.load_rates('EURUSD'), rates)
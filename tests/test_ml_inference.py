@@ -0,0 +1,106 @@
+"""
+Outcome predictor inference: fixed feature schema and compiled tree ensemble
+"""
+
+from collections import deque
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+pytest.importorskip("MetaTrader5")
+pytest.importorskip("sklearn")
+
+from sklearn.ensemble import GradientBoostingRegressor
+
+from src.core.ml_adaptive_engine import PerformanceAttributionAnalyzer
+from src.core.ml_inference import OUTCOME_FEATURE_SCHEMA, CompiledTreeEnsemble
+
+
+def _trades(n=300, seed=0):
+    rng = np.random.default_rng(seed)
+    trades = []
+    for _ in range(n):
+        entry = {'vpin': rng.uniform(0.2, 0.8), 'atr': rng.uniform(1e-4, 1e-3),
+                 'adx': rng.uniform(10, 40), 'rsi': rng.uniform(20, 80)}
+        # Shuffled key order must not change the feature columns
+        entry = dict(sorted(entry.items(), key=lambda _: rng.random()))
+        quality = rng.uniform(0.6, 1.0)
+        trades.append(SimpleNamespace(
+            quality_score=quality, mtf_confluence=rng.uniform(0, 1),
+            structure_alignment=rng.uniform(0, 1), order_flow_quality=1 - entry['vpin'],
+            regime_fit=0.7, risk_pct=0.5, entry_features=entry,
+            pnl_r=4 * (quality - 0.75) - 2 * (entry['vpin'] - 0.5) + rng.normal(0, 0.3),
+        ))
+    return trades
+
+
+def _signal(trade):
+    return {'quality_score': trade.quality_score, 'mtf_confluence': trade.mtf_confluence,
+            'structure_alignment': trade.structure_alignment,
+            'order_flow_quality': trade.order_flow_quality, 'regime_fit': trade.regime_fit,
+            'risk_pct': trade.risk_pct, 'entry_features': trade.entry_features}
+
+
+def test_schema_columns_are_named_and_order_independent():
+    signal = {'quality_score': 0.9, 'entry_features': {'atr': 0.001, 'vpin': 0.3, 'rsi': None}}
+    reordered = {'quality_score': 0.9, 'entry_features': {'rsi': None, 'vpin': 0.3, 'atr': 0.001}}
+
+    X = OUTCOME_FEATURE_SCHEMA.signal_matrix([signal, reordered])
+    names = OUTCOME_FEATURE_SCHEMA.names
+
+    assert X.shape == (2, len(OUTCOME_FEATURE_SCHEMA))
+    np.testing.assert_array_equal(X[0], X[1])
+    assert X[0, names.index('quality_score')] == 0.9
+    assert X[0, names.index('mtf_confluence')] == 0.5      # default
+    assert X[0, names.index('entry_vpin')] == 0.3
+    assert X[0, names.index('entry_atr')] == 0.001
+    assert X[0, names.index('entry_rsi')] == 50.0          # None -> default
+
+
+def test_schema_maps_alias_keys():
+    legacy = {'entry_features': {'order_book_imbalance': -0.4, 'vpin': 0.3}}
+    both = {'entry_features': {'order_book_imbalance': -0.4, 'order_flow_imbalance': 0.2}}
+
+    X = OUTCOME_FEATURE_SCHEMA.signal_matrix([legacy, both, {}])
+    column = OUTCOME_FEATURE_SCHEMA.names.index('entry_order_flow_imbalance')
+
+    np.testing.assert_array_equal(X[:, column], [-0.4, 0.2, 0.0])
+
+
+def test_compiled_ensemble_matches_sklearn():
+    rng = np.random.default_rng(1)
+    X = rng.normal(size=(400, 6))
+    y = X[:, 0] - 2 * X[:, 1] ** 2 + rng.normal(0, 0.1, 400)
+    model = GradientBoostingRegressor(n_estimators=50, max_depth=4, random_state=0).fit(X, y)
+
+    compiled = CompiledTreeEnsemble.from_gradient_boosting(model, X)
+
+    X_new = rng.normal(size=(200, 6))
+    # Rows sitting exactly on split thresholds
+    thresholds = model.estimators_[0, 0].tree_.threshold
+    X_new[:5, model.estimators_[0, 0].tree_.feature[0]] = thresholds[0]
+
+    np.testing.assert_allclose(compiled.predict(X_new), model.predict(X_new), rtol=0, atol=1e-12)
+
+
+def test_predict_batch_matches_single_predictions():
+    trades = _trades()
+    analyzer = PerformanceAttributionAnalyzer(SimpleNamespace(trades=deque(trades)))
+
+    signals = [_signal(t) for t in trades[:100]]
+    np.testing.assert_array_equal(analyzer.predict_batch(signals), np.ones(100))
+
+    analyzer.train_outcome_predictor()
+    batch = analyzer.predict_batch(signals)
+
+    assert batch.shape == (100,)
+    X = OUTCOME_FEATURE_SCHEMA.signal_matrix(signals)
+    np.testing.assert_allclose(batch, analyzer.outcome_predictor.predict(X), atol=1e-12)
+    assert analyzer.predict_trade_outcome(signals[7]) == pytest.approx(batch[7], abs=1e-12)
+
+    sklearn_only = PerformanceAttributionAnalyzer(SimpleNamespace(trades=deque(trades)),
+                                                  compiled_inference=False)
+    sklearn_only.train_outcome_predictor()
+    assert sklearn_only.compiled_predictor is None
+    np.testing.assert_allclose(sklearn_only.predict_batch(signals), batch, atol=1e-12)
@@ -2,10 +2,8 @@
 Tests unitarios CORRECTOS para order_flow.py
 Basados en API real: add_trade() y get_current_vpin()
 """
-import sys
-sys.path.insert(0, "C:/TradingSystem/src/features")
 import numpy as np
-from order_flow import VPINCalculator
+from src.features.order_flow import VPINCalculator
 
 def test_vpin_initialization():
     """Inicializacion con parametros correctos"""
@@ -91,6 +89,42 @@ def test_vpin_reset():
     
     print(f"  OK reset: estado limpiado correctamente")
 
+def test_vpin_running_totals_match_bucket_sums():
+    """Totales incrementales deben coincidir con la suma sobre buckets"""
+    calc = VPINCalculator(bucket_size=100, num_buckets=5)
+
+    np.random.seed(7)
+    for i in range(2000):
+        calc.add_trade(volume=np.random.randint(10, 60),
+                       trade_direction=1 if np.random.random() > 0.4 else -1)
+
+    expected = sum(b['imbalance'] for b in calc.buckets) / sum(b['total_volume'] for b in calc.buckets)
+    assert len(calc.buckets) == 5
+    assert abs(calc.get_current_vpin() - expected) < 1e-12
+
+    print(f"  OK running totals: {calc.get_current_vpin():.4f}")
+
+def test_vpin_series_matches_streaming():
+    """calculate_vpin_series debe reproducir add_trade/get_current_vpin"""
+    from src.features.order_flow import calculate_vpin_series
+
+    np.random.seed(11)
+    volumes = np.random.randint(10, 400, 5000).astype(float)
+    directions = np.random.choice([-1, 0, 1], size=5000, p=[0.45, 0.1, 0.45])
+
+    calc = VPINCalculator(bucket_size=1000, num_buckets=20)
+    streaming = []
+    for volume, direction in zip(volumes, directions):
+        calc.add_trade(volume, int(direction))
+        streaming.append(calc.get_current_vpin())
+
+    batch = calculate_vpin_series(volumes, directions, bucket_size=1000, num_buckets=20)
+
+    assert len(batch) == len(streaming)
+    assert np.allclose(batch, streaming, rtol=1e-9, atol=1e-12)
+
+    print(f"  OK VPIN series: {len(batch)} valores, ultimo={batch[-1]:.4f}")
+
 if __name__ == "__main__":
     print("\n" + "="*70)
     print("TESTS UNITARIOS: ORDER FLOW (VPIN)")
@@ -101,7 +135,9 @@ if __name__ == "__main__":
     
     for test_func in [test_vpin_initialization, test_vpin_add_trade, 
                      test_vpin_bucket_completion, test_vpin_calculation,
-                     test_vpin_empty, test_vpin_reset]:
+                     test_vpin_empty, test_vpin_reset,
+                     test_vpin_running_totals_match_bucket_sums,
+                     test_vpin_series_matches_streaming]:
         tests_run += 1
         try:
             test_func()
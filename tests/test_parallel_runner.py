@@ -0,0 +1,171 @@
+"""
+Tests for backtesting.ParallelBacktestRunner
+
+Process-pool shards must reproduce the in-process sweep exactly.
+"""
+
+import importlib.util
+import sys
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtesting import BacktestEngine, ParallelBacktestRunner
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+def historical_data(make_ohlcv):
+    index = pd.date_range('2024-01-01', periods=900, freq='h')
+    return {
+        'EURUSD': make_ohlcv(1, index, 1.10),
+        'GBPUSD': make_ohlcv(2, index[::2], 1.27),
+        'USDJPY': make_ohlcv(3, index, 1.50),
+    }
+
+
+@pytest.fixture
+def factories(alternating_strategy):
+    return {
+        'fast': partial(alternating_strategy, 11),
+        'slow': partial(alternating_strategy, 29),
+    }
+
+WINDOWS = [
+    (datetime(2024, 1, 2), datetime(2024, 1, 15)),
+    (datetime(2024, 1, 15), datetime(2024, 2, 5)),
+]
+
+
+def _summaries(results):
+    return [(r['shard'].key, r['summary'].get('total_trades'), r['summary'].get('final_equity'))
+            for r in results['shards']]
+
+
+def test_pool_matches_in_process(historical_data, factories):
+    sequential = ParallelBacktestRunner(factories, max_workers=1).run(historical_data, WINDOWS)
+    parallel = ParallelBacktestRunner(factories, max_workers=2).run(historical_data, WINDOWS)
+
+    assert len(sequential['shards']) == 2 * 3 * 2
+    assert _summaries(parallel) == _summaries(sequential)
+    assert [(t['strategy_name'], t['symbol'], t['entry_time']) for t in parallel['trades']] == \
+        [(t['strategy_name'], t['symbol'], t['entry_time']) for t in sequential['trades']]
+
+    for window_index in range(len(WINDOWS)):
+        pd.testing.assert_series_equal(parallel['portfolio_equity'][window_index],
+                                       sequential['portfolio_equity'][window_index])
+
+
+def test_shard_matches_single_engine(historical_data, factories):
+    results = ParallelBacktestRunner(factories, max_workers=1).run(historical_data, WINDOWS)
+    shard_result = next(r for r in results['shards'] if r['shard'].key == ('fast', 'GBPUSD', 1))
+
+    engine = BacktestEngine(strategies=[factories['fast']()])
+    direct = engine.run_backtest({'GBPUSD': historical_data['GBPUSD']}, *WINDOWS[1])
+
+    assert shard_result['summary']['total_trades'] == direct['total_trades']
+    assert shard_result['summary']['final_equity'] == pytest.approx(direct['final_equity'])
+    np.testing.assert_allclose(shard_result['equity'], [p['equity'] for p in direct['equity_curve']])
+
+
+def test_trades_merged_in_time_order(historical_data, factories):
+    results = ParallelBacktestRunner(factories, max_workers=1).run(historical_data, WINDOWS)
+    entry_times = [t['entry_time'] for t in results['trades']]
+    assert entry_times == sorted(entry_times)
+
+
+def test_walk_forward_efficiency(historical_data, factories):
+    runner = ParallelBacktestRunner(factories, max_workers=2)
+    results = runner.run_walk_forward(historical_data, in_sample_months=0.4,
+                                      out_sample_months=0.2, total_periods=2)
+
+    assert len(results['periods']) == 2
+    assert set(results['walk_forward']) == {(s, sym) for s in factories for sym in historical_data}
+    for totals in results['walk_forward'].values():
+        assert 'wf_efficiency' in totals
+
+
+def test_symbol_group_runs_in_one_shard(historical_data, factories):
+    groups = {'EURGBP': ['EURUSD', 'GBPUSD'], 'USDJPY': ['USDJPY']}
+    results = ParallelBacktestRunner(factories, max_workers=2, symbol_groups=groups).run(
+        historical_data, WINDOWS)
+
+    assert [r['shard'].key for r in results['shards']][:4] == [
+        ('fast', 'EURGBP', 0), ('fast', 'EURGBP', 1), ('fast', 'USDJPY', 0), ('fast', 'USDJPY', 1)]
+
+    shard_result = next(r for r in results['shards'] if r['shard'].key == ('slow', 'EURGBP', 0))
+    assert shard_result['shard'].symbols == ('EURUSD', 'GBPUSD')
+
+    engine = BacktestEngine(strategies=[factories['slow']()])
+    direct = engine.run_backtest({s: historical_data[s] for s in groups['EURGBP']}, *WINDOWS[0])
+    assert shard_result['summary']['total_trades'] == direct['total_trades']
+    np.testing.assert_allclose(shard_result['equity'], [p['equity'] for p in direct['equity_curve']])
+
+    with pytest.raises(ValueError, match='AUDUSD'):
+        ParallelBacktestRunner(factories, symbol_groups={'x': ['EURUSD', 'AUDUSD']}).run(
+            historical_data, WINDOWS)
+
+
+class EveryNBarsStrategy:
+    """institutional_backtest strategy interface: evaluate(history_df, features) -> signals."""
+
+    def __init__(self, every):
+        self.every = every
+
+    def evaluate(self, history, features):
+        if len(history) % self.every:
+            return []
+        close = float(history['close'].iloc[-1])
+        sign = 1 if close >= float(history['open'].iloc[-1]) else -1
+        return [SimpleNamespace(symbol=history['symbol'].iloc[-1],
+                                direction='LONG' if sign > 0 else 'SHORT', entry_price=close,
+                                stop_loss=close - sign * 0.002, take_profit=close + sign * 0.003)]
+
+
+def test_institutional_backtest_sharded_matches_serial(make_ohlcv, monkeypatch):
+    pytest.importorskip('psycopg2')
+    spec = importlib.util.spec_from_file_location(
+        'institutional_backtest', ROOT / 'scripts' / 'institutional_backtest.py')
+    script = importlib.util.module_from_spec(spec)
+    # Registered so the shard runner pickles by reference for the workers
+    monkeypatch.setitem(sys.modules, 'institutional_backtest', script)
+    spec.loader.exec_module(script)
+    # Feature pipeline is not under test; workers (fork) inherit the patch
+    monkeypatch.setattr(script.FeatureGenerator, 'generate_features',
+                        lambda self, data: {'close': float(data['close'].iloc[-1])})
+
+    index = pd.date_range('2024-01-01', periods=160, freq='D')
+    historical_data = {'EURUSD': make_ohlcv(4, index, 1.10), 'GBPUSD': make_ohlcv(5, index, 1.27)}
+    factories = {'every7': partial(EveryNBarsStrategy, 7), 'every11': partial(EveryNBarsStrategy, 11)}
+
+    serial = script.InstitutionalBacktestEngine({}, 10000.0)
+    for name, factory in factories.items():
+        serial.add_strategy(name, factory())
+    long_data = pd.concat([frame.rename_axis('time').reset_index().assign(symbol=symbol)
+                           for symbol, frame in historical_data.items()], ignore_index=True)
+    serial.run_backtest(long_data.sort_values('time', kind='stable', ignore_index=True))
+
+    runner = ParallelBacktestRunner(factories, max_workers=2,
+                                    engine_kwargs={'initial_capital': 10000.0},
+                                    shard_runner=script.run_institutional_shard)
+    sharded = script.InstitutionalBacktestEngine({}, 10000.0)
+    sharded.absorb_parallel_results(runner.run(historical_data, [(index[0], index[-1])]))
+
+    def trade_keys(trades):
+        return sorted((t['strategy'], t['symbol'], t['entry_date'], t.get('profit')) for t in trades)
+
+    assert len(serial.trades) > 10
+    assert trade_keys(sharded.trades) == trade_keys(serial.trades)
+    for name, stats in serial.strategy_stats.items():
+        assert sharded.strategy_stats[name] == pytest.approx(stats), name
+    assert [p['date'] for p in sharded.daily_equity] == [p['date'] for p in serial.daily_equity]
+    np.testing.assert_allclose([p['equity'] for p in sharded.daily_equity],
+                               [p['equity'] for p in serial.daily_equity])
+    np.testing.assert_allclose([p['peak'] for p in sharded.daily_equity],
+                               [p['peak'] for p in serial.daily_equity])
@@ -0,0 +1,84 @@
+"""
+Array-based purging/embargo vs the original per-index loops
+"""
+
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from src.research.purged_cv import PurgedKFold, CombinatorialPurgedKFold
+
+
+def _reference_train(train_indices, test_indices, timestamps, label_times, purge_pct, embargo_pct):
+    """Original _apply_purging + _apply_embargo loops."""
+    test_start = timestamps[test_indices[0]]
+    test_end = timestamps[test_indices[-1]]
+    total_duration = timestamps[-1] - timestamps[0]
+
+    purge_start = test_start - total_duration * purge_pct
+    purged = [idx for idx in train_indices
+              if label_times.iloc[idx] < purge_start or timestamps[idx] > test_end]
+
+    embargo_end = test_end + total_duration * embargo_pct
+    return [idx for idx in purged
+            if timestamps[idx] < test_end or timestamps[idx] > embargo_end]
+
+
+def _dataset(n=2000, seed=3):
+    rng = np.random.default_rng(seed)
+    index = pd.date_range('2024-01-01', periods=n, freq='5min')
+    holding = pd.to_timedelta(rng.integers(1, 240, n), unit='min')
+    label_times = pd.Series(index + holding, index=index)
+    X = pd.DataFrame({'f': rng.normal(size=n)}, index=index)
+    return X, label_times
+
+
+def test_purged_kfold_matches_reference():
+    X, label_times = _dataset()
+    cv = PurgedKFold(n_splits=5, purge_pct=0.02, embargo_pct=0.03)
+    n = len(X)
+    fold_size = n // 5
+
+    for fold, (train, test) in enumerate(cv.split(X, label_times=label_times)):
+        start = fold * fold_size
+        end = start + fold_size if fold < 4 else n
+        assert np.array_equal(test, np.arange(start, end))
+
+        candidates = np.r_[np.arange(start), np.arange(end, n)]
+        expected = _reference_train(candidates, test, X.index, label_times, 0.02, 0.03)
+        assert train.dtype == np.int64
+        assert train.tolist() == expected
+
+
+def test_combinatorial_matches_reference():
+    X, label_times = _dataset(1500)
+    cv = CombinatorialPurgedKFold(n_splits=6, n_test_groups=2, purge_pct=0.01, embargo_pct=0.02)
+    n = len(X)
+    size = n // 6
+    groups = [np.arange(g * size, (g + 1) * size if g < 5 else n) for g in range(6)]
+
+    splits = list(cv.split(X, label_times=label_times))
+    assert len(splits) == 15
+
+    for (train, test), test_groups in zip(splits, combinations(range(6), 2)):
+        expected_test = np.concatenate([groups[g] for g in test_groups])
+        candidates = np.concatenate([groups[g] for g in range(6) if g not in test_groups])
+        expected = _reference_train(candidates, expected_test, X.index, label_times, 0.01, 0.02)
+
+        assert np.array_equal(test, expected_test)
+        assert train.tolist() == expected
+
+
+def test_unsorted_index_uses_mask_path():
+    X, label_times = _dataset(600)
+    order = np.random.default_rng(0).permutation(len(X))
+    X, label_times = X.iloc[order], label_times.iloc[order]
+    cv = PurgedKFold(n_splits=3, purge_pct=0.05, embargo_pct=0.05)
+
+    for train, test in cv.split(X, label_times=label_times):
+        candidates = np.setdiff1d(np.arange(len(X)), test)
+        expected = cv._apply_embargo(
+            cv._apply_purging(candidates, test, X.index, label_times), test, X.index
+        )
+        assert train.tolist() == expected.tolist()
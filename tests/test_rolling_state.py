@@ -0,0 +1,81 @@
+"""
+Tests for features.rolling_state
+
+The incremental accumulator must reproduce calculate_atr, calculate_ofi and
+calculate_cumulative_volume_delta evaluated on the same window.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.features.ofi import calculate_ofi
+from src.features.order_flow import calculate_signed_volume, calculate_cumulative_volume_delta
+from src.features.rolling_state import RollingFeatureState, RollingSum
+from src.features.technical_indicators import calculate_atr
+
+
+@pytest.fixture
+def bars():
+    rng = np.random.default_rng(7)
+    n = 400
+    close = 1.10 + np.cumsum(rng.normal(0, 0.0005, n))
+    open_ = close + rng.normal(0, 0.0002, n)
+    high = np.maximum(open_, close) + rng.uniform(0, 0.0004, n)
+    low = np.minimum(open_, close) - rng.uniform(0, 0.0004, n)
+    volume = rng.integers(100, 3000, n).astype(float)
+    # Flat closes exercise the zero-change CVD branch
+    close[100:103] = close[99]
+    return pd.DataFrame({'open': open_, 'high': high, 'low': low,
+                         'close': close, 'volume': volume})
+
+
+def test_matches_batch_indicators(bars):
+    state = RollingFeatureState()
+
+    for i, row in enumerate(bars.itertuples(index=False)):
+        state.push(row.open, row.high, row.low, row.close, row.volume)
+        if i < 19:
+            continue
+
+        window = bars.iloc[max(0, i - 99):i + 1]
+        atr = calculate_atr(window['high'], window['low'], window['close'], period=14).iloc[-1]
+        ofi = calculate_ofi(window, window_size=20).iloc[-1]
+        signed = calculate_signed_volume(window['close'], window['volume'])
+        cvd = calculate_cumulative_volume_delta(signed, window=20).iloc[-1]
+
+        assert state.atr == pytest.approx(atr, rel=1e-9), i
+        assert state.ofi == pytest.approx(ofi, rel=1e-9, abs=1e-12), i
+        assert state.cvd == pytest.approx(cvd, rel=1e-9, abs=1e-9), i
+
+
+def test_bar_imbalance_matches_window(bars):
+    state = RollingFeatureState()
+    for row in bars.itertuples(index=False):
+        state.push(row.open, row.high, row.low, row.close, row.volume)
+
+    window = bars.iloc[-100:]
+    buy = window.loc[window['close'] > window['open'], 'volume'].sum()
+    sell = window.loc[window['close'] <= window['open'], 'volume'].sum()
+    assert state.bar_imbalance == pytest.approx(abs(buy - sell) / (buy + sell))
+
+
+def test_rolling_sum_nan_handling():
+    acc = RollingSum(3)
+    for value in (1.0, float('nan'), 2.0):
+        acc.push(value)
+    assert np.isnan(acc.sum())
+    assert acc.sum(skipna=True) == 3.0
+
+    acc.push(4.0)
+    acc.push(5.0)
+    assert acc.sum() == 11.0
+
+
+def test_no_drift_over_long_stream():
+    rng = np.random.default_rng(3)
+    values = rng.normal(0, 1e6, 200_000)
+    acc = RollingSum(20)
+    for value in values:
+        acc.push(value)
+    assert acc.sum() == pytest.approx(values[-20:].sum(), rel=1e-12, abs=1e-6)
@@ -0,0 +1,147 @@
+"""
+Rolling statistics for the gatekeepers
+
+RollingMedian / RollingMoments must track np.median / np.mean / np.std over
+the same window, and SpreadMonitor / KylesLambdaEstimator must produce the
+values the original array-based code computed from their deques.
+"""
+
+from collections import deque
+
+import numpy as np
+import pytest
+
+from gatekeepers.kyles_lambda import KylesLambdaEstimator
+from gatekeepers.rolling_statistics import RollingCovariance, RollingMedian, RollingMoments
+from gatekeepers.spread_monitor import SpreadMonitor
+
+
+def _slide(values, window):
+    """Yield (window contents, added, evicted) while sliding over values."""
+    buffer = deque(maxlen=window)
+    for value in values:
+        evicted = buffer[0] if len(buffer) == window else None
+        buffer.append(value)
+        yield buffer, value, evicted
+
+
+def test_rolling_median_matches_numpy_with_duplicates():
+    rng = np.random.default_rng(3)
+    values = rng.integers(0, 15, 3000).astype(float)  # many ties
+    median = RollingMedian()
+
+    for buffer, added, evicted in _slide(values, 41):
+        if evicted is not None:
+            median.remove(evicted)
+        median.add(added)
+        assert len(median) == len(buffer)
+        assert median.median() == np.median(buffer)
+
+
+def test_rolling_median_nan_and_inf():
+    values = [1.0, np.inf, 2.0, np.nan, 3.0, -np.inf, 4.0, 5.0, 6.0, 7.0]
+    median = RollingMedian()
+    assert median.median() is None
+
+    for buffer, added, evicted in _slide(values, 4):
+        if evicted is not None:
+            median.remove(evicted)
+        median.add(added)
+        np.testing.assert_equal(median.median(), np.median(buffer))
+
+
+def test_rolling_moments_match_numpy():
+    rng = np.random.default_rng(5)
+    values = 1e3 + rng.normal(0, 1, 5000)
+    values[1000] = np.inf
+    moments = RollingMoments(100)
+
+    for buffer, added, evicted in _slide(values, 100):
+        if evicted is not None:
+            moments.remove(evicted)
+        moments.add(added)
+        if moments.needs_resync:
+            moments.resync(buffer)
+        if np.isfinite(buffer).all():
+            assert moments.mean(buffer) == pytest.approx(np.mean(buffer), rel=1e-12)
+            assert moments.std(buffer) == pytest.approx(np.std(buffer), rel=1e-6)
+        else:
+            assert moments.mean(buffer) == np.mean(buffer)
+
+
+def test_rolling_covariance_matches_numpy():
+    rng = np.random.default_rng(8)
+    x = rng.normal(0, 100, 2000)
+    y = 0.01 * x + rng.normal(0, 1, 2000)
+    cov = RollingCovariance(200)
+
+    for buffer, added, evicted in _slide(list(zip(x, y)), 200):
+        if evicted is not None:
+            cov.remove(*evicted)
+        cov.add(*added)
+        if cov.needs_resync:
+            cov.resync(buffer)
+
+    xs, ys = np.array(buffer).T
+    assert cov.n == len(buffer)
+    assert cov.c_xy / (cov.n - 1) == pytest.approx(np.cov(ys, xs)[0, 1], rel=1e-9)
+    assert cov.m_xx / cov.n == pytest.approx(np.var(xs), rel=1e-9)
+
+
+def test_spread_monitor_matches_array_statistics():
+    rng = np.random.default_rng(11)
+    monitor = SpreadMonitor(window_size=50)
+
+    for i in range(1500):
+        mid = 1.1 + rng.normal(0, 1e-3)
+        if i % 3:
+            half = rng.choice([0.5e-5, 1e-5, 1.5e-5])  # repeated spreads
+            monitor.update_quoted(mid - half, mid + half)
+        else:
+            monitor.update_effective(mid + rng.normal(0, 1e-5), mid, 1)
+
+        if len(monitor.spreads) >= 10:
+            spreads = np.array(monitor.spreads)
+            assert monitor.get_median_spread() == np.median(spreads)
+            assert monitor.get_mean_spread() == pytest.approx(np.mean(spreads), rel=1e-9)
+            assert monitor.get_spread_std() == pytest.approx(np.std(spreads), rel=1e-6)
+
+
+def _reference_lambda(estimator):
+    """Original array-based estimate over the estimator's current window."""
+    delta_prices = np.array(estimator.price_changes)
+    signed_vols = np.array(estimator.signed_volumes)
+    nonzero_mask = signed_vols != 0
+    delta_prices, signed_vols = delta_prices[nonzero_mask], signed_vols[nonzero_mask]
+    variance_sv = np.var(signed_vols)
+    lambda_estimate = np.cov(delta_prices, signed_vols)[0, 1] / variance_sv
+    mse = np.mean((delta_prices - lambda_estimate * signed_vols) ** 2)
+    return lambda_estimate, np.sqrt(mse / variance_sv)
+
+
+def test_kyles_lambda_matches_array_regression():
+    rng = np.random.default_rng(13)
+    estimator = KylesLambdaEstimator(estimation_window=120, update_frequency=7,
+                                     historical_window=60)
+    price = 1.1
+    checked = 0
+
+    for _ in range(4000):
+        # Zero volumes exercise the nonzero-SV filter and its window removal
+        volume = float(rng.integers(1, 500)) if rng.random() > 0.2 else 0.0
+        new_price = price + rng.normal(0, 1e-5)
+        estimator.update(new_price, price, volume, new_price, price)
+        price = new_price
+
+        if estimator.trades_since_update == 0 and estimator.current_lambda is not None:
+            expected_lambda, expected_stderr = _reference_lambda(estimator)
+            assert estimator.current_lambda == pytest.approx(expected_lambda, rel=1e-7)
+            assert estimator.lambda_stderr == pytest.approx(expected_stderr, rel=1e-7)
+            checked += 1
+
+        if len(estimator.lambda_history) >= 50:
+            history = np.array(estimator.lambda_history)
+            assert estimator.get_historical_mean() == pytest.approx(np.mean(history), rel=1e-9)
+            assert estimator.get_historical_std() == pytest.approx(np.std(history), rel=1e-6)
+
+    assert checked > 500
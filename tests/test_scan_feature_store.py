@@ -0,0 +1,178 @@
+"""
+ScanFeatureStore: compute-once features per scan, shared by every consumer
+"""
+
+import importlib.util
+import math
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def _m1(n=300, seed=0, start='2024-01-01'):
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 2e-4, n))
+    high = close + rng.uniform(0, 3e-4, n)
+    low = close - rng.uniform(0, 3e-4, n)
+    return pd.DataFrame({
+        'time': pd.date_range(start, periods=n, freq='min'),
+        'open': np.r_[close[0], close[:-1]], 'high': high, 'low': low, 'close': close,
+        'volume': rng.integers(1, 300, n).astype(float),
+        'atr': pd.Series(high - low).rolling(14).mean().to_numpy(),
+    })
+
+
+def _same_features(a, b):
+    assert a.keys() == b.keys()
+    for key in a:
+        if isinstance(a[key], float) and math.isnan(a[key]):
+            assert math.isnan(b[key]), key
+        else:
+            assert a[key] == b[key], key
+
+
+class _CountingFeature:
+    def __init__(self, name):
+        self.name = name
+        self.calls = []
+
+    def __call__(self, symbol, data):
+        self.calls.append(symbol)
+        return {self.name: float(data['close'].iloc[-1])}
+
+
+@pytest.fixture
+def store(mt5_stub):
+    from src.core.scan_feature_store import ScanFeatureStore
+    return ScanFeatureStore()
+
+
+def test_features_computed_once_per_symbol_and_scan(store):
+    last_close, close_mean = _CountingFeature('last_close'), _CountingFeature('close_mean')
+    store.register('last_close', last_close)
+    store.register('close_mean', close_mean)
+    data = {'EURUSD': _m1(seed=1), 'GBPUSD': _m1(seed=2)}
+
+    store.begin_scan()
+    # Strategies, Brain, position manager and ML snapshot ask for the same symbol
+    seen = [store.get(symbol, data[symbol]) for _ in range(4) for symbol in data]
+
+    assert last_close.calls == close_mean.calls == ['EURUSD', 'GBPUSD']
+    assert all(features is seen[i % 2] for i, features in enumerate(seen))
+
+    stats = store.get_statistics()
+    assert (stats['hits'], stats['misses'], stats['cached_symbols']) == (6, 2, 2)
+    assert stats['timings']['last_close']['calls'] == 2
+
+
+def test_new_bar_or_scan_invalidates(store):
+    feature = _CountingFeature('last_close')
+    store.register('last_close', feature)
+    data = _m1(seed=3)
+
+    store.begin_scan()
+    first = store.get('EURUSD', data.iloc[:-1])
+    updated = store.get('EURUSD', data)           # new M1 bar within the scan
+    assert first['last_close'] != updated['last_close']
+    assert store.get('EURUSD', data) is updated
+
+    store.begin_scan()                            # forming bar / HTF may have changed
+    assert store.get('EURUSD', data) is not updated
+    assert len(feature.calls) == 3
+
+
+def test_failed_feature_is_not_cached(store):
+    calls = []
+
+    def flaky(symbol, data):
+        calls.append(symbol)
+        if len(calls) == 1:
+            raise ValueError('boom')
+        return {'value': 1.0}
+
+    store.register('flaky', flaky)
+    store.begin_scan()
+    with pytest.raises(ValueError):
+        store.get('EURUSD', _m1())
+    assert store.get('EURUSD', _m1()) == {'value': 1.0}
+
+
+class _MTFManager:
+    def __init__(self, data):
+        self.data = data
+        self.trend_calls = 0
+
+    def get_data(self, symbol, timeframe):
+        return self.data[symbol]
+
+    def calculate_mtf_trend(self, symbol):
+        self.trend_calls += 1
+        return {'H1': 'UP', 'H4': 'UP'}
+
+    def get_structure(self, symbol, timeframe):
+        return {'swing_high': 1.2, 'swing_low': 1.0}
+
+
+@pytest.fixture
+def engine(mt5_stub, tmp_path):
+    # Copy of the script so its module-level log file goes to tmp_path
+    (tmp_path / 'scripts').mkdir()
+    (tmp_path / 'config').symlink_to(ROOT / 'config')
+    script = tmp_path / 'scripts' / 'live_trading_engine_institutional.py'
+    script.write_bytes((ROOT / 'scripts' / 'live_trading_engine_institutional.py').read_bytes())
+
+    spec = importlib.util.spec_from_file_location('live_trading_engine_institutional', script)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module.InstitutionalTradingEngine()
+
+
+def test_engine_features_match_uncached_path(engine):
+    data = {'EURUSD.pro': _m1(seed=4), 'XAUUSD.pro': _m1(seed=5)}
+    engine.mtf_manager = _MTFManager(data)
+
+    engine.feature_store.begin_scan()
+    for symbol, m1 in data.items():
+        features = engine.calculate_features(symbol)
+        # Same dict for every consumer of the scan
+        assert engine.calculate_features(symbol) is features
+
+        # Uncached path: every registered group computed directly
+        direct = {}
+        for compute in (engine._feature_atr, engine._feature_rsi, engine._feature_order_flow,
+                        engine._feature_adx, engine._feature_mtf_trend, engine._feature_structure):
+            direct.update(compute(symbol, m1))
+        _same_features(features, direct)
+        assert {'atr', 'rsi', 'vpin', 'order_flow_imbalance', 'adx', 'mtf_trends', 'structure'} <= set(features)
+
+    # Once per symbol in the scan (the direct calls above add one each)
+    assert engine.mtf_manager.trend_calls == 2 * len(data)
+
+    engine.feature_store.begin_scan()
+    engine.calculate_features('EURUSD.pro')
+    assert engine.mtf_manager.trend_calls == 2 * len(data) + 1
+
+
+def test_engine_features_fill_outcome_schema(engine):
+    from src.core.ml_inference import OUTCOME_FEATURE_SCHEMA
+
+    engine.mtf_manager = _MTFManager({'EURUSD.pro': _m1(seed=6), 'XAUUSD.pro': _m1(n=20)})
+    engine.feature_store.begin_scan()
+    computed = engine.calculate_features('EURUSD.pro')
+    fallback = engine.calculate_features('XAUUSD.pro')     # too few bars
+
+    X = OUTCOME_FEATURE_SCHEMA.signal_matrix([{'entry_features': computed},
+                                              {'entry_features': fallback}])
+    entry_columns = [name for name in OUTCOME_FEATURE_SCHEMA.names if name.startswith('entry_')]
+
+    # Every entry column read from the engine's dict, none left to the default
+    for name in entry_columns:
+        key = name[len('entry_'):]
+        assert key in computed and key in fallback, key
+        row = X[:, OUTCOME_FEATURE_SCHEMA.names.index(name)]
+        np.testing.assert_array_equal(row, [computed[key], fallback[key]])
+    assert not np.isnan(X).any()
@@ -0,0 +1,114 @@
+"""
+StructureEngine vs the original per-bar structure loops
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("MetaTrader5")
+
+from src.core.bar_buffer import OHLCVRingBuffer
+from src.core.mt5_replay import RATES_DTYPE
+from src.core.structure_engine import StructureEngine
+
+
+def _reference_structure(df: pd.DataFrame):
+    """Original MultiTimeframeDataManager._update_structure_cache logic."""
+    if len(df) < 50:
+        return None
+
+    structure = {'swing_highs': [], 'swing_lows': [], 'order_blocks': [], 'fvgs': [], 'liquidity_zones': []}
+    highs = df['high'].values
+    lows = df['low'].values
+    times = df['time'].values
+
+    for i in range(5, len(df) - 5):
+        if highs[i] == max(highs[i-5:i+6]):
+            structure['swing_highs'].append({'price': float(highs[i]), 'time': times[i], 'index': i})
+    for i in range(5, len(df) - 5):
+        if lows[i] == min(lows[i-5:i+6]):
+            structure['swing_lows'].append({'price': float(lows[i]), 'time': times[i], 'index': i})
+
+    for idx, row in df.tail(100).iterrows():
+        if row['high'] - row['low'] > row['atr'] * 1.5:
+            structure['order_blocks'].append({
+                'type': 'BULLISH' if row['close'] > row['open'] else 'BEARISH',
+                'high': float(row['high']), 'low': float(row['low']), 'time': row['time'],
+            })
+
+    for i in range(2, len(df)):
+        if df.iloc[i-2]['high'] < df.iloc[i]['low']:
+            if df.iloc[i]['low'] - df.iloc[i-2]['high'] > df.iloc[i]['atr'] * 0.3:
+                structure['fvgs'].append({'type': 'BULLISH', 'high': float(df.iloc[i]['low']),
+                                          'low': float(df.iloc[i-2]['high']), 'time': df.iloc[i]['time']})
+        elif df.iloc[i-2]['low'] > df.iloc[i]['high']:
+            if df.iloc[i-2]['low'] - df.iloc[i]['high'] > df.iloc[i]['atr'] * 0.3:
+                structure['fvgs'].append({'type': 'BEARISH', 'high': float(df.iloc[i-2]['low']),
+                                          'low': float(df.iloc[i]['high']), 'time': df.iloc[i]['time']})
+
+    df_tail = df.tail(50)
+    atr_mean = np.mean(df_tail['atr'].values)
+    for i in range(5, len(df_tail)):
+        if df_tail.iloc[i-5:i]['atr'].mean() < atr_mean * 0.6:
+            structure['liquidity_zones'].append({
+                'high': float(df_tail.iloc[i-5:i]['high'].max()),
+                'low': float(df_tail.iloc[i-5:i]['low'].min()),
+                'time': df_tail.iloc[i]['time'],
+            })
+    return structure
+
+
+def _rates(n: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    rates = np.zeros(n, dtype=RATES_DTYPE)
+    rates['time'] = pd.date_range('2024-01-01', periods=n, freq='5min').as_unit('s').asi8
+    # Jumpy walk so FVGs, displacement candles and compression all occur
+    close = 1.1 + np.cumsum(rng.normal(0, 3e-4, n) * rng.choice([0.2, 1.0, 4.0], n))
+    rates['open'] = np.r_[close[0], close[:-1]]
+    rates['close'] = close
+    rates['high'] = np.maximum(rates['open'], close) + rng.uniform(0, 2e-4, n)
+    rates['low'] = np.minimum(rates['open'], close) - rng.uniform(0, 2e-4, n)
+    rates['tick_volume'] = rng.integers(1, 300, n)
+    return rates
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_detect_matches_reference(seed):
+    buffer = OHLCVRingBuffer(capacity=400)
+    buffer.update(_rates(400, seed))
+    df = buffer.to_frame('EURUSD', 'M5')
+
+    result = StructureEngine().detect(df)
+    expected = _reference_structure(df)
+
+    for key in expected:
+        assert result[key] == expected[key], key
+    assert len(result['fvgs']) > 0 and len(result['order_blocks']) > 0
+
+
+def test_incremental_update_matches_reference():
+    rates = _rates(900, seed=3)
+    buffer = OHLCVRingBuffer(capacity=300)
+    engine = StructureEngine()
+
+    buffer.update(rates[:300])
+    pos = 300
+    for step in [1, 1, 3, 0, 17, 1, 60, 2, 250]:
+        # Re-send the forming bar with a revised close, then the new bars
+        revised = rates[pos - 1:pos + step].copy()
+        revised['close'][0] += 1e-5
+        buffer.update(revised)
+        pos += step
+
+        df = buffer.to_frame('EURUSD', 'M5')
+        result = engine.update(('EURUSD', 'M5'), df)
+        expected = _reference_structure(df)
+        for key in expected:
+            assert result[key] == expected[key], (step, key)
+
+
+def test_short_frame_returns_none():
+    buffer = OHLCVRingBuffer(capacity=40)
+    buffer.update(_rates(40, seed=0))
+    assert StructureEngine().update('k', buffer.to_frame('EURUSD', 'M5')) is None
@@ -65,6 +65,120 @@ def test_custom_fields():
     
     print(f"  OK Campos personalizados presentes")
 
+def _async_lines(tmp_path, emit, **kwargs):
+    """Lineas JSON escritas por setup_async_logging tras emit(logger)."""
+    import logging
+    from structured_logging import setup_async_logging
+    
+    log_path = tmp_path / 'async.jsonl'
+    name = f"test_async_{len(list(tmp_path.iterdir()))}_{id(emit)}"
+    async_logging = setup_async_logging(str(log_path), logger_name=name, console=False, **kwargs)
+    try:
+        emit(async_logging.logger)
+    finally:
+        async_logging.close()
+        async_logging.logger.removeHandler(async_logging.handler)
+    
+    with open(log_path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f], async_logging.get_stats()
+
+def test_async_bound_context_and_exception(tmp_path):
+    """Test logging asincrono: contexto fijo, args diferidos y excepciones"""
+    from structured_logging import bind_logger
+    
+    def emit(logger):
+        log = bind_logger(logger, batch_id='B1', symbol='EURUSD')
+        state = {'signals': 3}
+        log.info("ARBITER_START: %s signals", state['signals'])
+        log.info("Signal", extra={'strategy': 'momentum'})
+        try:
+            raise ValueError('boom')
+        except ValueError:
+            log.exception("Fallo")
+    
+    lines, stats = _async_lines(tmp_path, emit)
+    assert [l['message'] for l in lines] == ["ARBITER_START: 3 signals", "Signal", "Fallo"]
+    assert all(l['batch_id'] == 'B1' and l['symbol'] == 'EURUSD' for l in lines)
+    assert lines[1]['strategy'] == 'momentum'
+    assert 'ValueError: boom' in lines[2]['exception']
+    assert stats['enqueued'] == 3 and stats['dropped'] == 0 and stats['queue_depth'] == 0
+
+def test_async_rate_limit(tmp_path):
+    """Test rate limit: se suprime por punto de llamada, WARNING nunca"""
+    import time
+    
+    def emit(logger):
+        for i in range(51):
+            if i == 50:
+                time.sleep(0.15)
+            logger.info("tick %d", i)
+            logger.warning("warn %d", i)
+    
+    lines, stats = _async_lines(tmp_path, emit, rate_limit_per_s=10.0, rate_limit_burst=5)
+    ticks = [l for l in lines if l['message'].startswith('tick')]
+    assert len([l for l in lines if l['level'] == 'WARNING']) == 51
+    assert [l['message'] for l in ticks] == ['tick 0', 'tick 1', 'tick 2', 'tick 3', 'tick 4', 'tick 50']
+    assert ticks[-1]['suppressed'] == 45
+    assert stats['suppressed'] == 45
+
+def test_async_lean_records(tmp_path):
+    """Test lean_records: sin linea el rate limit agrupa por plantilla"""
+    import logging
+    saved = (logging._srcfile, logging.logThreads, logging.logProcesses, logging.logMultiprocessing)
+    
+    def emit(logger):
+        for i in range(10):
+            logger.info("a %d", i)
+            logger.info("b %d", i)
+    
+    try:
+        lines, stats = _async_lines(tmp_path, emit, rate_limit_per_s=0.001, rate_limit_burst=2,
+                                    lean_records=True)
+    finally:
+        (logging._srcfile, logging.logThreads,
+         logging.logProcesses, logging.logMultiprocessing) = saved
+    
+    assert [l['message'] for l in lines] == ['a 0', 'b 0', 'a 1', 'b 1']
+    assert stats['suppressed'] == 16
+
+def test_async_queue_full_drops():
+    """Test cola llena: se descarta y se cuenta sin bloquear"""
+    import logging
+    import queue
+    from structured_logging import AsyncQueueHandler
+    
+    handler = AsyncQueueHandler(queue.SimpleQueue(), max_pending=3)
+    logger = logging.getLogger('test_async_queue_full')
+    logger.propagate = False
+    logger.addHandler(handler)
+    try:
+        for i in range(5):
+            logger.warning("msg %d", i)
+    finally:
+        logger.removeHandler(handler)
+    
+    assert handler.enqueued == 3 and handler.dropped == 2
+    assert handler.queue.get_nowait().msg == 'msg 0'
+
+def test_formatter_non_serializable_fields():
+    """Test formateador: numpy y objetos no serializables en campos de contexto"""
+    import logging
+    import numpy as np
+    from structured_logging import JSONFormatter
+    
+    record = logging.LogRecord('t', logging.INFO, __file__, 1, "x", None, None)
+    record.price = np.float64(1.085)
+    record.size = np.array([0.1, 0.2])
+    record.action = object()
+    data = json.loads(JSONFormatter().format(record))
+    assert data['price'] == 1.085 and data['size'] == [0.1, 0.2]
+    assert data['action'].startswith('<object')
+    
+    record.balance = {1: 'clave no str'}
+    data = json.loads(JSONFormatter().format(record))
+    assert data['price'] == 1.085 and data['balance'] == {'1': 'clave no str'}
+    assert data['timestamp'].endswith('Z') and len(data['timestamp']) == 27
+
 if __name__ == "__main__":
     print("\n" + "="*60)
     print("TESTS: LOGGING ESTRUCTURADO")
@@ -0,0 +1,146 @@
+"""
+Trade memory storage: segmented log, snapshot + tail startup, time-bounded indexes
+"""
+
+import json
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("MetaTrader5")
+pytest.importorskip("sklearn")
+
+from src.core.ml_adaptive_engine import SignalRecord, TradeMemoryDatabase, TradeRecord
+from src.core.trade_memory_store import SegmentedRecordLog, TimeBoundedIndex
+
+
+def _trade(i, strategy='liquidity_sweep', age_days=0.0):
+    ts = datetime.now() - timedelta(days=age_days)
+    return TradeRecord(
+        trade_id=f'T{i}', timestamp=ts, symbol='EURUSD', strategy=strategy, direction='LONG',
+        entry_price=1.1, entry_time=ts, entry_regime='TRENDING',
+        entry_features={'vpin': 0.3, 'atr': 0.001},
+        quality_score=0.8, mtf_confluence=0.6, structure_alignment=0.7,
+        order_flow_quality=0.7, regime_fit=0.7, lot_size=0.1, risk_pct=0.5,
+        stop_loss=1.098, take_profit=1.104, exit_price=1.102, exit_time=ts,
+        exit_reason='TARGET', pnl_pct=0.2, pnl_r=1.0 if i % 2 else -1.0,
+        mae_r=-0.3, mfe_r=1.5, duration_minutes=30,
+        avg_vpin_during=0.3, avg_volatility_during=0.001, regime_changes_during=0,
+    )
+
+
+def _signal(i):
+    return SignalRecord(
+        signal_id=f'S{i}', timestamp=datetime.now(), symbol='EURUSD',
+        strategy='liquidity_sweep', direction='LONG', quality_score=0.8,
+        entry_price=1.1, stop_loss=1.098, take_profit=1.104, regime='TRENDING',
+        features={'vpin': 0.3}, approved=True, rejection_reason=None,
+        trade_id=None, eventual_outcome_r=None,
+    )
+
+
+def test_log_rotates_and_replays_from_position(tmp_path):
+    log = SegmentedRecordLog(tmp_path, segment_bytes=200)
+    rotations = sum(log.append(('r', i, 'x' * 50)) for i in range(20))
+
+    assert rotations == log.rotations > 0
+    assert len(log.segments()) > 1
+    assert [r[1] for r in log.replay()] == list(range(20))
+
+    position = log.position()
+    log.append(('r', 20, ''))
+    log.close()
+    assert [r[1] for r in SegmentedRecordLog(tmp_path).replay(position)] == [20]
+
+
+def test_torn_tail_record_is_truncated(tmp_path):
+    log = SegmentedRecordLog(tmp_path)
+    for i in range(3):
+        log.append(('r', i))
+    log.close()
+
+    path = log.segment_path(log.segment)
+    size = path.stat().st_size
+    with open(path, 'ab') as f:
+        f.write(b'\x80\x05\x95\x10\x00')   # partial pickle frame
+
+    assert [r[1] for r in SegmentedRecordLog(tmp_path).replay()] == [0, 1, 2]
+    assert path.stat().st_size == size
+
+
+def test_time_bounded_index_evicts_old_records():
+    index = TimeBoundedIndex(timedelta(days=90))
+    old, new = SimpleNamespace(timestamp=datetime.now() - timedelta(days=100)), \
+        SimpleNamespace(timestamp=datetime.now())
+
+    index.add('a', old)
+    assert index['a'] == [] and 'a' not in index.keys()
+
+    index.add('a', new)
+    assert index.get('a') == [new] and len(index) == 1
+    assert index.get('missing') == []
+
+
+def test_restart_loads_snapshot_plus_tail(tmp_path):
+    db = TradeMemoryDatabase(tmp_path, segment_bytes=4096)
+    for i in range(40):
+        db.record_signal(_signal(i))
+        db.record_trade(_trade(i, strategy='a' if i % 2 else 'b'))
+    db.link_signal_to_trade('S39', 'T39', 1.0)
+    db.link_signal_to_trade('unknown', 'T0', 1.0)
+    assert db.snapshots_written > 0
+    db.log.close()
+
+    reloaded = TradeMemoryDatabase(tmp_path)
+    assert [t.trade_id for t in reloaded.trades] == [f'T{i}' for i in range(40)]
+    assert [s.signal_id for s in reloaded.signals] == [f'S{i}' for i in range(40)]
+    assert len(reloaded.trades_by_strategy['a']) == 20
+    assert len(reloaded.get_winning_trades('a')) == 20
+    assert reloaded.signals_by_id['S39'].trade_id == 'T39'
+    assert reloaded.signals_by_id['S39'].eventual_outcome_r == 1.0
+    reloaded.close()
+
+    # The closing snapshot covers the whole log: nothing is replayed twice
+    again = TradeMemoryDatabase(tmp_path)
+    assert len(again.trades) == 40 and len(again.signals) == 40
+    again.close()
+
+
+def test_indexes_skip_trades_older_than_retention(tmp_path):
+    db = TradeMemoryDatabase(tmp_path, index_retention_days=30)
+    db.record_trade(_trade(0, age_days=45))
+    db.record_trade(_trade(1, age_days=1))
+
+    assert len(db.trades) == 2
+    assert [t.trade_id for t in db.get_strategy_trades('liquidity_sweep', lookback_days=60)] == ['T1']
+    db.close()
+
+
+def test_signal_index_follows_deque_eviction(tmp_path):
+    db = TradeMemoryDatabase(tmp_path)
+    db.signals = type(db.signals)(maxlen=3)
+    for i in range(5):
+        db.record_signal(_signal(i))
+
+    assert sorted(db.signals_by_id) == ['S2', 'S3', 'S4']
+    db.close()
+
+
+def test_legacy_jsonl_is_migrated_once(tmp_path):
+    with open(tmp_path / 'trades.jsonl', 'w') as f:
+        for i in range(3):
+            f.write(json.dumps(_trade(i).to_dict()) + '\n')
+    with open(tmp_path / 'signals.jsonl', 'w') as f:
+        f.write(json.dumps(_signal(0).to_dict()) + '\n')
+
+    db = TradeMemoryDatabase(tmp_path)
+    assert len(db.trades) == 3 and len(db.signals) == 1
+    assert not (tmp_path / 'trades.jsonl').exists()
+    assert (tmp_path / 'trades.jsonl.migrated').exists()
+    db.record_trade(_trade(3))
+    db.log.close()
+
+    reloaded = TradeMemoryDatabase(tmp_path)
+    assert [t.trade_id for t in reloaded.trades] == ['T0', 'T1', 'T2', 'T3']
+    reloaded.close()